@@ -0,0 +1,197 @@
+"""
+⏱️ BENCHMARK DEL PIPELINE COMPLETO
+==================================
+
+Mide cada etapa del concentrado sobre libros sintéticos:
+📊 extracción → 🔄 transformación → 🔍 validación → 🧮 sumatoria → 📤 exportación
+
+Los resultados se guardan en JSON para comparar entre versiones.
+
+Uso:
+    python -m benchmarks.benchmark_pipeline --modo ESCUELAS --tamanos 10 100 1000 -o resultados.json
+"""
+
+import argparse
+import contextlib
+import datetime
+import functools
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+import openpyxl
+import pandas as pd
+
+from benchmarks.generar_libros import DISENOS, generar_libros
+from src.config import settings
+from src.config.settings import configurar_modo
+from src.controllers.app_controller import AppController
+from src.core.data_transformer import SALIDAS_LOTE
+from src.core.excel_extractor import ExcelExtractor
+
+ETAPAS = ("extraccion", "transformacion", "validacion", "sumatoria", "exportacion")
+
+
+def cronometrar(objeto, metodo, tiempos, etapa):
+    """
+    Sumar a tiempos[etapa] la duración de cada llamada a objeto.metodo.
+
+    Solo reemplaza el método en esa instancia; el resto del pipeline no cambia.
+    """
+    original = getattr(objeto, metodo)
+
+    @functools.wraps(original)
+    def medido(*args, **kwargs):
+        inicio = time.perf_counter()
+        try:
+            return original(*args, **kwargs)
+        finally:
+            tiempos[etapa] += time.perf_counter() - inicio
+
+    setattr(objeto, metodo, medido)
+
+
+def medir_lote(archivos, motor, directorio_salida):
+    """
+    Ejecutar el pipeline sobre un lote y medir cada etapa.
+
+    Sigue el mismo camino que cli.py (AppController con SALIDAS_LOTE). Una
+    etapa que falla queda con tiempo None y su mensaje en 'errores'.
+
+    Args:
+        archivos: Rutas de los libros
+        motor: Motor de extracción
+        directorio_salida: Carpeta para el concentrado exportado
+
+    Returns:
+        dict: Segundos por etapa, discrepancias encontradas y errores por etapa
+    """
+    controller = AppController(salidas=SALIDAS_LOTE)
+    procesador = controller.data_manager.processor
+    # Motor a medir y sin caché: cada lote vuelve a leer sus libros
+    procesador.extractor = ExcelExtractor(motor=motor)
+    procesador.cache = None
+
+    tiempos = dict.fromkeys(ETAPAS, 0.0)
+    errores = {}
+    discrepancias = 0
+
+    # 📊🔄 La transformación es el resto del procesamiento de cada archivo
+    cronometrar(procesador.extractor, 'extraer_con_metadatos', tiempos, 'extraccion')
+    inicio = time.perf_counter()
+    resumen = controller.procesar_lote(archivos, paralelo=False)
+    tiempos['transformacion'] = time.perf_counter() - inicio - tiempos['extraccion']
+    if resumen['fallidos']:
+        errores['transformacion'] = (f"{resumen['fallidos']} archivos fallidos "
+                                     f"(primero: {resumen['errores'][0]['error']})")
+
+    destino = os.path.join(directorio_salida, "concentrado.xlsx")
+    etapas = (
+        ('validacion', controller.validar_lote),
+        ('sumatoria', controller.calcular_sumatoria),
+        ('exportacion', lambda: controller.exportar_a_plantilla(destino)),
+    )
+    for etapa, ejecutar in etapas:
+        inicio = time.perf_counter()
+        resultado = ejecutar()
+        tiempos[etapa] = time.perf_counter() - inicio
+        if not resultado['exito']:
+            errores[etapa] = resultado.get('error') or resultado.get('mensaje')
+            tiempos[etapa] = None
+        elif etapa == 'validacion':
+            discrepancias = resultado['total_discrepancias']
+
+    return {'tiempos': tiempos, 'discrepancias': discrepancias, 'errores': errores}
+
+
+def ejecutar_benchmark(modo, tamanos, motor, directorio):
+    """
+    Generar libros y medir el pipeline para cada tamaño de lote.
+
+    Args:
+        modo: "ESCUELAS" o "ZONAS"
+        tamanos: Tamaños de lote (ej. [10, 100, 1000])
+        motor: Motor de extracción
+        directorio: Carpeta de trabajo
+
+    Returns:
+        dict: Resultados listos para serializar a JSON
+    """
+    with open(os.devnull, 'w') as nulo, contextlib.redirect_stdout(nulo):
+        configurar_modo(modo)
+
+    print(f"🏭 Generando {max(tamanos)} libros {modo}...", file=sys.stderr)
+    inicio = time.perf_counter()
+    archivos = generar_libros(modo, max(tamanos), os.path.join(directorio, "libros"))
+    segundos_generacion = time.perf_counter() - inicio
+
+    resultados = []
+    for tamano in tamanos:
+        print(f"⏱️ Midiendo lote de {tamano} archivos...", file=sys.stderr)
+        with open(os.devnull, 'w') as nulo, contextlib.redirect_stdout(nulo):
+            medicion = medir_lote(archivos[:tamano], motor, directorio)
+
+        tiempos = medicion['tiempos']
+        medidas = [etapa for etapa in ETAPAS if tiempos[etapa] is not None]
+        resultados.append({
+            'archivos': tamano,
+            'segundos': {etapa: round(tiempos[etapa], 6) if etapa in medidas else None for etapa in ETAPAS},
+            'ms_por_archivo': {etapa: round(tiempos[etapa] * 1000 / tamano, 4) if etapa in medidas else None
+                               for etapa in ETAPAS},
+            'total_segundos': round(sum(tiempos[etapa] for etapa in medidas), 6),
+            'discrepancias': medicion['discrepancias'],
+            'errores': medicion['errores']
+        })
+        for etapa, error in medicion['errores'].items():
+            print(f"   ❌ {etapa}: {error}", file=sys.stderr)
+        print(f"   total {resultados[-1]['total_segundos']:.3f} s", file=sys.stderr)
+
+    return {
+        'fecha': datetime.datetime.now().isoformat(timespec='seconds'),
+        'modo': modo,
+        'motor_extraccion': motor,
+        'entorno': {
+            'python': platform.python_version(),
+            'plataforma': platform.platform(),
+            'cpus': os.cpu_count(),
+            'pandas': pd.__version__,
+            'openpyxl': openpyxl.__version__
+        },
+        'generacion_segundos': round(segundos_generacion, 6),
+        'resultados': resultados
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Medir el pipeline completo sobre libros sintéticos.")
+    parser.add_argument("--modo", choices=sorted(DISENOS), default="ESCUELAS")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--motor", default=settings.MOTOR_EXTRACCION, help="Motor de extracción a medir")
+    parser.add_argument("-o", "--salida", default="benchmark_resultados.json", help="Archivo JSON de resultados")
+    parser.add_argument("--directorio", default=None, help="Carpeta de trabajo (por defecto una temporal)")
+    args = parser.parse_args(argv)
+
+    directorio = args.directorio or tempfile.mkdtemp(prefix="benchmark_")
+    try:
+        resultados = ejecutar_benchmark(args.modo, sorted(args.tamanos), args.motor, directorio)
+    finally:
+        if args.directorio is None:
+            shutil.rmtree(directorio, ignore_errors=True)
+
+    with open(args.salida, 'w', encoding='utf-8') as archivo:
+        json.dump(resultados, archivo, indent=2, ensure_ascii=False)
+
+    if any(resultado['errores'] for resultado in resultados['resultados']):
+        print(f"⚠️ Resultados con etapas fallidas guardados en {args.salida}", file=sys.stderr)
+        return 1
+
+    print(f"✅ Resultados guardados en {args.salida}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,250 @@
+"""
+🏭 GENERADOR DE LIBROS SINTÉTICOS
+=================================
+
+Genera N libros de captura (ESC2 para ESCUELAS, ZONA3 para ZONAS) a partir
+de las plantillas reales del proyecto, con números aleatorios pero
+internamente coherentes.
+
+CARACTERÍSTICAS:
+✅ Mismo diseño de celdas combinadas que las plantillas oficiales
+✅ Existencia = Inscripción - Bajas; Aprobados + Reprobados = Existencia
+✅ Subtotales H/M y totales calculados: el validador no reporta discrepancias
+✅ Reproducible: misma semilla, mismos libros
+
+Uso:
+    python -m benchmarks.generar_libros ESCUELAS 100 /tmp/libros_esc
+"""
+
+import argparse
+import io
+import os
+import random
+import re
+from zipfile import ZipFile, ZIP_DEFLATED
+
+from openpyxl import load_workbook
+
+from src.config.settings import get_absolute_path
+from src.utils.xlsx_xml import localizar_ruta_hoja
+
+# 📋 Plantilla, hoja y fila de INSCRIPCIÓN por modo
+DISENOS = {
+    "ESCUELAS": {
+        "plantilla": os.path.join("formatos reales", "FORMATO FIN DE CICLO ESCUELA.xlsx"),
+        "hoja": "ESC2",
+        "fila_inscripcion": 8
+    },
+    "ZONAS": {
+        "plantilla": "FORMATO FIN DE CICLO ZONA.xlsx",
+        "hoja": "ZONA3",
+        "fila_inscripcion": 6
+    }
+}
+
+# Filas a partir de INSCRIPCIÓN (mismo orden en ESC2 y ZONA3)
+CONCEPTOS = [
+    "INSCRIPCIÓN", "BAJAS", "EXISTENCIA", "ALTAS", "APROBADOS",
+    "REPROBADOS", "BECADOS MUNICIPIO", "BECADOS SEED", "BIENESTAR", "GRUPOS"
+]
+
+# Columnas: H..S = 6 grados x (H, M); T = subtotal H; V = subtotal M; X = total
+COLUMNA_PRIMER_GRADO = 8
+GRADOS = 6
+COLUMNA_SUBTOTAL_H = 20
+COLUMNA_SUBTOTAL_M = 22
+COLUMNA_TOTAL = 24
+
+# Marcadores numéricos escritos en la plantilla base y sustituidos en el XML
+MARCADOR_BASE = 900000
+PATRON_MARCADOR = re.compile(r"<v>(9\d{5})</v>")
+
+
+def generar_valores(aleatorio):
+    """
+    Generar los valores de una tabla de movimientos coherente.
+
+    Args:
+        aleatorio: Instancia de random.Random
+
+    Returns:
+        dict: {concepto: [(h, m) por grado]}; GRUPOS como [(grupos, 0)]
+    """
+    valores = {concepto: [] for concepto in CONCEPTOS}
+
+    for _ in range(GRADOS):
+        fila = {}
+        for _sexo in ("H", "M"):
+            inscripcion = aleatorio.randint(5, 40)
+            bajas = aleatorio.randint(0, min(3, inscripcion))
+            existencia = inscripcion - bajas
+            aprobados = existencia - aleatorio.randint(0, min(2, existencia))
+            fila.setdefault("INSCRIPCIÓN", []).append(inscripcion)
+            fila.setdefault("BAJAS", []).append(bajas)
+            fila.setdefault("EXISTENCIA", []).append(existencia)
+            fila.setdefault("ALTAS", []).append(aleatorio.randint(0, 3))
+            fila.setdefault("APROBADOS", []).append(aprobados)
+            fila.setdefault("REPROBADOS", []).append(existencia - aprobados)
+            fila.setdefault("BECADOS MUNICIPIO", []).append(aleatorio.randint(0, existencia // 10))
+            fila.setdefault("BECADOS SEED", []).append(aleatorio.randint(0, existencia // 10))
+            fila.setdefault("BIENESTAR", []).append(aleatorio.randint(0, existencia // 5))
+
+        for concepto, par in fila.items():
+            valores[concepto].append(tuple(par))
+        valores["GRUPOS"].append((aleatorio.randint(1, 3), 0))
+
+    return valores
+
+
+def celdas_de_datos(fila_inscripcion):
+    """
+    Listar las celdas ancla de datos en el orden en que se llenan.
+
+    Args:
+        fila_inscripcion: Fila de INSCRIPCIÓN en la hoja
+
+    Returns:
+        list: Tuplas (fila, columna)
+    """
+    celdas = []
+    for desplazamiento, concepto in enumerate(CONCEPTOS):
+        fila = fila_inscripcion + desplazamiento
+        for grado in range(GRADOS):
+            columna = COLUMNA_PRIMER_GRADO + grado * 2
+            celdas.append((fila, columna))
+            if concepto != "GRUPOS":
+                celdas.append((fila, columna + 1))
+        if concepto != "GRUPOS":
+            celdas.append((fila, COLUMNA_SUBTOTAL_H))
+            celdas.append((fila, COLUMNA_SUBTOTAL_M))
+        celdas.append((fila, COLUMNA_TOTAL))
+    return celdas
+
+
+def aplanar_valores(valores):
+    """
+    Ordenar los valores de generar_valores() como celdas_de_datos().
+
+    Args:
+        valores: Resultado de generar_valores()
+
+    Returns:
+        list: Un entero por celda
+    """
+    planos = []
+    for concepto in CONCEPTOS:
+        pares = valores[concepto]
+        for hombres, mujeres in pares:
+            planos.append(hombres)
+            if concepto != "GRUPOS":
+                planos.append(mujeres)
+
+        subtotal_h = sum(h for h, _ in pares)
+        subtotal_m = sum(m for _, m in pares)
+        if concepto != "GRUPOS":
+            planos.extend([subtotal_h, subtotal_m])
+        planos.append(subtotal_h + subtotal_m)
+    return planos
+
+
+def preparar_base(modo):
+    """
+    Cargar la plantilla del modo y marcar sus celdas de datos.
+
+    openpyxl tarda más de un segundo en guardar la plantilla de zona, así
+    que se guarda una sola vez con un marcador único en cada celda de
+    datos; cada libro se obtiene después sustituyendo los marcadores en
+    el XML de la hoja.
+
+    Args:
+        modo: "ESCUELAS" o "ZONAS"
+
+    Returns:
+        tuple: (partes del zip {nombre: bytes}, ruta del XML de la hoja)
+    """
+    diseno = DISENOS[modo]
+    libro = load_workbook(get_absolute_path(diseno["plantilla"]))
+    hoja = libro[diseno["hoja"]]
+
+    for indice, (fila, columna) in enumerate(celdas_de_datos(diseno["fila_inscripcion"])):
+        hoja.cell(row=fila, column=columna).value = MARCADOR_BASE + indice
+
+    memoria = io.BytesIO()
+    libro.save(memoria)
+    libro.close()
+
+    with ZipFile(memoria) as archivo_zip:
+        ruta_hoja = localizar_ruta_hoja(archivo_zip, diseno["hoja"])
+        partes = {nombre: archivo_zip.read(nombre) for nombre in archivo_zip.namelist()}
+
+    return partes, ruta_hoja
+
+
+def escribir_libro(ruta, partes, ruta_hoja, planos):
+    """
+    Escribir un libro sustituyendo los marcadores por valores.
+
+    Los ceros se dejan vacíos, igual que en los formatos capturados a mano.
+
+    Args:
+        ruta: Archivo de salida
+        partes: Partes del zip base
+        ruta_hoja: Parte de la hoja de datos
+        planos: Valores en el orden de celdas_de_datos()
+    """
+    def sustituir(coincidencia):
+        indice = int(coincidencia.group(1)) - MARCADOR_BASE
+        if not 0 <= indice < len(planos):
+            return coincidencia.group(0)
+        return f"<v>{planos[indice]}</v>" if planos[indice] else ""
+
+    hoja_xml = PATRON_MARCADOR.sub(sustituir, partes[ruta_hoja].decode("utf-8"))
+
+    with ZipFile(ruta, "w", ZIP_DEFLATED, compresslevel=1) as archivo_zip:
+        for nombre, contenido in partes.items():
+            archivo_zip.writestr(nombre, hoja_xml if nombre == ruta_hoja else contenido)
+
+
+def generar_libros(modo, cantidad, directorio, semilla=0):
+    """
+    Generar libros sintéticos.
+
+    Args:
+        modo: "ESCUELAS" o "ZONAS"
+        cantidad: Número de libros
+        directorio: Carpeta de salida (se crea si no existe)
+        semilla: Semilla del generador aleatorio
+
+    Returns:
+        list: Rutas de los libros generados, en orden
+    """
+    if modo not in DISENOS:
+        raise ValueError(f"Modo sin generador: {modo}")
+
+    os.makedirs(directorio, exist_ok=True)
+    partes, ruta_hoja = preparar_base(modo)
+    aleatorio = random.Random(semilla)
+
+    rutas = []
+    for numero in range(cantidad):
+        ruta = os.path.join(directorio, f"{modo.lower()}_{numero:05d}.xlsx")
+        escribir_libro(ruta, partes, ruta_hoja, aplanar_valores(generar_valores(aleatorio)))
+        rutas.append(ruta)
+
+    return rutas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generar libros sintéticos para pruebas de rendimiento.")
+    parser.add_argument("modo", choices=sorted(DISENOS))
+    parser.add_argument("cantidad", type=int)
+    parser.add_argument("directorio")
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rutas = generar_libros(args.modo, args.cantidad, args.directorio, args.semilla)
+    print(f"✅ {len(rutas)} libros generados en {args.directorio}")
+
+
+if __name__ == "__main__":
+    main()
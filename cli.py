@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+🖥️ CONCENTRADOR POR LÍNEA DE COMANDOS
+=====================================
+
+Ejecuta el flujo completo sin interfaz gráfica (sin importar PyQt):
+✅ Extracción de todos los archivos de un directorio o patrón glob
+✅ Validación de cada archivo
+✅ Sumatoria total
+✅ Inyección en la plantilla del modo
+✅ Tiempos por etapa
+
+Pensado para lotes nocturnos en un servidor. Por defecto solo se muestran
+advertencias y errores; -v agrega un resumen por etapa y -vv la traza
+completa (útil para depurar el archivo de una escuela).
+
+Con --jerarquia (modo ESCUELAS) se generan en la misma corrida los
+concentrados de todas las zonas y sectores del mapeo; -o es la carpeta.
+
+Uso:
+    python cli.py ESCUELAS "formatos reales" -o concentrado.xlsx
+    python cli.py ZONAS "entradas/*.xlsx" -o concentrado_zona.xlsx --paralelo
+    python cli.py ESCUELAS "entradas" -o concentrados/ --jerarquia escuelas.csv
+    python cli.py ESCUELAS "entradas/10DPR0054H*.xlsx" -o prueba.xlsx -vv
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+from src.controllers.app_controller import AppController
+from src.core.agregador_jerarquico import AgregadorJerarquico, cargar_mapeo_jerarquia
+from src.core.data_transformer import SALIDAS_LOTE
+from src.utils.log_utils import configurar_logging
+
+MODOS = ("ESCUELAS", "ZONAS", "SECTORES")
+
+
+def resolver_entradas(entradas):
+    """
+    Expandir directorios y patrones glob a una lista de archivos .xlsx.
+
+    Args:
+        entradas: Lista de directorios, patrones o rutas
+
+    Returns:
+        list: Rutas únicas, en orden, sin archivos temporales de Excel (~$)
+    """
+    archivos = []
+    for entrada in entradas:
+        if os.path.isdir(entrada):
+            encontrados = sorted(glob.glob(os.path.join(entrada, "*.xlsx")))
+        else:
+            encontrados = sorted(glob.glob(entrada))
+
+        for archivo in encontrados:
+            if os.path.basename(archivo).startswith("~$") or archivo in archivos:
+                continue
+            archivos.append(archivo)
+
+    return archivos
+
+
+def crear_parser():
+    """Construir el parser de argumentos."""
+    parser = argparse.ArgumentParser(
+        description="Concentrar archivos Excel sin interfaz gráfica."
+    )
+    parser.add_argument("modo", choices=MODOS, help="Modo de operación")
+    parser.add_argument("entradas", nargs="+", help="Directorio(s), patrón(es) glob o archivos .xlsx")
+    parser.add_argument("-o", "--salida", required=True, help="Ruta del archivo concentrado a generar")
+    parser.add_argument("--paralelo", action="store_true", help="Procesar archivos con un pool de procesos")
+    parser.add_argument("--workers", type=int, default=None, help="Número de procesos (por defecto uno por núcleo)")
+    parser.add_argument("--sin-validacion", action="store_true", help="Omitir la validación de archivos")
+    parser.add_argument("--jerarquia", metavar="MAPEO.csv", default=None,
+                        help="CSV escuela,zona,sector: exportar el concentrado de cada zona y sector "
+                             "(solo modo ESCUELAS; -o es la carpeta de salida)")
+    verbosidad = parser.add_mutually_exclusive_group()
+    verbosidad.add_argument("-v", "--verbose", action="count", default=0,
+                            help="Más mensajes: -v resumen por etapa, -vv traza completa")
+    verbosidad.add_argument("-q", "--quiet", action="store_true", help="Solo errores")
+    return parser
+
+
+def nivel_bitacora(args):
+    """
+    Nivel de logging según -v/-q.
+
+    Returns:
+        str: Nivel, o None para usar la variable de entorno o el de settings
+    """
+    if args.quiet:
+        return "ERROR"
+    if args.verbose:
+        return "DEBUG" if args.verbose > 1 else "INFO"
+    return None
+
+
+def imprimir_tiempos(tiempos):
+    """Imprimir tabla de tiempos por etapa."""
+    print("\n⏱️ Tiempos por etapa:")
+    for etapa, segundos in tiempos:
+        print(f"   {etapa:<12} {segundos:8.3f} s")
+    print(f"   {'TOTAL':<12} {sum(s for _, s in tiempos):8.3f} s")
+
+
+def ejecutar_jerarquia(args, archivos):
+    """
+    Generar los concentrados de zona y sector con una sola extracción.
+
+    Args:
+        args: Argumentos del parser
+        archivos: Rutas de los archivos de escuela
+
+    Returns:
+        int: Código de salida (0 = éxito)
+    """
+    tiempos = []
+
+    inicio = time.perf_counter()
+    escuela_a_zona, zona_a_sector = cargar_mapeo_jerarquia(args.jerarquia)
+    agregador = AgregadorJerarquico(escuela_a_zona, zona_a_sector)
+    tiempos.append(("preparación", time.perf_counter() - inicio))
+
+    # 📊 Extracción (una vez por archivo de escuela)
+    inicio = time.perf_counter()
+    resumen = agregador.ingestar(archivos, paralelo=args.paralelo, max_workers=args.workers)
+    tiempos.append(("extracción", time.perf_counter() - inicio))
+
+    for error in resumen['errores']:
+        print(f"❌ {error['archivo']}: {error['error']}")
+    print(f"📁 Archivos procesados: {resumen['exitosos']}/{resumen['total']}")
+
+    # 🏛️ Totales por zona y por sector
+    inicio = time.perf_counter()
+    grupos = agregador.agregar()
+    tiempos.append(("agregación", time.perf_counter() - inicio))
+
+    # 📤 Inyección de cada concentrado
+    inicio = time.perf_counter()
+    resultado_exportacion = agregador.exportar(os.path.abspath(args.salida))
+    tiempos.append(("exportación", time.perf_counter() - inicio))
+
+    imprimir_tiempos(tiempos)
+
+    for error in resultado_exportacion['errores']:
+        print(f"❌ Exportación {error['archivo']}: {error['error']}")
+    if not resultado_exportacion['archivos']:
+        print("❌ No se generó ningún concentrado")
+        return 1
+
+    print(f"✅ Concentrados generados: {len(grupos['zonas'])} zonas, {len(grupos['sectores'])} sectores "
+          f"en {os.path.abspath(args.salida)}")
+    return 0 if resultado_exportacion['exito'] else 1
+
+
+def main(argv=None):
+    """
+    Ejecutar el concentrado por línea de comandos.
+
+    Args:
+        argv: Argumentos (por defecto sys.argv[1:])
+
+    Returns:
+        int: Código de salida (0 = éxito)
+    """
+    args = crear_parser().parse_args(argv)
+    configurar_logging(nivel_bitacora(args))
+
+    archivos = resolver_entradas(args.entradas)
+    if not archivos:
+        print("❌ No se encontraron archivos .xlsx en las entradas indicadas")
+        return 1
+
+    if args.jerarquia:
+        if args.modo != "ESCUELAS":
+            print("❌ --jerarquia requiere el modo ESCUELAS")
+            return 1
+        return ejecutar_jerarquia(args, archivos)
+
+    tiempos = []
+
+    inicio = time.perf_counter()
+    # Sin interfaz: no se construyen vista combinada ni mapeo posicional
+    controller = AppController(salidas=SALIDAS_LOTE)
+    if not controller.cambiar_modo(args.modo):
+        return 1
+    tiempos.append(("preparación", time.perf_counter() - inicio))
+
+    # 📊 Extracción
+    inicio = time.perf_counter()
+    resumen = controller.procesar_lote(archivos, paralelo=args.paralelo, max_workers=args.workers)
+    tiempos.append(("extracción", time.perf_counter() - inicio))
+
+    for error in resumen['errores']:
+        print(f"❌ {error['archivo']}: {error['error']}")
+    print(f"📁 Archivos procesados: {resumen['exitosos']}/{resumen['total']}")
+
+    # 🔍 Validación (todos los archivos en una sola pasada)
+    if not args.sin_validacion:
+        inicio = time.perf_counter()
+        resumen_validaciones = controller.validar_lote()
+        tiempos.append(("validación", time.perf_counter() - inicio))
+        if resumen_validaciones['exito']:
+            print(f"🔍 Archivos con discrepancias: {resumen_validaciones['archivos_con_errores']} "
+                  f"({resumen_validaciones['total_discrepancias']} discrepancias)")
+        else:
+            print(f"⚠️ Validación: {resumen_validaciones.get('error') or resumen_validaciones.get('mensaje')}")
+
+    # 🧮 Sumatoria
+    inicio = time.perf_counter()
+    resultado_sumatoria = controller.calcular_sumatoria()
+    tiempos.append(("sumatoria", time.perf_counter() - inicio))
+
+    if not resultado_sumatoria['exito']:
+        print(f"❌ Sumatoria: {resultado_sumatoria.get('error') or resultado_sumatoria.get('mensaje')}")
+        imprimir_tiempos(tiempos)
+        return 1
+
+    # 📤 Inyección en plantilla
+    inicio = time.perf_counter()
+    resultado_exportacion = controller.exportar_a_plantilla(os.path.abspath(args.salida))
+    tiempos.append(("exportación", time.perf_counter() - inicio))
+
+    imprimir_tiempos(tiempos)
+
+    if not resultado_exportacion['exito']:
+        print(f"❌ Exportación: {resultado_exportacion.get('error') or resultado_exportacion.get('mensaje')}")
+        return 1
+
+    print(f"✅ Concentrado generado: {resultado_exportacion['archivo_destino']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -25,7 +25,8 @@ from src.controllers.app_controller import AppController
 from src.controllers.ui_manager import UIManager
 from src.controllers.event_handler import EventHandler
 from src.gui.mode_selector import ModeSelector
-from src.config.settings import configurar_modo
+from src.config.settings import configurar_modo, BITACORA
+from src.utils.log_utils import configurar_logging
 
 
 class ExcelVisualizerApp(QMainWindow):
@@ -137,6 +138,9 @@ def main():
     Solo maneja inicialización básica y delegación a controladores.
     """
     try:
+        # La interfaz muestra en consola un resumen por etapa
+        configurar_logging(predeterminado=BITACORA['NIVEL_INTERFAZ'])
+
         # Inicializar aplicación PyQt
         app = QApplication(sys.argv)
         app.setStyle('Fusion')
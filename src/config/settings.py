@@ -1,5 +1,8 @@
+import logging
 import os
 
+logger = logging.getLogger(__name__)
+
 # Configuraciones de rutas y archivos (rutas relativas al directorio raíz del proyecto)
 def get_project_root():
     """Obtiene la ruta raíz del proyecto de forma segura"""
@@ -81,6 +84,47 @@ SECTORES_CONFIG = {
     "VALIDACION_COMPLETA": False  # Solo sumatoria
 }
 
+# ⚡ MOTOR DE EXTRACCIÓN
+# "completo": carga el libro completo con openpyxl (comportamiento original)
+# "streaming": openpyxl read-only, solo se parsean las filas del rango
+# "xml": lectura directa del zip/XML de la hoja (la más rápida)
+MOTOR_EXTRACCION = "streaming"
+
+# 💾 CACHÉ PERSISTENTE DE EXTRACCIÓN
+# Reutiliza resultados de archivos sin cambios (clave: hash del contenido,
+# hoja, rango y versión de table_schemas)
+CACHE_EXTRACCION = {
+    "HABILITADO": True,
+    "DIRECTORIO": ".cache_extraccion",  # Relativo a la raíz del proyecto
+    "TAMANO_MAXIMO_MB": 256             # Se expulsan las entradas menos usadas
+}
+
+# 🚀 PROCESAMIENTO PARALELO DE LOTES
+# Reparte los archivos de procesar_multiples_archivos entre procesos
+# MAX_WORKERS None = un proceso por núcleo disponible
+PROCESAMIENTO_PARALELO = {
+    "HABILITADO": False,
+    "MAX_WORKERS": None
+}
+
+# 💾 Memoria acotada: solo los archivos consultados recientemente quedan en
+# memoria, el resto se descarga a disco (la sumatoria siempre está en memoria)
+MEMORIA_ACOTADA = {
+    "HABILITADO": False,
+    "MAX_ARCHIVOS_RESIDENTES": 32,
+    "DIRECTORIO": None  # None = directorio temporal
+}
+
+# 📝 BITÁCORA (logging por módulo, ver src/utils/log_utils.py)
+# "WARNING": solo advertencias y errores (lotes y CLI)
+# "INFO": un resumen por etapa / "DEBUG": traza completa de cada archivo
+# La variable de entorno indicada reemplaza el nivel sin tocar el código
+BITACORA = {
+    "NIVEL": "WARNING",
+    "NIVEL_INTERFAZ": "INFO",  # main.py (interfaz gráfica)
+    "VARIABLE_ENTORNO": "CONCENTRADOR_LOG"
+}
+
 # Variables globales para configuración activa
 MODO_ACTUAL = "ZONAS"  # Por defecto
 CONFIG_ACTUAL = ZONAS_CONFIG.copy()
@@ -104,10 +148,10 @@ def configurar_modo(modo):
         raise ValueError(f"Modo no válido: {modo}")
 
     MODO_ACTUAL = modo
-    print(f"🎯 Configuración actualizada para modo: {modo}")
-    print(f"   📋 Hoja: {CONFIG_ACTUAL['HOJA_DATOS']}")
-    print(f"   📊 Rango: {CONFIG_ACTUAL['RANGO_DATOS']}")
-    print(f"   🎯 Conceptos: {len(CONFIG_ACTUAL['CONCEPTOS'])}")
+    logger.info("🎯 Configuración actualizada para modo: %s", modo)
+    logger.debug("   📋 Hoja: %s", CONFIG_ACTUAL['HOJA_DATOS'])
+    logger.debug("   📊 Rango: %s", CONFIG_ACTUAL['RANGO_DATOS'])
+    logger.debug("   🎯 Conceptos: %s", len(CONFIG_ACTUAL['CONCEPTOS']))
 
     return CONFIG_ACTUAL
 
@@ -13,6 +13,7 @@ PRINCIPIOS:
 ✅ Reutilizable: funciona con cualquier estructura similar
 """
 
+import hashlib
 from typing import Dict, List, Any
 
 
@@ -166,6 +167,18 @@ TABLE_SCHEMAS = {
             }
         },
 
+        # ✅ Formato real de captura: listado "ALUMNOS QUE ATIENDE" de la hoja
+        # ESC1, una fila por grupo ("1°A") con sus alumnos H, M y SUBTOTAL
+        "listado_grupos": {
+            "rango": "L23:O99",         # GPO. | H | M | SUBTOTAL
+            "rango_numerico": {
+                "filas_inicio": 2,      # Primera fila de grupo (fila 25)
+                "filas_fin": 76,
+                "columnas_inicio": 1,   # H
+                "columnas_fin": 3       # SUBTOTAL
+            }
+        },
+
         "validaciones": {
             "total_por_grupo": {
                 "formula": "HOMBRES + MUJERES",
@@ -332,6 +345,19 @@ def get_table_schema(schema_name: str) -> Dict[str, Any]:
     return schema
 
 
+def get_schemas_version() -> str:
+    """
+    Obtener huella de la versión actual de los esquemas.
+
+    Cambia cada vez que se modifica TABLE_SCHEMAS, lo que invalida
+    cualquier resultado derivado de esquemas anteriores (ej. caché).
+    
+    Returns:
+        Hash hexadecimal corto de TABLE_SCHEMAS
+    """
+    return hashlib.blake2b(repr(TABLE_SCHEMAS).encode('utf-8'), digest_size=8).hexdigest()
+
+
 def get_mode_config(mode: str) -> Dict[str, Any]:
     """
     Obtener configuración por modo.
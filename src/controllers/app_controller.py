@@ -13,12 +13,16 @@ RESPONSABILIDADES:
 ✅ Sin lógica de interfaz gráfica
 """
 
-from typing import Dict, List, Any, Optional
+import logging
+from typing import Dict, List, Any, Optional, Tuple
 from ..core.data_manager import DataManager
+from ..core.data_transformer import SALIDAS_COMPLETAS
 from ..core.data_validator import DataValidator
 from ..core.template_injector import TemplateInjector
 from ..config.settings import get_config_actual, configurar_modo
 
+logger = logging.getLogger(__name__)
+
 
 class AppController:
     """
@@ -27,10 +31,17 @@ class AppController:
     Coordina toda la lógica sin mezclarse con la interfaz gráfica.
     """
     
-    def __init__(self):
-        """Inicializar controlador de aplicación."""
+    def __init__(self, salidas: Tuple[str, ...] = SALIDAS_COMPLETAS):
+        """
+        Inicializar controlador de aplicación.
+
+        Args:
+            salidas: Salidas a producir por archivo (ver DataManager).
+                     SALIDAS_LOTE omite las vistas de la interfaz gráfica.
+        """
         # Gestores principales
-        self.data_manager = DataManager()
+        self.salidas = tuple(salidas)
+        self.data_manager = DataManager(salidas=self.salidas)
         self.data_validator = DataValidator()
         self.template_injector = TemplateInjector()
         
@@ -44,7 +55,7 @@ class AppController:
         self.config_actual = get_config_actual()
         self.modo_actual = self.config_actual.get('MODO', 'ESCUELAS')
         
-        print(f"🎮 AppController inicializado - Modo: {self.modo_actual}")
+        logger.debug("🎮 AppController inicializado - Modo: %s", self.modo_actual)
     
     def cambiar_modo(self, nuevo_modo: str) -> bool:
         """
@@ -62,15 +73,15 @@ class AppController:
             self.config_actual = get_config_actual()
             
             # Reinicializar gestores con nueva configuración
-            self.data_manager = DataManager()
+            self.data_manager = DataManager(salidas=self.salidas)
             self.data_validator = DataValidator()
             self.template_injector = TemplateInjector()
             
-            print(f"✅ Modo cambiado a: {nuevo_modo}")
+            logger.info("✅ Modo cambiado a: %s", nuevo_modo)
             return True
             
         except Exception as e:
-            print(f"❌ Error cambiando modo: {e}")
+            logger.error("❌ Error cambiando modo: %s", e)
             return False
     
     def procesar_archivo(self, archivo_path: str) -> Dict[str, Any]:
@@ -84,7 +95,7 @@ class AppController:
             dict: Resultado del procesamiento
         """
         try:
-            print(f"🎮 Procesando archivo: {archivo_path}")
+            logger.debug("🎮 Procesando archivo: %s", archivo_path)
             
             # Procesar usando DataManager
             datos_procesados = self.data_manager.procesar_archivo(archivo_path)
@@ -110,13 +121,100 @@ class AppController:
             }
             
         except Exception as e:
-            print(f"❌ Error procesando archivo: {e}")
+            logger.error("❌ Error procesando archivo: %s", e)
             return {
                 'exito': False,
                 'error': str(e),
                 'archivo': archivo_path
             }
     
+    def procesar_lote(self, archivos_paths: List[str], paralelo: Optional[bool] = None,
+                      max_workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Procesar un lote de archivos sin validarlos.
+
+        La validación queda como etapa aparte (validar_archivos_procesados)
+        para poder medir y ejecutar cada etapa por separado.
+
+        Args:
+            archivos_paths: Lista de rutas de archivos
+            paralelo: Procesar con un pool de procesos (ver DataManager)
+            max_workers: Número de procesos
+
+        Returns:
+            dict: Resumen del procesamiento (total, exitosos, fallidos, errores)
+        """
+        logger.info("🎮 Procesando lote de %s archivos", len(archivos_paths))
+
+        resumen = self.data_manager.procesar_multiples_archivos(
+            archivos_paths, paralelo=paralelo, max_workers=max_workers
+        )
+
+        for nombre_archivo, datos in self.data_manager.archivos_procesados.items():
+            self.archivos_procesados[nombre_archivo] = {
+                'datos': datos,
+                'validacion': None,
+                'archivo_completo': datos['archivo_completo']
+            }
+
+        return resumen
+
+    def validar_archivos_procesados(self) -> Dict[str, Any]:
+        """
+        Validar todos los archivos procesados que aún no tienen validación.
+
+        Returns:
+            dict: Resumen de validaciones
+        """
+        for archivo_info in self.archivos_procesados.values():
+            if archivo_info.get('validacion') is None:
+                archivo_info['validacion'] = self._validar_archivo(
+                    archivo_info['archivo_completo'], archivo_info['datos']
+                )
+
+        return self.obtener_resumen_validaciones()
+
+    def validar_lote(self) -> Dict[str, Any]:
+        """
+        Validar todos los archivos procesados en una sola pasada vectorizada.
+
+        Usa las matrices del cubo del DataManager y la estructura de la
+        tabla del primer archivo (todos deben compartir formato).
+
+        Returns:
+            dict: Resultado con la tabla de discrepancias (ver DataValidator.validar_lote)
+        """
+        try:
+            cubo = self.data_manager.cubo
+            if len(cubo) == 0:
+                return {
+                    'exito': False,
+                    'mensaje': 'No hay archivos procesados para validar'
+                }
+
+            datos_crudos = self.data_manager.archivos_procesados[cubo.nombres[0]].get('datos_crudos')
+            if datos_crudos is None:
+                return {
+                    'exito': False,
+                    'mensaje': 'Los archivos se procesaron sin datos_crudos'
+                }
+
+            tabla = self.data_validator.validar_lote(cubo.datos, datos_crudos, cubo.nombres)
+            return {
+                'exito': True,
+                'discrepancias': tabla,
+                'total_archivos': len(cubo),
+                'archivos_con_errores': tabla['archivo'].nunique(),
+                'total_discrepancias': len(tabla)
+            }
+
+        except Exception as e:
+            logger.error("❌ Error validando lote: %s", e)
+            return {
+                'exito': False,
+                'error': str(e)
+            }
+
     def _validar_archivo(self, archivo_path: str, datos_procesados: Dict) -> Dict[str, Any]:
         """
         Validar un archivo procesado.
@@ -130,7 +228,7 @@ class AppController:
         """
         try:
             nombre_archivo = archivo_path.split('/')[-1]
-            print(f"🔍 Validando: {nombre_archivo}")
+            logger.debug("🔍 Validando: %s", nombre_archivo)
             
             # Validar usando DataValidator
             reporte = self.data_validator.validar_tabla_completa(
@@ -145,7 +243,7 @@ class AppController:
             return reporte
             
         except Exception as e:
-            print(f"❌ Error validando archivo: {e}")
+            logger.error("❌ Error validando archivo: %s", e)
             return {
                 'archivo': archivo_path,
                 'error': str(e),
@@ -160,7 +258,7 @@ class AppController:
             dict: Resultado del cálculo
         """
         try:
-            print("🎮 Calculando sumatoria total...")
+            logger.debug("🎮 Calculando sumatoria total...")
             
             if not self.archivos_procesados:
                 return {
@@ -172,7 +270,7 @@ class AppController:
             self.sumatoria_total = self.data_manager.calcular_sumatoria()
             
             if self.sumatoria_total is not None:
-                print(f"✅ Sumatoria calculada: {self.sumatoria_total.shape}")
+                logger.info("✅ Sumatoria calculada: %s", self.sumatoria_total.shape)
                 return {
                     'exito': True,
                     'sumatoria': self.sumatoria_total,
@@ -185,7 +283,7 @@ class AppController:
                 }
                 
         except Exception as e:
-            print(f"❌ Error calculando sumatoria: {e}")
+            logger.error("❌ Error calculando sumatoria: %s", e)
             return {
                 'exito': False,
                 'error': str(e)
@@ -202,7 +300,7 @@ class AppController:
             dict: Resultado de la exportación
         """
         try:
-            print(f"🎮 Exportando a plantilla: {archivo_destino}")
+            logger.debug("🎮 Exportando a plantilla: %s", archivo_destino)
             
             if self.sumatoria_total is None:
                 return {
@@ -231,7 +329,7 @@ class AppController:
                 }
                 
         except Exception as e:
-            print(f"❌ Error exportando: {e}")
+            logger.error("❌ Error exportando: %s", e)
             return {
                 'exito': False,
                 'error': str(e)
@@ -258,7 +356,7 @@ class AppController:
         self.archivos_procesados.clear()
         self.sumatoria_total = None
         self.data_manager.limpiar_datos()
-        print("🧹 Datos de aplicación limpiados")
+        logger.debug("🧹 Datos de aplicación limpiados")
     
     def habilitar_validaciones(self, habilitar: bool = True):
         """
@@ -268,7 +366,7 @@ class AppController:
             habilitar: True para habilitar, False para deshabilitar
         """
         self.validaciones_activas = habilitar
-        print(f"🔍 Validaciones {'habilitadas' if habilitar else 'deshabilitadas'}")
+        logger.debug("🔍 Validaciones %s", 'habilitadas' if habilitar else 'deshabilitadas')
     
     def obtener_resumen_validaciones(self) -> Dict[str, Any]:
         """
@@ -309,11 +407,11 @@ class AppController:
             if nombre_archivo in self.archivos_procesados:
                 return self.archivos_procesados[nombre_archivo]
             else:
-                print(f"⚠️ Archivo no encontrado: {nombre_archivo}")
+                logger.warning("⚠️ Archivo no encontrado: %s", nombre_archivo)
                 return None
 
         except Exception as e:
-            print(f"❌ Error obteniendo datos de archivo: {e}")
+            logger.error("❌ Error obteniendo datos de archivo: %s", e)
             return None
 
     def obtener_estado(self) -> Dict[str, Any]:
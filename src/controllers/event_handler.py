@@ -128,6 +128,10 @@ class EventHandler(QObject):
                 # Habilitar botón sumatoria si hay múltiples archivos
                 total_archivos = len(self.app_controller.archivos_procesados)
                 self.ui_manager.habilitar_boton_sumatoria(total_archivos > 1)
+
+                # Sumatoria en vivo: si ya se mostró, se actualiza con este archivo
+                if self.app_controller.sumatoria_total is not None and total_archivos > 1:
+                    self.manejar_solicitud_sumatoria()
                 
                 # Emitir señal de éxito
                 self.archivo_procesado.emit(archivo_path, resultado)
@@ -0,0 +1,239 @@
+"""
+🏛️ AGREGADOR JERÁRQUICO - Escuelas → Zonas → Sectores
+=====================================================
+
+Genera en una sola corrida los concentrados de zona y de sector a partir
+de los archivos de escuela.
+
+Antes, un reporte de sector requería generar cada libro de zona y volver
+a leerlo en modo SECTORES. Aquí cada archivo de escuela se extrae una vez
+(en modo ESCUELAS) y su matriz queda en el CuboResultados del DataManager.
+Los totales de zona se suman desde el cubo y los de sector desde los
+totales de zona, sin volver a leer ningún Excel.
+
+CARACTERÍSTICAS:
+✅ Mapeo escuela → zona y zona → sector (diccionarios o CSV)
+✅ Una sola extracción por archivo (secuencial o paralela)
+✅ Totales por nivel con un producto matricial sobre el cubo
+✅ Exportación de la plantilla de cada zona y cada sector
+"""
+
+import csv
+import logging
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..config.settings import configurar_modo
+from .data_manager import DataManager
+from .data_transformer import SALIDAS_LOTE
+from .template_injector import TemplateInjector
+
+logger = logging.getLogger(__name__)
+
+NIVELES = ('zonas', 'sectores')
+_NOMBRE_GRUPO = {'zonas': 'ZONA', 'sectores': 'SECTOR'}
+
+
+def cargar_mapeo_jerarquia(ruta_csv: str) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """
+    Leer el mapeo escuela → zona → sector de un CSV.
+
+    El CSV lleva encabezados 'escuela', 'zona' y 'sector'. 'escuela' es el
+    nombre del archivo (ej. "10DPR0054H ESTADISTICA FIN.xlsx"); 'sector'
+    puede quedar vacío.
+
+    Args:
+        ruta_csv: Ruta del archivo CSV
+
+    Returns:
+        tuple: (escuela_a_zona, zona_a_sector)
+
+    Raises:
+        ValueError: Si falta una columna o una zona tiene dos sectores
+    """
+    escuela_a_zona = {}
+    zona_a_sector = {}
+
+    with open(ruta_csv, newline='', encoding='utf-8-sig') as archivo:
+        lector = csv.DictReader(archivo)
+        faltantes = {'escuela', 'zona'} - set(lector.fieldnames or [])
+        if faltantes:
+            raise ValueError(f"Faltan columnas en {ruta_csv}: {sorted(faltantes)}")
+
+        for fila in lector:
+            escuela = (fila.get('escuela') or '').strip()
+            zona = (fila.get('zona') or '').strip()
+            sector = (fila.get('sector') or '').strip()
+            if not escuela or not zona:
+                continue
+
+            escuela_a_zona[os.path.basename(escuela)] = zona
+            if sector:
+                if zona_a_sector.setdefault(zona, sector) != sector:
+                    raise ValueError(f"La zona {zona} aparece en los sectores "
+                                     f"{zona_a_sector[zona]} y {sector}")
+
+    return escuela_a_zona, zona_a_sector
+
+
+class AgregadorJerarquico:
+    """
+    Motor de agregación escuelas → zonas → sectores.
+
+    Los totales de cada nivel son arreglos grupos × conceptos × columnas
+    guardados en self.totales; totales_nivel() los devuelve como
+    DataFrames con el mismo formato que DataManager.sumatoria_total.
+    """
+
+    def __init__(self, escuela_a_zona: Dict[str, str], zona_a_sector: Optional[Dict[str, str]] = None,
+                 data_manager: Optional[DataManager] = None):
+        """
+        Inicializar agregador.
+
+        Args:
+            escuela_a_zona: {nombre de archivo de escuela: zona}
+            zona_a_sector: {zona: sector} (opcional)
+            data_manager: DataManager en modo ESCUELAS. Si None, se configura
+                          el modo ESCUELAS y se crea uno sin vistas de interfaz
+        """
+        self.escuela_a_zona = {os.path.basename(escuela): zona for escuela, zona in escuela_a_zona.items()}
+        self.zona_a_sector = dict(zona_a_sector or {})
+
+        if data_manager is None:
+            configurar_modo('ESCUELAS')
+            data_manager = DataManager(salidas=SALIDAS_LOTE)
+        self.data_manager = data_manager
+
+        # {nivel: (nombres de grupos, arreglo grupos × conceptos × columnas)}
+        self.totales = {}
+        self.miembros = {nivel: {} for nivel in NIVELES}
+        self.sin_asignar = {nivel: [] for nivel in NIVELES}
+
+        logger.debug("🏛️ AgregadorJerarquico inicializado - %s escuelas, %s zonas, %s sectores",
+                     len(self.escuela_a_zona), len(set(self.escuela_a_zona.values())),
+                     len(set(self.zona_a_sector.values())))
+
+    def ingestar(self, archivos_paths: Iterable[str], callback_progreso=None,
+                 paralelo: Optional[bool] = None, max_workers: Optional[int] = None) -> Dict:
+        """
+        Extraer los archivos de escuela (una vez cada uno).
+
+        Args:
+            archivos_paths: Rutas de los archivos de escuela
+            callback_progreso: Ver DataManager.procesar_multiples_archivos
+            paralelo: Ver DataManager.procesar_multiples_archivos
+            max_workers: Ver DataManager.procesar_multiples_archivos
+
+        Returns:
+            dict: Resumen del procesamiento
+        """
+        return self.data_manager.procesar_multiples_archivos(
+            list(archivos_paths), callback_progreso=callback_progreso,
+            paralelo=paralelo, max_workers=max_workers
+        )
+
+    def agregar(self) -> Dict[str, List[str]]:
+        """
+        Calcular los totales de zona (desde el cubo de escuelas) y de sector
+        (desde los totales de zona).
+
+        Returns:
+            dict: {nivel: nombres de grupos con total}
+        """
+        cubo = self.data_manager.cubo
+
+        zonas, totales_zona = cubo.sumar_por_grupo(self.escuela_a_zona)
+        presentes = set(cubo.nombres)
+        self.miembros['zonas'] = {zona: [] for zona in zonas}
+        for escuela in cubo.nombres:
+            if escuela in self.escuela_a_zona:
+                self.miembros['zonas'][self.escuela_a_zona[escuela]].append(escuela)
+        self.sin_asignar['zonas'] = [escuela for escuela in cubo.nombres if escuela not in self.escuela_a_zona]
+
+        # Zonas sin ninguna escuela procesada no generan concentrado
+        con_datos = [g for g, zona in enumerate(zonas) if self.miembros['zonas'][zona]]
+        zonas = [zonas[g] for g in con_datos]
+        totales_zona = totales_zona[con_datos]
+        self.miembros['zonas'] = {zona: self.miembros['zonas'][zona] for zona in zonas}
+        self.totales['zonas'] = (zonas, totales_zona)
+
+        # Sectores desde los totales de zona: matriz de pertenencia sectores × zonas
+        sectores = list(dict.fromkeys(self.zona_a_sector[zona] for zona in zonas if zona in self.zona_a_sector))
+        indice_sector = {sector: s for s, sector in enumerate(sectores)}
+        pertenencia = np.zeros((len(sectores), len(zonas)), dtype=totales_zona.dtype)
+        self.miembros['sectores'] = {sector: [] for sector in sectores}
+        for z, zona in enumerate(zonas):
+            sector = self.zona_a_sector.get(zona)
+            if sector is not None:
+                pertenencia[indice_sector[sector], z] = 1
+                self.miembros['sectores'][sector].append(zona)
+        self.sin_asignar['sectores'] = [zona for zona in zonas if zona not in self.zona_a_sector]
+        self.totales['sectores'] = (sectores, np.tensordot(pertenencia, totales_zona, axes=1))
+
+        faltantes = sorted(set(self.escuela_a_zona) - presentes)
+        if faltantes:
+            logger.warning("⚠️ Escuelas del mapeo sin procesar: %s", len(faltantes))
+        for nivel in NIVELES:
+            if self.sin_asignar[nivel]:
+                logger.warning("⚠️ Sin %s asignada: %s",
+                               _NOMBRE_GRUPO[nivel].lower(), ', '.join(self.sin_asignar[nivel]))
+            logger.info("✅ Totales de %s: %s", nivel, len(self.totales[nivel][0]))
+
+        return {nivel: list(self.totales[nivel][0]) for nivel in NIVELES}
+
+    def totales_nivel(self, nivel: str) -> Dict[str, pd.DataFrame]:
+        """
+        Totales de un nivel como DataFrames listos para inyectar.
+
+        Args:
+            nivel: 'zonas' o 'sectores'
+
+        Returns:
+            dict: {grupo: DataFrame}
+        """
+        if nivel not in NIVELES:
+            raise ValueError(f"Nivel no válido: {nivel}")
+        if nivel not in self.totales:
+            self.agregar()
+        grupos, totales = self.totales[nivel]
+        return {grupo: pd.DataFrame(totales[g]) for g, grupo in enumerate(grupos)}
+
+    def exportar(self, directorio_destino: str, niveles: Iterable[str] = NIVELES,
+                 plantilla_path: Optional[str] = None) -> Dict:
+        """
+        Inyectar el total de cada grupo de cada nivel en su plantilla.
+
+        Los archivos se llaman "ZONA <zona>.xlsx" y "SECTOR <sector>.xlsx".
+
+        Args:
+            directorio_destino: Carpeta de salida (se crea si no existe)
+            niveles: Niveles a exportar
+            plantilla_path: Plantilla (por defecto la del modo ESCUELAS)
+
+        Returns:
+            dict: {'exito', 'archivos': [rutas], 'errores': [{'archivo', 'error'}]}
+        """
+        os.makedirs(directorio_destino, exist_ok=True)
+        injector = TemplateInjector()
+        if plantilla_path is None:
+            plantilla_path = injector._obtener_plantilla_dinamica()
+
+        archivos = []
+        errores = []
+        for nivel in niveles:
+            prefijo = _NOMBRE_GRUPO[nivel]
+            for grupo, datos in self.totales_nivel(nivel).items():
+                destino = os.path.join(directorio_destino, f"{prefijo} {grupo}.xlsx")
+                try:
+                    if injector.inyectar_en_plantilla(datos, plantilla_path, destino):
+                        archivos.append(destino)
+                    else:
+                        errores.append({'archivo': destino, 'error': 'Error durante la exportación'})
+                except Exception as e:
+                    errores.append({'archivo': destino, 'error': str(e)})
+
+        logger.info("📤 Concentrados exportados: %s (%s con error)", len(archivos), len(errores))
+        return {'exito': not errores, 'archivos': archivos, 'errores': errores}
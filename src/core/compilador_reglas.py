@@ -0,0 +1,436 @@
+"""
+🧮 COMPILADOR DE REGLAS - Fórmulas de Esquema a Evaluadores Vectorizados
+========================================================================
+
+Traduce las fórmulas de TABLE_SCHEMAS[...]['validaciones'] (por ejemplo
+"suma(H_1O + H_2O + ... + H_6O)" o "INSCRIPCIÓN - BAJAS") a matrices de
+coeficientes sobre la matriz numérica.
+
+Cada fórmula se analiza una sola vez por esquema y forma de matriz: los
+nombres se resuelven a índices de fila o columna al compilar, y evaluar
+todas las reglas sobre una matriz (o sobre un cubo archivos × filas ×
+columnas) son dos productos matriciales, sin ciclos de Python por regla.
+
+TIPOS DE REGLA:
+✅ Por columna: {"formula": ..., "columna_resultado": c}
+   La fórmula combina columnas y se comprueba en cada fila de concepto
+✅ Por fila: {"formula": ..., "fila_resultado": f}
+   La fórmula combina filas y se comprueba en cada columna de datos
+✅ Coherencia: {"EXISTENCIA": "INSCRIPCIÓN - BAJAS", ...}
+   Una regla por fila con el nombre de la fila resultado como clave
+
+SINTAXIS:
+✅ Nombres de columna: H_1O, M_6O (grados), subtotal_H, subtotal_M, total,
+   1ER_GRADO_A (grupos de ESC1)
+✅ Nombres de fila: los conceptos del mapeo (INSCRIPCIÓN, BECADOS SEED...)
+✅ Operadores + y -, números, factores numéricos (2 * X), paréntesis,
+   suma(...) y "..." para los nombres intermedios (H_1O + ... + H_6O)
+"""
+
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from openpyxl.utils import get_column_letter
+
+from ..config.table_schemas import get_schemas_version, get_table_schema
+
+# Desfase entre la tabla completa (datos_crudos) y la matriz numérica
+OFFSET_FILA = 3
+OFFSET_COLUMNA = 7
+
+# Funciones aceptadas en las fórmulas (todas son lineales)
+_FUNCIONES = {'suma'}
+
+# Operadores o el texto entre ellos (nombres, números, "...")
+_TOKEN = re.compile(r"[-+*()]|[^-+*()]+")
+_NUMERO = re.compile(r"\d+(?:\.\d+)?")
+
+_MAX_COMPILADAS = 32
+_cache_compiladas = {}
+
+
+class _Espacio:
+    """Nombres de un eje (filas o columnas) con su índice en la tabla completa."""
+
+    def __init__(self):
+        self.indices = {}
+
+    def agregar(self, nombre: str, indice: int):
+        self.indices.setdefault(str(nombre).strip(), int(indice))
+
+    def nombre_de(self, indice: int) -> Optional[str]:
+        for nombre, i in self.indices.items():
+            if i == indice:
+                return nombre
+        return None
+
+    def intermedios(self, desde: str, hasta: str) -> List[str]:
+        """Nombres entre 'desde' y 'hasta' (exclusivos) de la misma familia (prefijo antes de '_')."""
+        nombres = list(self.indices)
+        inicio, fin = nombres.index(desde), nombres.index(hasta)
+        familia = desde.split('_')[0] if '_' in desde else None
+        return [nombre for nombre in nombres[inicio + 1:fin]
+                if familia is None or nombre.split('_')[0] == familia]
+
+
+def espacios_de_esquema(estructura: Dict) -> Tuple[_Espacio, _Espacio]:
+    """
+    Construir los nombres de filas y columnas de la estructura de un esquema.
+
+    Args:
+        estructura: TABLE_SCHEMAS[...]['estructura'] (ya con herencia resuelta)
+
+    Returns:
+        tuple: (filas, columnas), índices de la tabla completa
+    """
+    filas = _Espacio()
+    columnas = _Espacio()
+
+    for clave in ('filas_conceptos', 'filas_datos'):
+        for indice, concepto in sorted(estructura.get(clave, {}).get('mapeo', {}).items()):
+            filas.agregar(concepto, indice)
+
+    grados = estructura.get('columnas_grados', {})
+    if grados:
+        patron = grados.get('patron', 'H_M').split('_')
+        for k, grado in enumerate(grados.get('grados', [])):
+            for g, genero in enumerate(patron):
+                columnas.agregar(f"{genero}_{grado}", grados['inicio'] + k * len(patron) + g)
+
+    for nombre_grado, grado in estructura.get('columnas_grupos', {}).get('estructura', {}).items():
+        for grupo, indice in zip(grado.get('grupos', []), grado.get('columnas', [])):
+            columnas.agregar(f"{nombre_grado}_{grupo}", indice)
+
+    for tipo, indice in estructura.get('columnas_subtotales', {}).items():
+        columnas.agregar(f"subtotal_{tipo}", indice)
+    if 'inicio' in estructura.get('columnas_totales', {}):
+        columnas.agregar("total", estructura['columnas_totales']['inicio'])
+
+    return filas, columnas
+
+
+def compilar_formula(formula: str, espacio: _Espacio) -> Tuple[Dict[int, float], float]:
+    """
+    Convertir una fórmula lineal en coeficientes por índice más una constante.
+
+    Args:
+        formula: Texto de la fórmula (ej. "INSCRIPCIÓN - BAJAS")
+        espacio: Nombres del eje sobre el que se combina
+
+    Returns:
+        tuple: ({índice de tabla: coeficiente}, constante)
+
+    Raises:
+        ValueError: Si la fórmula tiene errores de sintaxis, usa un nombre
+                    desconocido o no es lineal
+    """
+    tokens = []
+    for fragmento in _TOKEN.findall(formula):
+        fragmento = fragmento.strip()
+        if not fragmento:
+            continue
+        if fragmento in '+-*()':
+            tokens.append((fragmento, fragmento))
+        elif fragmento == '...':
+            tokens.append(('...', fragmento))
+        elif _NUMERO.fullmatch(fragmento):
+            tokens.append(('numero', float(fragmento)))
+        else:
+            tokens.append(('nombre', fragmento))
+    tokens.append(('fin', None))
+
+    analizador = _Analizador(tokens, espacio, formula)
+    coeficientes, constante = analizador.expresion()
+    analizador.esperar('fin')
+    return {indice: valor for indice, valor in coeficientes.items() if valor != 0}, constante
+
+
+class _Analizador:
+    """
+    Descenso recursivo sobre los tokens de una fórmula.
+
+    Cada subexpresión es una forma lineal ({índice: coeficiente}, constante).
+    """
+
+    def __init__(self, tokens, espacio: _Espacio, formula: str):
+        self.tokens = tokens
+        self.posicion = 0
+        self.espacio = espacio
+        self.formula = formula
+
+    def _actual(self):
+        return self.tokens[self.posicion][0]
+
+    def esperar(self, tipo: str):
+        if self._actual() != tipo:
+            encontrado = self.tokens[self.posicion][1]
+            raise ValueError(f"Fórmula no válida '{self.formula}': se esperaba '{tipo}', se encontró '{encontrado}'")
+        valor = self.tokens[self.posicion][1]
+        self.posicion += 1
+        return valor
+
+    def _indice(self, nombre: str) -> int:
+        if nombre not in self.espacio.indices:
+            raise ValueError(f"Nombre desconocido '{nombre}' en la fórmula '{self.formula}'")
+        return self.espacio.indices[nombre]
+
+    def expresion(self):
+        # expresion := ['+'|'-'] termino (('+'|'-') termino)*
+        coeficientes, constante = {}, 0.0
+        signo = 1.0
+        if self._actual() in ('+', '-'):
+            signo = -1.0 if self.esperar(self._actual()) == '-' else 1.0
+
+        anterior = None
+        while True:
+            if self._actual() == '...':
+                # "A + ... + B": los nombres entre A y B con el signo de los puntos
+                self.esperar('...')
+                if anterior is None or self._actual() not in ('+', '-'):
+                    raise ValueError(f"'...' debe ir entre dos nombres en '{self.formula}'")
+                pendiente_signo, pendiente_desde = signo, anterior
+                signo = -1.0 if self.esperar(self._actual()) == '-' else 1.0
+                if self._actual() != 'nombre':
+                    raise ValueError(f"'...' debe ir entre dos nombres en '{self.formula}'")
+                hasta = self.tokens[self.posicion][1]
+                self._indice(hasta)
+                for nombre in self.espacio.intermedios(pendiente_desde, hasta):
+                    indice = self.espacio.indices[nombre]
+                    coeficientes[indice] = coeficientes.get(indice, 0.0) + pendiente_signo
+
+            termino, constante_termino, anterior = self.termino()
+            for indice, valor in termino.items():
+                coeficientes[indice] = coeficientes.get(indice, 0.0) + signo * valor
+            constante += signo * constante_termino
+
+            if self._actual() not in ('+', '-'):
+                return coeficientes, constante
+            signo = -1.0 if self.esperar(self._actual()) == '-' else 1.0
+
+    def termino(self):
+        # termino := [numero '*'] atomo | numero   (devuelve también el nombre simple, para '...')
+        factor = 1.0
+        if self._actual() == 'numero':
+            factor = self.esperar('numero')
+            if self._actual() != '*':
+                return {}, factor, None
+            self.esperar('*')
+
+        coeficientes, constante, nombre = self.atomo()
+        if self._actual() == '*':
+            self.esperar('*')
+            factor *= self.esperar('numero')
+        return ({indice: factor * valor for indice, valor in coeficientes.items()},
+                factor * constante, nombre)
+
+    def atomo(self):
+        # atomo := nombre | funcion '(' expresion ')' | '(' expresion ')'
+        if self._actual() == '(':
+            self.esperar('(')
+            coeficientes, constante = self.expresion()
+            self.esperar(')')
+            return coeficientes, constante, None
+
+        nombre = self.esperar('nombre')
+        if self._actual() == '(':
+            if nombre.lower() not in _FUNCIONES:
+                raise ValueError(f"Función no soportada '{nombre}' en '{self.formula}'")
+            self.esperar('(')
+            coeficientes, constante = self.expresion()
+            self.esperar(')')
+            return coeficientes, constante, None
+        return {self._indice(nombre): 1.0}, 0.0, nombre
+
+
+class ReglasCompiladas:
+    """
+    Reglas de un esquema listas para evaluarse sobre matrices de una forma.
+
+    evaluar() devuelve el valor esperado y el reportado de cada
+    comprobación; etiquetas[k] = (regla, concepto, columna) describe la
+    comprobación k, y formulas[regla] guarda el texto original.
+    """
+
+    def __init__(self, forma: Tuple[int, int]):
+        self.forma = tuple(forma)
+        self.formulas = {}
+        self.etiquetas = np.empty((0, 3), dtype=object)
+
+        # Reglas por columna: esperado = datos[filas] @ W + c, reportado = datos[filas][:, resultado]
+        self._filas_columna = np.empty(0, dtype=np.intp)
+        self._pesos_columna = np.zeros((forma[1], 0))
+        self._constantes_columna = np.zeros(0)
+        self._resultado_columna = np.empty(0, dtype=np.intp)
+
+        # Reglas por fila: esperado = V @ datos[:, columnas] + c, reportado = datos[resultado, columnas]
+        self._columnas_fila = np.empty(0, dtype=np.intp)
+        self._pesos_fila = np.zeros((0, forma[0]))
+        self._constantes_fila = np.zeros(0)
+        self._resultado_fila = np.empty(0, dtype=np.intp)
+
+    def __len__(self) -> int:
+        return len(self.etiquetas)
+
+    def evaluar(self, datos: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Evaluar todas las reglas.
+
+        Args:
+            datos: Matriz filas × columnas o cubo archivos × filas × columnas
+                   (float, sin NaN)
+
+        Returns:
+            tuple: (esperado, reportado), arreglos (comprobaciones,) o
+                   (archivos, comprobaciones)
+        """
+        datos = np.asarray(datos, dtype=np.float64)
+        una_matriz = datos.ndim == 2
+        if una_matriz:
+            datos = datos[np.newaxis]
+        if datos.shape[1:] != self.forma:
+            raise ValueError(f"Las reglas se compilaron para {self.forma}, se recibió {datos.shape[1:]}")
+
+        archivos = len(datos)
+        por_fila = datos[:, self._filas_columna, :]
+        esperado_columna = por_fila @ self._pesos_columna + self._constantes_columna
+        reportado_columna = por_fila[:, :, self._resultado_columna]
+
+        por_columna = datos[:, :, self._columnas_fila]
+        esperado_fila = np.einsum('kr,arc->akc', self._pesos_fila, por_columna) + self._constantes_fila[:, np.newaxis]
+        reportado_fila = datos[:, self._resultado_fila[:, np.newaxis], self._columnas_fila[np.newaxis, :]]
+
+        esperado = np.concatenate([esperado_columna.reshape(archivos, -1), esperado_fila.reshape(archivos, -1)], axis=1)
+        reportado = np.concatenate([reportado_columna.reshape(archivos, -1), reportado_fila.reshape(archivos, -1)], axis=1)
+        if una_matriz:
+            return esperado[0], reportado[0]
+        return esperado, reportado
+
+
+def _reglas_del_esquema(validaciones: Dict) -> List[Tuple[str, str, str, int]]:
+    """Aplanar 'validaciones' en (nombre, eje del resultado, fórmula, índice resultado)."""
+    reglas = []
+    for nombre, regla in validaciones.items():
+        if not isinstance(regla, dict):
+            continue
+        if 'formula' in regla:
+            if 'columna_resultado' in regla:
+                reglas.append((nombre, 'columna', regla['formula'], regla['columna_resultado']))
+            elif 'fila_resultado' in regla:
+                reglas.append((nombre, 'fila', regla['formula'], regla['fila_resultado']))
+        elif regla and all(isinstance(formula, str) for formula in regla.values()) and 'descripcion' not in regla:
+            # Coherencia: {fila resultado: fórmula}
+            reglas.extend((f"{nombre}.{fila}", 'fila', formula, fila) for fila, formula in regla.items())
+    return reglas
+
+
+def compilar_reglas(esquema: Dict, forma: Tuple[int, int], excluir: Sequence[str] = (),
+                    offset_fila: int = OFFSET_FILA, offset_columna: int = OFFSET_COLUMNA) -> ReglasCompiladas:
+    """
+    Compilar las validaciones de un esquema para matrices de una forma.
+
+    Args:
+        esquema: Esquema de tabla (get_table_schema)
+        forma: (filas, columnas) de la matriz numérica
+        excluir: Nombres de reglas que no se compilan (ej. las que el
+                 validador ya comprueba por su cuenta)
+        offset_fila: Fila de la tabla completa que es la fila 0 de la matriz
+        offset_columna: Columna de la tabla completa que es la columna 0
+
+    Returns:
+        ReglasCompiladas
+
+    Raises:
+        ValueError: Si una fórmula no es válida o cae fuera de la matriz
+    """
+    n_filas, n_columnas = forma
+    estructura = esquema.get('estructura', {})
+    filas, columnas = espacios_de_esquema(estructura)
+    compiladas = ReglasCompiladas(forma)
+
+    def en_matriz(indice: int, eje: str) -> int:
+        offset, limite = (offset_fila, n_filas) if eje == 'fila' else (offset_columna, n_columnas)
+        if not 0 <= indice - offset < limite:
+            raise ValueError(f"La {eje} {indice} queda fuera de la matriz numérica {tuple(forma)}")
+        return indice - offset
+
+    def nombre_columna(indice: int) -> str:
+        return columnas.nombre_de(indice) or get_column_letter(indice + 1)
+
+    # Filas donde se comprueban las reglas por columna (sin conceptos especiales, ej. GRUPOS)
+    especiales = set(esquema.get('conceptos_especiales', {}))
+    filas_aplica = [(concepto, indice) for concepto, indice in filas.indices.items()
+                    if concepto not in especiales and 0 <= indice - offset_fila < n_filas]
+    # Columnas donde se comprueban las reglas por fila (columnas de datos)
+    columnas_aplica = [(nombre, indice) for nombre, indice in columnas.indices.items()
+                       if not nombre.startswith(('subtotal_', 'total')) and 0 <= indice - offset_columna < n_columnas]
+
+    pesos_columna, pesos_fila = [], []
+    etiquetas_columna, etiquetas_fila = [], []
+    for nombre, eje, formula, resultado in _reglas_del_esquema(esquema.get('validaciones', {})):
+        if nombre in excluir:
+            continue
+        if eje == 'columna':
+            coeficientes, constante = compilar_formula(formula, columnas)
+            vector = np.zeros(n_columnas)
+            for indice, valor in coeficientes.items():
+                vector[en_matriz(indice, 'columna')] += valor
+            pesos_columna.append((vector, constante, en_matriz(resultado, 'columna')))
+            etiquetas_columna.append((nombre, nombre_columna(resultado)))
+        else:
+            if isinstance(resultado, str):
+                if resultado not in filas.indices:
+                    raise ValueError(f"Fila resultado desconocida '{resultado}' en la regla '{nombre}'")
+                resultado = filas.indices[resultado]
+            coeficientes, constante = compilar_formula(formula, filas)
+            vector = np.zeros(n_filas)
+            for indice, valor in coeficientes.items():
+                vector[en_matriz(indice, 'fila')] += valor
+            pesos_fila.append((vector, constante, en_matriz(resultado, 'fila')))
+            etiquetas_fila.append((nombre, filas.nombre_de(resultado)))
+        compiladas.formulas[nombre] = formula
+
+    if pesos_columna and filas_aplica:
+        compiladas._filas_columna = np.array([indice - offset_fila for _, indice in filas_aplica], dtype=np.intp)
+        compiladas._pesos_columna = np.column_stack([vector for vector, _, _ in pesos_columna])
+        compiladas._constantes_columna = np.array([constante for _, constante, _ in pesos_columna])
+        compiladas._resultado_columna = np.array([j for _, _, j in pesos_columna], dtype=np.intp)
+    else:
+        etiquetas_columna = []
+    if pesos_fila and columnas_aplica:
+        compiladas._columnas_fila = np.array([indice - offset_columna for _, indice in columnas_aplica], dtype=np.intp)
+        compiladas._pesos_fila = np.vstack([vector for vector, _, _ in pesos_fila])
+        compiladas._constantes_fila = np.array([constante for _, constante, _ in pesos_fila])
+        compiladas._resultado_fila = np.array([i for _, _, i in pesos_fila], dtype=np.intp)
+    else:
+        etiquetas_fila = []
+
+    # Mismo orden que evaluar(): (fila, regla) para las de columna, (regla, columna) para las de fila
+    etiquetas = [(regla, concepto, columna) for concepto, _ in filas_aplica for regla, columna in etiquetas_columna]
+    etiquetas += [(regla, concepto, columna) for regla, concepto in etiquetas_fila for columna, _ in columnas_aplica]
+    compiladas.etiquetas = np.array(etiquetas, dtype=object).reshape(-1, 3)
+    return compiladas
+
+
+def reglas_de_esquema(nombre_esquema: str, forma: Tuple[int, int], excluir: Sequence[str] = ()) -> ReglasCompiladas:
+    """
+    Reglas compiladas de un esquema de TABLE_SCHEMAS, compilando una sola vez.
+
+    La caché se invalida sola si TABLE_SCHEMAS cambia (get_schemas_version).
+
+    Args:
+        nombre_esquema: Nombre en TABLE_SCHEMAS (ej. "ESC2_MOVIMIENTOS")
+        forma: (filas, columnas) de la matriz numérica
+        excluir: Ver compilar_reglas
+
+    Returns:
+        ReglasCompiladas
+    """
+    clave = (nombre_esquema, tuple(forma), tuple(excluir), get_schemas_version())
+    compiladas = _cache_compiladas.get(clave)
+    if compiladas is None:
+        compiladas = compilar_reglas(get_table_schema(nombre_esquema), forma, excluir)
+        if len(_cache_compiladas) >= _MAX_COMPILADAS:
+            _cache_compiladas.pop(next(iter(_cache_compiladas)))
+        _cache_compiladas[clave] = compiladas
+    return compiladas
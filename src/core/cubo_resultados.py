@@ -0,0 +1,335 @@
+"""
+🧊 CUBO RESULTADOS - Resultados Numéricos Apilados
+==================================================
+
+Guarda la matriz numérica de cada archivo procesado en un solo arreglo
+3-D (archivos × conceptos × columnas) para que las operaciones entre
+archivos sean reducciones NumPy en lugar de ciclos sobre DataFrames.
+
+CARACTERÍSTICAS:
+✅ Arreglo preasignado que crece por duplicación (agregar es O(celdas))
+✅ Índices por nombre de archivo, concepto y columna (grado/género)
+✅ Orden de archivos igual al orden de llegada (también al eliminar)
+✅ Eliminar deja un hueco; el cubo se compacta al consultarlo
+✅ Sumatoria acumulada: agregar y eliminar la actualizan en O(celdas)
+✅ int64 mientras todos los valores sean enteros, float64 si no
+✅ Sumatoria, totales por concepto, ranking y consistencia vectorizados
+✅ Sumas por grupo (ej. escuelas → zonas) con un solo producto matricial
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class CuboResultados:
+    """
+    Cubo archivos × conceptos × columnas con los datos numéricos.
+
+    Las matrices de formas distintas se rellenan con ceros (igual que
+    DataFrame.add(fill_value=0)); la forma original de cada archivo se
+    conserva para las revisiones de consistencia.
+
+    indice_archivo guarda la posición de cada archivo en el arreglo
+    interno; tras eliminar puede haber huecos hasta la siguiente consulta
+    de datos o formas, que los junta en el orden de nombres.
+    """
+
+    def __init__(self, conceptos: Optional[Sequence[str]] = None,
+                 columnas: Optional[Sequence[str]] = None, capacidad_inicial: int = 16):
+        """
+        Inicializar cubo vacío.
+
+        Args:
+            conceptos: Etiqueta de cada fila de la matriz numérica
+            columnas: Etiqueta de cada columna de la matriz numérica
+            capacidad_inicial: Archivos que caben antes de crecer
+        """
+        self.conceptos = list(conceptos or [])
+        self.columnas = list(columnas or [])
+        self.indice_concepto = {concepto: i for i, concepto in enumerate(self.conceptos)}
+        self.indice_columna = {columna: j for j, columna in enumerate(self.columnas)}
+
+        self.nombres: List[str] = []
+        self.indice_archivo: Dict[str, int] = {}
+
+        self._capacidad_inicial = max(capacidad_inicial, 1)
+        self._filas_base = len(self.conceptos)
+        self._columnas_base = len(self.columnas)
+        self.limpiar()
+
+    def __len__(self) -> int:
+        return len(self.nombres)
+
+    def __contains__(self, nombre: str) -> bool:
+        return nombre in self.indice_archivo
+
+    @property
+    def datos(self) -> np.ndarray:
+        """Vista de solo lectura del cubo ocupado (archivos × conceptos × columnas)."""
+        self._compactar()
+        vista = self._datos[:len(self.nombres)]
+        vista.flags.writeable = False
+        return vista
+
+    @property
+    def formas(self) -> np.ndarray:
+        """Forma original (filas, columnas) de la matriz de cada archivo."""
+        self._compactar()
+        return self._formas[:len(self.nombres)].copy()
+
+    def agregar(self, nombre: str, matriz: np.ndarray) -> int:
+        """
+        Agregar (o reemplazar) la matriz numérica de un archivo.
+
+        Args:
+            nombre: Nombre del archivo
+            matriz: Matriz 2-D numérica
+
+        Returns:
+            int: Posición del archivo en el cubo
+        """
+        matriz = np.asarray(matriz)
+        if not np.issubdtype(matriz.dtype, np.number):
+            matriz = matriz.astype(np.float64)
+        self._ajustar(matriz.shape, matriz.dtype)
+
+        posicion = self.indice_archivo.get(nombre)
+        if posicion is None:
+            if self._ocupados == self._datos.shape[0]:
+                # Antes de crecer se reaprovechan los huecos de eliminar
+                self._compactar()
+            if self._ocupados == self._datos.shape[0]:
+                self._redimensionar(capacidad=2 * self._ocupados)
+            posicion = self._ocupados
+            self._ocupados += 1
+            self.nombres.append(nombre)
+            self.indice_archivo[nombre] = posicion
+
+        # Reemplazar un archivo descuenta su aporte anterior a la sumatoria
+        self._total -= self._datos[posicion]
+        self._datos[posicion] = 0
+        self._datos[posicion, :matriz.shape[0], :matriz.shape[1]] = matriz
+        self._total[:matriz.shape[0], :matriz.shape[1]] += matriz
+        self._formas[posicion] = matriz.shape
+        self._flotantes[posicion] = np.result_type(matriz.dtype, np.int64) != np.int64
+        return posicion
+
+    def eliminar(self, nombre: str) -> bool:
+        """
+        Quitar un archivo del cubo.
+
+        Args:
+            nombre: Nombre del archivo
+
+        Returns:
+            bool: True si estaba en el cubo
+        """
+        posicion = self.indice_archivo.pop(nombre, None)
+        if posicion is None:
+            return False
+
+        # Solo se vacía su lugar (O(celdas)); los siguientes se recorren
+        # una sola vez, en la próxima consulta (ver _compactar)
+        self._total -= self._datos[posicion]
+        self._datos[posicion] = 0
+        self._formas[posicion] = 0
+        self._flotantes[posicion] = False
+        self.nombres.remove(nombre)
+        self._huecos = True
+        return True
+
+    def limpiar(self):
+        """Vaciar el cubo conservando etiquetas."""
+        self.nombres.clear()
+        self.indice_archivo.clear()
+        self._recortar_etiquetas(self._filas_base, self._columnas_base)
+        self._datos = np.zeros((self._capacidad_inicial, self._filas_base, self._columnas_base), dtype=np.int64)
+        self._total = np.zeros(self._datos.shape[1:], dtype=np.int64)
+        self._formas = np.zeros((self._capacidad_inicial, 2), dtype=np.int64)
+        self._flotantes = np.zeros(self._capacidad_inicial, dtype=bool)
+        self._ocupados = 0
+        self._huecos = False
+
+    def matriz(self, nombre: str) -> np.ndarray:
+        """Matriz de un archivo, recortada a su forma original."""
+        posicion = self.indice_archivo[nombre]
+        filas, columnas = self._formas[posicion]
+        return self._datos[posicion, :filas, :columnas].copy()
+
+    def sumatoria(self) -> np.ndarray:
+        """
+        Suma de todos los archivos (conceptos × columnas), sin recalcularla.
+
+        Es una copia del total acumulado por agregar/eliminar, recortada a la
+        forma más grande entre los archivos presentes; es int64 si ninguno de
+        ellos tiene decimales, aunque el cubo haya crecido o se haya
+        promovido por un archivo ya eliminado.
+        """
+        posiciones = np.fromiter(self.indice_archivo.values(), dtype=np.intp, count=len(self.indice_archivo))
+        if len(posiciones) == 0:
+            return np.zeros((0, 0), dtype=np.int64)
+
+        filas, columnas = self._formas[posiciones].max(axis=0)
+        total = self._total[:filas, :columnas]
+        if self._total.dtype != np.int64 and not self._flotantes[posiciones].any():
+            # Solo quedan enteros: el total flotante se redondea (restar
+            # decimales puede dejar residuos de redondeo)
+            return np.rint(total).astype(np.int64)
+        return total.copy()
+
+    def sumar_por_grupo(self, asignacion: Dict[str, str],
+                        grupos: Optional[Sequence[str]] = None) -> Tuple[List[str], np.ndarray]:
+        """
+        Sumar las matrices de los archivos de cada grupo.
+
+        Args:
+            asignacion: {nombre de archivo: grupo}; los archivos sin grupo
+                        no se suman
+            grupos: Orden de los grupos (por defecto el de primera aparición
+                    en asignacion)
+
+        Returns:
+            tuple: (grupos, arreglo grupos × conceptos × columnas)
+        """
+        if grupos is None:
+            grupos = list(dict.fromkeys(asignacion.values()))
+        else:
+            grupos = list(grupos)
+        indice_grupo = {grupo: g for g, grupo in enumerate(grupos)}
+
+        # Matriz de pertenencia grupos × archivos: la suma es un tensordot
+        datos = self.datos
+        pertenencia = np.zeros((len(grupos), len(self.nombres)), dtype=datos.dtype)
+        for i, nombre in enumerate(self.nombres):
+            g = indice_grupo.get(asignacion.get(nombre))
+            if g is not None:
+                pertenencia[g, i] = 1
+        return grupos, np.tensordot(pertenencia, datos, axes=1)
+
+    def totales_por_concepto(self, columna: str = 'TOTAL') -> pd.DataFrame:
+        """
+        Valor de una columna por archivo y concepto.
+
+        Args:
+            columna: Etiqueta de la columna (por defecto el total H + M)
+
+        Returns:
+            pd.DataFrame: Filas = archivos, columnas = conceptos
+        """
+        valores = self.datos[:, :, self.indice_columna[columna]]
+        return pd.DataFrame(valores, index=self.nombres, columns=self.conceptos)
+
+    def ranking(self, concepto: str, columna: str = 'TOTAL', descendente: bool = True) -> List[Tuple[str, float]]:
+        """
+        Ordenar archivos por el valor de un concepto.
+
+        Args:
+            concepto: Etiqueta del concepto (ej. 'EXISTENCIA')
+            columna: Etiqueta de la columna (por defecto el total H + M)
+            descendente: Mayor primero
+
+        Returns:
+            list: [(nombre, valor), ...] ordenada
+        """
+        valores = self.datos[:, self.indice_concepto[concepto], self.indice_columna[columna]]
+        orden = np.argsort(-valores if descendente else valores, kind='stable')
+        return [(self.nombres[i], valores[i].item()) for i in orden]
+
+    def formas_inconsistentes(self) -> List[Dict]:
+        """
+        Archivos cuya matriz no tiene la forma del primero.
+
+        Returns:
+            list: [{'archivo', 'forma_esperada', 'forma_actual'}, ...]
+        """
+        formas = self.formas
+        if len(formas) == 0:
+            return []
+        distintas = np.flatnonzero((formas != formas[0]).any(axis=1))
+        forma_esperada = tuple(formas[0].tolist())
+        return [{
+            'archivo': self.nombres[i],
+            'forma_esperada': forma_esperada,
+            'forma_actual': tuple(formas[i].tolist())
+        } for i in distintas]
+
+    def _compactar(self):
+        """
+        Juntar los archivos en el orden de nombres tras eliminar y devolver
+        el cubo a la forma y el tipo mínimos para los archivos presentes.
+        """
+        if not self._huecos:
+            return
+
+        orden = np.array([self.indice_archivo[nombre] for nombre in self.nombres], dtype=np.intp)
+        total = len(orden)
+        formas = self._formas[orden]
+        flotantes = self._flotantes[orden]
+        filas = max(self._filas_base, int(formas[:, 0].max(initial=0)))
+        columnas = max(self._columnas_base, int(formas[:, 1].max(initial=0)))
+        tipo = np.float64 if flotantes.any() else np.int64
+
+        capacidad = self._datos.shape[0]
+        datos = np.zeros((capacidad, filas, columnas), dtype=tipo)
+        datos[:total] = self._datos[orden, :filas, :columnas]
+        self._datos = datos
+        # Se vuelve a sumar: descarta los residuos de restar decimales
+        self._total = datos[:total].sum(axis=0)
+        self._formas = np.zeros((capacidad, 2), dtype=np.int64)
+        self._formas[:total] = formas
+        self._flotantes = np.zeros(capacidad, dtype=bool)
+        self._flotantes[:total] = flotantes
+
+        self.indice_archivo = {nombre: i for i, nombre in enumerate(self.nombres)}
+        self._ocupados = total
+        self._huecos = False
+        self._recortar_etiquetas(filas, columnas)
+
+    def _recortar_etiquetas(self, filas: int, columnas: int):
+        """Quitar las etiquetas de índice agregadas para filas o columnas que ya no existen."""
+        for concepto in self.conceptos[filas:]:
+            del self.indice_concepto[concepto]
+        del self.conceptos[filas:]
+        for columna in self.columnas[columnas:]:
+            del self.indice_columna[columna]
+        del self.columnas[columnas:]
+
+    def _ajustar(self, forma: Tuple[int, int], tipo: np.dtype):
+        """Ampliar filas/columnas o promover el tipo para recibir una matriz."""
+        filas = max(self._datos.shape[1], forma[0])
+        columnas = max(self._datos.shape[2], forma[1])
+        tipo = np.result_type(self._datos.dtype, tipo)
+        if (filas, columnas) != self._datos.shape[1:] or tipo != self._datos.dtype:
+            self._redimensionar(filas=filas, columnas=columnas, tipo=tipo)
+
+    def _redimensionar(self, capacidad: Optional[int] = None, filas: Optional[int] = None,
+                       columnas: Optional[int] = None, tipo: Optional[np.dtype] = None):
+        """Copiar el cubo a un arreglo nuevo más grande (o de otro tipo)."""
+        capacidad = capacidad or self._datos.shape[0]
+        filas = filas or self._datos.shape[1]
+        columnas = columnas or self._datos.shape[2]
+        tipo = tipo or self._datos.dtype
+
+        anterior = self._datos
+        self._datos = np.zeros((capacidad, filas, columnas), dtype=tipo)
+        self._datos[:anterior.shape[0], :anterior.shape[1], :anterior.shape[2]] = anterior
+        total = np.zeros((filas, columnas), dtype=tipo)
+        total[:self._total.shape[0], :self._total.shape[1]] = self._total
+        self._total = total
+
+        formas = np.zeros((capacidad, 2), dtype=np.int64)
+        formas[:len(self._formas)] = self._formas
+        self._formas = formas
+        flotantes = np.zeros(capacidad, dtype=bool)
+        flotantes[:len(self._flotantes)] = self._flotantes
+        self._flotantes = flotantes
+
+        # Filas o columnas nuevas sin etiqueta reciben su índice
+        for i in range(len(self.conceptos), filas):
+            self.conceptos.append(str(i))
+            self.indice_concepto[str(i)] = i
+        for j in range(len(self.columnas), columnas):
+            self.columnas.append(str(j))
+            self.indice_columna[str(j)] = j
@@ -11,12 +11,66 @@ CARACTERÍSTICAS:
 ✅ Configuración dinámica
 ✅ Preparado para validaciones cruzadas
 ✅ Extensible para IA y análisis avanzado
+✅ Procesamiento paralelo de lotes con ProcessPoolExecutor
+✅ Memoria acotada: los archivos menos consultados se descargan a disco
 """
 
+import logging
+import os
+import shutil
+import tempfile
+import weakref
+from collections import OrderedDict
 import pandas as pd
-from ..config.settings import get_config_actual
+from concurrent.futures import ProcessPoolExecutor
+from ..config import settings
+from ..config.settings import get_config_actual, configurar_modo, PROCESAMIENTO_PARALELO, MEMORIA_ACOTADA
 from ..config.table_schemas import get_table_schema
 from .excel_processor import ExcelProcessor
+from .data_transformer import SALIDAS_COMPLETAS
+from .resultado_procesamiento import ResultadoProcesamiento
+from .cubo_resultados import CuboResultados
+
+logger = logging.getLogger(__name__)
+
+
+# 🚀 Estado de cada proceso trabajador (un ExcelProcessor por proceso)
+_processor_worker = None
+
+
+def _inicializar_worker(modo, salidas):
+    """
+    Preparar un proceso trabajador: mismo modo que el proceso principal
+    y un único ExcelProcessor reutilizado para todos sus archivos.
+
+    Args:
+        modo: Modo activo en el proceso principal
+        salidas: Salidas que debe producir el ExcelProcessor
+    """
+    global _processor_worker
+    configurar_modo(modo)
+    _processor_worker = ExcelProcessor(salidas=salidas)
+
+
+def _procesar_en_worker(archivo_path):
+    """
+    Procesar un archivo dentro de un proceso trabajador.
+
+    El ResultadoProcesamiento viaja con sus vistas aún sin calcular: la
+    vista combinada y el mapeo se construyen en el proceso principal solo
+    si alguien los consulta. Los errores se devuelven como texto para que
+    siempre sean serializables.
+
+    Args:
+        archivo_path: Ruta del archivo Excel
+
+    Returns:
+        dict: {'exito': True, 'resultado': ResultadoProcesamiento} o {'exito': False, 'error': str}
+    """
+    try:
+        return {'exito': True, 'resultado': _processor_worker.extraer_datos_completo(archivo_path)}
+    except Exception as e:
+        return {'exito': False, 'error': str(e)}
 
 
 class DataManager:
@@ -27,17 +81,70 @@ class DataManager:
     compatibilidad total con la interfaz existente.
     """
 
-    def __init__(self):
-        """Inicializar gestor con arquitectura modular."""
+    def __init__(self, salidas=SALIDAS_COMPLETAS, max_residentes=None):
+        """
+        Inicializar gestor con arquitectura modular.
+
+        Args:
+            salidas: Salidas a conservar por archivo (ver ExcelProcessor).
+                     SALIDAS_LOTE omite las vistas de la interfaz gráfica.
+            max_residentes: Archivos que se conservan en memoria; los menos
+                            consultados recientemente se descargan a disco.
+                            Si None, usa MEMORIA_ACOTADA (sin límite si está
+                            deshabilitada)
+        """
         self.archivos_procesados = {}
-        self.sumatoria_total = None
-        self.processor = ExcelProcessor()
+        self.salidas = tuple(salidas)
+        self.processor = ExcelProcessor(salidas=self.salidas)
+
+        # 💾 Memoria acotada: nombres residentes del menos al más reciente
+        if max_residentes is None and MEMORIA_ACOTADA.get('HABILITADO', False):
+            max_residentes = MEMORIA_ACOTADA.get('MAX_ARCHIVOS_RESIDENTES')
+        self.max_residentes = max(max_residentes, 1) if max_residentes else None
+        self._residentes = OrderedDict()
+        self._directorio_descarga = None
 
         # Configuración dinámica
         self.config_actual = get_config_actual()
         self.modo_actual = self.config_actual.get('MODO', 'ESCUELAS')
 
-        print(f"📊 DataManager inicializado - Modo: {self.modo_actual}")
+        # 🧊 Datos numéricos de todos los archivos (archivos × conceptos × columnas)
+        self.cubo = CuboResultados(*self._etiquetas_cubo())
+
+        logger.debug("📊 DataManager inicializado - Modo: %s", self.modo_actual)
+
+    def _etiquetas_cubo(self):
+        """
+        Etiquetas de filas (conceptos) y columnas del rango numérico según el esquema.
+
+        Las columnas de grados se nombran "1O_H", "1O_M", ...; las de
+        subtotales "SUBTOTAL_H"/"SUBTOTAL_M"; la primera de totales "TOTAL";
+        el resto con su letra de Excel.
+
+        Returns:
+            tuple: (conceptos, columnas)
+        """
+        rango_numerico = self.processor._obtener_rango_numerico_dinamico()
+        tabla = 'ZONA3_CONCENTRADO' if self.modo_actual in ('ZONAS', 'SECTORES') else 'ESC2_MOVIMIENTOS'
+        estructura = get_table_schema(tabla).get('estructura', {})
+
+        mapeo_conceptos = estructura.get('filas_conceptos', {}).get('mapeo', {})
+        conceptos = [mapeo_conceptos.get(fila, str(fila))
+                     for fila in range(rango_numerico['filas_inicio'], rango_numerico['filas_fin'] + 1)]
+
+        etiquetas_columnas = {}
+        grados = estructura.get('columnas_grados', {})
+        for k, grado in enumerate(grados.get('grados', [])):
+            etiquetas_columnas[grados['inicio'] + 2 * k] = f"{grado}_H"
+            etiquetas_columnas[grados['inicio'] + 2 * k + 1] = f"{grado}_M"
+        for genero, columna in estructura.get('columnas_subtotales', {}).items():
+            etiquetas_columnas[columna] = f"SUBTOTAL_{genero}"
+        if 'columnas_totales' in estructura:
+            etiquetas_columnas[estructura['columnas_totales']['inicio']] = 'TOTAL'
+
+        columnas = [etiquetas_columnas.get(columna, chr(65 + columna))
+                    for columna in range(rango_numerico['columnas_inicio'], rango_numerico['columnas_fin'] + 1)]
+        return conceptos, columnas
         
     def procesar_archivo(self, archivo_path):
         """
@@ -56,23 +163,51 @@ class DataManager:
             datos_procesados = self.processor.extraer_datos_completo(archivo_path)
 
             # Agregar a la colección CON FORMATO EXACTO de main_pyqt.py
-            self.archivos_procesados[nombre_archivo] = {
-                'archivo_completo': archivo_path,
-                'datos_crudos': datos_procesados['datos_crudos'].copy(),
-                'datos_combinados': datos_procesados['datos_combinados'].copy(),
-                'datos_numericos': datos_procesados['datos_numericos'].copy(),
-                'mapeo_posicional': datos_procesados['mapeo_posicional'].copy(),
-                'modo': self.modo_actual,
-                'tipo_procesamiento': 'hoja_unica'
-            }
-
-            print(f"✅ Archivo procesado y agregado: {nombre_archivo}")
+            self._registrar_archivo(archivo_path, datos_procesados)
             return datos_procesados
 
         except Exception as e:
-            print(f"❌ Error procesando {nombre_archivo}: {str(e)}")
+            logger.error("❌ Error procesando %s: %s", nombre_archivo, str(e))
             raise
 
+    def _registrar_archivo(self, archivo_path, datos_procesados):
+        """
+        Agregar un resultado de ExcelProcessor a archivos_procesados.
+
+        Args:
+            archivo_path: Ruta del archivo Excel
+            datos_procesados: Resultado de extraer_datos_completo()
+        """
+        nombre_archivo = archivo_path.split('/')[-1]
+
+        # Reprocesar un archivo reemplaza su aporte a la sumatoria
+        self._soltar_registro(nombre_archivo, quitar=False)
+
+        # Se guarda el mismo resultado que devolvió ExcelProcessor, sin copias:
+        # sus DataFrames son de solo lectura. Las salidas omitidas (ver
+        # self.salidas) quedan en None y las perezosas siguen sin calcular
+        registro = datos_procesados
+        if not isinstance(registro, ResultadoProcesamiento):
+            registro = ResultadoProcesamiento(registro)
+        for clave in SALIDAS_COMPLETAS:
+            if clave not in self.salidas or clave not in registro:
+                registro[clave] = None
+        registro['archivo_completo'] = archivo_path
+        registro['modo'] = self.modo_actual
+        registro['tipo_procesamiento'] = 'hoja_unica'
+
+        self.archivos_procesados[nombre_archivo] = registro
+        if registro['datos_numericos'] is not None:
+            self.cubo.agregar(nombre_archivo, registro['datos_numericos'].to_numpy())
+        else:
+            self.cubo.eliminar(nombre_archivo)
+
+        if self.max_residentes is not None:
+            registro.al_cargar = lambda _registro, nombre=nombre_archivo: self._marcar_residente(nombre)
+            self._marcar_residente(nombre_archivo)
+
+        logger.info("✅ Archivo procesado y agregado: %s", nombre_archivo)
+
     def procesar_archivo_multiples_hojas(self, archivo_path, config_hojas=None):
         """
         Procesar archivo con múltiples hojas usando configuración dinámica.
@@ -87,7 +222,7 @@ class DataManager:
             dict: Datos de todas las hojas procesadas
         """
         nombre_archivo = archivo_path.split('/')[-1]
-        print(f"📊 Procesando múltiples hojas: {nombre_archivo}")
+        logger.debug("📊 Procesando múltiples hojas: %s", nombre_archivo)
 
         # Configuración por defecto si no se proporciona
         if config_hojas is None:
@@ -98,6 +233,8 @@ class DataManager:
             resultados_hojas = self.processor.extraer_multiples_hojas(archivo_path, config_hojas)
 
             # Almacenar resultados con estructura extendida
+            self._soltar_registro(nombre_archivo, quitar=False)
+            self.cubo.eliminar(nombre_archivo)
             self.archivos_procesados[nombre_archivo] = {
                 'archivo_completo': archivo_path,
                 'tipo_procesamiento': 'multiples_hojas',
@@ -106,11 +243,11 @@ class DataManager:
                 'modo': self.modo_actual
             }
 
-            print(f"✅ Múltiples hojas procesadas: {nombre_archivo}")
+            logger.debug("✅ Múltiples hojas procesadas: %s", nombre_archivo)
             return resultados_hojas
 
         except Exception as e:
-            print(f"❌ Error procesando múltiples hojas {nombre_archivo}: {e}")
+            logger.error("❌ Error procesando múltiples hojas %s: %s", nombre_archivo, e)
             raise e
 
     def _obtener_config_hojas_por_defecto(self):
@@ -121,20 +258,22 @@ class DataManager:
             dict: Configuración de hojas
         """
         if self.modo_actual == 'ESCUELAS':
+            # ESC1 y ESC2 se leen del mismo libro abierto (una sola sesión)
+            listado_grupos = get_table_schema("ESC1_GRUPOS")["listado_grupos"]
             return {
                 "ESC2": {
                     "hoja": "ESC2",
                     "rango": "A5:Z17",
                     "tipo": "movimientos",
                     "esquema": "ESC2_MOVIMIENTOS"
+                },
+                "ESC1": {
+                    "hoja": "ESC1",
+                    "rango": listado_grupos["rango"],
+                    "rango_numerico": listado_grupos["rango_numerico"],
+                    "tipo": "grupos",
+                    "esquema": "ESC1_GRUPOS"
                 }
-                # Preparado para agregar ESC1 cuando sea necesario
-                # "ESC1": {
-                #     "hoja": "ESC1",
-                #     "rango": "A3:Z15",
-                #     "tipo": "grupos",
-                #     "esquema": "ESC1_GRUPOS"
-                # }
             }
         elif self.modo_actual == 'ZONAS':
             return {
@@ -207,17 +346,31 @@ class DataManager:
                     }
                 }
             }
-    def procesar_multiples_archivos(self, archivos_paths, callback_progreso=None):
+    def procesar_multiples_archivos(self, archivos_paths, callback_progreso=None,
+                                    paralelo=None, max_workers=None):
         """
         Procesar múltiples archivos con callback de progreso
         
         Args:
             archivos_paths: Lista de rutas de archivos
             callback_progreso: Función callback para reportar progreso
+            paralelo: Repartir archivos entre procesos. Si None, usa
+                      PROCESAMIENTO_PARALELO['HABILITADO']
+            max_workers: Número de procesos. Si None, usa
+                         PROCESAMIENTO_PARALELO['MAX_WORKERS'] (o un proceso por núcleo)
             
         Returns:
             dict: Resumen del procesamiento
         """
+        if paralelo is None:
+            paralelo = PROCESAMIENTO_PARALELO.get('HABILITADO', False)
+        if max_workers is None:
+            max_workers = PROCESAMIENTO_PARALELO.get('MAX_WORKERS') or os.cpu_count() or 1
+        max_workers = min(max_workers, len(archivos_paths))
+
+        if paralelo and max_workers > 1:
+            return self._procesar_multiples_archivos_paralelo(archivos_paths, callback_progreso, max_workers)
+
         total_archivos = len(archivos_paths)
         archivos_exitosos = 0
         archivos_fallidos = []
@@ -248,45 +401,198 @@ class DataManager:
             'fallidos': len(archivos_fallidos),
             'errores': archivos_fallidos
         }
+
+    def _procesar_multiples_archivos_paralelo(self, archivos_paths, callback_progreso, max_workers):
+        """
+        Procesar archivos repartidos en un pool de procesos.
+
+        Los resultados se consumen en el orden de entrada, así el callback de
+        progreso, el orden de archivos_procesados y la lista de errores son
+        los mismos que en el modo secuencial.
+
+        Args:
+            archivos_paths: Lista de rutas de archivos
+            callback_progreso: Función callback para reportar progreso
+            max_workers: Número de procesos
+
+        Returns:
+            dict: Resumen del procesamiento
+        """
+        total_archivos = len(archivos_paths)
+        archivos_exitosos = 0
+        archivos_fallidos = []
+
+        logger.info("🚀 Procesando %s archivos con %s procesos", total_archivos, max_workers)
+
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_inicializar_worker,
+                                 initargs=(settings.MODO_ACTUAL, self.salidas)) as executor:
+            futuros = [executor.submit(_procesar_en_worker, archivo_path) for archivo_path in archivos_paths]
+
+            for i, (archivo_path, futuro) in enumerate(zip(archivos_paths, futuros)):
+                if callback_progreso:
+                    callback_progreso(i, total_archivos, archivo_path)
+
+                try:
+                    resultado = futuro.result()
+                    if not resultado['exito']:
+                        raise Exception(resultado['error'])
+
+                    self._registrar_archivo(archivo_path, resultado['resultado'])
+                    archivos_exitosos += 1
+
+                except Exception as e:
+                    logger.error("❌ Error procesando %s: %s", archivo_path.split('/')[-1], str(e))
+                    archivos_fallidos.append({
+                        'archivo': archivo_path,
+                        'error': str(e)
+                    })
+
+        if callback_progreso:
+            callback_progreso(total_archivos, total_archivos, "Completado")
+
+        return {
+            'total': total_archivos,
+            'exitosos': archivos_exitosos,
+            'fallidos': len(archivos_fallidos),
+            'errores': archivos_fallidos
+        }
     
+    @property
+    def sumatoria_total(self):
+        """
+        Sumatoria actual de los archivos procesados (sin recalcular).
+
+        Es una copia del total que el cubo acumula al agregar y eliminar
+        archivos (O(celdas) por lectura), recortada a la forma más grande
+        entre los archivos presentes.
+
+        Returns:
+            pd.DataFrame: Sumatoria, o None si no hay archivos numéricos
+        """
+        if len(self.cubo) == 0:
+            return None
+        return pd.DataFrame(self.cubo.sumatoria())
+
     def calcular_sumatoria(self):
         """
         Calcular sumatoria de todos los archivos procesados
         
+        La suma es el total acumulado del cubo, que se actualiza al agregar
+        y eliminar archivos, así que no se vuelve a recorrer cada archivo.
+        
         Returns:
             pd.DataFrame: DataFrame con la sumatoria total
         """
-        if len(self.archivos_procesados) < 2:
+        # Solo cuentan los archivos con datos numéricos (los de múltiples
+        # hojas no entran al cubo)
+        if len(self.cubo) < 2:
             raise ValueError("Se necesitan al menos 2 archivos para calcular sumatoria")
         
-        print("➕ Calculando sumatoria total...")
-        
-        # Obtener todos los DataFrames numéricos
-        dataframes_numericos = []
-        for nombre, datos in self.archivos_procesados.items():
-            df_numerico = datos['datos_numericos']
-            dataframes_numericos.append(df_numerico)
-            print(f"   📊 {nombre}: {df_numerico.shape}")
-        
-        # Sumar todos los DataFrames
-        self.sumatoria_total = dataframes_numericos[0].copy()
-        for df in dataframes_numericos[1:]:
-            self.sumatoria_total = self.sumatoria_total.add(df, fill_value=0)
+        logger.debug("➕ Calculando sumatoria total...")
+        # Formas tomadas del cubo: no obliga a cargar archivos descargados.
+        # Solo con -vv: la sumatoria en vivo se pide tras cada archivo
+        if logger.isEnabledFor(logging.DEBUG):
+            for nombre, forma in zip(self.cubo.nombres, self.cubo.formas):
+                logger.debug("   📊 %s: %s", nombre, tuple(forma.tolist()))
         
-        print(f"✅ Sumatoria calculada: {self.sumatoria_total.shape}")
-        return self.sumatoria_total
+        sumatoria = self.sumatoria_total
+        logger.info("✅ Sumatoria calculada: %s", sumatoria.shape)
+        return sumatoria
+
+    def _soltar_registro(self, nombre_archivo, quitar=True):
+        """
+        Quitar el aporte de un archivo a la sumatoria y a la lista de
+        residentes, borrando su descarga a disco si la tenía.
+
+        No consulta los valores del registro: uno descargado a disco se
+        descarta sin volver a cargarlo.
+
+        Args:
+            nombre_archivo: Nombre del archivo
+            quitar: Sacarlo también de archivos_procesados y del cubo (False
+                    cuando se va a reemplazar en el mismo lugar)
+
+        Returns:
+            dict: Registro anterior, o None si no existía
+        """
+        registro = self.archivos_procesados.get(nombre_archivo)
+        self._residentes.pop(nombre_archivo, None)
+        if quitar:
+            self.archivos_procesados.pop(nombre_archivo, None)
+            self.cubo.eliminar(nombre_archivo)
+        if isinstance(registro, ResultadoProcesamiento):
+            # Ya no es de este DataManager: leerlo después no cuenta como
+            # consulta reciente
+            registro.al_cargar = None
+            registro.descartar_disco()
+        return registro
+
+    def _marcar_residente(self, nombre_archivo):
+        """
+        Marcar un archivo como el más reciente en memoria y descargar a
+        disco los menos recientes que excedan max_residentes.
+
+        Args:
+            nombre_archivo: Nombre del archivo
+        """
+        self._residentes[nombre_archivo] = True
+        self._residentes.move_to_end(nombre_archivo)
+
+        while len(self._residentes) > self.max_residentes:
+            nombre, _ = self._residentes.popitem(last=False)
+            registro = self.archivos_procesados.get(nombre)
+            if isinstance(registro, ResultadoProcesamiento):
+                registro.descargar(os.path.join(self._obtener_directorio_descarga(), f"{nombre}.resultado"))
+
+    def _obtener_directorio_descarga(self):
+        """
+        Carpeta de las descargas a disco (MEMORIA_ACOTADA['DIRECTORIO'] o
+        una temporal que se borra junto con el DataManager).
+
+        Returns:
+            str: Ruta de la carpeta
+        """
+        if self._directorio_descarga is None:
+            directorio = MEMORIA_ACOTADA.get('DIRECTORIO')
+            if directorio:
+                directorio = settings.get_absolute_path(directorio)
+                os.makedirs(directorio, exist_ok=True)
+            else:
+                directorio = tempfile.mkdtemp(prefix='sumatoria_resultados_')
+                weakref.finalize(self, shutil.rmtree, directorio, True)
+            self._directorio_descarga = directorio
+        return self._directorio_descarga
+
+    def archivos_residentes(self):
+        """
+        Nombres de los archivos con sus datos en memoria (del menos al más
+        reciente). Sin límite de memoria, todos los procesados.
+
+        Returns:
+            list: Nombres de archivos
+        """
+        if self.max_residentes is None:
+            return list(self.archivos_procesados)
+        return list(self._residentes)
     
     def obtener_archivo(self, nombre_archivo):
         """
         Obtener datos de un archivo específico
         
+        Si el archivo estaba descargado a disco se vuelve a cargar y pasa a
+        ser el más reciente.
+        
         Args:
             nombre_archivo: Nombre del archivo
             
         Returns:
             dict: Datos del archivo o None si no existe
         """
-        return self.archivos_procesados.get(nombre_archivo)
+        registro = self.archivos_procesados.get(nombre_archivo)
+        if isinstance(registro, ResultadoProcesamiento) and self.max_residentes is not None:
+            registro.cargar()
+            self._marcar_residente(nombre_archivo)
+        return registro
     
     def obtener_lista_archivos(self):
         """
@@ -305,21 +611,27 @@ class DataManager:
             list: Lista de diccionarios con resumen de cada archivo
         """
         resumen = []
+        formas = dict(zip(self.cubo.nombres, self.cubo.formas))
         for nombre, datos in self.archivos_procesados.items():
-            df_numerico = datos['datos_numericos']
+            # La forma del cubo evita cargar archivos descargados a disco
+            forma = formas[nombre] if nombre in formas else datos['datos_numericos'].shape
             resumen.append({
                 'nombre': nombre,
-                'filas': df_numerico.shape[0],
-                'columnas': df_numerico.shape[1],
+                'filas': int(forma[0]),
+                'columnas': int(forma[1]),
                 'archivo_completo': datos['archivo_completo']
             })
         return resumen
     
     def limpiar_datos(self):
         """Limpiar todos los datos almacenados"""
+        for registro in self.archivos_procesados.values():
+            if isinstance(registro, ResultadoProcesamiento):
+                registro.descartar_disco()
         self.archivos_procesados.clear()
-        self.sumatoria_total = None
-        print("🗑️ Datos limpiados")
+        self._residentes.clear()
+        self.cubo.limpiar()
+        logger.debug("🗑️ Datos limpiados")
     
     def eliminar_archivo(self, nombre_archivo):
         """
@@ -332,13 +644,9 @@ class DataManager:
             bool: True si se eliminó, False si no existía
         """
         if nombre_archivo in self.archivos_procesados:
-            del self.archivos_procesados[nombre_archivo]
-            # Recalcular sumatoria si había una
-            if self.sumatoria_total is not None and len(self.archivos_procesados) > 1:
-                self.calcular_sumatoria()
-            elif len(self.archivos_procesados) <= 1:
-                self.sumatoria_total = None
-            print(f"🗑️ Archivo eliminado: {nombre_archivo}")
+            # La sumatoria se actualiza quitando solo este archivo del cubo
+            self._soltar_registro(nombre_archivo)
+            logger.debug("🗑️ Archivo eliminado: %s", nombre_archivo)
             return True
         return False
     
@@ -350,7 +658,7 @@ class DataManager:
             nuevo_rango: Diccionario con configuración del rango
         """
         self.processor.configurar_rango(nuevo_rango)
-        print(f"⚙️ Rango de extracción configurado: {nuevo_rango}")
+        logger.debug("⚙️ Rango de extracción configurado: %s", nuevo_rango)
     
     def validar_consistencia(self):
         """
@@ -362,19 +670,8 @@ class DataManager:
         if len(self.archivos_procesados) < 2:
             return {'valido': True, 'mensaje': 'Solo un archivo, no hay inconsistencias'}
         
-        # Obtener forma del primer archivo
-        primer_archivo = list(self.archivos_procesados.values())[0]
-        forma_esperada = primer_archivo['datos_numericos'].shape
-        
-        inconsistencias = []
-        for nombre, datos in self.archivos_procesados.items():
-            forma_actual = datos['datos_numericos'].shape
-            if forma_actual != forma_esperada:
-                inconsistencias.append({
-                    'archivo': nombre,
-                    'forma_esperada': forma_esperada,
-                    'forma_actual': forma_actual
-                })
+        # Formas originales guardadas en el cubo, comparadas de una vez
+        inconsistencias = self.cubo.formas_inconsistentes()
         
         if inconsistencias:
             return {
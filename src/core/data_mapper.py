@@ -13,11 +13,14 @@ CARACTERÍSTICAS:
 ✅ Extensible y testeable
 """
 
+import logging
 import pandas as pd
 from typing import Dict, List, Tuple, Any, Optional
 from ..config.settings import get_config_actual
 from ..config.table_schemas import get_table_schema
 
+logger = logging.getLogger(__name__)
+
 
 class DataMapper:
     """
@@ -31,7 +34,7 @@ class DataMapper:
         """Inicializar mapeador de datos."""
         self.config_actual = get_config_actual()
         self.modo_actual = self.config_actual.get('MODO', 'ESCUELAS')
-        print("🗺️ DataMapper inicializado")
+        logger.debug("🗺️ DataMapper inicializado")
     
     def mapear_datos_para_inyeccion(self, datos_numericos: pd.DataFrame, 
                                    rango_destino: Dict[str, int]) -> List[Tuple[int, int, Any]]:
@@ -50,14 +53,14 @@ class DataMapper:
         Returns:
             list: Lista de tuplas (fila_excel, columna_excel, valor)
         """
-        print("🗺️ Mapeando datos para inyección...")
+        logger.debug("🗺️ Mapeando datos para inyección...")
         
         datos_mapeados = []
         filas_datos, columnas_datos = datos_numericos.shape
         
-        print(f"   📊 Datos origen: {filas_datos} filas x {columnas_datos} columnas")
-        print(f"   🎯 Rango destino: fila {rango_destino['fila_inicio']}, "
-              f"columnas {rango_destino['columna_inicio']}-{rango_destino['columna_fin']}")
+        logger.debug("   📊 Datos origen: %s filas x %s columnas", filas_datos, columnas_datos)
+        logger.debug("   🎯 Rango destino: fila %s, columnas %s-%s",
+                     rango_destino['fila_inicio'], rango_destino['columna_inicio'], rango_destino['columna_fin'])
         
         # Mapear cada celda de datos a coordenadas Excel
         for fila_datos in range(filas_datos):
@@ -74,7 +77,7 @@ class DataMapper:
                     if pd.notna(valor) and valor != 0:
                         datos_mapeados.append((fila_excel, columna_excel, valor))
         
-        print(f"✅ Mapeo completado: {len(datos_mapeados)} valores mapeados")
+        logger.debug("✅ Mapeo completado: %s valores mapeados", len(datos_mapeados))
         return datos_mapeados
     
     def mapear_con_esquema_dinamico(self, datos_numericos: pd.DataFrame, 
@@ -89,7 +92,7 @@ class DataMapper:
         Returns:
             list: Lista de tuplas (fila_excel, columna_excel, valor)
         """
-        print("🗺️ Mapeando con esquema dinámico...")
+        logger.debug("🗺️ Mapeando con esquema dinámico...")
         
         # Determinar esquema a usar
         if esquema_nombre is None:
@@ -115,19 +118,19 @@ class DataMapper:
             # Verificar si hay configuración de celdas combinadas
             celdas_combinadas = config_inyeccion.get('celdas_combinadas', {})
             if celdas_combinadas.get('X_Z_combinadas', False):
-                print("🔗 Detectadas celdas combinadas X-Z, ajustando mapeo...")
+                logger.debug("🔗 Detectadas celdas combinadas X-Z, ajustando mapeo...")
                 # Para celdas combinadas X-Z, solo mapear hasta columna Y (25)
                 config_inyeccion['columna_fin'] = 25  # Columna Y
             
-            print(f"   📋 Usando esquema: {esquema_nombre}")
-            print(f"   ⚙️ Configuración: {config_inyeccion}")
+            logger.debug("   📋 Usando esquema: %s", esquema_nombre)
+            logger.debug("   ⚙️ Configuración: %s", config_inyeccion)
             
             # Mapear usando configuración del esquema
             return self.mapear_datos_para_inyeccion(datos_numericos, config_inyeccion)
             
         except Exception as e:
-            print(f"⚠️ Error con esquema dinámico: {e}")
-            print("🔄 Usando configuración por defecto...")
+            logger.warning("⚠️ Error con esquema dinámico: %s", e)
+            logger.debug("🔄 Usando configuración por defecto...")
             
             # Fallback a configuración por defecto
             config_default = {
@@ -147,7 +150,7 @@ class DataMapper:
         Returns:
             list: Lista de tuplas (fila_excel, columna_excel, valor)
         """
-        print("🗺️ Mapeando sumatoria total...")
+        logger.debug("🗺️ Mapeando sumatoria total...")
         
         # Usar esquema dinámico para sumatoria
         return self.mapear_con_esquema_dinamico(datos_sumatoria)
@@ -13,9 +13,161 @@ PRINCIPIOS:
 ✅ Configurable: usa esquemas dinámicos
 """
 
+import logging
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple, Optional, Any
+from collections.abc import Mapping
+from typing import Dict, List, Tuple, Optional, Any, Iterator
+
+logger = logging.getLogger(__name__)
+
+
+# 🏷️ Códigos de clasificación de celdas
+CELDA_VALOR = 0
+CELDA_VACIA = 1
+CELDA_MARCADOR = 2
+
+
+def _codigo_celda(valor: Any) -> int:
+    """Código de una celda: vacía (None o en blanco), marcador "[...]" o valor."""
+    if valor is None:
+        return CELDA_VACIA
+    if isinstance(valor, str):
+        if valor.startswith('[') and valor.endswith(']'):
+            return CELDA_MARCADOR
+        if valor.strip() == '':
+            return CELDA_VACIA
+        return CELDA_VALOR
+    return CELDA_VACIA if str(valor).strip() == '' else CELDA_VALOR
+
+
+_CLASIFICAR_CELDA = np.frompyfunc(_codigo_celda, 1, 1)
+
+
+def _valor_numerico(valor: Any) -> float:
+    """
+    Valor de una celda para la matriz numérica.
+
+    Vacías y marcadores "[...]" valen 0; números y textos numéricos ("14")
+    su valor; cualquier otro contenido devuelve NaN (celda no numérica).
+    """
+    if valor is None:
+        return 0.0
+    if isinstance(valor, str):
+        valor_limpio = valor.strip()
+        if valor_limpio == '' or (valor_limpio.startswith('[') and valor_limpio.endswith(']')):
+            return 0.0
+        try:
+            return float(valor_limpio)
+        except ValueError:
+            return np.nan
+    if isinstance(valor, (int, float, np.number)):
+        return 0.0 if pd.isna(valor) else float(valor)
+    return np.nan
+
+
+_VALOR_NUMERICO = np.frompyfunc(_valor_numerico, 1, 1)
+
+
+# 🏷️ Tipos de valor del mapeo posicional (el código es el índice en la tupla)
+TIPOS_MAPEO = ('vacio', 'numero', 'numero_string', 'marcador', 'texto', 'desconocido')
+_CODIGO_TIPO = {tipo: codigo for codigo, tipo in enumerate(TIPOS_MAPEO)}
+
+
+def _codigo_tipo(valor: Any) -> int:
+    """Código de TIPOS_MAPEO para un valor, con las reglas de _clasificar_valor."""
+    if valor is None or valor == '' or (not isinstance(valor, str) and pd.isna(valor)):
+        return _CODIGO_TIPO['vacio']
+    if isinstance(valor, (int, float, np.number)):
+        return _CODIGO_TIPO['numero']
+    if isinstance(valor, str):
+        if valor.startswith('[') and valor.endswith(']'):
+            return _CODIGO_TIPO['marcador']
+        try:
+            float(valor)
+            return _CODIGO_TIPO['numero_string']
+        except ValueError:
+            return _CODIGO_TIPO['texto']
+    return _CODIGO_TIPO['desconocido']
+
+
+_CLASIFICAR_TIPO = np.frompyfunc(_codigo_tipo, 1, 1)
+
+# 📦 Salidas de transformar_fusionado(): todas (interfaz gráfica) o solo las
+# que necesitan validación, sumatoria y exportación (lotes sin interfaz)
+SALIDAS_COMPLETAS = ('datos_crudos', 'datos_combinados', 'datos_numericos', 'mapeo_posicional')
+SALIDAS_LOTE = ('datos_crudos', 'datos_numericos')
+
+
+class MapeoPosicional(Mapping):
+    """
+    Mapeo posicional compacto del rango numérico.
+
+    Guarda tres arreglos paralelos (valores originales, valores numéricos y
+    código de tipo uint8) en lugar de un diccionario por celda. Se comporta
+    como el diccionario original: mapeo[(fila, columna)] devuelve
+    {'valor_original', 'valor_numerico', 'tipo'}, construido al consultarlo.
+    """
+
+    def __init__(self, fila_inicio: int, columna_inicio: int, valores_originales: np.ndarray,
+                 valores_numericos: np.ndarray, tipos: np.ndarray):
+        """
+        Inicializar mapeo.
+
+        Args:
+            fila_inicio: Fila de los datos que corresponde a la fila 0 de los arreglos
+            columna_inicio: Columna de los datos que corresponde a la columna 0
+            valores_originales: Arreglo de objetos con los valores de las celdas
+            valores_numericos: Arreglo int64/float64 de la misma forma
+            tipos: Arreglo uint8 con índices de TIPOS_MAPEO
+        """
+        for arreglo in (valores_originales, valores_numericos, tipos):
+            arreglo.flags.writeable = False
+
+        self.fila_inicio = fila_inicio
+        self.columna_inicio = columna_inicio
+        self.valores_originales = valores_originales
+        self.valores_numericos = valores_numericos
+        self.tipos = tipos
+
+    def _posicion(self, clave: Any) -> Optional[Tuple[int, int]]:
+        """Convertir una clave (fila, columna) a índices de los arreglos, o None."""
+        try:
+            fila, columna = clave
+        except (TypeError, ValueError):
+            return None
+        i, j = fila - self.fila_inicio, columna - self.columna_inicio
+        filas, columnas = self.tipos.shape
+        if 0 <= i < filas and 0 <= j < columnas:
+            return i, j
+        return None
+
+    def __getitem__(self, clave: Tuple[int, int]) -> Dict[str, Any]:
+        posicion = self._posicion(clave)
+        if posicion is None:
+            raise KeyError(clave)
+        return {
+            'valor_original': self.valores_originales[posicion],
+            'valor_numerico': self.valores_numericos[posicion].item(),
+            'tipo': TIPOS_MAPEO[self.tipos[posicion]]
+        }
+
+    def __contains__(self, clave: Any) -> bool:
+        return self._posicion(clave) is not None
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        filas, columnas = self.tipos.shape
+        for i in range(self.fila_inicio, self.fila_inicio + filas):
+            for j in range(self.columna_inicio, self.columna_inicio + columnas):
+                yield (i, j)
+
+    def __len__(self) -> int:
+        return self.tipos.size
+
+    def copy(self) -> 'MapeoPosicional':
+        """Copia superficial: los arreglos son de solo lectura y se comparten."""
+        return MapeoPosicional(self.fila_inicio, self.columna_inicio, self.valores_originales,
+                               self.valores_numericos, self.tipos)
 
 
 class DataTransformer:
@@ -27,82 +179,141 @@ class DataTransformer:
     
     def __init__(self):
         """Inicializar transformador."""
-        print("🔄 DataTransformer inicializado")
+        logger.debug("🔄 DataTransformer inicializado")
     
-    def crear_marcadores_combinadas(self, datos: pd.DataFrame, celdas_combinadas: List[Tuple]) -> pd.DataFrame:
+    def crear_marcadores_combinadas(self, datos: pd.DataFrame, celdas_combinadas: List[Tuple],
+                                    devolver_mascara: bool = False):
         """
         Crear marcadores [valor] para celdas combinadas.
         
         Args:
             datos: DataFrame con datos raw
             celdas_combinadas: Lista de tuplas con rangos combinados
+            devolver_mascara: Si True, devuelve también la máscara de marcadores
+                              para reutilizarla en crear_vista_combinada()
             
         Returns:
-            DataFrame con marcadores [valor] en celdas combinadas
+            DataFrame con marcadores [valor] en celdas combinadas, o tupla
+            (DataFrame, máscara booleana) si devolver_mascara es True
         """
-        print("🔄 Creando marcadores para celdas combinadas...")
+        logger.debug("🔄 Creando marcadores para celdas combinadas...")
         
-        # Crear copia para no modificar original
-        datos_marcados = datos.copy()
+        # Trabajar sobre una copia NumPy para no modificar el original
+        valores = datos.to_numpy(dtype=object, copy=True)
+        codigos = self._clasificar_celdas(valores)
+        mascara_marcadores = self._aplicar_marcadores(valores, codigos == CELDA_VACIA, celdas_combinadas)
+        datos_marcados = self._reconstruir_dataframe(valores, datos)
         
-        # Procesar cada celda combinada
-        for celda in celdas_combinadas:
-            min_row, min_col, max_row, max_col = celda
-
-            # Obtener valor original de la celda principal
-            if min_row < len(datos_marcados) and min_col < len(datos_marcados.columns):
-                valor_original = datos_marcados.iloc[min_row, min_col]
-
-                # Solo marcar si el valor original no está vacío
-                if valor_original is not None and str(valor_original).strip() != '':
-                    # Marcar celdas secundarias con [valor]
-                    for fila in range(min_row, max_row + 1):
-                        for col in range(min_col, max_col + 1):
-                            if fila < len(datos_marcados) and col < len(datos_marcados.columns):
-                                if fila == min_row and col == min_col:
-                                    # Celda principal: mantener valor original
-                                    continue
-                                else:
-                                    # Celdas secundarias: marcar con [valor] solo si no está vacía
-                                    celda_actual = datos_marcados.iloc[fila, col]
-                                    if celda_actual is None or str(celda_actual).strip() == '':
-                                        datos_marcados.iloc[fila, col] = f"[{valor_original}]"
-        
-        print(f"✅ Marcadores creados para {len(celdas_combinadas)} celdas combinadas")
+        logger.debug("✅ Marcadores creados para %s celdas combinadas", len(celdas_combinadas))
+        if devolver_mascara:
+            # Incluir también textos "[...]" que ya venían en el archivo
+            return datos_marcados, mascara_marcadores | (codigos == CELDA_MARCADOR)
         return datos_marcados
+
+    @staticmethod
+    def _clasificar_celdas(valores: np.ndarray) -> np.ndarray:
+        """
+        Clasificar cada celda en una sola pasada.
+
+        Args:
+            valores: Arreglo de objetos
+
+        Returns:
+            Arreglo uint8 con CELDA_VALOR, CELDA_VACIA o CELDA_MARCADOR
+        """
+        if valores.size == 0:
+            return np.zeros(valores.shape, dtype=np.uint8)
+        return _CLASIFICAR_CELDA(valores).astype(np.uint8)
+
+    @staticmethod
+    def _reconstruir_dataframe(valores: np.ndarray, referencia: pd.DataFrame) -> pd.DataFrame:
+        """
+        Crear un DataFrame en un solo bloque con los dtypes de otro.
+
+        Args:
+            valores: Arreglo de objetos
+            referencia: DataFrame del que se copian índice, columnas y dtypes
+
+        Returns:
+            DataFrame nuevo
+        """
+        resultado = pd.DataFrame(valores, index=referencia.index, columns=referencia.columns, dtype=object)
+        for j, tipo in enumerate(referencia.dtypes):
+            if tipo != object:
+                resultado.isetitem(j, pd.array(valores[:, j], dtype=tipo))
+        return resultado
+
+    def _aplicar_marcadores(self, valores: np.ndarray, vacias: np.ndarray,
+                            celdas_combinadas: List[Tuple]) -> np.ndarray:
+        """
+        Escribir marcadores [valor] en las celdas secundarias de cada rango combinado.
+
+        Cada rango se resuelve con una máscara booleana sobre su bloque:
+        celdas vacías, excepto la celda principal. Los rangos combinados de
+        Excel no se superponen, así que la máscara de vacías se calcula una
+        sola vez.
+
+        Args:
+            valores: Arreglo de objetos (se modifica en el lugar)
+            vacias: Máscara de celdas vacías
+            celdas_combinadas: Lista de tuplas (min_row, min_col, max_row, max_col) relativas
+
+        Returns:
+            Máscara booleana de las celdas marcadas
+        """
+        filas, columnas = valores.shape
+        mascara_marcadores = np.zeros((filas, columnas), dtype=bool)
+
+        for min_row, min_col, max_row, max_col in celdas_combinadas:
+            if min_row >= filas or min_col >= columnas or vacias[min_row, min_col]:
+                continue
+
+            bloque = (slice(min_row, max_row + 1), slice(min_col, max_col + 1))
+            marcar = vacias[bloque].copy()
+            marcar[0, 0] = False
+
+            valores[bloque][marcar] = f"[{valores[min_row, min_col]}]"
+            mascara_marcadores[bloque] |= marcar
+
+        return mascara_marcadores
     
-    def crear_vista_combinada(self, datos_marcados: pd.DataFrame) -> pd.DataFrame:
+    def crear_vista_combinada(self, datos_marcados: pd.DataFrame,
+                              mascara_marcadores: Optional[np.ndarray] = None) -> pd.DataFrame:
         """
         Crear vista combinada revirtiendo marcadores [valor].
         
         Args:
             datos_marcados: DataFrame con marcadores [valor]
+            mascara_marcadores: Máscara devuelta por crear_marcadores_combinadas().
+                                Si None, se calcula recorriendo la tabla.
             
         Returns:
             DataFrame con vista Excel original (sin marcadores)
         """
-        print("🔄 Creando vista combinada (revirtiendo marcadores)...")
-        
-        # Crear copia
-        vista_combinada = datos_marcados.copy()
+        logger.debug("🔄 Creando vista combinada (revirtiendo marcadores)...")
         
-        # Revertir marcadores - LÓGICA EXACTA DEL ORIGINAL
-        for i in range(len(vista_combinada)):
-            for j in range(len(vista_combinada.columns)):
-                valor = vista_combinada.iloc[i, j]
-
-                if isinstance(valor, str) and valor.startswith('[') and valor.endswith(']'):
-                    # COMPORTAMIENTO ORIGINAL: Celdas con marcadores se convierten en vacías
-                    # El original NO rellena con el valor, las deja vacías para simular Excel
-                    vista_combinada.iloc[i, j] = ''
+        valores = datos_marcados.to_numpy(dtype=object, copy=True)
+        if mascara_marcadores is None:
+            mascara_marcadores = self._clasificar_celdas(valores) == CELDA_MARCADOR
+
+        # COMPORTAMIENTO ORIGINAL: Celdas con marcadores se convierten en vacías
+        # El original NO rellena con el valor, las deja vacías para simular Excel
+        valores[mascara_marcadores] = ''
+        vista_combinada = self._reconstruir_dataframe(valores, datos_marcados)
         
-        print("✅ Vista combinada creada")
+        logger.debug("✅ Vista combinada creada")
         return vista_combinada
     
-    def extraer_datos_numericos(self, datos: pd.DataFrame, rango_numerico: Dict[str, int]) -> pd.DataFrame:
+    def extraer_datos_numericos(self, datos: pd.DataFrame, rango_numerico: Dict[str, int],
+                                devolver_mascara: bool = False):
         """
         Extraer solo datos numéricos de un rango específico.
         
+        El resultado es una matriz tipada: int64 si todos los valores son
+        enteros, float64 si alguno tiene decimales. Las celdas vacías, los
+        marcadores y el texto no numérico valen 0; el texto no numérico
+        queda señalado en la máscara.
+        
         Args:
             datos: DataFrame con datos (puede tener marcadores)
             rango_numerico: Diccionario con coordenadas del rango numérico
@@ -112,44 +323,189 @@ class DataTransformer:
                     'columnas_inicio': 7,
                     'columnas_fin': 25
                 }
+            devolver_mascara: Si True, devolver también la máscara de
+                celdas no numéricas
                 
         Returns:
-            DataFrame solo con datos numéricos
+            Tupla (DataFrame numérico, mapeo posicional) o
+            (DataFrame numérico, mapeo posicional, máscara no numérica)
         """
-        print("🔢 Extrayendo datos numéricos...")
-        
-        datos_numericos = []
-        mapeo_posicional = {}
+        logger.debug("🔢 Extrayendo datos numéricos...")
         
-        # Extraer rango especificado
-        for i in range(rango_numerico['filas_inicio'], rango_numerico['filas_fin'] + 1):
-            if i < len(datos):
-                fila_numerica = []
-                
-                for j in range(rango_numerico['columnas_inicio'], rango_numerico['columnas_fin'] + 1):
-                    if j < len(datos.columns):
-                        valor_original = datos.iloc[i, j]
-                        
-                        # Convertir a número
-                        valor_numerico = self._convertir_a_numero(valor_original)
-                        fila_numerica.append(valor_numerico)
-                        
-                        # Guardar mapeo posicional
-                        mapeo_posicional[(i, j)] = {
-                            'valor_original': valor_original,
-                            'valor_numerico': valor_numerico,
-                            'tipo': self._clasificar_valor(valor_original)
-                        }
-                    else:
-                        fila_numerica.append(0.0)
-                
-                datos_numericos.append(fila_numerica)
+        matriz, mascara_no_numerica = self.extraer_matriz_numerica(datos, rango_numerico)
+        df_numericos = pd.DataFrame(matriz)
+        mapeo_posicional = self.generar_mapeo_posicional(datos, rango_numerico, matriz)
         
-        df_numericos = pd.DataFrame(datos_numericos)
+        if mascara_no_numerica.any():
+            logger.warning("⚠️ Celdas no numéricas en el rango: %s", int(mascara_no_numerica.sum()))
         
-        print(f"✅ Datos numéricos extraídos: {df_numericos.shape}")
+        logger.debug("✅ Datos numéricos extraídos: %s", df_numericos.shape)
+        if devolver_mascara:
+            return df_numericos, mapeo_posicional, mascara_no_numerica
         return df_numericos, mapeo_posicional
     
+    def extraer_matriz_numerica(self, datos: pd.DataFrame,
+                                rango_numerico: Dict[str, int]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Convertir el rango numérico a una matriz int64/float64 contigua.
+
+        Las filas fuera de los datos se omiten y las columnas fuera de los
+        datos se rellenan con 0, igual que en la extracción original.
+
+        Args:
+            datos: DataFrame con datos (puede tener marcadores)
+            rango_numerico: Diccionario con coordenadas del rango numérico
+
+        Returns:
+            Tupla (matriz numérica, máscara booleana de celdas no numéricas)
+        """
+        filas, columnas, ancho = self._limites_rango(datos.shape, rango_numerico)
+        bloque = datos.iloc[filas, columnas].to_numpy(dtype=object)
+        return self._matriz_desde_bloque(bloque, ancho)
+    
+    def generar_mapeo_posicional(self, datos: pd.DataFrame, rango_numerico: Dict[str, int],
+                                 matriz_numerica: Optional[np.ndarray] = None) -> MapeoPosicional:
+        """
+        Generar solo el mapeo posicional del rango numérico.
+
+        Útil cuando los datos numéricos ya están disponibles (ej. desde caché).
+        Solo se incluyen las celdas que existen en los datos.
+
+        Args:
+            datos: DataFrame con datos (puede tener marcadores)
+            rango_numerico: Diccionario con coordenadas del rango numérico
+            matriz_numerica: Matriz de extraer_matriz_numerica(), si ya se calculó
+
+        Returns:
+            MapeoPosicional {(fila, columna): {valor_original, valor_numerico, tipo}}
+        """
+        filas, columnas, ancho = self._limites_rango(datos.shape, rango_numerico)
+        bloque = datos.iloc[filas, columnas].to_numpy(dtype=object)
+        if matriz_numerica is None:
+            matriz_numerica, _ = self._matriz_desde_bloque(bloque, ancho)
+        return self._mapeo_desde_bloque(bloque, filas.start, columnas.start, matriz_numerica)
+
+    @staticmethod
+    def _limites_rango(forma: Tuple[int, int], rango_numerico: Dict[str, int]) -> Tuple[slice, slice, int]:
+        """
+        Recortar el rango numérico a la forma de los datos.
+
+        Args:
+            forma: (filas, columnas) de los datos
+            rango_numerico: Diccionario con coordenadas del rango numérico
+
+        Returns:
+            Tupla (slice de filas, slice de columnas existentes, ancho pedido)
+        """
+        fila_inicio = rango_numerico['filas_inicio']
+        columna_inicio = rango_numerico['columnas_inicio']
+        fila_fin = max(min(rango_numerico['filas_fin'] + 1, forma[0]), fila_inicio)
+        ancho = max(rango_numerico['columnas_fin'] + 1 - columna_inicio, 0)
+        columna_fin = max(min(columna_inicio + ancho, forma[1]), columna_inicio)
+        return slice(fila_inicio, fila_fin), slice(columna_inicio, columna_fin), ancho
+
+    @staticmethod
+    def _matriz_desde_bloque(bloque: np.ndarray, ancho: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Convertir un bloque de objetos a matriz numérica de `ancho` columnas.
+
+        Args:
+            bloque: Arreglo de objetos del rango (columnas existentes)
+            ancho: Columnas pedidas; las que faltan se rellenan con 0
+
+        Returns:
+            Tupla (matriz int64/float64, máscara de celdas no numéricas)
+        """
+        valores = np.zeros((bloque.shape[0], ancho), dtype=np.float64)
+        if bloque.size:
+            valores[:, :bloque.shape[1]] = _VALOR_NUMERICO(bloque).astype(np.float64)
+
+        mascara_no_numerica = np.isnan(valores)
+        valores[mascara_no_numerica] = 0.0
+
+        # Enteros exactos como int64; cualquier decimal mantiene float64
+        if np.isfinite(valores).all() and (valores == np.trunc(valores)).all():
+            return valores.astype(np.int64), mascara_no_numerica
+        return valores, mascara_no_numerica
+
+    @staticmethod
+    def _mapeo_desde_bloque(bloque: np.ndarray, fila_inicio: int, columna_inicio: int,
+                            matriz_numerica: np.ndarray) -> MapeoPosicional:
+        """
+        Construir el MapeoPosicional de un bloque de objetos.
+
+        Args:
+            bloque: Arreglo de objetos del rango (columnas existentes)
+            fila_inicio: Fila de los datos donde empieza el bloque
+            columna_inicio: Columna de los datos donde empieza el bloque
+            matriz_numerica: Matriz numérica del mismo rango
+
+        Returns:
+            MapeoPosicional con una copia propia de los valores
+        """
+        valores_originales = np.array(bloque, dtype=object, copy=True)
+        if valores_originales.size:
+            tipos = _CLASIFICAR_TIPO(valores_originales).astype(np.uint8)
+        else:
+            tipos = np.zeros(valores_originales.shape, dtype=np.uint8)
+
+        filas, columnas = valores_originales.shape
+        return MapeoPosicional(fila_inicio, columna_inicio, valores_originales,
+                               matriz_numerica[:filas, :columnas], tipos)
+
+    def transformar_fusionado(self, datos: pd.DataFrame, celdas_combinadas: List[Tuple],
+                              rango_numerico: Dict[str, int],
+                              salidas: Tuple[str, ...] = SALIDAS_COMPLETAS) -> Dict[str, Any]:
+        """
+        Producir marcadores, vista combinada, datos numéricos y mapeo en una sola pasada.
+
+        Equivale a crear_marcadores_combinadas() + crear_vista_combinada() +
+        extraer_datos_numericos(), pero convierte y clasifica la tabla una
+        sola vez y solo construye las salidas pedidas.
+
+        Args:
+            datos: DataFrame con datos raw
+            celdas_combinadas: Lista de tuplas con rangos combinados
+            rango_numerico: Diccionario con coordenadas del rango numérico
+            salidas: Claves a producir (subconjunto de SALIDAS_COMPLETAS)
+
+        Returns:
+            Diccionario con las salidas pedidas
+        """
+        desconocidas = set(salidas) - set(SALIDAS_COMPLETAS)
+        if desconocidas:
+            raise ValueError(f"Salidas no soportadas: {sorted(desconocidas)}")
+
+        logger.debug("🔄 Transformación en una pasada: %s", ', '.join(salidas))
+
+        valores = datos.to_numpy(dtype=object, copy=True)
+        codigos = self._clasificar_celdas(valores)
+        mascara_marcadores = self._aplicar_marcadores(valores, codigos == CELDA_VACIA, celdas_combinadas)
+
+        resultado = {}
+        if 'datos_crudos' in salidas:
+            resultado['datos_crudos'] = self._reconstruir_dataframe(valores, datos)
+
+        if 'datos_combinados' in salidas:
+            vista = valores.copy()
+            vista[mascara_marcadores | (codigos == CELDA_MARCADOR)] = ''
+            resultado['datos_combinados'] = self._reconstruir_dataframe(vista, datos)
+
+        if 'datos_numericos' in salidas or 'mapeo_posicional' in salidas:
+            filas, columnas, ancho = self._limites_rango(valores.shape, rango_numerico)
+            bloque = valores[filas, columnas]
+            matriz, mascara_no_numerica = self._matriz_desde_bloque(bloque, ancho)
+
+            if 'datos_numericos' in salidas:
+                resultado['datos_numericos'] = pd.DataFrame(matriz)
+                if mascara_no_numerica.any():
+                    logger.warning("⚠️ Celdas no numéricas en el rango: %s", int(mascara_no_numerica.sum()))
+            if 'mapeo_posicional' in salidas:
+                resultado['mapeo_posicional'] = self._mapeo_desde_bloque(bloque, filas.start, columnas.start, matriz)
+
+        logger.debug("✅ Transformación completada")
+        return resultado
+    
     def normalizar_estructura(self, datos: pd.DataFrame, esquema: Dict) -> Dict[str, Any]:
         """
         Normalizar datos según un esquema específico.
@@ -172,7 +528,7 @@ class DataTransformer:
         Returns:
             Diccionario con datos normalizados
         """
-        print("🔄 Normalizando estructura de datos...")
+        logger.debug("🔄 Normalizando estructura de datos...")
         
         estructura_normalizada = {
             'datos_por_concepto': {},
@@ -202,7 +558,7 @@ class DataTransformer:
                     estructura_normalizada['datos_por_grado'][grado] = datos.iloc[:, col_grado].tolist()
                     estructura_normalizada['metadatos']['grados_detectados'].append(grado)
         
-        print("✅ Estructura normalizada")
+        logger.debug("✅ Estructura normalizada")
         return estructura_normalizada
     
     def crear_tabla_pivote(self, datos: pd.DataFrame, config_pivot: Dict) -> pd.DataFrame:
@@ -222,14 +578,14 @@ class DataTransformer:
         Returns:
             DataFrame pivoteado
         """
-        print("🔄 Creando tabla pivote...")
+        logger.debug("🔄 Creando tabla pivote...")
         
         # Esta es una implementación básica
         # Se puede extender según necesidades específicas
         
         tabla_pivote = datos.copy()
         
-        print("✅ Tabla pivote creada")
+        logger.debug("✅ Tabla pivote creada")
         return tabla_pivote
     
     def _convertir_a_numero(self, valor: Any):
@@ -317,7 +673,7 @@ class DataTransformer:
         Returns:
             Mapeo completo para trazabilidad
         """
-        print("🗺️ Generando mapeo completo...")
+        logger.debug("🗺️ Generando mapeo completo...")
         
         mapeo = {
             'dimensiones_originales': datos_originales.shape,
@@ -338,5 +694,5 @@ class DataTransformer:
                     'procesado': True
                 }
         
-        print("✅ Mapeo completo generado")
+        logger.debug("✅ Mapeo completo generado")
         return mapeo
@@ -8,8 +8,12 @@ Detecta discrepancias en cálculos manuales sin ser invasivo.
 FUNCIONALIDADES:
 ✅ Validación de subtotales y totales
 ✅ Verificación de coherencia entre filas (Existencia = Inscripción - Bajas)
+✅ Validación cruzada ESC1 vs ESC2: alumnos y grupos por grado y género
 ✅ Detección automática de estructura de tabla
+✅ Validación de lotes: todos los archivos de una zona en una sola pasada
+✅ Reglas adicionales del esquema (table_schemas) compiladas a evaluadores vectorizados
 ✅ Reportes de discrepancias no invasivos
+✅ Resultados compactos: las descripciones se generan solo al consultarlas
 
 FILOSOFÍA:
 🎯 Solo alertar, nunca modificar
@@ -18,11 +22,64 @@ FILOSOFÍA:
 🔄 Integración transparente con el flujo existente
 """
 
+import logging
+import re
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, NamedTuple, Tuple, Optional, Sequence
 from ..config.settings import get_config_actual
 from ..config.table_schemas import get_table_schema
+from .compilador_reglas import reglas_de_esquema
+from .registros_validacion import RegistrosValidacion, id_regla
+
+logger = logging.getLogger(__name__)
+
+# Desfase entre la tabla completa (datos_crudos) y la matriz numérica
+_OFFSET_FILA_NUMERICA = 3
+_OFFSET_COLUMNA_NUMERICA = 7
+
+# Distribuciones de tabla distintas que se recuerdan (ver _huella_tabla)
+_MAX_ESTRUCTURAS_CACHE = 64
+
+# Reglas del esquema que las validaciones integradas ya comprueban (con la
+# estructura detectada en los encabezados); el resto se compila y se evalúa aparte
+_REGLAS_INTEGRADAS = ('subtotales_H', 'subtotales_M', 'totales', 'coherencia.EXISTENCIA')
+
+# Listado de grupos de ESC1: encabezado de la columna de grupo y etiqueta "1°A"
+_ENCABEZADO_GRUPO = 'GPO.'
+_PATRON_GRUPO = r'^(\d+)\s*°?\s*[A-Z]{1,2}$'
+_TOLERANCIA_CRUZADA = 0.01  # diferencia máxima para que ESC1 y ESC2 coincidan
+
+# Clases de celda de un datos_numericos de tipo object. Las sumas de subtotales
+# leen cada celda con float(): las que no lo admiten no son sumandos, y si el
+# subtotal reportado no es legible la comprobación no se hace
+_CELDA_NUMERO = 0          # número o texto numérico
+_CELDA_VACIA = 1           # None/NaN: vale 0
+_CELDA_EN_BLANCO = 2       # '': sumando 0, subtotal no legible
+_CELDA_MARCADOR = 3        # '[v]': subtotal v, no es sumando
+_CELDA_MARCADOR_VACIO = 4  # '[]': subtotal 0, no es sumando
+_CELDA_TEXTO = 5           # no numérica: ni sumando ni subtotal
+_NO_SUMANDO = (_CELDA_MARCADOR, _CELDA_MARCADOR_VACIO, _CELDA_TEXTO)
+_NO_SUBTOTAL = (_CELDA_EN_BLANCO, _CELDA_TEXTO)
+_CERO_ENTERO = (_CELDA_VACIA, _CELDA_EN_BLANCO, _CELDA_MARCADOR_VACIO)  # se muestran como "0"
+
+# Columnas de la tabla de discrepancias de validar_lote
+COLUMNAS_LOTE = ('archivo', 'tipo', 'concepto', 'columna', 'esperado', 'reportado')
+
+
+class _BloqueTotales(NamedTuple):
+    """Comprobaciones de una regla de totales para varios conceptos (ver _validar_totales)."""
+    regla: str
+    conceptos: np.ndarray        # Índices en indices['filas']
+    columna: int                 # Columna de la matriz (-1 si no aplica)
+    esperado: np.ndarray
+    reportado: np.ndarray
+    siempre_discrepa: bool = False
+    orden: int = 0               # Posición del bloque dentro de cada concepto
+
+    @property
+    def regla_id(self) -> int:
+        return id_regla(self.regla)
 
 
 class DataValidator:
@@ -31,21 +88,28 @@ class DataValidator:
     
     Detecta automáticamente la estructura y valida cálculos internos.
     """
+
+    # 🗂️ Estructuras detectadas por huella de encabezados (compartidas entre instancias)
+    _cache_estructuras = {}
     
     def __init__(self):
         """Inicializar validador de datos con configuración modular."""
-        self.discrepancias = []
-        self.validaciones_exitosas = []
+        self.discrepancias = RegistrosValidacion(exito=False)
+        self.validaciones_exitosas = RegistrosValidacion(exito=True)
         self.estructura_detectada = {}
+        self._indices = {'filas': [], 'datos': [], 'subtotales': [], 'totales': []}
+        self._indices_cache = {}
+        self._reglas_cache = {}
 
         # Configuración dinámica
         self.config_actual = get_config_actual()
         self.modo_actual = self.config_actual.get('MODO', 'ESCUELAS')
 
         # Cargar esquema de validación según el modo
+        self.nombre_esquema = None
         self.esquema_validacion = self._cargar_esquema_validacion()
 
-        print(f"🔍 DataValidator inicializado - Modo: {self.modo_actual}")
+        logger.debug("🔍 DataValidator inicializado - Modo: %s", self.modo_actual)
 
     def _cargar_esquema_validacion(self):
         """
@@ -56,20 +120,22 @@ class DataValidator:
         """
         try:
             if self.modo_actual == 'ESCUELAS':
-                esquema = get_table_schema("ESC2_MOVIMIENTOS")
+                nombre = "ESC2_MOVIMIENTOS"
             elif self.modo_actual == 'ZONAS':
-                esquema = get_table_schema("ZONA3_MOVIMIENTOS")
+                nombre = "ZONA3_MOVIMIENTOS"
             else:
-                esquema = get_table_schema("ESC2_MOVIMIENTOS")  # Fallback
+                nombre = "ESC2_MOVIMIENTOS"  # Fallback
+            esquema = get_table_schema(nombre)
 
             # Extraer reglas de validación del esquema
             validaciones = esquema.get('validaciones', {})
+            self.nombre_esquema = nombre
 
-            print(f"✅ Esquema de validación cargado para {self.modo_actual}")
+            logger.debug("✅ Esquema de validación cargado para %s", self.modo_actual)
             return validaciones
 
         except Exception as e:
-            print(f"⚠️ Error cargando esquema de validación: {e}")
+            logger.warning("⚠️ Error cargando esquema de validación: %s", e)
             # Fallback a validaciones por defecto
             return {
                 'subtotales': True,
@@ -92,7 +158,7 @@ class DataValidator:
         Returns:
             dict: Reporte de validación completo con validaciones cruzadas
         """
-        print("🔍 Iniciando validación de múltiples hojas...")
+        logger.debug("🔍 Iniciando validación de múltiples hojas...")
 
         reporte_completo = {
             'validaciones_por_hoja': {},
@@ -104,10 +170,11 @@ class DataValidator:
             }
         }
 
-        # Validar cada hoja individualmente
+        # Validar cada hoja individualmente (el listado de grupos de ESC1 solo
+        # participa en las validaciones cruzadas)
         for nombre_hoja, datos_hoja in datos_hojas.items():
-            if 'error' not in datos_hoja:
-                print(f"🔍 Validando hoja: {nombre_hoja}")
+            if 'error' not in datos_hoja and datos_hoja.get('tipo') != 'grupos':
+                logger.debug("🔍 Validando hoja: %s", nombre_hoja)
 
                 reporte_hoja = self.validar_tabla_completa(
                     datos_hoja['datos_numericos'],
@@ -119,42 +186,186 @@ class DataValidator:
                 reporte_completo['resumen']['total_discrepancias'] += len(reporte_hoja.get('discrepancias', []))
                 reporte_completo['resumen']['validaciones_exitosas'] += len(reporte_hoja.get('validaciones_exitosas', []))
 
-        # Validaciones cruzadas (preparado para ESC1 vs ESC2)
+        # Validaciones cruzadas ESC1 vs ESC2
         if len(datos_hojas) > 1:
-            reporte_completo['validaciones_cruzadas'] = self._validar_coherencia_cruzada(datos_hojas)
-
-        print(f"✅ Validación múltiples hojas completada: {reporte_completo['resumen']}")
+            cruzadas = self._validar_coherencia_cruzada(datos_hojas)
+            reporte_completo['validaciones_cruzadas'] = cruzadas
+            reporte_completo['resumen']['discrepancias_cruzadas'] = sum(
+                1 for clave in ('coherencia_grupos_movimientos', 'consistencia_totales')
+                for comparacion in cruzadas[clave] if not comparacion['coincide']
+            )
+
+        logger.info("✅ Validación múltiples hojas completada: %s", reporte_completo['resumen'])
         return reporte_completo
 
     def _validar_coherencia_cruzada(self, datos_hojas):
         """
         Validar coherencia entre múltiples hojas (ESC1 vs ESC2).
 
+        Los alumnos de los grupos de ESC1 se suman por grado y género y se
+        comparan con la EXISTENCIA de ESC2; el número de grupos de cada
+        grado, con la fila GRUPOS. Ambas hojas se reducen a arreglos
+        alineados por grado y se comparan de una vez.
+
         Args:
             datos_hojas: Dict con datos de múltiples hojas
 
         Returns:
-            dict: Resultados de validaciones cruzadas
+            dict: {'coherencia_grupos_movimientos': [comparación por grado y género],
+                   'consistencia_totales': [grupos por grado y totales H/M],
+                   'alertas_cruzadas': [{'tipo', 'mensaje'}]}
+                  Las comparaciones son RegistrosValidacion; cada una se consulta
+                  con 'tipo', 'grado', 'genero', 'valor_esc1', 'valor_esc2',
+                  'diferencia', 'coincide' y 'descripcion' (ver _ContextoCruzado)
         """
+        contexto = _ContextoCruzado()
         validaciones_cruzadas = {
-            'coherencia_grupos_movimientos': [],
-            'consistencia_totales': [],
+            'coherencia_grupos_movimientos': RegistrosValidacion(exito=False, contexto=contexto),
+            'consistencia_totales': RegistrosValidacion(exito=False, contexto=contexto),
             'alertas_cruzadas': []
         }
+        alertas = validaciones_cruzadas['alertas_cruzadas']
+
+        if 'ESC1' not in datos_hojas or 'ESC2' not in datos_hojas:
+            return validaciones_cruzadas
+
+        esc1, esc2 = datos_hojas['ESC1'], datos_hojas['ESC2']
+        if 'error' in esc1 or 'error' in esc2:
+            alertas.append({'tipo': 'advertencia',
+                            'mensaje': 'No se pudo leer ESC1 o ESC2: validación cruzada omitida'})
+            return validaciones_cruzadas
+
+        logger.debug("🔀 Validando coherencia ESC1 vs ESC2...")
+        grupos = self._grupos_por_grado(esc1['datos_crudos'])
+        movimientos = self._movimientos_por_grado(esc2['datos_numericos'], esc2['datos_crudos'])
+        if grupos is None:
+            alertas.append({'tipo': 'advertencia',
+                            'mensaje': f"ESC1 sin listado de grupos (encabezado '{_ENCABEZADO_GRUPO}')"})
+        if movimientos is None:
+            alertas.append({'tipo': 'advertencia', 'mensaje': 'ESC2 sin fila EXISTENCIA o sin columnas por grado'})
+        if grupos is None or movimientos is None:
+            return validaciones_cruzadas
+
+        # Alinear por grado: la posición g es el grado g + 1 en ambas hojas
+        n_grados = max(len(grupos['H']), len(movimientos['H']))
+        def alinear(arreglo):
+            return np.pad(arreglo, (0, n_grados - len(arreglo)))
+
+        esc1_por_clave = {clave: alinear(grupos[clave]) for clave in ('H', 'M', 'grupos')}
+        esc2_por_clave = {clave: alinear(movimientos[clave]) for clave in ('H', 'M', 'grupos')}
+
+        # Registros: concepto = posición del grado, columna = género (ver _ContextoCruzado)
+        posiciones = np.arange(n_grados)
+        discrepancias = 0
+
+        def comparar(destino, tipo, grados, generos, valores_esc1, valores_esc2):
+            nonlocal discrepancias
+            validaciones_cruzadas[destino].agregar(tipo, grados, generos, valores_esc1, valores_esc2)
+            discrepancias += int(np.count_nonzero(np.abs(valores_esc1 - valores_esc2) > _TOLERANCIA_CRUZADA))
+
+        # Alumnos de los grupos vs EXISTENCIA, por grado y género
+        comparar('coherencia_grupos_movimientos', 'EXISTENCIA_VS_GRUPOS',
+                 np.tile(posiciones, 2), np.repeat([0, 1], n_grados),
+                 np.concatenate([esc1_por_clave['H'], esc1_por_clave['M']]),
+                 np.concatenate([esc2_por_clave['H'], esc2_por_clave['M']]))
+
+        # Número de grupos por grado y totales por género
+        comparar('consistencia_totales', 'GRUPOS_POR_GRADO', posiciones, -1,
+                 esc1_por_clave['grupos'], esc2_por_clave['grupos'])
+        comparar('consistencia_totales', 'TOTAL_ALUMNOS', -1, np.array([0, 1]),
+                 np.array([esc1_por_clave['H'].sum(), esc1_por_clave['M'].sum()]),
+                 np.array([esc2_por_clave['H'].sum(), esc2_por_clave['M'].sum()]))
+
+        if discrepancias:
+            alertas.append({'tipo': 'error',
+                            'mensaje': f'ESC1 y ESC2 no coinciden en {discrepancias} comparaciones'})
+        logger.info("✅ Validación cruzada: %s grupos, %s discrepancias", int(grupos['grupos'].sum()), discrepancias)
+        return validaciones_cruzadas
 
-        # Preparado para validaciones específicas ESC1 vs ESC2
-        if 'ESC1' in datos_hojas and 'ESC2' in datos_hojas:
-            # Aquí se implementarían validaciones específicas como:
-            # - Comparar totales de grupos vs movimientos
-            # - Verificar coherencia de datos entre hojas
-            # - Detectar inconsistencias cruzadas
+    def _grupos_por_grado(self, datos_crudos: pd.DataFrame) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Sumar el listado de grupos de ESC1 por grado.
 
-            validaciones_cruzadas['alertas_cruzadas'].append({
-                'tipo': 'info',
-                'mensaje': 'Validaciones cruzadas ESC1 vs ESC2 preparadas para implementación futura'
-            })
+        Ubica el encabezado 'GPO.' y sus columnas H y M; las filas cuya
+        etiqueta es un grupo ("1°A", "5° C") se acumulan por grado.
 
-        return validaciones_cruzadas
+        Returns:
+            dict: {'H', 'M', 'grupos'}: arreglos donde la posición g es el
+                  grado g + 1, o None si no hay listado
+        """
+        tabla = datos_crudos.to_numpy(dtype=object)
+        texto = np.char.upper(np.char.strip(np.where(pd.isna(tabla), '', tabla).astype(str)))
+
+        filas, columnas = np.nonzero(texto == _ENCABEZADO_GRUPO)
+        if not len(filas):
+            return None
+        encabezado, columna_grupo = filas[0], columnas[0]
+        columna = {}
+        for genero in ('H', 'M'):
+            posiciones = np.nonzero(texto[encabezado, columna_grupo + 1:] == genero)[0]
+            if not len(posiciones):
+                return None
+            columna[genero] = columna_grupo + 1 + posiciones[0]
+
+        etiquetas = pd.Series(texto[encabezado + 1:, columna_grupo])
+        grados = pd.to_numeric(etiquetas.str.extract(_PATRON_GRUPO, expand=False), errors='coerce').to_numpy()
+        es_grupo = ~np.isnan(grados) & (grados >= 1)
+        if not es_grupo.any():
+            return {'H': np.zeros(0), 'M': np.zeros(0), 'grupos': np.zeros(0)}
+
+        filas_grupo = encabezado + 1 + np.nonzero(es_grupo)[0]
+        valores = self._matriz_numerica(datos_crudos.iloc[filas_grupo, [columna['H'], columna['M']]])
+        indice_grado = grados[es_grupo].astype(np.intp) - 1
+        n_grados = int(indice_grado.max()) + 1
+        return {
+            'H': np.bincount(indice_grado, weights=valores[:, 0], minlength=n_grados),
+            'M': np.bincount(indice_grado, weights=valores[:, 1], minlength=n_grados),
+            'grupos': np.bincount(indice_grado, minlength=n_grados).astype(np.float64)
+        }
+
+    def _movimientos_por_grado(self, datos_numericos: pd.DataFrame,
+                               datos_crudos: pd.DataFrame) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Existencia por grado y género y grupos por grado de ESC2.
+
+        Returns:
+            dict: {'H', 'M', 'grupos'}: arreglos donde la posición g es el
+                  grado g + 1, o None si no se detectó EXISTENCIA
+        """
+        self._detectar_estructura_tabla(datos_crudos)
+        matriz = self._matriz_numerica(datos_numericos)
+        indices = self._preparar_indices(matriz.shape)
+
+        fila_existencia = self.estructura_detectada.get('fila_existencia')
+        if fila_existencia is None or not 0 <= fila_existencia - _OFFSET_FILA_NUMERICA < len(matriz):
+            return None
+        existencia = matriz[fila_existencia - _OFFSET_FILA_NUMERICA]
+
+        # Grado de cada columna de datos desde su encabezado ("1O.", "[1O.]")
+        columnas = []
+        for tipo, j, grado in indices['datos']:
+            numero = re.search(r'\d+', str(grado))
+            if numero and int(numero.group()) >= 1:
+                columnas.append((tipo, j, int(numero.group()) - 1))
+        if not columnas:
+            return None
+
+        tipos = np.array([tipo for tipo, _, _ in columnas])
+        idx_columnas = np.array([j for _, j, _ in columnas], dtype=np.intp)
+        idx_grados = np.array([g for _, _, g in columnas], dtype=np.intp)
+        n_grados = int(idx_grados.max()) + 1
+
+        por_grado = {genero: np.bincount(idx_grados[tipos == genero], weights=existencia[idx_columnas[tipos == genero]],
+                                         minlength=n_grados)
+                     for genero in ('H', 'M')}
+
+        # GRUPOS se captura en la primera columna de cada grado
+        fila_grupos = next((i for concepto, i in indices['filas'] if 'GRUPOS' in concepto.upper()), None)
+        if fila_grupos is None:
+            por_grado['grupos'] = np.zeros(n_grados)
+        else:
+            por_grado['grupos'] = np.bincount(idx_grados, weights=matriz[fila_grupos, idx_columnas], minlength=n_grados)
+        return por_grado
 
     def validar_tabla_completa(self, datos_numericos: pd.DataFrame, datos_crudos: pd.DataFrame) -> Dict:
         """
@@ -167,38 +378,239 @@ class DataValidator:
         Returns:
             Dict con reporte de validación
         """
-        print("🔍 Iniciando validación completa de tabla...")
-        
-        # Limpiar resultados anteriores
-        self.discrepancias = []
-        self.validaciones_exitosas = []
+        logger.debug("🔍 Iniciando validación completa de tabla...")
         
         # 1. Detectar estructura de la tabla
         self._detectar_estructura_tabla(datos_crudos)
+
+        # Las reglas se evalúan sobre la matriz completa, no celda por celda
+        matriz = self._matriz_numerica(datos_numericos)
+        self._indices = self._preparar_indices(matriz.shape)
+
+        # Limpiar resultados anteriores; los nuevos se describen desde este contexto
+        self._contexto = _ContextoTabla(matriz, self._indices, self._clases_celdas(datos_numericos))
+        self.discrepancias = RegistrosValidacion(exito=False, contexto=self._contexto)
+        self.validaciones_exitosas = RegistrosValidacion(exito=True, contexto=self._contexto)
         
         # 2. Validar subtotales y totales
-        self._validar_subtotales_totales(datos_numericos)
+        self._validar_subtotales_totales(matriz)
         
         # 3. Validar totales (suma de subtotales H + M)
-        self._validar_totales(datos_numericos)
+        self._validar_totales(matriz)
 
         # 4. Validar coherencia entre filas
-        self._validar_coherencia_filas(datos_numericos)
+        self._validar_coherencia_filas(matriz)
+
+        # 5. Reglas adicionales del esquema
+        self._validar_reglas_esquema(matriz)
 
-        # 5. Generar reporte final
+        # 6. Generar reporte final
         reporte = self._generar_reporte()
         
-        print(f"✅ Validación completada: {len(self.discrepancias)} discrepancias encontradas")
+        logger.info("✅ Validación completada: %s discrepancias encontradas", len(self.discrepancias))
         return reporte
     
+    def validar_lote(self, datos: np.ndarray, datos_crudos: pd.DataFrame,
+                     nombres: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        Validar muchos archivos con la misma estructura en una sola pasada.
+
+        La estructura se detecta una sola vez (con la tabla completa de
+        cualquiera de los archivos) y cada regla se evalúa para todos los
+        archivos a la vez sobre el arreglo apilado. Aplica las mismas reglas
+        que validar_tabla_completa, pero sin descripciones por celda.
+
+        Args:
+            datos: Matrices numéricas apiladas, archivos × filas × columnas
+                   (por ejemplo DataManager.cubo.datos)
+            datos_crudos: Tabla completa (datos_crudos) de uno de los archivos
+            nombres: Nombre de cada archivo (por defecto su posición)
+
+        Returns:
+            pd.DataFrame: Una fila por discrepancia, con las columnas
+                          COLUMNAS_LOTE (esperado/reportado NaN en
+                          SUBTOTALES_FALTANTES)
+        """
+        datos = np.asarray(datos, dtype=np.float64)
+        if datos.ndim == 2:
+            datos = datos[np.newaxis]
+        datos = np.where(np.isnan(datos), 0.0, datos)
+        nombres = list(nombres) if nombres is not None else list(range(len(datos)))
+        if len(nombres) != len(datos):
+            raise ValueError(f"Se recibieron {len(nombres)} nombres para {len(datos)} archivos")
+
+        self._detectar_estructura_tabla(datos_crudos)
+        indices = self._preparar_indices(datos.shape[1:])
+        estructura = self.estructura_detectada
+
+        # Cada comprobación aporta una columna: (tipo, concepto, columna), esperado y reportado por archivo
+        etiquetas = []
+        esperados = []
+        reportados = []
+        sin_valor = np.full(len(datos), np.nan)
+
+        def comprobar(etiqueta, esperado, reportado):
+            etiquetas.append(etiqueta)
+            esperados.append(esperado)
+            reportados.append(reportado)
+
+        filas = indices['filas']
+        idx_filas = np.array([i for _, i in filas], dtype=np.intp)
+        columnas_genero = {tipo: np.array([j for t, j, _ in indices['datos'] if t == tipo], dtype=np.intp)
+                           for tipo in ('H', 'M')}
+        sumas_genero = {tipo: datos[:, idx_filas[:, np.newaxis], columnas[np.newaxis, :]].sum(axis=2)
+                        for tipo, columnas in columnas_genero.items()}
+
+        # Subtotales H/M = suma de las columnas de datos de cada género
+        if estructura.get('columnas_subtotales'):
+            for f, (concepto, i) in enumerate(filas):
+                if 'GRUPOS' in concepto.upper():
+                    continue
+                for tipo, j in indices['subtotales']:
+                    if tipo in sumas_genero:
+                        comprobar((f'SUBTOTAL_{tipo}', concepto, f'SUBTOTAL_{tipo}'), sumas_genero[tipo][:, f], datos[:, i, j])
+
+        # Totales = Subtotal H + Subtotal M (GRUPOS: suma directa de celdas positivas)
+        if estructura.get('columnas_totales') and filas:
+            celdas = datos[:, idx_filas[:, np.newaxis], np.array([j for _, j, _ in indices['datos']], dtype=np.intp)]
+            total_directo = celdas.sum(axis=2)
+            total_grupos = np.where(celdas > 0, celdas, 0.0).sum(axis=2)
+            columna_h = [j for tipo, j in indices['subtotales'] if tipo == 'H'][-1:]
+            columna_m = [j for tipo, j in indices['subtotales'] if tipo == 'M'][-1:]
+            columna_total = indices['totales'][0][1] if indices['totales'] else None
+
+            for f, (concepto, i) in enumerate(filas):
+                if 'GRUPOS' in concepto.upper():
+                    if columna_total is not None:
+                        comprobar(('TOTAL_GRUPOS', concepto, 'TOTAL'), total_grupos[:, f], datos[:, i, columna_total])
+                elif not columna_h or not columna_m:
+                    comprobar(('SUBTOTALES_FALTANTES', concepto, 'SUBTOTALES'), sin_valor, sin_valor)
+                else:
+                    suma_subtotales = datos[:, i, columna_h[0]] + datos[:, i, columna_m[0]]
+                    comprobar(('DISCREPANCIA_INTERNA', concepto, 'SUBTOTALES'), total_directo[:, f], suma_subtotales)
+                    if columna_total is not None:
+                        comprobar(('TOTAL', concepto, 'TOTAL'), suma_subtotales, datos[:, i, columna_total])
+
+        # Existencia = Inscripción - Bajas en cada columna de datos
+        filas_coherencia = [estructura.get('fila_inscripcion'), estructura.get('fila_bajas'), estructura.get('fila_existencia')]
+        if all(fila is not None for fila in filas_coherencia):
+            inscripcion, bajas, existencia = (fila - _OFFSET_FILA_NUMERICA for fila in filas_coherencia)
+            if all(0 <= i < datos.shape[1] for i in (inscripcion, bajas, existencia)):
+                for tipo, j, grado in indices['datos']:
+                    comprobar(('COHERENCIA_EXISTENCIA', 'EXISTENCIA', f'{tipo}-{grado}'),
+                              datos[:, inscripcion, j] - datos[:, bajas, j], datos[:, existencia, j])
+
+        if etiquetas:
+            esperado = np.stack(esperados, axis=1)
+            reportado = np.stack(reportados, axis=1)
+        else:
+            esperado = reportado = np.empty((len(datos), 0))
+
+        # Reglas adicionales del esquema: todas a la vez sobre el cubo
+        reglas = self._reglas_esquema(datos.shape[1:])
+        if reglas is not None and len(reglas):
+            esperado_reglas, reportado_reglas = reglas.evaluar(datos)
+            esperado = np.concatenate([esperado, esperado_reglas], axis=1)
+            reportado = np.concatenate([reportado, reportado_reglas], axis=1)
+            etiquetas += [(_tipo_regla(regla), concepto, columna) for regla, concepto, columna in reglas.etiquetas]
+
+        # NaN (subtotales faltantes) también cuenta como discrepancia
+        discrepa = ~(np.abs(esperado - reportado) <= 0.01)
+        archivos_idx, comprobaciones_idx = np.nonzero(discrepa)
+
+        etiquetas = np.array(etiquetas, dtype=object).reshape(-1, 3)
+        tabla = pd.DataFrame({
+            'archivo': np.array(nombres, dtype=object)[archivos_idx],
+            'tipo': etiquetas[comprobaciones_idx, 0],
+            'concepto': etiquetas[comprobaciones_idx, 1],
+            'columna': etiquetas[comprobaciones_idx, 2],
+            'esperado': esperado[archivos_idx, comprobaciones_idx],
+            'reportado': reportado[archivos_idx, comprobaciones_idx]
+        }, columns=COLUMNAS_LOTE)
+
+        logger.info("✅ Validación de lote: %s archivos, %s comprobaciones, %s discrepancias en %s archivos",
+                    len(datos), discrepa.size, len(tabla), tabla['archivo'].nunique())
+        return tabla
+
     def _detectar_estructura_tabla(self, datos_crudos: pd.DataFrame):
+        """
+        Detectar la estructura de la tabla, reutilizando la de otro archivo
+        con la misma huella (ver _huella_tabla).
+
+        Solo las filas con un concepto no reconocido dependen de los datos
+        (se incluyen si tienen números); esas se revisan en cada archivo.
+        """
+        huella = self._huella_tabla(datos_crudos)
+        plantilla = DataValidator._cache_estructuras.get(huella)
+        if plantilla is None:
+            if len(DataValidator._cache_estructuras) >= _MAX_ESTRUCTURAS_CACHE:
+                DataValidator._cache_estructuras.clear()
+            plantilla = self._analizar_estructura_tabla(datos_crudos)
+            plantilla['indices'] = {}
+            DataValidator._cache_estructuras[huella] = plantilla
+        else:
+            logger.debug("♻️ Estructura de tabla reutilizada (misma huella de encabezados)")
+
+        adicionales = [(concepto, i) for concepto, i in plantilla['candidatas']
+                       if self._fila_tiene_numeros(datos_crudos.loc[i])]
+        for concepto, i in adicionales:
+            logger.debug("📍 Concepto adicional encontrado en fila %s: %s", i, concepto)
+
+        estructura = {clave: list(valor) if isinstance(valor, list) else valor
+                      for clave, valor in plantilla['estructura'].items()}
+        if adicionales:
+            estructura['filas_conceptos'] = sorted(estructura['filas_conceptos'] + adicionales,
+                                                   key=lambda concepto_fila: concepto_fila[1])
+
+        self.estructura_detectada = estructura
+        self._indices_cache = plantilla['indices'].setdefault(tuple(adicionales), {})
+
+    @staticmethod
+    def _huella_tabla(datos_crudos: pd.DataFrame) -> Tuple:
+        """
+        Huella de la distribución de una tabla: columna de conceptos y filas
+        de grados (1) y géneros (2). Las tablas de una misma plantilla la
+        comparten aunque sus números sean distintos.
+
+        Returns:
+            tuple: Valores como texto (None para vacíos), usable como clave
+        """
+        tabla = datos_crudos.to_numpy(dtype=object)
+        vectores = [tabla[:, 0]] if tabla.shape[1] else []
+        if len(tabla) >= 3:
+            vectores += [tabla[1], tabla[2]]
+
+        partes = [tabla.shape]
+        for valores in vectores:
+            vacios = pd.isna(valores).tolist()
+            partes.append(tuple(None if vacio else str(valor) for valor, vacio in zip(valores.tolist(), vacios)))
+        return tuple(partes)
+
+    @staticmethod
+    def _fila_tiene_numeros(fila: pd.Series) -> bool:
+        """Indicar si una fila tiene algún número en el área de datos (columnas 7 a 18)."""
+        for j in range(7, min(19, len(fila))):
+            valor = fila.iloc[j]
+            if pd.notna(valor) and str(valor).strip() != '' and not str(valor).startswith('['):
+                try:
+                    float(valor)
+                    return True
+                except:
+                    pass
+        return False
+
+    def _analizar_estructura_tabla(self, datos_crudos: pd.DataFrame) -> Dict:
         """
         Detectar automáticamente la estructura de la tabla usando datos del Paso 2.
 
         Analiza la tabla con marcadores [valor] para identificar estructura.
+
+        Returns:
+            dict: {'estructura': estructura sin las filas adicionales,
+                   'candidatas': [(concepto, fila)] con concepto no reconocido}
         """
-        print("🔍 Detectando estructura de tabla...")
-        print(f"📊 Analizando tabla de {datos_crudos.shape[0]}x{datos_crudos.shape[1]}")
+        logger.debug("🔍 Detectando estructura de tabla...")
+        logger.debug("📊 Analizando tabla de %sx%s", datos_crudos.shape[0], datos_crudos.shape[1])
 
         # Buscar patrones conocidos en los datos
         estructura = {
@@ -211,87 +623,75 @@ class DataValidator:
             'fila_existencia': None,
             'fila_altas': None
         }
+        candidatas = []
 
         # 🔍 PASO 1: Detectar filas de conceptos principales
         for i, fila in datos_crudos.iterrows():
             concepto = str(fila.iloc[0]).upper() if pd.notna(fila.iloc[0]) else ""
 
             # Mostrar todas las filas para debugging
-            print(f"🔍 Fila {i}: '{concepto}'")
+            logger.debug("🔍 Fila %s: '%s'", i, concepto)
 
             if 'INSCRIPCIÓN' in concepto or 'INSCRIPCION' in concepto:
                 estructura['fila_inscripcion'] = i
                 estructura['filas_conceptos'].append(('INSCRIPCIÓN', i))
-                print(f"📍 INSCRIPCIÓN encontrada en fila {i}")
+                logger.debug("📍 INSCRIPCIÓN encontrada en fila %s", i)
 
             elif 'BAJAS' in concepto:
                 estructura['fila_bajas'] = i
                 estructura['filas_conceptos'].append(('BAJAS', i))
-                print(f"📍 BAJAS encontrada en fila {i}")
+                logger.debug("📍 BAJAS encontrada en fila %s", i)
 
             elif 'EXISTENCIA' in concepto:
                 estructura['fila_existencia'] = i
                 estructura['filas_conceptos'].append(('EXISTENCIA', i))
-                print(f"📍 EXISTENCIA encontrada en fila {i}")
+                logger.debug("📍 EXISTENCIA encontrada en fila %s", i)
 
             elif 'ALTAS' in concepto:
                 estructura['fila_altas'] = i
                 estructura['filas_conceptos'].append(('ALTAS', i))
-                print(f"📍 ALTAS encontrada en fila {i}")
+                logger.debug("📍 ALTAS encontrada en fila %s", i)
 
             elif 'PREINSCRIPCIÓN' in concepto or 'PREINSCRIPCION' in concepto:
                 estructura['filas_conceptos'].append(('PREINSCRIPCIÓN 1ER. GRADO', i))
-                print(f"📍 PREINSCRIPCIÓN 1ER. GRADO encontrada en fila {i}")
+                logger.debug("📍 PREINSCRIPCIÓN 1ER. GRADO encontrada en fila %s", i)
 
             elif 'BECADOS MUNICIPIO' in concepto:
                 estructura['filas_conceptos'].append(('BECADOS MUNICIPIO', i))
-                print(f"📍 BECADOS MUNICIPIO encontrada en fila {i}")
+                logger.debug("📍 BECADOS MUNICIPIO encontrada en fila %s", i)
 
             elif 'BECADOS SEED' in concepto:
                 estructura['filas_conceptos'].append(('BECADOS SEED', i))
-                print(f"📍 BECADOS SEED encontrada en fila {i}")
+                logger.debug("📍 BECADOS SEED encontrada en fila %s", i)
 
             elif 'BIENESTAR' in concepto:
                 estructura['filas_conceptos'].append(('BIENESTAR', i))
-                print(f"📍 BIENESTAR encontrada en fila {i}")
+                logger.debug("📍 BIENESTAR encontrada en fila %s", i)
 
             elif 'GRUPOS' in concepto:
                 estructura['filas_conceptos'].append(('GRUPOS', i))
-                print(f"📍 GRUPOS encontrada en fila {i}")
+                logger.debug("📍 GRUPOS encontrada en fila %s", i)
 
             elif 'APROBADOS' in concepto:
                 estructura['filas_conceptos'].append(('APROBADOS', i))
-                print(f"📍 APROBADOS encontrada en fila {i}")
+                logger.debug("📍 APROBADOS encontrada en fila %s", i)
 
             elif 'REPROBADOS' in concepto:
                 estructura['filas_conceptos'].append(('REPROBADOS', i))
-                print(f"📍 REPROBADOS encontrada en fila {i}")
+                logger.debug("📍 REPROBADOS encontrada en fila %s", i)
 
-            # Detectar otras filas que puedan tener datos numéricos
+            # Otras filas con concepto: se incluyen si tienen datos numéricos,
+            # lo que depende de cada archivo (ver _detectar_estructura_tabla)
             elif concepto.strip() != '' and not concepto.startswith('[') and i > 2:
-                # Verificar si la fila tiene datos numéricos
-                tiene_numeros = False
-                for j in range(7, min(19, len(fila))):  # Verificar área de datos
-                    valor = fila.iloc[j]
-                    if pd.notna(valor) and str(valor).strip() != '' and not str(valor).startswith('['):
-                        try:
-                            float(valor)
-                            tiene_numeros = True
-                            break
-                        except:
-                            pass
-
-                if tiene_numeros:
-                    estructura['filas_conceptos'].append((concepto, i))
-                    print(f"📍 Concepto adicional encontrado en fila {i}: {concepto}")
+                candidatas.append((concepto, i))
 
         # 🔍 PASO 2: Analizar estructura de columnas de forma más inteligente
         if len(datos_crudos) >= 3:  # Fila 2 debería tener H, M, H, M, etc.
             fila_headers = datos_crudos.iloc[2]  # Fila "CONCEPTO" con H, M
             fila_grados = datos_crudos.iloc[1]   # Fila "GRADOS" para contexto
 
-            print(f"🔍 Analizando headers: {fila_headers.values}")
-            print(f"🔍 Analizando grados: {fila_grados.values}")
+            logger.debug("🔍 Analizando headers: %s", fila_headers.values)
+            logger.debug("🔍 Analizando grados: %s", fila_grados.values)
 
             for j, header in enumerate(fila_headers):
                 header_str = str(header).upper().strip()
@@ -302,560 +702,303 @@ class DataValidator:
                     # Estamos en área de subtotales
                     if header_str == 'H':
                         estructura['columnas_subtotales'].append(('H', j))
-                        print(f"📍 Subtotal H encontrado en posición {j}")
+                        logger.debug("📍 Subtotal H encontrado en posición %s", j)
                     elif header_str == 'M':
                         estructura['columnas_subtotales'].append(('M', j))
-                        print(f"📍 Subtotal M encontrado en posición {j}")
+                        logger.debug("📍 Subtotal M encontrado en posición %s", j)
 
                 elif 'TOTAL' in grado_str and 'SUBTOTAL' not in grado_str:
                     # Estamos en área de totales
                     estructura['columnas_totales'].append(('TOTAL', j))
-                    print(f"📍 Total encontrado en posición {j}")
+                    logger.debug("📍 Total encontrado en posición %s", j)
 
                 elif header_str == 'H' and ('1O' in grado_str or '2O' in grado_str or '3O' in grado_str or
                                            '4O' in grado_str or '5O' in grado_str or '6O' in grado_str):
                     # Columna H de datos por grado
                     estructura['columnas_datos'].append(('H', j, grado_str))
-                    print(f"📍 Datos H-{grado_str} en posición {j}")
+                    logger.debug("📍 Datos H-%s en posición %s", grado_str, j)
 
                 elif header_str == 'M' and ('1O' in grado_str or '2O' in grado_str or '3O' in grado_str or
                                            '4O' in grado_str or '5O' in grado_str or '6O' in grado_str):
                     # Columna M de datos por grado
                     estructura['columnas_datos'].append(('M', j, grado_str))
-                    print(f"📍 Datos M-{grado_str} en posición {j}")
+                    logger.debug("📍 Datos M-%s en posición %s", grado_str, j)
 
                 elif header_str == 'H' and j > 15:  # Área probable de subtotales
                     estructura['columnas_subtotales'].append(('H', j))
-                    print(f"📍 Posible Subtotal H en posición {j}")
+                    logger.debug("📍 Posible Subtotal H en posición %s", j)
 
                 elif header_str == 'M' and j > 15:  # Área probable de subtotales
                     estructura['columnas_subtotales'].append(('M', j))
-                    print(f"📍 Posible Subtotal M en posición {j}")
-
-        self.estructura_detectada = estructura
-        print(f"✅ Estructura detectada:")
-        print(f"   📋 Conceptos: {len(estructura['filas_conceptos'])}")
-        print(f"   📊 Columnas datos: {len(estructura['columnas_datos'])}")
-        print(f"   🧮 Columnas subtotales: {len(estructura['columnas_subtotales'])}")
-        print(f"   📈 Columnas totales: {len(estructura['columnas_totales'])}")
+                    logger.debug("📍 Posible Subtotal M en posición %s", j)
+
+        logger.debug("✅ Estructura detectada:")
+        logger.debug("   📋 Conceptos: %s (+%s por confirmar)", len(estructura['filas_conceptos']), len(candidatas))
+        logger.debug("   📊 Columnas datos: %s", len(estructura['columnas_datos']))
+        logger.debug("   🧮 Columnas subtotales: %s", len(estructura['columnas_subtotales']))
+        logger.debug("   📈 Columnas totales: %s", len(estructura['columnas_totales']))
+        return {'estructura': estructura, 'candidatas': candidatas}
     
-    def _validar_subtotales_totales(self, datos_numericos: pd.DataFrame):
+    def _preparar_indices(self, forma: Tuple[int, int]):
         """
-        Validar que los subtotales y totales coincidan con las sumas reales.
+        Traducir la estructura detectada a índices de la matriz numérica.
+
+        Las filas y columnas de la tabla completa se desplazan
+        (_OFFSET_FILA_NUMERICA, _OFFSET_COLUMNA_NUMERICA) y se descartan las
+        que quedan fuera de la matriz.
+
+        Args:
+            forma: (filas, columnas) de la matriz numérica
+
+        Returns:
+            dict: {'filas': [(concepto, i)], 'datos': [(tipo, j, grado)],
+                   'subtotales': [(tipo, j)], 'totales': [(tipo, j)]}
         """
-        print("🧮 Validando subtotales y totales...")
+        if forma in self._indices_cache:
+            return self._indices_cache[forma]
 
-        # Verificar si tenemos columnas de subtotales detectadas
-        if not self.estructura_detectada.get('columnas_subtotales'):
-            print("⚠️ No se detectaron columnas de subtotales")
-            return
+        n_filas, n_columnas = forma
+        estructura = self.estructura_detectada
 
-        print(f"✅ Detectadas {len(self.estructura_detectada['columnas_subtotales'])} columnas de subtotales")
+        def columnas_en_rango(items):
+            return [item for item in items
+                    if len(item) >= 2 and 0 <= item[1] - _OFFSET_COLUMNA_NUMERICA < n_columnas]
+
+        indices = self._indices_cache[forma] = {
+            'filas': [(concepto, fila - _OFFSET_FILA_NUMERICA) for concepto, fila in estructura.get('filas_conceptos', [])
+                      if 0 <= fila - _OFFSET_FILA_NUMERICA < n_filas],
+            'datos': [(item[0], item[1] - _OFFSET_COLUMNA_NUMERICA, item[2] if len(item) > 2 else f"Col{item[1]}")
+                      for item in columnas_en_rango(estructura.get('columnas_datos', []))],
+            'subtotales': [(item[0], item[1] - _OFFSET_COLUMNA_NUMERICA)
+                           for item in columnas_en_rango(estructura.get('columnas_subtotales', []))],
+            'totales': [(item[0], item[1] - _OFFSET_COLUMNA_NUMERICA)
+                        for item in columnas_en_rango(estructura.get('columnas_totales', []))]
+        }
+        return indices
 
-        # Validar cada fila de conceptos
-        for concepto, fila_idx in self.estructura_detectada['filas_conceptos']:
-            # MAPEAR índice de tabla completa a datos_numericos
-            offset_numerico = 3  # Primer fila de datos numéricos
-            idx_numerico = fila_idx - offset_numerico
+    def _matriz_numerica(self, datos_numericos: pd.DataFrame) -> np.ndarray:
+        """
+        Convertir datos_numericos a una matriz float64 (vacíos = 0).
 
-            if 0 <= idx_numerico < len(datos_numericos):
-                print(f"🔍 Validando {concepto} en fila {fila_idx}")
-                self._validar_fila_subtotales(datos_numericos, concepto, fila_idx)
-            else:
-                print(f"⚠️ Fila {fila_idx} fuera de rango para {concepto} (mapeado: {idx_numerico})")
-    
-    def _validar_fila_subtotales(self, datos_numericos: pd.DataFrame, concepto: str, fila_idx: int):
+        Las matrices ya numéricas se convierten sin recorrer celdas; solo las
+        de tipo object pasan por _convertir_a_numero celda a celda.
         """
-        Validar subtotales de una fila específica usando estructura detectada.
+        valores = datos_numericos.to_numpy()
+        if valores.dtype.kind in 'biuf':
+            matriz = valores.astype(np.float64)
+            matriz[np.isnan(matriz)] = 0.0
+            return matriz
+        return np.frompyfunc(self._convertir_a_numero, 1, 1)(valores).astype(np.float64)
+
+    def _clases_celdas(self, datos_numericos: pd.DataFrame) -> Optional[np.ndarray]:
         """
-        try:
-            # GRUPOS no tiene subtotales H/M, se valida diferente
-            if 'GRUPOS' in concepto.upper():
-                print(f"🔍 GRUPOS detectado - saltando validación de subtotales H/M")
-                print(f"   ℹ️ GRUPOS se valida como suma directa en la validación de totales")
-                return
-
-            print(f"🔍 Validando subtotales para {concepto} (fila {fila_idx})")
-            print(f"📊 Tamaño datos_numericos: {datos_numericos.shape}")
-
-            # MAPEAR índice de tabla completa a datos_numericos
-            offset_numerico = 3  # Primer fila de datos numéricos
-            idx_numerico = fila_idx - offset_numerico
-
-            print(f"🔍 Mapeando fila {fila_idx} → {idx_numerico} en datos_numericos")
-
-            if idx_numerico < 0 or idx_numerico >= len(datos_numericos):
-                print(f"⚠️ Fila {fila_idx} fuera de rango para datos_numericos (max: {len(datos_numericos)-1})")
-                return
-
-            fila_cruda = datos_numericos.iloc[idx_numerico]
-            print(f"📊 Datos de fila {fila_idx}: {fila_cruda.values}")
-            print(f"📊 Longitud de fila: {len(fila_cruda)}")
-
-            # Mostrar estructura detectada para debugging
-            print(f"🔍 Columnas de datos detectadas: {len(self.estructura_detectada['columnas_datos'])}")
-            print(f"🔍 Columnas de subtotales detectadas: {len(self.estructura_detectada['columnas_subtotales'])}")
-            for i, item in enumerate(self.estructura_detectada['columnas_datos'][:5]):  # Mostrar solo las primeras 5
-                print(f"   📊 Dato {i}: {item}")
-            for i, item in enumerate(self.estructura_detectada['columnas_subtotales']):
-                print(f"   🧮 Subtotal {i}: {item}")
-
-            # Separar columnas de datos H y M usando estructura detectada
-            valores_h = []
-            valores_m = []
-
-            for item in self.estructura_detectada['columnas_datos']:
-                if len(item) >= 2:  # Puede tener 2 o 3 elementos (tipo, col_idx, [grado])
-                    tipo, col_idx = item[0], item[1]
-                    grado = item[2] if len(item) > 2 else "N/A"
-
-                    # MAPEAR columna de tabla completa a datos_numericos
-                    offset_columna = 7  # Primera columna de datos numéricos
-                    idx_columna = col_idx - offset_columna
-
-                    if 0 <= idx_columna < len(fila_cruda):
-                        valor = fila_cruda.iloc[idx_columna]
-                        # Convertir a número si es posible
-                        try:
-                            valor_num = float(valor) if pd.notna(valor) and str(valor).strip() != '' else 0
-                            if tipo == 'H':
-                                valores_h.append(valor_num)
-                                print(f"   📊 H-{grado} en col {col_idx}: {valor_num}")
-                            elif tipo == 'M':
-                                valores_m.append(valor_num)
-                                print(f"   📊 M-{grado} en col {col_idx}: {valor_num}")
-                        except (ValueError, TypeError):
-                            print(f"   ⚠️ Valor no numérico en col {col_idx}: {valor}")
-
-            # Calcular sumas y mostrar operación completa
-            suma_h_calculada = sum(valores_h) if valores_h else 0
-            suma_m_calculada = sum(valores_m) if valores_m else 0
-
-            # Mostrar operación de suma H
-            if valores_h:
-                operacion_h = " + ".join([str(v) for v in valores_h])
-                print(f"🧮 Suma H calculada: {operacion_h} = {suma_h_calculada}")
-            else:
-                print(f"🧮 Suma H calculada: 0 (sin valores)")
+        Clase de cada celda (_CELDA_*), o None si todas son números.
 
-            # Mostrar operación de suma M
-            if valores_m:
-                operacion_m = " + ".join([str(v) for v in valores_m])
-                print(f"🧮 Suma M calculada: {operacion_m} = {suma_m_calculada}")
-            else:
-                print(f"🧮 Suma M calculada: 0 (sin valores)")
-
-            # Buscar subtotales reportados en las columnas de subtotales
-            for item in self.estructura_detectada['columnas_subtotales']:
-                if len(item) >= 2:
-                    tipo, col_idx = item[0], item[1]
-
-                    # MAPEAR columna de tabla completa a datos_numericos
-                    offset_columna = 7  # Primera columna de datos numéricos
-                    idx_columna = col_idx - offset_columna
-
-                    if 0 <= idx_columna < len(fila_cruda):
-                        valor_celda = fila_cruda.iloc[idx_columna]
-                        print(f"🔍 DEBUG - {concepto} {tipo} col {col_idx}→{idx_columna}: valor_celda = {valor_celda}")
-
-                        # Convertir a número, manejando marcadores [valor]
-                        try:
-                            if isinstance(valor_celda, str) and valor_celda.startswith('[') and valor_celda.endswith(']'):
-                                # Es un marcador [valor], extraer el número
-                                numero_str = valor_celda.strip('[]')
-                                subtotal_reportado = float(numero_str) if numero_str.strip() != '' else 0
-                            else:
-                                subtotal_reportado = float(valor_celda) if pd.notna(valor_celda) else 0
-
-                            if tipo == 'H':
-                                print(f"📋 Subtotal H reportado: {subtotal_reportado}")
-                                diferencia = abs(suma_h_calculada - subtotal_reportado)
-                                print(f"🔍 Diferencia H en {concepto}: |{suma_h_calculada} - {subtotal_reportado}| = {diferencia}")
-                                if diferencia > 0.01:
-                                    print(f"❌ Discrepancia en subtotal H de {concepto}: reportado {subtotal_reportado} vs calculado {suma_h_calculada}")
-                                    self.discrepancias.append({
-                                        'tipo': 'SUBTOTAL_H',
-                                        'concepto': concepto,
-                                        'valor_reportado': subtotal_reportado,
-                                        'valor_calculado': suma_h_calculada,
-                                        'diferencia': abs(suma_h_calculada - subtotal_reportado),
-                                        'descripcion': f"❌ Subtotal H en {concepto}: reportado {subtotal_reportado}, calculado {' + '.join([str(v) for v in valores_h]) if valores_h else '0'} = {suma_h_calculada}"
-                                    })
-                                else:
-                                    operacion_h = " + ".join([str(v) for v in valores_h]) if valores_h else "0"
-                                    self.validaciones_exitosas.append({
-                                        'tipo': 'SUBTOTAL_H',
-                                        'concepto': concepto,
-                                        'valor': subtotal_reportado,
-                                        'descripcion': f"✅ Subtotal H en {concepto}: {operacion_h} = {subtotal_reportado} (correcto)"
-                                    })
-                                    print(f"✅ Subtotal H correcto en {concepto}")
-
-                            elif tipo == 'M':
-                                print(f"📋 Subtotal M reportado: {subtotal_reportado}")
-                                if abs(suma_m_calculada - subtotal_reportado) > 0.01:
-                                    self.discrepancias.append({
-                                        'tipo': 'SUBTOTAL_M',
-                                        'concepto': concepto,
-                                        'valor_reportado': subtotal_reportado,
-                                        'valor_calculado': suma_m_calculada,
-                                        'diferencia': abs(suma_m_calculada - subtotal_reportado),
-                                        'descripcion': f"❌ Subtotal M en {concepto}: reportado {subtotal_reportado}, calculado {' + '.join([str(v) for v in valores_m]) if valores_m else '0'} = {suma_m_calculada}"
-                                    })
-                                else:
-                                    operacion_m = " + ".join([str(v) for v in valores_m]) if valores_m else "0"
-                                    self.validaciones_exitosas.append({
-                                        'tipo': 'SUBTOTAL_M',
-                                        'concepto': concepto,
-                                        'valor': subtotal_reportado,
-                                        'descripcion': f"✅ Subtotal M en {concepto}: {operacion_m} = {subtotal_reportado} (correcto)"
-                                    })
-                                    print(f"✅ Subtotal M correcto en {concepto}")
-
-                        except (ValueError, TypeError) as e:
-                            print(f"⚠️ Error procesando subtotal {tipo} en col {col_idx}: {valor_celda} - {e}")
-
-        except Exception as e:
-            print(f"⚠️ Error validando subtotales en {concepto}: {e}")
-    
-    def _validar_coherencia_filas(self, datos_numericos: pd.DataFrame):
+        Las matrices numéricas solo pueden tener celdas vacías (NaN); las de
+        tipo object se clasifican celda a celda.
         """
-        Validar coherencia entre filas relacionadas (Existencia = Inscripción - Bajas).
+        valores = datos_numericos.to_numpy()
+        if valores.dtype.kind in 'biu':
+            return None
+        if valores.dtype.kind == 'f':
+            vacias = np.isnan(valores)
+            return np.where(vacias, _CELDA_VACIA, _CELDA_NUMERO).astype(np.int8) if vacias.any() else None
+        return np.frompyfunc(_clase_celda, 1, 1)(valores).astype(np.int8)
+
+    def _validar_subtotales_totales(self, matriz: np.ndarray):
         """
-        print("🔄 Validando coherencia entre filas...")
-        
-        estructura = self.estructura_detectada
-        fila_inscripcion = estructura.get('fila_inscripcion')
-        fila_bajas = estructura.get('fila_bajas')
-        fila_existencia = estructura.get('fila_existencia')
-        
-        if all(x is not None for x in [fila_inscripcion, fila_bajas, fila_existencia]):
-            try:
-                # MAPEAR índices de tabla completa a datos_numericos
-                # datos_numericos empieza en fila 3 de la tabla completa
-                offset_numerico = 3  # Primer fila de datos numéricos
+        Validar que los subtotales H y M coincidan con la suma de las
+        columnas de datos de cada género, para todas las filas a la vez.
+        """
+        logger.debug("🧮 Validando subtotales y totales...")
 
-                idx_inscripcion = fila_inscripcion - offset_numerico
-                idx_bajas = fila_bajas - offset_numerico
-                idx_existencia = fila_existencia - offset_numerico
+        if not self.estructura_detectada.get('columnas_subtotales'):
+            logger.warning("⚠️ No se detectaron columnas de subtotales")
+            return
 
-                print(f"🔍 Mapeando índices: inscripción {fila_inscripcion}→{idx_inscripcion}, bajas {fila_bajas}→{idx_bajas}, existencia {fila_existencia}→{idx_existencia}")
+        indices = self._indices
+        contexto = self._contexto
+        # GRUPOS no tiene subtotales H/M: se valida como suma directa en los totales
+        filas = [f for f, (concepto, _) in enumerate(indices['filas']) if 'GRUPOS' not in concepto.upper()]
+        subtotales = [(tipo, j) for tipo, j in indices['subtotales'] if tipo in ('H', 'M')]
+        if not filas or not subtotales:
+            return
 
-                if all(0 <= idx < len(datos_numericos) for idx in [idx_inscripcion, idx_bajas, idx_existencia]):
-                    inscripcion = datos_numericos.iloc[idx_inscripcion]
-                    bajas = datos_numericos.iloc[idx_bajas]
-                    existencia = datos_numericos.iloc[idx_existencia]
-                else:
-                    print(f"❌ Índices fuera de rango para datos_numericos ({len(datos_numericos)} filas)")
-                    return
-                
-                # Calcular existencia esperada por columna (solo en columnas de datos)
-                for item in self.estructura_detectada['columnas_datos']:
-                    if len(item) >= 2:
-                        tipo, col_idx = item[0], item[1]
-                        grado = item[2] if len(item) > 2 else f"Col{col_idx}"
-
-                        # MAPEAR columna de tabla completa a datos_numericos
-                        offset_columna = 7  # Primera columna de datos numéricos
-                        idx_columna = col_idx - offset_columna
-
-                        if 0 <= idx_columna < min(len(inscripcion), len(bajas), len(existencia)):
-                            try:
-                                # Convertir valores a números
-                                val_inscripcion = self._convertir_a_numero(inscripcion.iloc[idx_columna])
-                                val_bajas = self._convertir_a_numero(bajas.iloc[idx_columna])
-                                val_existencia = self._convertir_a_numero(existencia.iloc[idx_columna])
-
-                                if val_inscripcion is not None and val_bajas is not None and val_existencia is not None:
-                                    existencia_calculada = val_inscripcion - val_bajas
-
-                                    if abs(existencia_calculada - val_existencia) > 0.01:
-                                        self.discrepancias.append({
-                                            'tipo': 'COHERENCIA_EXISTENCIA',
-                                            'concepto': f'{tipo}-{grado}',
-                                            'valor_reportado': val_existencia,
-                                            'valor_calculado': existencia_calculada,
-                                            'diferencia': abs(existencia_calculada - val_existencia),
-                                            'descripcion': f"Existencia {tipo}-{grado}: reportada {val_existencia}, calculada {existencia_calculada} (Inscripción {val_inscripcion} - Bajas {val_bajas})"
-                                        })
-                                    else:
-                                        self.validaciones_exitosas.append({
-                                            'tipo': 'COHERENCIA_EXISTENCIA',
-                                            'concepto': f'{tipo}-{grado}',
-                                            'valor': val_existencia,
-                                            'descripcion': f"✅ Coherencia {tipo}-{grado}: Existencia {val_existencia} = Inscripción {val_inscripcion} - Bajas {val_bajas}"
-                                        })
-                                        print(f"✅ Coherencia correcta en {tipo}-{grado}")
-
-                            except Exception as e:
-                                print(f"⚠️ Error validando coherencia en col {col_idx}: {e}")
-                            
-            except Exception as e:
-                print(f"⚠️ Error validando coherencia de filas: {e}")
+        idx_conceptos = np.array(filas, dtype=np.intp)
+        idx_filas = np.array([indices['filas'][f][1] for f in filas], dtype=np.intp)
+        sumandos = matriz if contexto.clases is None else np.where(np.isin(contexto.clases, _NO_SUMANDO), 0.0, matriz)
+        sumas = {tipo: sumandos[np.ix_(idx_filas, columnas)].sum(axis=1)
+                 for tipo, columnas in contexto.columnas_genero.items()}
+
+        # Rejilla filas × subtotales, en el mismo orden en que se revisaban
+        columnas = np.array([j for _, j in subtotales])
+        reportados = matriz[np.ix_(idx_filas, columnas)]
+        calculados = np.column_stack([sumas[tipo] for tipo, _ in subtotales])
+        reglas = np.array([id_regla(f'SUBTOTAL_{tipo}') for tipo, _ in subtotales])
+        if contexto.clases is None:
+            legibles = np.ones(calculados.shape, dtype=bool)
         else:
-            print("⚠️ No se pudieron identificar todas las filas necesarias para validación de coherencia")
+            legibles = ~np.isin(contexto.clases[np.ix_(idx_filas, columnas)], _NO_SUBTOTAL)
+        discrepa = self._agregar_comprobaciones(
+            np.broadcast_to(reglas, calculados.shape)[legibles],
+            np.broadcast_to(idx_conceptos[:, np.newaxis], calculados.shape)[legibles],
+            np.broadcast_to(columnas, calculados.shape)[legibles], calculados[legibles], reportados[legibles]
+        )
 
-    def _validar_totales(self, datos_numericos: pd.DataFrame):
+        logger.debug("   📊 Subtotales: %s revisados, %s discrepancias", discrepa.size, int(discrepa.sum()))
+
+    def _validar_coherencia_filas(self, matriz: np.ndarray):
         """
-        Validar que los totales coincidan con la suma de subtotales H + M.
+        Validar coherencia entre filas relacionadas (Existencia = Inscripción - Bajas)
+        en todas las columnas de datos a la vez.
         """
-        print("🧮 Validando totales (Subtotal H + Subtotal M)...")
+        logger.debug("🔄 Validando coherencia entre filas...")
 
-        # Verificar si tenemos columnas de totales detectadas
-        if not self.estructura_detectada.get('columnas_totales'):
-            print("⚠️ No se detectaron columnas de totales")
+        estructura = self.estructura_detectada
+        filas = [estructura.get('fila_inscripcion'), estructura.get('fila_bajas'), estructura.get('fila_existencia')]
+        if any(fila is None for fila in filas):
+            logger.warning("⚠️ No se pudieron identificar todas las filas necesarias para validación de coherencia")
+            return
+
+        idx_inscripcion, idx_bajas, idx_existencia = (fila - _OFFSET_FILA_NUMERICA for fila in filas)
+        if not all(0 <= idx < len(matriz) for idx in (idx_inscripcion, idx_bajas, idx_existencia)):
+            logger.error("❌ Índices fuera de rango para datos_numericos (%s filas)", len(matriz))
             return
 
-        print(f"✅ Detectadas {len(self.estructura_detectada['columnas_totales'])} columnas de totales")
+        columnas = self._contexto.columnas_datos
+        if not len(columnas):
+            return
 
-        # Validar cada fila de conceptos
-        for concepto, fila_idx in self.estructura_detectada['filas_conceptos']:
-            # MAPEAR índice de tabla completa a datos_numericos
-            offset_numerico = 3  # Primer fila de datos numéricos
-            idx_numerico = fila_idx - offset_numerico
+        self._contexto.filas_coherencia = (idx_inscripcion, idx_bajas)
+        calculada = matriz[idx_inscripcion, columnas] - matriz[idx_bajas, columnas]
+        discrepa = self._agregar_comprobaciones('COHERENCIA_EXISTENCIA', -1, np.arange(len(columnas)),
+                                                calculada, matriz[idx_existencia, columnas])
 
-            if 0 <= idx_numerico < len(datos_numericos):
-                print(f"🔍 Validando total de {concepto} en fila {fila_idx}")
-                self._validar_fila_totales(datos_numericos, concepto, fila_idx)
-            else:
-                print(f"⚠️ Fila {fila_idx} fuera de rango para total de {concepto} (mapeado: {idx_numerico})")
+        logger.debug("   📊 Coherencia: %s columnas revisadas, %s discrepancias", discrepa.size, int(discrepa.sum()))
 
-    def _validar_fila_totales(self, datos_numericos: pd.DataFrame, concepto: str, fila_idx: int):
+    def _validar_totales(self, matriz: np.ndarray):
         """
-        Validar total de una fila específica.
+        Validar los totales de todas las filas a la vez.
 
-        - Para conceptos normales: Total = Subtotal H + Subtotal M
-        - Para GRUPOS: Total = suma directa de todas las celdas H + M
+        - Para conceptos normales: Total = Subtotal H + Subtotal M, y los
+          subtotales deben coincidir con la suma directa de las celdas
+        - Para GRUPOS: Total = suma directa de las celdas H + M positivas
         """
-        try:
-            print(f"🔍 Validando total para {concepto} (fila {fila_idx})")
-
-            # MAPEAR índice de tabla completa a datos_numericos
-            offset_numerico = 3  # Primer fila de datos numéricos
-            idx_numerico = fila_idx - offset_numerico
-
-            if idx_numerico < 0 or idx_numerico >= len(datos_numericos):
-                print(f"⚠️ Fila {fila_idx} fuera de rango para datos_numericos")
-                return
-
-            fila_cruda = datos_numericos.iloc[idx_numerico]
-
-            # Validación especial para GRUPOS
-            if 'GRUPOS' in concepto.upper():
-                self._validar_total_grupos(fila_cruda, concepto)
-                return
-
-            # Buscar subtotales H y M en esta fila
-            subtotal_h = None
-            subtotal_m = None
-
-            for item in self.estructura_detectada['columnas_subtotales']:
-                if len(item) >= 2:
-                    tipo, col_idx = item[0], item[1]
-
-                    # MAPEAR columna de tabla completa a datos_numericos
-                    offset_columna = 7  # Primera columna de datos numéricos
-                    idx_columna = col_idx - offset_columna
-
-                    if 0 <= idx_columna < len(fila_cruda):
-                        valor_celda = fila_cruda.iloc[idx_columna]
-                        valor_num = self._convertir_a_numero(valor_celda)
-
-                        if valor_num is not None:
-                            if tipo == 'H':
-                                subtotal_h = valor_num
-                                print(f"   📊 Subtotal H: {subtotal_h}")
-                            elif tipo == 'M':
-                                subtotal_m = valor_num
-                                print(f"   📊 Subtotal M: {subtotal_m}")
-
-            # Calcular total esperado y mostrar operación
-            if subtotal_h is not None and subtotal_m is not None:
-                total_calculado = subtotal_h + subtotal_m
-                print(f"🧮 Total calculado para {concepto}: {subtotal_h} (H) + {subtotal_m} (M) = {total_calculado}")
-
-                # VALIDACIÓN CRUZADA: Calcular también suma directa de celdas
-                total_directo = self._calcular_total_directo(fila_cruda, concepto)
-                if abs(total_calculado - total_directo) > 0.01:
-                    print(f"⚠️ DISCREPANCIA INTERNA en {concepto}:")
-                    print(f"   Método subtotales: {total_calculado}")
-                    print(f"   Método directo: {total_directo}")
-                    print(f"   Diferencia: {abs(total_calculado - total_directo)}")
-
-                    # AGREGAR como discrepancia oficial
-                    self.discrepancias.append({
-                        'tipo': 'DISCREPANCIA_INTERNA',
-                        'concepto': concepto,
-                        'valor_reportado': total_calculado,
-                        'valor_calculado': total_directo,
-                        'diferencia': abs(total_calculado - total_directo),
-                        'descripcion': f"❌ {concepto}: Subtotales suman {total_calculado}, pero celdas suman {total_directo}. Problema en subtotales H/M."
-                    })
-                else:
-                    print(f"✅ Validación cruzada OK: {total_calculado} = {total_directo}")
-
-                # Buscar totales reportados
-                for item in self.estructura_detectada['columnas_totales']:
-                    if len(item) >= 2:
-                        tipo, col_idx = item[0], item[1]
-
-                        # MAPEAR columna de tabla completa a datos_numericos
-                        offset_columna = 7  # Primera columna de datos numéricos
-                        idx_columna = col_idx - offset_columna
-
-                        if 0 <= idx_columna < len(fila_cruda):
-                            valor_celda = fila_cruda.iloc[idx_columna]
-                            total_reportado = self._convertir_a_numero(valor_celda)
-
-                            if total_reportado is not None:
-                                print(f"📋 Total reportado: {total_reportado}")
-
-                                if abs(total_calculado - total_reportado) > 0.01:
-                                    self.discrepancias.append({
-                                        'tipo': 'TOTAL',
-                                        'concepto': concepto,
-                                        'valor_reportado': total_reportado,
-                                        'valor_calculado': total_calculado,
-                                        'diferencia': abs(total_calculado - total_reportado),
-                                        'descripcion': f"❌ Total {concepto}: reportado {total_reportado}, calculado {subtotal_h} (H) + {subtotal_m} (M) = {total_calculado}"
-                                    })
-                                else:
-                                    self.validaciones_exitosas.append({
-                                        'tipo': 'TOTAL',
-                                        'concepto': concepto,
-                                        'valor': total_reportado,
-                                        'descripcion': f"✅ Total {concepto}: {subtotal_h} (H) + {subtotal_m} (M) = {total_reportado}"
-                                    })
-                                    print(f"✅ Total correcto en {concepto}")
-                                break  # Solo validar el primer total encontrado
-            else:
-                subtotal_h_str = f"{subtotal_h}" if subtotal_h is not None else "NO ENCONTRADO"
-                subtotal_m_str = f"{subtotal_m}" if subtotal_m is not None else "NO ENCONTRADO"
-                print(f"⚠️ No se encontraron ambos subtotales para calcular total de {concepto}")
-                print(f"   📊 Subtotal H: {subtotal_h_str}")
-                print(f"   📊 Subtotal M: {subtotal_m_str}")
-
-                # Agregar como discrepancia si hay datos pero faltan subtotales
-                if subtotal_h is None or subtotal_m is None:
-                    self.discrepancias.append({
-                        'tipo': 'SUBTOTALES_FALTANTES',
-                        'concepto': concepto,
-                        'valor_reportado': 'N/A',
-                        'valor_calculado': 'N/A',
-                        'diferencia': 0,
-                        'descripcion': f"❌ {concepto}: Subtotal H: {subtotal_h_str}, Subtotal M: {subtotal_m_str}"
-                    })
+        logger.debug("🧮 Validando totales (Subtotal H + Subtotal M)...")
 
-        except Exception as e:
-            print(f"⚠️ Error validando total en {concepto}: {e}")
+        if not self.estructura_detectada.get('columnas_totales'):
+            logger.warning("⚠️ No se detectaron columnas de totales")
+            return
 
-    def _validar_total_grupos(self, fila_cruda, concepto):
-        """
-        Validar total de GRUPOS sumando directamente todas las celdas H y M.
+        indices = self._indices
+        contexto = self._contexto
+        filas = indices['filas']
+        if not filas:
+            return
 
-        Para GRUPOS no hay subtotales reales, el total es la suma directa.
-        """
-        try:
-            print(f"🔍 Validación especial para {concepto} - suma directa de celdas")
-
-            # Sumar todas las celdas de datos H y M directamente
-            suma_total_calculada = 0
-            celdas_sumadas = []
-
-            for item in self.estructura_detectada['columnas_datos']:
-                if len(item) >= 2:
-                    tipo, col_idx = item[0], item[1]
-                    grado = item[2] if len(item) > 2 else f"Col{col_idx}"
-
-                    # MAPEAR columna de tabla completa a datos_numericos
-                    offset_columna = 7  # Primera columna de datos numéricos
-                    idx_columna = col_idx - offset_columna
-
-                    if 0 <= idx_columna < len(fila_cruda):
-                        valor_num = self._convertir_a_numero(fila_cruda.iloc[idx_columna])
-                        if valor_num is not None and valor_num > 0:  # Solo sumar valores positivos
-                            suma_total_calculada += valor_num
-                            celdas_sumadas.append(f"{tipo}-{grado}: {valor_num}")
-                            print(f"   📊 {tipo}-{grado}: {valor_num}")
-
-            # Mostrar operación completa
-            if celdas_sumadas:
-                operacion_completa = " + ".join([celda.split(": ")[1] for celda in celdas_sumadas])
-                print(f"🧮 Total GRUPOS calculado: {operacion_completa} = {suma_total_calculada}")
-                print(f"📋 Celdas incluidas: {', '.join([celda.split(': ')[0] for celda in celdas_sumadas])}")
-            else:
-                print(f"🧮 Total GRUPOS calculado: 0 (sin celdas con valores)")
-                print(f"📋 Celdas sumadas: 0")
-
-            # Buscar total reportado
-            for item in self.estructura_detectada['columnas_totales']:
-                if len(item) >= 2:
-                    tipo, col_idx = item[0], item[1]
-
-                    # MAPEAR columna de tabla completa a datos_numericos
-                    offset_columna = 7  # Primera columna de datos numéricos
-                    idx_columna = col_idx - offset_columna
-
-                    if 0 <= idx_columna < len(fila_cruda):
-                        valor_celda = fila_cruda.iloc[idx_columna]
-                        total_reportado = self._convertir_a_numero(valor_celda)
-
-                        if total_reportado is not None:
-                            print(f"📋 Total GRUPOS reportado: {total_reportado}")
-
-                            if abs(suma_total_calculada - total_reportado) > 0.01:
-                                self.discrepancias.append({
-                                    'tipo': 'TOTAL_GRUPOS',
-                                    'concepto': concepto,
-                                    'valor_reportado': total_reportado,
-                                    'valor_calculado': suma_total_calculada,
-                                    'diferencia': abs(suma_total_calculada - total_reportado),
-                                    'descripcion': f"❌ Total GRUPOS: reportado {total_reportado}, calculado {' + '.join([celda.split(': ')[1] for celda in celdas_sumadas]) if celdas_sumadas else '0'} = {suma_total_calculada}"
-                                })
-                            else:
-                                self.validaciones_exitosas.append({
-                                    'tipo': 'TOTAL_GRUPOS',
-                                    'concepto': concepto,
-                                    'valor': total_reportado,
-                                    'descripcion': f"✅ Total GRUPOS: {' + '.join([celda.split(': ')[1] for celda in celdas_sumadas]) if celdas_sumadas else '0'} = {total_reportado} (suma directa)"
-                                })
-                                print(f"✅ Total GRUPOS correcto")
-                            break  # Solo validar el primer total encontrado
+        idx_filas = np.array([i for _, i in filas], dtype=np.intp)
+        celdas = matriz[np.ix_(idx_filas, contexto.columnas_datos)]
+        total_directo = celdas.sum(axis=1)
+        total_grupos = np.where(celdas > 0, celdas, 0.0).sum(axis=1)
+        columna_total = indices['totales'][0][1] if indices['totales'] else None
+
+        conceptos = np.arange(len(filas))
+        es_grupos = np.array(['GRUPOS' in concepto.upper() for concepto, _ in filas])
+        normales = conceptos[~es_grupos]
+        sin_valor = np.full(len(filas), np.nan)
+
+        bloques = []
+        if columna_total is not None:
+            grupos = conceptos[es_grupos]
+            bloques.append(_BloqueTotales(regla='TOTAL_GRUPOS', conceptos=grupos, columna=columna_total,
+                                          esperado=total_grupos[grupos],
+                                          reportado=matriz[idx_filas[grupos], columna_total]))
+
+        if contexto.columna_h is None or contexto.columna_m is None:
+            bloques.append(_BloqueTotales(regla='SUBTOTALES_FALTANTES', conceptos=normales, columna=-1,
+                                          esperado=sin_valor[normales], reportado=sin_valor[normales],
+                                          siempre_discrepa=True))
+        else:
+            total_calculado = matriz[idx_filas, contexto.columna_h] + matriz[idx_filas, contexto.columna_m]
+            internas = normales[np.abs(total_calculado[normales] - total_directo[normales]) > 0.01]
+            bloques.append(_BloqueTotales(regla='DISCREPANCIA_INTERNA', conceptos=internas, columna=-1,
+                                          esperado=total_directo[internas], reportado=total_calculado[internas],
+                                          siempre_discrepa=True))
+            if columna_total is not None:
+                # Dentro de cada concepto, el total va después de la discrepancia interna
+                bloques.append(_BloqueTotales(regla='TOTAL', conceptos=normales, columna=columna_total,
+                                              esperado=total_calculado[normales],
+                                              reportado=matriz[idx_filas[normales], columna_total], orden=1))
+
+        bloques = [bloque for bloque in bloques if len(bloque.conceptos)]
+        if not bloques:
+            return
 
-        except Exception as e:
-            print(f"⚠️ Error validando total de GRUPOS: {e}")
+        def unir(campo, dtype=None):
+            return np.concatenate([np.broadcast_to(np.asarray(getattr(bloque, campo), dtype=dtype),
+                                                   len(bloque.conceptos)) for bloque in bloques])
 
-    def _calcular_total_directo(self, fila_cruda, concepto):
+        # Mismo orden que la revisión fila por fila: por concepto y, dentro de él, por bloque
+        conceptos_bloques = unir('conceptos')
+        orden = np.argsort(conceptos_bloques * 2 + unir('orden'), kind='stable')
+        reglas = unir('regla_id')
+        self._agregar_comprobaciones(reglas[orden], conceptos_bloques[orden], unir('columna')[orden],
+                                     unir('esperado', np.float64)[orden], unir('reportado', np.float64)[orden],
+                                     unir('siempre_discrepa', bool)[orden])
+
+        logger.debug("   📊 Totales: %s filas revisadas", len(filas))
+
+    def _reglas_esquema(self, forma: Tuple[int, int]):
         """
-        Calcular total sumando directamente todas las celdas H y M.
+        Reglas del esquema no integradas, compiladas para matrices de esta forma.
 
-        Esto sirve para validación cruzada contra el método de subtotales.
+        Returns:
+            ReglasCompiladas o None si no hay esquema o una fórmula no es válida
         """
-        try:
-            suma_directa = 0
-            celdas_sumadas = []
+        if self.nombre_esquema is None:
+            return None
+        forma = tuple(forma)
+        if forma not in self._reglas_cache:
+            try:
+                self._reglas_cache[forma] = reglas_de_esquema(self.nombre_esquema, forma, _REGLAS_INTEGRADAS)
+            except ValueError as e:
+                logger.warning("⚠️ Reglas del esquema %s no compiladas: %s", self.nombre_esquema, e)
+                self._reglas_cache[forma] = None
+        return self._reglas_cache[forma]
 
-            for item in self.estructura_detectada['columnas_datos']:
-                if len(item) >= 2:
-                    tipo, col_idx = item[0], item[1]
-                    grado = item[2] if len(item) > 2 else f"Col{col_idx}"
+    def _validar_reglas_esquema(self, matriz: np.ndarray):
+        """
+        Evaluar las reglas adicionales del esquema (todas en una sola pasada).
+        """
+        reglas = self._reglas_esquema(matriz.shape)
+        if reglas is None or not len(reglas):
+            return
 
-                    # MAPEAR columna de tabla completa a datos_numericos
-                    offset_columna = 7  # Primera columna de datos numéricos
-                    idx_columna = col_idx - offset_columna
+        logger.debug("📐 Validando %s reglas del esquema...", len(reglas.formulas))
+        self._contexto.reglas = reglas
+        esperado, reportado = reglas.evaluar(matriz)
+        ids = np.array([id_regla(_tipo_regla(regla)) for regla in reglas.etiquetas[:, 0]])
+        self._agregar_comprobaciones(ids, -1, np.arange(len(reglas)), esperado, reportado)
 
-                    if 0 <= idx_columna < len(fila_cruda):
-                        valor_num = self._convertir_a_numero(fila_cruda.iloc[idx_columna])
-                        if valor_num is not None:
-                            suma_directa += valor_num
-                            if valor_num > 0:  # Solo mostrar valores no-cero
-                                celdas_sumadas.append(f"{tipo}-{grado}: {valor_num}")
+    def _agregar_comprobaciones(self, regla, concepto, columna, esperado, reportado, siempre_discrepa=False) -> np.ndarray:
+        """
+        Registrar un bloque de comprobaciones como discrepancias o validaciones exitosas.
 
-            return suma_directa
+        Discrepa toda comprobación con diferencia mayor a 0.01 (o marcada en
+        siempre_discrepa); el orden de cada lista se conserva.
 
-        except Exception as e:
-            print(f"⚠️ Error calculando total directo: {e}")
-            return 0
+        Returns:
+            np.ndarray: Máscara de discrepancias del bloque
+        """
+        if isinstance(regla, str):
+            regla = id_regla(regla)
+        esperado = np.asarray(esperado, dtype=np.float64)
+        reportado = np.asarray(reportado, dtype=np.float64)
+        discrepa = (np.abs(esperado - reportado) > 0.01) | siempre_discrepa
+        campos = [np.broadcast_to(valor, esperado.shape) for valor in (regla, concepto, columna, esperado, reportado)]
+        self.discrepancias.agregar(*(valor[discrepa] for valor in campos))
+        self.validaciones_exitosas.agregar(*(valor[~discrepa] for valor in campos))
+        return discrepa
 
     def _generar_reporte(self) -> Dict:
         """
@@ -875,6 +1018,8 @@ class DataValidator:
     def _generar_resumen(self) -> str:
         """
         Generar resumen textual completo de validaciones.
+
+        Solo se describen los dos primeros ejemplos de cada tipo de discrepancia.
         """
         total_validaciones = len(self.validaciones_exitosas) + len(self.discrepancias)
 
@@ -886,34 +1031,21 @@ class DataValidator:
         resumen += f"⚠️ Discrepancias: {len(self.discrepancias)}\n"
 
         # Mostrar validaciones exitosas (resumen)
-        if self.validaciones_exitosas:
+        if len(self.validaciones_exitosas):
             resumen += f"\n✅ VALIDACIONES EXITOSAS:\n"
-            tipos_exitosos = {}
-            for val in self.validaciones_exitosas:
-                tipo = val['tipo']
-                if tipo not in tipos_exitosos:
-                    tipos_exitosos[tipo] = []
-                tipos_exitosos[tipo].append(val)
-
-            for tipo, validaciones in tipos_exitosos.items():
-                resumen += f"   📊 {tipo}: {len(validaciones)} correctas\n"
+            for tipo, cantidad in self.validaciones_exitosas.contar_por_regla().items():
+                resumen += f"   📊 {tipo}: {cantidad} correctas\n"
 
         # Mostrar discrepancias (detallado)
-        if self.discrepancias:
+        if len(self.discrepancias):
             resumen += f"\n⚠️ DISCREPANCIAS ENCONTRADAS:\n"
-            tipos_disc = {}
-            for disc in self.discrepancias:
-                tipo = disc['tipo']
-                if tipo not in tipos_disc:
-                    tipos_disc[tipo] = []
-                tipos_disc[tipo].append(disc)
-
-            for tipo, discrepancias in tipos_disc.items():
-                resumen += f"   📊 {tipo}: {len(discrepancias)} casos\n"
-                for disc in discrepancias[:2]:  # Mostrar máximo 2 ejemplos
-                    resumen += f"      • {disc['descripcion']}\n"
-                if len(discrepancias) > 2:
-                    resumen += f"      • ... y {len(discrepancias) - 2} más\n"
+            reglas = self.discrepancias.datos['regla']
+            for tipo, cantidad in self.discrepancias.contar_por_regla().items():
+                resumen += f"   📊 {tipo}: {cantidad} casos\n"
+                for k in np.nonzero(reglas == id_regla(tipo))[0][:2]:  # Mostrar máximo 2 ejemplos
+                    resumen += f"      • {self.discrepancias[k]['descripcion']}\n"
+                if cantidad > 2:
+                    resumen += f"      • ... y {cantidad - 2} más\n"
 
         return resumen
 
@@ -952,9 +1084,181 @@ class DataValidator:
                     return float(valor_limpio)
 
             # Otros tipos no soportados
-            print(f"⚠️ Tipo no soportado para conversión: {type(valor)} - {valor}")
+            logger.warning("⚠️ Tipo no soportado para conversión: %s - %s", type(valor), valor)
             return 0.0
 
         except (ValueError, TypeError) as e:
-            print(f"⚠️ Error convirtiendo '{valor}' a número: {e}")
+            logger.warning("⚠️ Error convirtiendo '%s' a número: %s", valor, e)
             return 0.0
+
+
+def _clase_celda(valor) -> int:
+    """Clase (_CELDA_*) de una celda según cómo la leía la validación de subtotales."""
+    if isinstance(valor, str):
+        if valor.startswith('[') and valor.endswith(']'):
+            interior = valor.strip('[]')
+            if interior.strip() == '':
+                return _CELDA_MARCADOR_VACIO
+            return _CELDA_MARCADOR if _es_flotante(interior) else _CELDA_TEXTO
+        if valor.strip() == '':
+            return _CELDA_EN_BLANCO
+    elif valor is None or pd.isna(valor):
+        return _CELDA_VACIA
+    return _CELDA_NUMERO if _es_flotante(valor) else _CELDA_TEXTO
+
+
+def _es_flotante(valor) -> bool:
+    try:
+        float(valor)
+        return True
+    except (ValueError, TypeError):
+        return False
+
+
+def _tipo_regla(regla: str) -> str:
+    """Tipo de discrepancia de una regla del esquema (ej. 'coherencia.ALTAS' → 'REGLA_COHERENCIA_ALTAS')."""
+    return 'REGLA_' + regla.upper().replace('.', '_')
+
+
+class _ContextoTabla:
+    """
+    Datos de una validación de tabla con los que sus registros se describen.
+
+    Los registros guardan solo índices y valores; el concepto y el texto
+    de cada uno se arman aquí cuando alguien los consulta.
+    """
+
+    def __init__(self, matriz: np.ndarray, indices: Dict, clases: Optional[np.ndarray] = None):
+        self.matriz = matriz
+        self.indices = indices
+        self.clases = clases  # ver DataValidator._clases_celdas
+        self.columnas_datos = np.array([j for _, j, _ in indices['datos']], dtype=np.intp)
+        self.columnas_genero = {tipo: np.array([j for t, j, _ in indices['datos'] if t == tipo], dtype=np.intp)
+                                for tipo in ('H', 'M')}
+
+        # El último subtotal de cada género es el que cuenta en los totales
+        columna_h = [j for tipo, j in indices['subtotales'] if tipo == 'H'][-1:]
+        columna_m = [j for tipo, j in indices['subtotales'] if tipo == 'M'][-1:]
+        self.columna_h = columna_h[0] if columna_h else None
+        self.columna_m = columna_m[0] if columna_m else None
+
+        self.filas_coherencia = None  # (inscripción, bajas), ver _validar_coherencia_filas
+        self.reglas = None            # ReglasCompiladas, ver _validar_reglas_esquema
+
+    def _fila(self, registro) -> int:
+        return self.indices['filas'][registro.concepto_idx][1]
+
+    def _valor(self, i: int, j: int) -> float:
+        return float(self.matriz[i, j])
+
+    def _celda(self, i: int, j: int):
+        """Valor de la celda como lo mostraba la validación de subtotales (vacías = 0 entero)."""
+        if self.clases is not None and self.clases[i, j] in _CERO_ENTERO:
+            return 0
+        return self._valor(i, j)
+
+    def concepto(self, registro) -> str:
+        """Concepto legible del registro."""
+        tipo = registro.tipo
+        if tipo == 'COHERENCIA_EXISTENCIA':
+            genero, _, grado = self.indices['datos'][registro.columna_idx]
+            return f'{genero}-{grado}'
+        if tipo.startswith('REGLA_'):
+            return self.reglas.etiquetas[registro.columna_idx][1]
+        return self.indices['filas'][registro.concepto_idx][0]
+
+    def descripcion(self, registro) -> str:
+        """Descripción legible del registro (mismo texto que mostraba el validador)."""
+        tipo = registro.tipo
+        concepto = self.concepto(registro)
+        reportado, calculado = registro.reportado, registro.esperado
+
+        if tipo in ('SUBTOTAL_H', 'SUBTOTAL_M'):
+            genero = tipo[-1]
+            i = self._fila(registro)
+            sumandos = [self._celda(i, j) for j in self.columnas_genero[genero].tolist()
+                        if self.clases is None or self.clases[i, j] not in _NO_SUMANDO]
+            operacion = " + ".join(str(v) for v in sumandos) or "0"
+            calculado = sum(sumandos) if sumandos else 0
+            reportado = self._celda(i, registro.columna_idx)
+            if registro.exito:
+                return f"✅ Subtotal {genero} en {concepto}: {operacion} = {reportado} (correcto)"
+            return f"❌ Subtotal {genero} en {concepto}: reportado {reportado}, calculado {operacion} = {calculado}"
+
+        if tipo == 'TOTAL_GRUPOS':
+            celdas = self.matriz[self._fila(registro), self.columnas_datos]
+            operacion = " + ".join(str(v) for v in celdas[celdas > 0].tolist()) or "0"
+            if registro.exito:
+                return f"✅ Total GRUPOS: {operacion} = {reportado} (suma directa)"
+            return f"❌ Total GRUPOS: reportado {reportado}, calculado {operacion} = {calculado}"
+
+        if tipo == 'TOTAL':
+            i = self._fila(registro)
+            subtotal_h, subtotal_m = self._valor(i, self.columna_h), self._valor(i, self.columna_m)
+            if registro.exito:
+                return f"✅ Total {concepto}: {subtotal_h} (H) + {subtotal_m} (M) = {reportado}"
+            return f"❌ Total {concepto}: reportado {reportado}, calculado {subtotal_h} (H) + {subtotal_m} (M) = {calculado}"
+
+        if tipo == 'DISCREPANCIA_INTERNA':
+            return f"❌ {concepto}: Subtotales suman {reportado}, pero celdas suman {calculado}. Problema en subtotales H/M."
+
+        if tipo == 'SUBTOTALES_FALTANTES':
+            i = self._fila(registro)
+            subtotal_h = self._valor(i, self.columna_h) if self.columna_h is not None else "NO ENCONTRADO"
+            subtotal_m = self._valor(i, self.columna_m) if self.columna_m is not None else "NO ENCONTRADO"
+            return f"❌ {concepto}: Subtotal H: {subtotal_h}, Subtotal M: {subtotal_m}"
+
+        if tipo == 'COHERENCIA_EXISTENCIA':
+            j = self.columnas_datos[registro.columna_idx]
+            inscripcion, bajas = (self._valor(i, j) for i in self.filas_coherencia)
+            if registro.exito:
+                return f"✅ Coherencia {concepto}: Existencia {reportado} = Inscripción {inscripcion} - Bajas {bajas}"
+            return f"Existencia {concepto}: reportada {reportado}, calculada {calculado} (Inscripción {inscripcion} - Bajas {bajas})"
+
+        # Reglas del esquema
+        regla, _, columna = self.reglas.etiquetas[registro.columna_idx]
+        formula = self.reglas.formulas[regla]
+        if registro.exito:
+            return f"✅ Regla {regla} en {concepto}/{columna}: {reportado} = {formula}"
+        return f"❌ Regla {regla} en {concepto}/{columna}: reportado {reportado}, calculado {calculado} ({formula})"
+
+
+class _ContextoCruzado:
+    """
+    Describe las comparaciones ESC1 vs ESC2 guardadas como registros.
+
+    Cada registro guarda la posición del grado en concepto (-1 = todos), el
+    género en columna (0 = H, 1 = M, -1 = ambos), ESC1 en esperado y ESC2
+    en reportado; se consultan con las claves de antes (grado, genero,
+    valor_esc1, ...) y la descripción se arma solo si alguien la pide.
+    """
+
+    claves = ('tipo', 'grado', 'genero', 'valor_esc1', 'valor_esc2', 'diferencia', 'coincide', 'descripcion')
+
+    def valor(self, registro, clave: str):
+        """Valor de una clave del registro (salvo 'tipo' y 'descripcion')."""
+        if clave == 'grado':
+            return str(registro.concepto_idx + 1) if registro.concepto_idx >= 0 else None
+        if clave == 'genero':
+            return ('H', 'M')[registro.columna_idx] if registro.columna_idx >= 0 else None
+        if clave == 'valor_esc1':
+            return registro.esperado
+        if clave == 'valor_esc2':
+            return registro.reportado
+        if clave == 'diferencia':
+            return abs(registro.esperado - registro.reportado)
+        if clave == 'coincide':
+            return abs(registro.esperado - registro.reportado) <= _TOLERANCIA_CRUZADA
+        raise KeyError(clave)
+
+    def descripcion(self, registro) -> str:
+        """Descripción legible (mismo texto que armaba la validación cruzada)."""
+        grado, genero = self.valor(registro, 'grado'), self.valor(registro, 'genero')
+        if registro.tipo == 'EXISTENCIA_VS_GRUPOS':
+            texto = f"Alumnos {genero} de {grado}° (grupos ESC1 vs existencia ESC2)"
+        elif registro.tipo == 'GRUPOS_POR_GRADO':
+            texto = f"Grupos de {grado}°"
+        else:
+            texto = f"Total de alumnos {genero}"
+        marca = "✅" if self.valor(registro, 'coincide') else "❌"
+        return f"{marca} {texto}: ESC1 {registro.esperado}, ESC2 {registro.reportado}"
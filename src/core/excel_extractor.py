@@ -11,12 +11,17 @@ PRINCIPIOS:
 ✅ Sin lógica de negocio: solo lectura
 ✅ Reutilizable: funciona con cualquier hoja/rango
 ✅ Configurable: usa esquemas dinámicos
+✅ Un solo parseo por archivo: WorkbookSession compartida entre llamadas
+✅ Motores intercambiables: completo, streaming (read-only) o xml directo
 """
 
+import logging
 import pandas as pd
-from openpyxl import load_workbook
 from typing import Dict, List, Tuple, Optional, Any
-from ..utils.excel_utils import cargar_excel
+from ..config.settings import MOTOR_EXTRACCION
+from .workbook_session import WorkbookSession, abrir_sesion_libro, MOTORES_SESION
+
+logger = logging.getLogger(__name__)
 
 
 class ExcelExtractor:
@@ -26,9 +31,46 @@ class ExcelExtractor:
     Responsabilidad única: leer datos de archivos Excel sin transformarlos.
     """
     
-    def __init__(self):
-        """Inicializar extractor."""
-        print("📊 ExcelExtractor inicializado")
+    def __init__(self, motor: Optional[str] = None):
+        """
+        Inicializar extractor.
+
+        Args:
+            motor: Motor de lectura ('completo', 'streaming', 'xml').
+                   Si None, usa MOTOR_EXTRACCION de settings.
+        """
+        self.motor = motor or MOTOR_EXTRACCION
+        if self.motor not in MOTORES_SESION:
+            raise ValueError(f"Motor de extracción no válido: {self.motor}")
+
+        self._sesion: Optional[WorkbookSession] = None
+        logger.debug("📊 ExcelExtractor inicializado - Motor: %s", self.motor)
+
+    def abrir_sesion(self, archivo_path: str) -> WorkbookSession:
+        """
+        Obtener sesión abierta del archivo, reutilizando la actual si sigue vigente.
+
+        Todas las consultas sobre el mismo archivo (datos, celdas combinadas,
+        hojas, validación) comparten un único parseo del libro.
+
+        Args:
+            archivo_path: Ruta del archivo Excel
+
+        Returns:
+            Sesión abierta sobre el archivo
+        """
+        if self._sesion is not None and self._sesion.es_vigente(archivo_path):
+            return self._sesion
+
+        self.cerrar_sesion()
+        self._sesion = abrir_sesion_libro(archivo_path, self.motor)
+        return self._sesion
+
+    def cerrar_sesion(self):
+        """Liberar el libro mantenido en la sesión actual."""
+        if self._sesion is not None:
+            self._sesion.cerrar()
+            self._sesion = None
     
     def extraer_hoja_simple(self, archivo_path: str, hoja_nombre: str, rango: str) -> pd.DataFrame:
         """
@@ -42,21 +84,21 @@ class ExcelExtractor:
         Returns:
             DataFrame con datos tal como están en Excel
         """
-        print(f"📋 Extrayendo hoja '{hoja_nombre}' rango '{rango}' de {archivo_path}")
+        logger.debug("📋 Extrayendo hoja '%s' rango '%s' de %s", hoja_nombre, rango, archivo_path)
         
-        # Cargar hoja
-        hoja = cargar_excel(archivo_path, hoja_nombre)
+        # Obtener sesión (un solo parseo por archivo)
+        sesion = self.abrir_sesion(archivo_path)
         
         # Parsear rango
         rango_coords = self._parsear_rango(rango)
         
         # Extraer datos sin transformar
-        datos_raw = self._extraer_datos_raw(hoja, rango_coords)
+        datos_raw = sesion.leer_rango(hoja_nombre, rango_coords)
         
         # Crear DataFrame
         df = pd.DataFrame(datos_raw)
         
-        print(f"✅ Datos extraídos: {df.shape}")
+        logger.debug("✅ Datos extraídos: %s", df.shape)
         return df
     
     def extraer_multiples_hojas(self, archivo_path: str, config_hojas: Dict[str, Dict]) -> Dict[str, pd.DataFrame]:
@@ -74,7 +116,7 @@ class ExcelExtractor:
         Returns:
             Diccionario con DataFrames por hoja
         """
-        print(f"📊 Extrayendo múltiples hojas de {archivo_path}")
+        logger.debug("📊 Extrayendo múltiples hojas de %s", archivo_path)
         
         resultados = {}
         
@@ -86,10 +128,10 @@ class ExcelExtractor:
                 datos = self.extraer_hoja_simple(archivo_path, hoja_nombre, rango)
                 resultados[nombre_config] = datos
                 
-                print(f"✅ {nombre_config}: {datos.shape}")
+                logger.debug("✅ %s: %s", nombre_config, datos.shape)
                 
             except Exception as e:
-                print(f"❌ Error extrayendo {nombre_config}: {e}")
+                logger.error("❌ Error extrayendo %s: %s", nombre_config, e)
                 resultados[nombre_config] = None
         
         return resultados
@@ -105,19 +147,12 @@ class ExcelExtractor:
         Returns:
             Lista de rangos combinados como tuplas (min_row, min_col, max_row, max_col)
         """
-        print(f"🔍 Detectando celdas combinadas en '{hoja_nombre}'")
-        
-        # Cargar workbook para acceder a merged_cells
-        workbook = load_workbook(archivo_path, data_only=True)
-        hoja = workbook[hoja_nombre]
+        logger.debug("🔍 Detectando celdas combinadas en '%s'", hoja_nombre)
         
-        # Obtener rangos combinados
-        rangos_combinados = []
-        for rango in hoja.merged_cells.ranges:
-            coords = (rango.min_row, rango.min_col, rango.max_row, rango.max_col)
-            rangos_combinados.append(coords)
+        # Reutilizar el libro ya abierto por la sesión
+        rangos_combinados = self.abrir_sesion(archivo_path).obtener_celdas_combinadas(hoja_nombre)
         
-        print(f"✅ Detectadas {len(rangos_combinados)} celdas combinadas")
+        logger.debug("✅ Detectadas %s celdas combinadas", len(rangos_combinados))
         return rangos_combinados
     
     def extraer_con_metadatos(self, archivo_path: str, hoja_nombre: str, rango: str) -> Dict[str, Any]:
@@ -132,7 +167,7 @@ class ExcelExtractor:
         Returns:
             Diccionario con datos y metadatos
         """
-        print(f"📊 Extrayendo con metadatos: '{hoja_nombre}' rango '{rango}'")
+        logger.debug("📊 Extrayendo con metadatos: '%s' rango '%s'", hoja_nombre, rango)
         
         # Extraer datos principales
         datos = self.extraer_hoja_simple(archivo_path, hoja_nombre, rango)
@@ -153,7 +188,7 @@ class ExcelExtractor:
             'dimensiones': datos.shape
         }
         
-        print(f"✅ Extracción con metadatos completada")
+        logger.debug("✅ Extracción con metadatos completada")
         return resultado
     
     def _parsear_rango(self, rango: str) -> Dict[str, int]:
@@ -203,29 +238,6 @@ class ExcelExtractor:
             numero = numero * 26 + (ord(char.upper()) - ord('A') + 1)
         return numero
     
-    def _extraer_datos_raw(self, hoja, rango_coords: Dict[str, int]) -> List[List]:
-        """
-        Extraer datos raw de la hoja en el rango especificado.
-        
-        Args:
-            hoja: Hoja de Excel (openpyxl)
-            rango_coords: Coordenadas del rango
-            
-        Returns:
-            Lista de listas con datos raw
-        """
-        datos = []
-        
-        for fila in range(rango_coords['min_row'], rango_coords['max_row'] + 1):
-            fila_datos = []
-            for col in range(rango_coords['min_col'], rango_coords['max_col'] + 1):
-                celda = hoja.cell(row=fila, column=col)
-                valor = celda.value if celda.value is not None else ""
-                fila_datos.append(valor)
-            datos.append(fila_datos)
-        
-        return datos
-    
     def _filtrar_celdas_en_rango(self, celdas_combinadas: List[Tuple], rango_coords: Dict[str, int]) -> List[Tuple]:
         """
         Filtrar celdas combinadas que están dentro del rango especificado.
@@ -268,11 +280,10 @@ class ExcelExtractor:
             True si el archivo es válido
         """
         try:
-            workbook = load_workbook(archivo_path, data_only=True)
-            workbook.close()
+            self.abrir_sesion(archivo_path)
             return True
         except Exception as e:
-            print(f"❌ Error validando archivo {archivo_path}: {e}")
+            logger.error("❌ Error validando archivo %s: %s", archivo_path, e)
             return False
     
     def listar_hojas(self, archivo_path: str) -> List[str]:
@@ -286,11 +297,9 @@ class ExcelExtractor:
             Lista de nombres de hojas
         """
         try:
-            workbook = load_workbook(archivo_path, data_only=True)
-            hojas = workbook.sheetnames
-            workbook.close()
-            print(f"📋 Hojas disponibles: {hojas}")
+            hojas = self.abrir_sesion(archivo_path).listar_hojas()
+            logger.debug("📋 Hojas disponibles: %s", hojas)
             return hojas
         except Exception as e:
-            print(f"❌ Error listando hojas: {e}")
+            logger.error("❌ Error listando hojas: %s", e)
             return []
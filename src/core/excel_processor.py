@@ -10,13 +10,26 @@ ARQUITECTURA:
 ✅ Configuración dinámica: Sin hardcodeo
 ✅ Extensible: Preparado para validaciones cruzadas
 ✅ Mantenible: Código limpio y organizado
+✅ Caché persistente: archivos sin cambios no se vuelven a parsear
+✅ Vistas perezosas: las vistas de la interfaz se calculan al consultarlas
 """
 
+import logging
+from functools import partial
 import pandas as pd
-from ..config.settings import get_config_actual
+from ..config.settings import get_config_actual, CACHE_EXTRACCION
 from ..config.table_schemas import get_table_schema
 from .excel_extractor import ExcelExtractor
-from .data_transformer import DataTransformer
+from .data_transformer import DataTransformer, SALIDAS_COMPLETAS
+from .extraction_cache import ExtractionCache
+from .resultado_procesamiento import GeneradorConjunto, ResultadoProcesamiento
+
+logger = logging.getLogger(__name__)
+
+
+def _vistas_desde_extraccion(transformer, datos_raw, celdas_combinadas, rango_numerico, claves):
+    """Calcular juntas las salidas pendientes con una pasada de transformar_fusionado()."""
+    return transformer.transformar_fusionado(datos_raw, celdas_combinadas, rango_numerico, tuple(claves))
 
 
 class ExcelProcessor:
@@ -26,19 +39,52 @@ class ExcelProcessor:
     GARANTÍA: Comportamiento idéntico al ExcelProcessor actual.
     """
 
-    def __init__(self):
-        """Inicializar procesador con arquitectura modular."""
-        # Datos procesados
-        self.datos_crudos = None
-        self.datos_combinados = None
-        self.datos_numericos = None
-        self.mapeo_posicional = None
+    def __init__(self, cache=None, salidas=SALIDAS_COMPLETAS):
+        """
+        Inicializar procesador con arquitectura modular.
+
+        Args:
+            cache: ExtractionCache a usar. Si None, se crea según
+                   CACHE_EXTRACCION['HABILITADO']. False la desactiva.
+            salidas: Claves que produce extraer_datos_completo(). SALIDAS_LOTE
+                     omite las vistas que solo usa la interfaz gráfica.
+        """
+        # Último resultado procesado (ver propiedades datos_crudos, etc.)
+        self.resultado = None
 
         # Inicializar módulos especializados
         self.extractor = ExcelExtractor()
         self.transformer = DataTransformer()
 
-        print("📊 ExcelProcessor inicializado con arquitectura modular")
+        # Caché persistente de extracción
+        if cache is None:
+            cache = ExtractionCache() if CACHE_EXTRACCION.get('HABILITADO', False) else False
+        self.cache = cache or None
+        self.salidas = tuple(salidas)
+
+        logger.debug("📊 ExcelProcessor inicializado con arquitectura modular")
+
+    @property
+    def datos_crudos(self):
+        return self._salida_actual('datos_crudos')
+
+    @property
+    def datos_combinados(self):
+        return self._salida_actual('datos_combinados')
+
+    @property
+    def datos_numericos(self):
+        return self._salida_actual('datos_numericos')
+
+    @property
+    def mapeo_posicional(self):
+        return self._salida_actual('mapeo_posicional')
+
+    def _salida_actual(self, clave):
+        """Salida del último resultado (la calcula si era perezosa), o None."""
+        if self.resultado is None or clave not in self.resultado:
+            return None
+        return self.resultado[clave]
 
     def extraer_datos_completo(self, archivo_path):
         """
@@ -47,18 +93,25 @@ class ExcelProcessor:
         Args:
             archivo_path: Ruta del archivo Excel
 
+        Las vistas para la interfaz (datos_crudos, datos_combinados,
+        mapeo_posicional) se calculan la primera vez que se consultan.
+
         Returns:
-            dict: Diccionario con datos procesados
+            ResultadoProcesamiento: Se usa como dict (solo las claves de self.salidas)
                 {
                     'datos_crudos': DataFrame con marcadores [valor],
                     'datos_combinados': DataFrame vista Excel,
                     'datos_numericos': DataFrame solo números,
-                    'mapeo_posicional': dict con mapeo posicional
+                    'mapeo_posicional': MapeoPosicional (se consulta como dict)
                 }
         """
-        print(f"📋 ExcelProcessor procesando: {archivo_path}")
+        logger.debug("📋 ExcelProcessor procesando: %s", archivo_path)
 
-        return self._procesar_archivo_modular(archivo_path)
+        try:
+            return self._procesar_archivo_modular(archivo_path)
+        finally:
+            # Las vistas perezosas no vuelven a leer el libro: no dejarlo abierto
+            self.extractor.cerrar_sesion()
 
     def _procesar_archivo_modular(self, archivo_path):
         """
@@ -70,7 +123,7 @@ class ExcelProcessor:
         Returns:
             dict: Datos procesados con formato estándar
         """
-        print("🔄 Procesando con arquitectura modular...")
+        logger.debug("🔄 Procesando con arquitectura modular...")
         
         try:
             # 🎯 Obtener configuración dinámica (igual que original)
@@ -78,7 +131,18 @@ class ExcelProcessor:
             hoja_nombre = config_actual['HOJA_DATOS']
             rango_datos = config_actual['RANGO_DATOS']
 
-            print(f"⚙️ Configuración: Hoja '{hoja_nombre}', Rango '{rango_datos}'")
+            logger.debug("⚙️ Configuración: Hoja '%s', Rango '%s'", hoja_nombre, rango_datos)
+
+            rango_numerico = self._obtener_rango_numerico_dinamico()
+
+            # 💾 Reutilizar resultado en caché si el archivo no cambió
+            clave_cache = None
+            if self.cache is not None:
+                clave_cache = self.cache.generar_clave(archivo_path, hoja_nombre, rango_datos, rango_numerico)
+                en_cache = self.cache.obtener(clave_cache)
+                if en_cache is not None:
+                    logger.debug("💾 Resultado recuperado de caché")
+                    return self._restaurar_desde_cache(en_cache, rango_numerico)
 
             # 📊 PASO 1: Extracción usando nuevo módulo
             resultado_extraccion = self.extractor.extraer_con_metadatos(
@@ -88,55 +152,76 @@ class ExcelProcessor:
             datos_raw = resultado_extraccion['datos']
             celdas_combinadas = resultado_extraccion['celdas_combinadas']
             
-            print(f"✅ Extracción completada: {datos_raw.shape}")
+            logger.debug("✅ Extracción completada: %s", datos_raw.shape)
 
-            # 🔄 PASO 2: Crear marcadores usando nuevo módulo
-            self.datos_crudos = self.transformer.crear_marcadores_combinadas(
-                datos_raw, celdas_combinadas
+            # 🔄 PASOS 2-4: Solo los datos numéricos se calculan ahora; las
+            # vistas se derivan del bloque extraído cuando se consultan
+            transformado = self.transformer.transformar_fusionado(
+                datos_raw, celdas_combinadas, rango_numerico, ('datos_numericos',)
             )
-            
-            # VALIDACIÓN CRÍTICA: Verificar dimensiones exactas
-            if self.datos_crudos.shape != (13, 26):  # Ajustar según datos reales
-                print(f"⚠️ Dimensión inesperada datos_crudos: {self.datos_crudos.shape}")
-
-            print("📋 DATOS CRUDOS (con marcadores []):")
-            print(self.datos_crudos.head(8).to_string())
-
-            # 🔄 PASO 3: Vista combinada usando nuevo módulo
-            self.datos_combinados = self.transformer.crear_vista_combinada(
-                self.datos_crudos
-            )
-            
-            # VALIDACIÓN CRÍTICA: Verificar que vista combinada es correcta
-            if self.datos_combinados.shape != self.datos_crudos.shape:
-                print(f"❌ Error: dimensiones no coinciden entre crudos y combinados")
+            datos_numericos = transformado['datos_numericos']
+            resultado = self._crear_resultado(datos_raw, celdas_combinadas, datos_numericos, rango_numerico)
+            self.resultado = resultado
 
-            # 🔄 PASO 4: Datos numéricos usando nuevo módulo
-            rango_numerico = self._obtener_rango_numerico_dinamico()
-            self.datos_numericos, self.mapeo_posicional = self.transformer.extraer_datos_numericos(
-                self.datos_crudos, rango_numerico
-            )
-            
             # VALIDACIÓN CRÍTICA: Verificar dimensiones de datos numéricos
-            if self.datos_numericos.shape[0] != 10:  # Debe ser (10, 19)
-                print(f"⚠️ Dimensión inesperada datos_numericos: {self.datos_numericos.shape}")
+            if datos_numericos.shape[0] != 10:  # Debe ser (10, 19)
+                logger.warning("⚠️ Dimensión inesperada datos_numericos: %s", datos_numericos.shape)
+
+            logger.debug("✅ Procesamiento modular completado exitosamente")
 
-            print(f"✅ Procesamiento modular completado exitosamente")
+            # La caché guarda el bloque extraído, no las vistas
+            if clave_cache is not None:
+                self.cache.guardar(clave_cache, datos_raw, datos_numericos, celdas_combinadas)
 
-            # Retornar datos procesados
-            return {
-                'datos_crudos': self.datos_crudos,
-                'datos_combinados': self.datos_combinados,
-                'datos_numericos': self.datos_numericos,
-                'mapeo_posicional': self.mapeo_posicional
-            }
+            return resultado
 
         except Exception as e:
-            print(f"❌ Error en procesamiento modular: {e}")
+            logger.error("❌ Error en procesamiento modular: %s", e)
             raise e  # Re-lanzar excepción para debugging
 
 
 
+    def _restaurar_desde_cache(self, en_cache, rango_numerico):
+        """
+        Reconstruir las salidas pedidas a partir de una entrada de caché.
+
+        Args:
+            en_cache: Diccionario devuelto por ExtractionCache.obtener()
+            rango_numerico: Configuración del rango numérico
+
+        Returns:
+            ResultadoProcesamiento: Datos procesados con formato estándar
+        """
+        self.resultado = self._crear_resultado(en_cache['datos'], en_cache['celdas_combinadas'],
+                                               en_cache['datos_numericos'], rango_numerico)
+        return self.resultado
+
+    def _crear_resultado(self, datos_raw, celdas_combinadas, datos_numericos, rango_numerico):
+        """
+        Crear el resultado con los datos numéricos ya calculados.
+
+        Las demás salidas (crudos, vista combinada, mapeo posicional) quedan
+        perezosas: la primera consulta a cualquiera de ellas las calcula
+        todas juntas, con una sola pasada sobre el bloque extraído.
+
+        Args:
+            datos_raw: DataFrame extraído de la hoja
+            celdas_combinadas: Rangos combinados del bloque
+            datos_numericos: DataFrame numérico
+            rango_numerico: Configuración del rango numérico
+
+        Returns:
+            ResultadoProcesamiento: Solo con las claves de self.salidas
+        """
+        valores = {'datos_numericos': datos_numericos}
+        vistas = GeneradorConjunto(partial(_vistas_desde_extraccion, self.transformer, datos_raw,
+                                           celdas_combinadas, rango_numerico))
+        generadores = {clave: vistas for clave in self.salidas if clave != 'datos_numericos'}
+        return ResultadoProcesamiento(
+            {clave: valor for clave, valor in valores.items() if clave in self.salidas},
+            generadores
+        )
+
     def _obtener_rango_numerico_dinamico(self):
         """Obtener rango numérico dinámico desde configuración de esquemas."""
         # Obtener configuración actual
@@ -161,7 +246,7 @@ class ExcelProcessor:
             'columnas_fin': 25
         })
 
-        print(f"🎯 Rango numérico dinámico para {modo_actual}: {rango_numerico}")
+        logger.debug("🎯 Rango numérico dinámico para %s: %s", modo_actual, rango_numerico)
         return rango_numerico
 
     def extraer_multiples_hojas(self, archivo_path, config_hojas):
@@ -185,63 +270,67 @@ class ExcelProcessor:
                     "ESC2": {datos_crudos, datos_combinados, datos_numericos, mapeo_posicional}
                 }
         """
-        print(f"📊 Extrayendo múltiples hojas de: {archivo_path}")
-        print(f"🎯 Hojas a procesar: {list(config_hojas.keys())}")
+        logger.debug("📊 Extrayendo múltiples hojas de: %s", archivo_path)
+        logger.debug("🎯 Hojas a procesar: %s", list(config_hojas.keys()))
 
         resultados = {}
 
-        for nombre_hoja, config in config_hojas.items():
-            try:
-                print(f"🔄 Procesando hoja: {nombre_hoja}")
-
-                # Extracción usando módulos especializados
-                resultado_extraccion = self.extractor.extraer_con_metadatos(
-                    archivo_path, config['hoja'], config['rango']
-                )
-
-                datos_raw = resultado_extraccion['datos']
-                celdas_combinadas = resultado_extraccion['celdas_combinadas']
-
-                # Transformación usando módulos especializados
-                datos_crudos = self.transformer.crear_marcadores_combinadas(
-                    datos_raw, celdas_combinadas
-                )
-
-                datos_combinados = self.transformer.crear_vista_combinada(
-                    datos_crudos
-                )
-
-                # Datos numéricos con configuración específica si existe
-                if 'rango_numerico' in config:
-                    rango_numerico = config['rango_numerico']
-                else:
-                    # Calcular rango numérico dinámico basado en el rango de datos
-                    rango_numerico = self._calcular_rango_numerico_desde_datos(config['rango'])
-
-                datos_numericos, mapeo_posicional = self.transformer.extraer_datos_numericos(
-                    datos_crudos, rango_numerico
-                )
-
-                # Almacenar resultado
-                resultados[nombre_hoja] = {
-                    'datos_crudos': datos_crudos,
-                    'datos_combinados': datos_combinados,
-                    'datos_numericos': datos_numericos,
-                    'mapeo_posicional': mapeo_posicional,
-                    'tipo': config.get('tipo', 'desconocido'),
-                    'config': config
-                }
-
-                print(f"✅ {nombre_hoja} procesada: {datos_crudos.shape}")
-
-            except Exception as e:
-                print(f"❌ Error procesando {nombre_hoja}: {e}")
-                resultados[nombre_hoja] = {
-                    'error': str(e),
-                    'config': config
-                }
-
-        print(f"✅ Múltiples hojas procesadas: {len(resultados)} hojas")
+        try:
+            for nombre_hoja, config in config_hojas.items():
+                try:
+                    logger.debug("🔄 Procesando hoja: %s", nombre_hoja)
+
+                    # Extracción usando módulos especializados
+                    resultado_extraccion = self.extractor.extraer_con_metadatos(
+                        archivo_path, config['hoja'], config['rango']
+                    )
+
+                    datos_raw = resultado_extraccion['datos']
+                    celdas_combinadas = resultado_extraccion['celdas_combinadas']
+
+                    # Transformación usando módulos especializados
+                    datos_crudos, mascara_marcadores = self.transformer.crear_marcadores_combinadas(
+                        datos_raw, celdas_combinadas, devolver_mascara=True
+                    )
+
+                    datos_combinados = self.transformer.crear_vista_combinada(
+                        datos_crudos, mascara_marcadores
+                    )
+
+                    # Datos numéricos con configuración específica si existe
+                    if 'rango_numerico' in config:
+                        rango_numerico = config['rango_numerico']
+                    else:
+                        # Calcular rango numérico dinámico basado en el rango de datos
+                        rango_numerico = self._calcular_rango_numerico_desde_datos(config['rango'])
+
+                    datos_numericos, mapeo_posicional = self.transformer.extraer_datos_numericos(
+                        datos_crudos, rango_numerico
+                    )
+
+                    # Almacenar resultado
+                    resultados[nombre_hoja] = {
+                        'datos_crudos': datos_crudos,
+                        'datos_combinados': datos_combinados,
+                        'datos_numericos': datos_numericos,
+                        'mapeo_posicional': mapeo_posicional,
+                        'tipo': config.get('tipo', 'desconocido'),
+                        'config': config
+                    }
+
+                    logger.debug("✅ %s procesada: %s", nombre_hoja, datos_crudos.shape)
+
+                except Exception as e:
+                    logger.error("❌ Error procesando %s: %s", nombre_hoja, e)
+                    resultados[nombre_hoja] = {
+                        'error': str(e),
+                        'config': config
+                    }
+        finally:
+            # Todas las hojas salen de la misma sesión; se cierra al terminar
+            self.extractor.cerrar_sesion()
+
+        logger.info("✅ Múltiples hojas procesadas: %s hojas", len(resultados))
         return resultados
 
     def _calcular_rango_numerico_desde_datos(self, rango_datos):
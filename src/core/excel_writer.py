@@ -13,10 +13,13 @@ CARACTERÍSTICAS:
 ✅ Extensible y testeable
 """
 
+import logging
 from openpyxl import load_workbook
 from typing import Dict, Any, List, Tuple
 from ..config.ui_config import get_ui_config
 
+logger = logging.getLogger(__name__)
+
 
 class ExcelWriter:
     """
@@ -29,7 +32,7 @@ class ExcelWriter:
     def __init__(self):
         """Inicializar escritor de Excel."""
         self.ui_config = get_ui_config()
-        print("📝 ExcelWriter inicializado")
+        logger.debug("📝 ExcelWriter inicializado")
     
     def escribir_datos_en_hoja(self, archivo_path: str, hoja_nombre: str, 
                               datos_mapeados: List[Tuple[int, int, Any]], 
@@ -47,13 +50,13 @@ class ExcelWriter:
             bool: True si la escritura fue exitosa
         """
         try:
-            print(f"📝 Escribiendo datos en {archivo_path}, hoja '{hoja_nombre}'")
+            logger.debug("📝 Escribiendo datos en %s, hoja '%s'", archivo_path, hoja_nombre)
             
             # Cargar workbook
             workbook = load_workbook(archivo_path)
             
             if hoja_nombre not in workbook.sheetnames:
-                print(f"❌ Hoja '{hoja_nombre}' no encontrada")
+                logger.error("❌ Hoja '%s' no encontrada", hoja_nombre)
                 return False
             
             hoja = workbook[hoja_nombre]
@@ -73,11 +76,11 @@ class ExcelWriter:
             workbook.save(archivo_path)
             workbook.close()
             
-            print(f"✅ Escritura completada: {datos_escritos} valores escritos")
+            logger.debug("✅ Escritura completada: %s valores escritos", datos_escritos)
             return True
             
         except Exception as e:
-            print(f"❌ Error escribiendo en Excel: {e}")
+            logger.error("❌ Error escribiendo en Excel: %s", e)
             return False
     
     def _escribir_valor_en_celda(self, hoja, fila: int, columna: int, valor: Any, 
@@ -104,21 +107,21 @@ class ExcelWriter:
                 if fila == rango_combinado.min_row and columna == rango_combinado.min_col:
                     celda = hoja.cell(row=fila, column=columna)
                     celda.value = valor
-                    print(f"   📝 Escrito en celda principal combinada {celda.coordinate}: {valor}")
+                    logger.debug("   📝 Escrito en celda principal combinada (%s,%s): %s", fila, columna, valor)
                     return True
                 else:
                     # Celda secundaria de rango combinado - no escribir
-                    print(f"   ⏭️ Saltando celda secundaria combinada ({fila},{columna})")
+                    logger.debug("   ⏭️ Saltando celda secundaria combinada (%s,%s)", fila, columna)
                     return False
             else:
                 # Celda normal - escribir directamente
                 celda = hoja.cell(row=fila, column=columna)
                 celda.value = valor
-                print(f"   📝 Escrito en celda normal {celda.coordinate}: {valor}")
+                logger.debug("   📝 Escrito en celda normal (%s,%s): %s", fila, columna, valor)
                 return True
                 
         except Exception as e:
-            print(f"   ❌ Error escribiendo en celda ({fila},{columna}): {e}")
+            logger.error("   ❌ Error escribiendo en celda (%s,%s): %s", fila, columna, e)
             return False
     
     def _crear_mapa_combinadas(self, rangos_combinados) -> Dict[Tuple[int, int], Any]:
@@ -138,7 +141,7 @@ class ExcelWriter:
                 for col in range(rango_combinado.min_col, rango_combinado.max_col + 1):
                     mapa_combinadas[(fila, col)] = rango_combinado
         
-        print(f"🔗 Mapa de celdas combinadas creado: {len(rangos_combinados)} rangos")
+        logger.debug("🔗 Mapa de celdas combinadas creado: %s rangos", len(rangos_combinados))
         return mapa_combinadas
     
     def validar_archivo_escribible(self, archivo_path: str) -> Dict[str, Any]:
@@ -203,11 +206,11 @@ class ExcelWriter:
             # Copiar archivo
             shutil.copy2(archivo_path, backup_path)
             
-            print(f"💾 Backup creado: {backup_path}")
+            logger.debug("💾 Backup creado: %s", backup_path)
             return backup_path
             
         except Exception as e:
-            print(f"❌ Error creando backup: {e}")
+            logger.error("❌ Error creando backup: %s", e)
             raise e
     
     def obtener_info_hoja(self, archivo_path: str, hoja_nombre: str) -> Dict[str, Any]:
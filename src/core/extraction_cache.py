@@ -0,0 +1,212 @@
+"""
+💾 EXTRACTION CACHE - Caché Persistente de Extracción
+=====================================================
+
+Guarda en disco el resultado de procesar un archivo Excel para que
+las re-ejecuciones de una concentración no vuelvan a parsear archivos
+que no cambiaron.
+
+CARACTERÍSTICAS:
+✅ Clave por contenido: hash del archivo + hoja + rangos + versión de esquemas
+✅ Invalidación automática al modificar table_schemas
+✅ Formato binario compacto (pickle + zlib)
+✅ Tamaño acotado: expulsa las entradas menos usadas (LRU)
+✅ Tolerante a fallos: una entrada dañada se descarta, nunca rompe el flujo
+"""
+
+import logging
+import os
+import pickle
+import hashlib
+import zlib
+import pandas as pd
+from typing import Dict, Any, Optional
+from ..config.settings import CACHE_EXTRACCION, get_absolute_path
+from ..config.table_schemas import get_schemas_version
+
+logger = logging.getLogger(__name__)
+
+# Versión del formato de las entradas (cambiar si cambia el contenido guardado)
+VERSION_FORMATO = 3
+EXTENSION = ".bin"
+
+
+class ExtractionCache:
+    """
+    Caché en disco de resultados de extracción.
+
+    Guarda por archivo el bloque extraído, sus celdas combinadas y
+    datos_numericos; las vistas (datos_crudos, etc.) se derivan del bloque
+    solo si se consultan.
+    """
+
+    def __init__(self, directorio: Optional[str] = None, tamano_maximo_bytes: Optional[int] = None):
+        """
+        Inicializar caché.
+
+        Args:
+            directorio: Carpeta de la caché (por defecto CACHE_EXTRACCION['DIRECTORIO'])
+            tamano_maximo_bytes: Límite de tamaño (por defecto CACHE_EXTRACCION['TAMANO_MAXIMO_MB'])
+        """
+        if directorio is None:
+            directorio = get_absolute_path(CACHE_EXTRACCION['DIRECTORIO'])
+        if tamano_maximo_bytes is None:
+            tamano_maximo_bytes = CACHE_EXTRACCION['TAMANO_MAXIMO_MB'] * 1024 * 1024
+
+        self.directorio = directorio
+        self.tamano_maximo_bytes = tamano_maximo_bytes
+        os.makedirs(self.directorio, exist_ok=True)
+
+        logger.debug("💾 ExtractionCache inicializada en %s", self.directorio)
+
+    def generar_clave(self, archivo_path: str, hoja_nombre: str, rango: str,
+                      rango_numerico: Dict[str, int]) -> str:
+        """
+        Generar clave de caché para un archivo y configuración de extracción.
+
+        Args:
+            archivo_path: Ruta del archivo Excel
+            hoja_nombre: Nombre de la hoja
+            rango: Rango de datos (ej. "A5:Z17")
+            rango_numerico: Configuración del rango numérico
+
+        Returns:
+            Clave hexadecimal
+        """
+        huella = hashlib.blake2b(digest_size=20)
+        with open(archivo_path, 'rb') as archivo:
+            for bloque in iter(lambda: archivo.read(1024 * 1024), b''):
+                huella.update(bloque)
+
+        huella.update(repr((
+            VERSION_FORMATO,
+            hoja_nombre,
+            rango,
+            sorted(rango_numerico.items()),
+            get_schemas_version()
+        )).encode('utf-8'))
+
+        return huella.hexdigest()
+
+    def obtener(self, clave: str) -> Optional[Dict[str, Any]]:
+        """
+        Obtener resultado guardado.
+
+        Args:
+            clave: Clave generada con generar_clave()
+
+        Returns:
+            Diccionario con 'datos' (bloque extraído), 'datos_numericos' y
+            'celdas_combinadas', o None si no existe
+        """
+        ruta = self._ruta_entrada(clave)
+        try:
+            with open(ruta, 'rb') as archivo:
+                contenido = pickle.loads(zlib.decompress(archivo.read()))
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning("⚠️ Entrada de caché inválida, se descarta: %s", e)
+            self._eliminar(ruta)
+            return None
+
+        # Marcar como usada recientemente (LRU por fecha de modificación)
+        try:
+            os.utime(ruta, None)
+        except OSError:
+            pass
+
+        # Reconstruir desde listas para inferir los mismos tipos que la extracción;
+        # la matriz numérica ya se guarda tipada (int64/float64)
+        return {
+            'datos': pd.DataFrame(contenido['datos'].tolist()),
+            'datos_numericos': pd.DataFrame(contenido['datos_numericos']),
+            'celdas_combinadas': [tuple(celda) for celda in contenido['celdas_combinadas']]
+        }
+
+    def guardar(self, clave: str, datos: pd.DataFrame, datos_numericos: pd.DataFrame,
+                celdas_combinadas):
+        """
+        Guardar resultado de extracción.
+
+        Args:
+            clave: Clave generada con generar_clave()
+            datos: Bloque extraído de la hoja (ExcelExtractor.extraer_con_metadatos)
+            datos_numericos: DataFrame numérico
+            celdas_combinadas: Lista de tuplas de rangos combinados
+        """
+        contenido = {
+            'datos': datos.to_numpy(dtype=object),
+            'datos_numericos': datos_numericos.to_numpy(),
+            'celdas_combinadas': [tuple(celda) for celda in celdas_combinadas]
+        }
+
+        ruta = self._ruta_entrada(clave)
+        temporal = f"{ruta}.{os.getpid()}.tmp"
+        try:
+            with open(temporal, 'wb') as archivo:
+                archivo.write(zlib.compress(pickle.dumps(contenido, protocol=pickle.HIGHEST_PROTOCOL)))
+            os.replace(temporal, ruta)
+        except Exception as e:
+            logger.warning("⚠️ No se pudo guardar en caché: %s", e)
+            self._eliminar(temporal)
+            return
+
+        self._expulsar_excedente()
+
+    def limpiar(self):
+        """Eliminar todas las entradas de la caché."""
+        for ruta, _, _ in self._listar_entradas():
+            self._eliminar(ruta)
+        logger.debug("🗑️ Caché de extracción limpiada")
+
+    def obtener_estadisticas(self) -> Dict[str, int]:
+        """
+        Obtener estadísticas de uso.
+
+        Returns:
+            dict: {'entradas': n, 'tamano_bytes': total}
+        """
+        entradas = self._listar_entradas()
+        return {
+            'entradas': len(entradas),
+            'tamano_bytes': sum(tamano for _, tamano, _ in entradas)
+        }
+
+    def _ruta_entrada(self, clave: str) -> str:
+        """Ruta del archivo de una entrada."""
+        return os.path.join(self.directorio, clave + EXTENSION)
+
+    def _listar_entradas(self):
+        """Listar entradas como tuplas (ruta, tamaño, último uso)."""
+        entradas = []
+        try:
+            with os.scandir(self.directorio) as iterador:
+                for entrada in iterador:
+                    if entrada.is_file() and entrada.name.endswith(EXTENSION):
+                        estado = entrada.stat()
+                        entradas.append((entrada.path, estado.st_size, estado.st_mtime_ns))
+        except FileNotFoundError:
+            pass
+        return entradas
+
+    def _expulsar_excedente(self):
+        """Eliminar las entradas usadas hace más tiempo hasta respetar el límite."""
+        entradas = self._listar_entradas()
+        tamano_total = sum(tamano for _, tamano, _ in entradas)
+        if tamano_total <= self.tamano_maximo_bytes:
+            return
+
+        for ruta, tamano, _ in sorted(entradas, key=lambda entrada: entrada[2]):
+            if tamano_total <= self.tamano_maximo_bytes:
+                break
+            self._eliminar(ruta)
+            tamano_total -= tamano
+
+    @staticmethod
+    def _eliminar(ruta: str):
+        """Eliminar archivo ignorando errores."""
+        try:
+            os.remove(ruta)
+        except OSError:
+            pass
@@ -0,0 +1,203 @@
+"""
+🧾 REGISTROS DE VALIDACIÓN - Resultados Compactos con Descripción Perezosa
+=========================================================================
+
+Guarda las discrepancias y validaciones exitosas del DataValidator como un
+arreglo estructurado (regla, concepto, columna, esperado, reportado) en
+lugar de un diccionario con textos por comprobación.
+
+Cada elemento se sigue usando como el diccionario de antes
+(registro['tipo'], registro['descripcion'], ...), pero el concepto y la
+descripción legibles solo se construyen cuando alguien los consulta (la
+ventana de detalles, un resumen o una exportación).
+
+CARACTERÍSTICAS:
+✅ Un registro = 5 campos numéricos; sin textos mientras nadie los pida
+✅ Comprobaciones agregadas por bloques (arreglos), sin ciclos por celda
+✅ Interfaz de lista de diccionarios: los consumidores existentes no cambian
+✅ Conteo por regla sin construir registros (contar_por_regla)
+✅ Otras formas de registro: el contexto puede declarar sus propias claves
+"""
+
+from collections.abc import Mapping, Sequence
+from typing import Any, Dict, Iterator, List, Tuple
+
+import numpy as np
+
+# Campos de cada registro
+DTYPE_REGISTRO = np.dtype([
+    ('regla', np.int32),        # Identificador de la regla (ver id_regla)
+    ('concepto', np.int32),     # Índice del concepto (o -1); lo interpreta el contexto
+    ('columna', np.int32),      # Índice de la columna (o -1); lo interpreta el contexto
+    ('esperado', np.float64),   # Valor calculado (NaN = no disponible)
+    ('reportado', np.float64)   # Valor reportado (NaN = no disponible)
+])
+
+# Claves de cada registro, igual que los diccionarios del validador
+CLAVES_DISCREPANCIA = ('tipo', 'concepto', 'valor_reportado', 'valor_calculado', 'diferencia', 'descripcion')
+CLAVES_EXITOSA = ('tipo', 'concepto', 'valor', 'descripcion')
+
+# Registro global de nombres de regla ('SUBTOTAL_H', 'TOTAL', ...) ↔ identificador
+_NOMBRES_REGLA: List[str] = []
+_IDS_REGLA: Dict[str, int] = {}
+
+
+def id_regla(nombre: str) -> int:
+    """Identificador numérico de una regla (se asigna la primera vez)."""
+    if nombre not in _IDS_REGLA:
+        _IDS_REGLA[nombre] = len(_NOMBRES_REGLA)
+        _NOMBRES_REGLA.append(nombre)
+    return _IDS_REGLA[nombre]
+
+
+def nombre_regla(identificador: int) -> str:
+    """Nombre de una regla a partir de su identificador."""
+    return _NOMBRES_REGLA[identificador]
+
+
+class RegistroValidacion(Mapping):
+    """
+    Un resultado de validación con interfaz de diccionario.
+
+    'concepto' y 'descripcion' se piden al contexto al consultarlos; los
+    valores no disponibles (NaN) se muestran como 'N/A'.
+
+    Si el contexto define 'claves', esas son las claves del registro y
+    cada valor (salvo 'tipo' y 'descripcion') lo entrega contexto.valor().
+    """
+
+    __slots__ = ('regla', 'concepto_idx', 'columna_idx', 'esperado', 'reportado', 'exito', 'contexto')
+
+    def __init__(self, campos, exito: bool, contexto):
+        self.regla, self.concepto_idx, self.columna_idx, self.esperado, self.reportado = campos
+        self.exito = exito
+        self.contexto = contexto
+
+    @property
+    def tipo(self) -> str:
+        return nombre_regla(self.regla)
+
+    def _claves(self) -> Tuple[str, ...]:
+        claves = getattr(self.contexto, 'claves', None)
+        if claves is not None:
+            return claves
+        return CLAVES_EXITOSA if self.exito else CLAVES_DISCREPANCIA
+
+    def __getitem__(self, clave: str) -> Any:
+        if clave == 'tipo':
+            return self.tipo
+        if clave == 'descripcion':
+            return self.contexto.descripcion(self)
+        if getattr(self.contexto, 'claves', None) is not None:
+            if clave not in self.contexto.claves:
+                raise KeyError(clave)
+            return self.contexto.valor(self, clave)
+        if clave == 'concepto':
+            return self.contexto.concepto(self)
+        if self.exito:
+            if clave == 'valor':
+                return _valor(self.reportado)
+        elif clave == 'valor_reportado':
+            return _valor(self.reportado)
+        elif clave == 'valor_calculado':
+            return _valor(self.esperado)
+        elif clave == 'diferencia':
+            diferencia = abs(self.esperado - self.reportado)
+            return 0 if diferencia != diferencia else diferencia
+        raise KeyError(clave)
+
+    def __contains__(self, clave: Any) -> bool:
+        return clave in self._claves()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._claves())
+
+    def __len__(self) -> int:
+        return len(self._claves())
+
+    def __repr__(self) -> str:
+        return (f"RegistroValidacion({self.tipo}, concepto={self.concepto_idx}, columna={self.columna_idx}, "
+                f"esperado={self.esperado}, reportado={self.reportado})")
+
+
+def _valor(numero: float):
+    return 'N/A' if numero != numero else numero
+
+
+class RegistrosValidacion(Sequence):
+    """
+    Lista de resultados de validación guardada como arreglo estructurado.
+
+    agregar() recibe bloques de comprobaciones (arreglos); los elementos se
+    entregan como RegistroValidacion al indexar o iterar.
+    """
+
+    def __init__(self, exito: bool, contexto=None):
+        """
+        Inicializar lista vacía.
+
+        Args:
+            exito: True para validaciones exitosas, False para discrepancias
+            contexto: Objeto con concepto(registro) y descripcion(registro)
+                      (o con claves y valor(registro, clave), ver RegistroValidacion)
+        """
+        self.exito = exito
+        self.contexto = contexto
+        self._bloques = []
+        self._datos = np.empty(0, dtype=DTYPE_REGISTRO)
+
+    def agregar(self, regla, concepto, columna, esperado, reportado):
+        """
+        Agregar un bloque de comprobaciones (escalares o arreglos del mismo largo).
+
+        Args:
+            regla: Nombre(s) o identificador(es) de regla
+            concepto: Índice(s) de concepto
+            columna: Índice(s) de columna
+            esperado: Valor(es) calculado(s)
+            reportado: Valor(es) reportado(s)
+        """
+        if isinstance(regla, str):
+            regla = id_regla(regla)
+        campos = np.broadcast_arrays(np.asarray(regla), np.asarray(concepto), np.asarray(columna),
+                                     np.asarray(esperado, dtype=np.float64), np.asarray(reportado, dtype=np.float64))
+        bloque = np.empty(np.size(campos[3]), dtype=DTYPE_REGISTRO)
+        for nombre, valores in zip(DTYPE_REGISTRO.names, campos):
+            bloque[nombre] = np.ravel(valores)
+        if len(bloque):
+            self._bloques.append(bloque)
+
+    @property
+    def datos(self) -> np.ndarray:
+        """Arreglo estructurado con todos los registros (DTYPE_REGISTRO)."""
+        if self._bloques:
+            self._datos = np.concatenate([self._datos] + self._bloques)
+            self._bloques = []
+        return self._datos
+
+    def contar_por_regla(self) -> Dict[str, int]:
+        """{nombre de regla: registros}, en orden de primera aparición."""
+        reglas, primeros, conteos = np.unique(self.datos['regla'], return_index=True, return_counts=True)
+        orden = np.argsort(primeros)
+        return {nombre_regla(int(reglas[k])): int(conteos[k]) for k in orden}
+
+    def __len__(self) -> int:
+        return len(self._datos) + sum(len(bloque) for bloque in self._bloques)
+
+    def __getitem__(self, indice):
+        datos = self.datos
+        if isinstance(indice, slice):
+            return [RegistroValidacion(campos, self.exito, self.contexto) for campos in datos[indice].tolist()]
+        return RegistroValidacion(datos[indice].tolist(), self.exito, self.contexto)
+
+    def __iter__(self) -> Iterator[RegistroValidacion]:
+        for campos in self.datos.tolist():
+            yield RegistroValidacion(campos, self.exito, self.contexto)
+
+    def __eq__(self, otro: Any) -> bool:
+        if isinstance(otro, (list, tuple, RegistrosValidacion)):
+            return list(self) == list(otro)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"RegistrosValidacion({'exitosas' if self.exito else 'discrepancias'}, {len(self)} registros)"
@@ -0,0 +1,255 @@
+"""
+📦 RESULTADO PROCESAMIENTO - Resultado con Vistas Perezosas
+===========================================================
+
+Contenedor del resultado de procesar un archivo Excel.
+
+Se usa como un diccionario ('datos_crudos', 'datos_numericos', ...),
+pero las vistas que solo necesita la interfaz gráfica se calculan la
+primera vez que se consultan y se guardan para los siguientes accesos.
+
+CARACTERÍSTICAS:
+✅ Interfaz de diccionario: los llamadores existentes no cambian
+✅ Vistas bajo demanda: un lote sin interfaz no las construye
+✅ Vistas conjuntas: las que salen de la misma pasada se calculan juntas
+✅ Solo lectura: DataManager, AppController y la GUI comparten los mismos
+   DataFrames sin copias defensivas (quien quiera modificar, hace .copy())
+✅ Serializable: viaja entre procesos del pool paralelo
+✅ Descargable a disco: en modo de memoria acotada los datos pesados se
+   guardan en un archivo y vuelven a memoria al consultarlos
+"""
+
+import os
+import pickle
+import zlib
+from collections.abc import MutableMapping
+from typing import Any, Callable, Dict, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def _solo_lectura(arreglo: np.ndarray) -> np.ndarray:
+    """Vista de solo lectura de un arreglo NumPy."""
+    arreglo = np.asarray(arreglo)
+    arreglo.flags.writeable = False
+    return arreglo
+
+
+def proteger_escritura(valor: Any) -> Any:
+    """
+    Proteger contra escritura los arreglos NumPy de un valor.
+
+    Los DataFrames se reconstruyen (sin copiar datos) sobre arreglos
+    marcados como solo lectura: escribir en el lugar (df.iloc[i, j] = x)
+    lanza ValueError y las operaciones que crean objetos nuevos siguen
+    funcionando. Las columnas con dtype de extensión (string, category,
+    Int64...) no tienen un arreglo NumPy que marcar: se conservan como
+    Series y Copy-on-Write evita que una escritura llegue al original.
+
+    Args:
+        valor: DataFrame, ndarray u otro objeto (se devuelve sin cambios)
+
+    Returns:
+        El ndarray marcado, un DataFrame equivalente protegido o el valor
+    """
+    if isinstance(valor, np.ndarray):
+        valor.flags.writeable = False
+        return valor
+    if not isinstance(valor, pd.DataFrame) or valor.shape[1] == 0:
+        return valor
+
+    tipos = set(valor.dtypes)
+    if len(tipos) == 1 and isinstance(next(iter(tipos)), np.dtype):
+        # Homogéneo: un solo bloque, sin reconstruir columna por columna
+        arreglo = _solo_lectura(valor)
+        return pd.DataFrame(arreglo, index=valor.index, columns=valor.columns,
+                            dtype=arreglo.dtype, copy=False)
+
+    columnas = {}
+    for posicion in range(valor.shape[1]):
+        serie = valor.iloc[:, posicion]
+        if isinstance(serie.dtype, np.dtype):
+            # dtype explícito: pandas 3 convertiría object con textos a str
+            serie = pd.Series(_solo_lectura(serie), index=valor.index, dtype=serie.dtype, copy=False)
+        columnas[posicion] = serie
+    protegido = pd.DataFrame(columnas, index=valor.index, copy=False)
+    protegido.columns = valor.columns
+    return protegido
+
+
+class GeneradorConjunto:
+    """
+    Generador de varias claves perezosas que se calculan en una sola llamada.
+
+    Se registra el mismo objeto en cada clave. La primera consulta a
+    cualquiera de ellas llama funcion(claves) con todas las claves que aún
+    lo tienen pendiente; funcion devuelve {clave: valor} y se guardan todas.
+    """
+
+    def __init__(self, funcion: Callable[[tuple], Dict[str, Any]]):
+        self.funcion = funcion
+
+
+def _es_ligero(valor: Any) -> bool:
+    """Valores que se quedan en memoria al descargar (metadatos)."""
+    return valor is None or isinstance(valor, (str, int, float, bool))
+
+
+class ResultadoProcesamiento(MutableMapping):
+    """
+    Diccionario con valores calculados bajo demanda.
+
+    Cada clave perezosa tiene un generador sin argumentos (por ejemplo un
+    functools.partial, para que el resultado siga siendo serializable) o
+    un GeneradorConjunto compartido con otras claves. Al consultarla por
+    primera vez se ejecuta y el valor queda guardado.
+    Todos los DataFrames y arreglos guardados quedan protegidos contra
+    escritura (ver proteger_escritura).
+
+    descargar() mueve a disco los valores pesados y los generadores
+    pendientes; cualquier consulta a una de esas claves los vuelve a cargar.
+    """
+
+    def __init__(self, valores: Optional[Dict[str, Any]] = None,
+                 generadores: Optional[Dict[str, Callable[[], Any]]] = None):
+        """
+        Inicializar resultado.
+
+        Args:
+            valores: Valores ya calculados
+            generadores: {clave: función sin argumentos} para las vistas perezosas
+        """
+        self._valores = {clave: proteger_escritura(valor) for clave, valor in (valores or {}).items()}
+        self._generadores = {clave: generador for clave, generador in (generadores or {}).items()
+                             if clave not in self._valores}
+
+        # Estado de descarga a disco (ver descargar/cargar)
+        self._ruta_disco = None
+        self._claves_en_disco = ()
+        self.al_cargar = None
+
+    def __getstate__(self):
+        estado = self.__dict__.copy()
+        estado['al_cargar'] = None  # Los callbacks no viajan entre procesos
+        return estado
+
+    def __getitem__(self, clave: str) -> Any:
+        if clave in self._claves_en_disco:
+            self.cargar()
+        if clave in self._valores:
+            return self._valores[clave]
+        if clave in self._generadores:
+            generador = self._generadores[clave]
+            if isinstance(generador, GeneradorConjunto):
+                # Todas las claves pendientes del mismo generador, de una vez
+                claves = tuple(c for c, g in self._generadores.items() if g is generador)
+                valores = generador.funcion(claves)
+                for c in claves:
+                    del self._generadores[c]
+                    self._valores[c] = proteger_escritura(valores[c])
+                return self._valores[clave]
+            valor = proteger_escritura(self._generadores.pop(clave)())
+            self._valores[clave] = valor
+            return valor
+        raise KeyError(clave)
+
+    def __setitem__(self, clave: str, valor: Any):
+        if clave in self._claves_en_disco:
+            self.cargar()
+        self._generadores.pop(clave, None)
+        self._valores[clave] = proteger_escritura(valor)
+
+    def __delitem__(self, clave: str):
+        if clave in self._claves_en_disco:
+            self.cargar()
+        if clave in self._valores:
+            del self._valores[clave]
+        elif clave in self._generadores:
+            del self._generadores[clave]
+        else:
+            raise KeyError(clave)
+
+    def __contains__(self, clave: Any) -> bool:
+        return clave in self._valores or clave in self._generadores or clave in self._claves_en_disco
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._valores
+        yield from self._generadores
+        yield from self._claves_en_disco
+
+    def __len__(self) -> int:
+        return len(self._valores) + len(self._generadores) + len(self._claves_en_disco)
+
+    def __repr__(self) -> str:
+        return (f"ResultadoProcesamiento(calculados={list(self._valores)}, "
+                f"pendientes={list(self._generadores)}, en_disco={list(self._claves_en_disco)})")
+
+    @property
+    def en_disco(self) -> bool:
+        """Indicar si los datos pesados están descargados a disco."""
+        return bool(self._claves_en_disco)
+
+    def descargar(self, ruta: str):
+        """
+        Mover a disco los valores pesados y los generadores pendientes.
+
+        Los metadatos (textos, números, None) se quedan en memoria.
+
+        Args:
+            ruta: Archivo donde guardarlos (pickle + zlib)
+        """
+        if self.en_disco:
+            return
+
+        pesados = {clave: valor for clave, valor in self._valores.items() if not _es_ligero(valor)}
+        if not pesados and not self._generadores:
+            return
+
+        contenido = {'valores': pesados, 'generadores': self._generadores}
+        temporal = f"{ruta}.tmp"
+        with open(temporal, 'wb') as archivo:
+            archivo.write(zlib.compress(pickle.dumps(contenido, protocol=pickle.HIGHEST_PROTOCOL)))
+        os.replace(temporal, ruta)
+
+        self._claves_en_disco = tuple(pesados) + tuple(self._generadores)
+        for clave in pesados:
+            del self._valores[clave]
+        self._generadores = {}
+        self._ruta_disco = ruta
+
+    def cargar(self):
+        """Volver a memoria lo descargado con descargar() y borrar el archivo."""
+        if not self.en_disco:
+            return
+
+        with open(self._ruta_disco, 'rb') as archivo:
+            contenido = pickle.loads(zlib.decompress(archivo.read()))
+
+        for clave, valor in contenido['valores'].items():
+            self._valores.setdefault(clave, proteger_escritura(valor))
+        for clave, generador in contenido['generadores'].items():
+            if clave not in self._valores:
+                self._generadores.setdefault(clave, generador)
+
+        self.descartar_disco()
+        if self.al_cargar is not None:
+            self.al_cargar(self)
+
+    def descartar_disco(self):
+        """Borrar el archivo de descarga (lo que tenía se pierde si no se cargó)."""
+        if self._ruta_disco is not None:
+            try:
+                os.remove(self._ruta_disco)
+            except OSError:
+                pass
+        self._ruta_disco = None
+        self._claves_en_disco = ()
+
+    def esta_calculado(self, clave: str) -> bool:
+        """Indicar si una clave ya tiene su valor (sin calcularlo)."""
+        return clave in self._valores
+
+    def pendientes(self) -> list:
+        """Claves perezosas que todavía no se han consultado."""
+        return list(self._generadores)
@@ -18,13 +18,16 @@ CARACTERÍSTICAS:
 ✅ Extensible y mantenible
 """
 
+import logging
 from typing import Dict, Any, Optional
-from ..config.settings import get_config_actual
+from ..config.settings import get_config_actual, get_absolute_path
 from ..config.table_schemas import get_table_schema
 from .template_manager import TemplateManager
 from .data_mapper import DataMapper
 from .excel_writer import ExcelWriter
 
+logger = logging.getLogger(__name__)
+
 
 class TemplateInjector:
     """
@@ -63,7 +66,7 @@ class TemplateInjector:
         # Cargar configuración del esquema
         self.esquema = self._cargar_esquema()
 
-        print(f"💉 TemplateInjector inicializado - Modo: {self.modo_actual}, Esquema: {self.esquema_nombre}")
+        logger.debug("💉 TemplateInjector inicializado - Modo: %s, Esquema: %s", self.modo_actual, self.esquema_nombre)
 
     def _cargar_esquema(self) -> Dict[str, Any]:
         """
@@ -74,11 +77,11 @@ class TemplateInjector:
         """
         try:
             esquema = get_table_schema(self.esquema_nombre)
-            print(f"✅ Esquema cargado: {self.esquema_nombre}")
+            logger.debug("✅ Esquema cargado: %s", self.esquema_nombre)
             return esquema
         except Exception as e:
-            print(f"⚠️ Error cargando esquema {self.esquema_nombre}: {e}")
-            print("🔄 Usando configuración por defecto...")
+            logger.warning("⚠️ Error cargando esquema %s: %s", self.esquema_nombre, e)
+            logger.debug("🔄 Usando configuración por defecto...")
 
             # Esquema por defecto
             return {
@@ -104,26 +107,26 @@ class TemplateInjector:
             bool: True si la inyección fue exitosa
         """
         try:
-            print(f"💉 Iniciando inyección modular...")
-            print(f"📋 Plantilla: {plantilla_path}")
-            print(f"📤 Destino: {archivo_destino}")
-            print(f"📊 Datos: {datos_sumatoria.shape}")
+            logger.debug("💉 Iniciando inyección modular...")
+            logger.debug("📋 Plantilla: %s", plantilla_path)
+            logger.debug("📤 Destino: %s", archivo_destino)
+            logger.debug("📊 Datos: %s", datos_sumatoria.shape)
 
             # PASO 1: Validar plantilla usando TemplateManager
             validacion = self.template_manager.validar_plantilla(plantilla_path)
             if not validacion['valida']:
-                print(f"❌ Plantilla inválida: {validacion['mensaje']}")
+                logger.error("❌ Plantilla inválida: %s", validacion['mensaje'])
                 return False
 
-            print(f"✅ Plantilla válida: {validacion['hoja_principal']}")
+            logger.debug("✅ Plantilla válida: %s", validacion['hoja_principal'])
 
             # PASO 2: Validar datos usando DataMapper
             validacion_datos = self.data_mapper.validar_datos_para_mapeo(datos_sumatoria)
             if not validacion_datos['valido']:
-                print(f"❌ Datos inválidos: {validacion_datos['mensaje']}")
+                logger.error("❌ Datos inválidos: %s", validacion_datos['mensaje'])
                 return False
 
-            print(f"✅ Datos válidos: {validacion_datos['detalles']}")
+            logger.debug("✅ Datos válidos: %s", validacion_datos['detalles'])
 
             # PASO 3: Mapear datos usando DataMapper con esquema dinámico
             datos_mapeados = self.data_mapper.mapear_con_esquema_dinamico(
@@ -131,7 +134,7 @@ class TemplateInjector:
             )
 
             if not datos_mapeados:
-                print("⚠️ No hay datos para inyectar")
+                logger.warning("⚠️ No hay datos para inyectar")
                 return False
 
             # PASO 4: Crear backup solo si está configurado
@@ -140,16 +143,16 @@ class TemplateInjector:
             if crear_backup:
                 backup_path = self.excel_writer.crear_backup(plantilla_path)
             else:
-                print("⏭️ Backup deshabilitado en configuración")
+                logger.debug("⏭️ Backup deshabilitado en configuración")
 
             # PASO 5: Copiar plantilla a destino
             import shutil
             shutil.copy2(plantilla_path, archivo_destino)
-            print(f"📋 Plantilla copiada a destino: {archivo_destino}")
+            logger.debug("📋 Plantilla copiada a destino: %s", archivo_destino)
 
             # PASO 6: Determinar hoja de destino desde configuración
             hoja_destino = self._obtener_hoja_destino()
-            print(f"🎯 Hoja de destino: '{hoja_destino}'")
+            logger.debug("🎯 Hoja de destino: '%s'", hoja_destino)
 
             # PASO 7: Escribir datos usando ExcelWriter
             exito_escritura = self.excel_writer.escribir_datos_en_hoja(
@@ -159,18 +162,18 @@ class TemplateInjector:
             if exito_escritura:
                 # PASO 8: Obtener estadísticas
                 estadisticas = self.data_mapper.obtener_estadisticas_mapeo(datos_mapeados)
-                print(f"📊 Estadísticas de inyección: {estadisticas}")
+                logger.debug("📊 Estadísticas de inyección: %s", estadisticas)
 
-                print(f"✅ Inyección modular completada exitosamente")
+                logger.info("✅ Inyección modular completada exitosamente")
                 if backup_path:
-                    print(f"💾 Backup disponible en: {backup_path}")
+                    logger.info("💾 Backup disponible en: %s", backup_path)
                 return True
             else:
-                print("❌ Error en escritura de datos")
+                logger.error("❌ Error en escritura de datos")
                 return False
 
         except Exception as e:
-            print(f"❌ Error en inyección modular: {str(e)}")
+            logger.error("❌ Error en inyección modular: %s", str(e))
             raise
 
     def _obtener_hoja_destino(self) -> str:
@@ -187,28 +190,31 @@ class TemplateInjector:
             hoja_destino = rango_inyeccion.get('hoja_destino')
 
             if hoja_destino:
-                print(f"✅ Hoja destino desde esquema: '{hoja_destino}'")
+                logger.debug("✅ Hoja destino desde esquema: '%s'", hoja_destino)
                 return hoja_destino
 
             # Fallback: obtener desde configuración de modo
             hoja_destino = self.config_actual.get('HOJA_INYECCION')
             if hoja_destino:
-                print(f"✅ Hoja destino desde configuración: '{hoja_destino}'")
+                logger.debug("✅ Hoja destino desde configuración: '%s'", hoja_destino)
                 return hoja_destino
 
             # Fallback final: usar hoja de datos
             hoja_destino = self.config_actual.get('HOJA_DATOS', 'Sheet1')
-            print(f"⚠️ Usando hoja de datos como destino: '{hoja_destino}'")
+            logger.warning("⚠️ Usando hoja de datos como destino: '%s'", hoja_destino)
             return hoja_destino
 
         except Exception as e:
-            print(f"❌ Error obteniendo hoja destino: {e}")
+            logger.error("❌ Error obteniendo hoja destino: %s", e)
             return "Sheet1"  # Fallback absoluto
 
     def _obtener_plantilla_dinamica(self) -> str:
         """
         Obtener ruta de plantilla desde configuración dinámica.
 
+        Las rutas de la configuración son relativas a la raíz del proyecto,
+        no al directorio de trabajo (ej. cli.py ejecutado desde otra carpeta).
+
         Returns:
             str: Ruta de la plantilla
         """
@@ -216,21 +222,22 @@ class TemplateInjector:
             # Intentar obtener desde configuración de modo
             plantilla = self.config_actual.get('PLANTILLA')
             if plantilla:
-                print(f"✅ Plantilla desde configuración: '{plantilla}'")
+                plantilla = get_absolute_path(plantilla)
+                logger.debug("✅ Plantilla desde configuración: '%s'", plantilla)
                 return plantilla
 
             # Fallback: usar plantilla por defecto del template manager
             plantilla_default = self.template_manager.obtener_plantilla_por_defecto()
             if plantilla_default:
-                print(f"✅ Plantilla por defecto: '{plantilla_default}'")
+                logger.debug("✅ Plantilla por defecto: '%s'", plantilla_default)
                 return plantilla_default
 
             # Fallback final
-            print("⚠️ Usando plantilla_base.xlsx como fallback")
+            logger.warning("⚠️ Usando plantilla_base.xlsx como fallback")
             return "plantilla_base.xlsx"
 
         except Exception as e:
-            print(f"❌ Error obteniendo plantilla: {e}")
+            logger.error("❌ Error obteniendo plantilla: %s", e)
             return "plantilla_base.xlsx"
 
     def configurar_esquema(self, nuevo_esquema_nombre: str):
@@ -242,7 +249,7 @@ class TemplateInjector:
         """
         self.esquema_nombre = nuevo_esquema_nombre
         self.esquema = self._cargar_esquema()
-        print(f"⚙️ Esquema configurado: {nuevo_esquema_nombre}")
+        logger.debug("⚙️ Esquema configurado: %s", nuevo_esquema_nombre)
 
     def obtener_configuracion_actual(self) -> Dict[str, Any]:
         """
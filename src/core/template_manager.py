@@ -13,12 +13,15 @@ CARACTERÍSTICAS:
 ✅ Extensible y testeable
 """
 
+import logging
 import os
 from pathlib import Path
 from openpyxl import load_workbook
 from typing import Dict, List, Any, Optional
 from ..config.settings import get_config_actual
 
+logger = logging.getLogger(__name__)
+
 
 class TemplateManager:
     """
@@ -32,7 +35,7 @@ class TemplateManager:
         """Inicializar gestor de plantillas."""
         self.config_actual = get_config_actual()
         self.plantillas_cache = {}
-        print("📋 TemplateManager inicializado")
+        logger.debug("📋 TemplateManager inicializado")
     
     def validar_plantilla(self, plantilla_path: str) -> Dict[str, Any]:
         """
@@ -103,7 +106,7 @@ class TemplateManager:
         try:
             # Usar cache si está disponible
             if plantilla_path in self.plantillas_cache:
-                print(f"📋 Usando info de plantilla desde cache: {plantilla_path}")
+                logger.debug("📋 Usando info de plantilla desde cache: %s", plantilla_path)
                 return self.plantillas_cache[plantilla_path]
             
             # Validar primero
@@ -161,7 +164,7 @@ class TemplateManager:
             # Guardar en cache
             self.plantillas_cache[plantilla_path] = info
             
-            print(f"📋 Info de plantilla obtenida: {info['archivo']['nombre']}")
+            logger.debug("📋 Info de plantilla obtenida: %s", info['archivo']['nombre'])
             return info
             
         except Exception as e:
@@ -185,7 +188,7 @@ class TemplateManager:
         """
         try:
             if not os.path.exists(directorio):
-                print(f"❌ Directorio no encontrado: {directorio}")
+                logger.error("❌ Directorio no encontrado: %s", directorio)
                 return []
             
             plantillas_encontradas = []
@@ -212,11 +215,11 @@ class TemplateManager:
                     
                     plantillas_encontradas.append(plantilla_info)
             
-            print(f"📋 Plantillas encontradas en {directorio}: {len(plantillas_encontradas)}")
+            logger.debug("📋 Plantillas encontradas en %s: %s", directorio, len(plantillas_encontradas))
             return plantillas_encontradas
             
         except Exception as e:
-            print(f"❌ Error buscando plantillas: {e}")
+            logger.error("❌ Error buscando plantillas: %s", e)
             return []
     
     def obtener_plantilla_por_defecto(self) -> Optional[str]:
@@ -234,7 +237,7 @@ class TemplateManager:
             if os.path.exists(plantilla_default):
                 validacion = self.validar_plantilla(plantilla_default)
                 if validacion['valida']:
-                    print(f"📋 Plantilla por defecto encontrada: {plantilla_default}")
+                    logger.debug("📋 Plantilla por defecto encontrada: %s", plantilla_default)
                     return plantilla_default
             
             # Buscar en directorios comunes
@@ -250,20 +253,20 @@ class TemplateManager:
                 if os.path.exists(plantilla_path):
                     validacion = self.validar_plantilla(plantilla_path)
                     if validacion['valida']:
-                        print(f"📋 Plantilla por defecto encontrada en {directorio}: {plantilla_path}")
+                        logger.debug("📋 Plantilla por defecto encontrada en %s: %s", directorio, plantilla_path)
                         return plantilla_path
             
-            print("⚠️ Plantilla por defecto no encontrada")
+            logger.warning("⚠️ Plantilla por defecto no encontrada")
             return None
             
         except Exception as e:
-            print(f"❌ Error obteniendo plantilla por defecto: {e}")
+            logger.error("❌ Error obteniendo plantilla por defecto: %s", e)
             return None
     
     def limpiar_cache(self):
         """Limpiar cache de plantillas."""
         self.plantillas_cache.clear()
-        print("🧹 Cache de plantillas limpiado")
+        logger.debug("🧹 Cache de plantillas limpiado")
     
     def verificar_compatibilidad_plantilla(self, plantilla_path: str, 
                                          modo: str = None) -> Dict[str, Any]:
@@ -0,0 +1,411 @@
+"""
+📂 WORKBOOK SESSION - Sesión de Lectura de Libros Excel
+=======================================================
+
+Abre un archivo Excel UNA sola vez y sirve a todas las consultas
+del extractor: valores de un rango, celdas combinadas y nombres de hojas.
+
+PRINCIPIOS:
+✅ Un solo parseo por archivo: openpyxl es el costo dominante
+✅ Solo lectura: nunca modifica el libro
+✅ Caché por hoja: celdas combinadas calculadas una vez
+✅ Detecta cambios en disco (tamaño y fecha de modificación)
+
+MOTORES:
+📦 completo: libro completo en memoria (comportamiento original)
+🌊 streaming: openpyxl read-only, se detiene en la última fila del rango
+⚡ xml: lectura directa del zip/XML, sin openpyxl para las celdas
+"""
+
+import os
+from zipfile import ZipFile
+from openpyxl import load_workbook
+from openpyxl.utils.datetime import from_excel, from_ISO8601, CALENDAR_MAC_1904, CALENDAR_WINDOWS_1900
+from typing import Dict, List, Tuple, Any
+from ..utils.xlsx_xml import (
+    leer_rangos_combinados, leer_rangos_combinados_archivo, listar_hojas_zip,
+    iterar_celdas, leer_cadenas_compartidas, leer_estilos_fecha, usa_fechas_1904
+)
+
+
+class WorkbookSession:
+    """
+    Sesión sobre un libro Excel abierto una sola vez.
+
+    Uso:
+        with WorkbookSession(archivo_path) as sesion:
+            hojas = sesion.listar_hojas()
+            datos = sesion.leer_rango('ESC2', rango_coords)
+            combinadas = sesion.obtener_celdas_combinadas('ESC2')
+    """
+
+    # Parámetros de openpyxl para este motor
+    OPCIONES_CARGA = {'data_only': True}
+
+    def __init__(self, archivo_path: str):
+        """
+        Abrir libro Excel.
+
+        Args:
+            archivo_path: Ruta del archivo Excel
+
+        Raises:
+            Exception: Si el archivo no se puede abrir
+        """
+        self.archivo_path = archivo_path
+        self.firma = self.calcular_firma(archivo_path)
+        self.workbook = None
+
+        try:
+            self._abrir()
+        except Exception as e:
+            raise Exception(f"Error al cargar el archivo Excel: {str(e)}")
+
+        self._abierta = True
+        self._combinadas_por_hoja: Dict[str, List[Tuple]] = {}
+
+    def _abrir(self):
+        """Parsear el libro con openpyxl."""
+        self.workbook = load_workbook(self.archivo_path, **self.OPCIONES_CARGA)
+
+    @staticmethod
+    def calcular_firma(archivo_path: str) -> Tuple[int, int]:
+        """
+        Calcular firma barata del archivo en disco.
+
+        Args:
+            archivo_path: Ruta del archivo
+
+        Returns:
+            Tupla (tamaño, fecha de modificación en ns)
+        """
+        estado = os.stat(archivo_path)
+        return (estado.st_size, estado.st_mtime_ns)
+
+    def es_vigente(self, archivo_path: str) -> bool:
+        """
+        Verificar si la sesión sigue sirviendo para un archivo.
+
+        Args:
+            archivo_path: Ruta del archivo solicitado
+
+        Returns:
+            True si es el mismo archivo y no cambió en disco
+        """
+        if not self._abierta or archivo_path != self.archivo_path:
+            return False
+        try:
+            return self.calcular_firma(archivo_path) == self.firma
+        except OSError:
+            return False
+
+    def listar_hojas(self) -> List[str]:
+        """
+        Listar nombres de hojas del libro.
+
+        Returns:
+            Lista de nombres de hojas
+        """
+        return list(self.workbook.sheetnames)
+
+    def obtener_hoja(self, hoja_nombre: str):
+        """
+        Obtener hoja por nombre.
+
+        Args:
+            hoja_nombre: Nombre de la hoja
+
+        Returns:
+            Hoja de Excel (openpyxl)
+        """
+        return self.workbook[hoja_nombre]
+
+    def leer_rango(self, hoja_nombre: str, rango_coords: Dict[str, int]) -> List[List]:
+        """
+        Leer valores de un rango sin transformarlos.
+
+        Args:
+            hoja_nombre: Nombre de la hoja
+            rango_coords: Coordenadas del rango (min_row, max_row, min_col, max_col)
+
+        Returns:
+            Lista de listas con valores ("" para celdas vacías)
+        """
+        hoja = self.obtener_hoja(hoja_nombre)
+        datos = []
+
+        for fila in hoja.iter_rows(min_row=rango_coords['min_row'], max_row=rango_coords['max_row'],
+                                   min_col=rango_coords['min_col'], max_col=rango_coords['max_col'],
+                                   values_only=True):
+            datos.append([valor if valor is not None else "" for valor in fila])
+
+        return datos
+
+    def obtener_celdas_combinadas(self, hoja_nombre: str) -> List[Tuple]:
+        """
+        Obtener rangos combinados de una hoja (calculados una sola vez).
+
+        Args:
+            hoja_nombre: Nombre de la hoja
+
+        Returns:
+            Lista de tuplas (min_row, min_col, max_row, max_col)
+        """
+        if hoja_nombre not in self._combinadas_por_hoja:
+            hoja = self.obtener_hoja(hoja_nombre)
+            self._combinadas_por_hoja[hoja_nombre] = [
+                (rango.min_row, rango.min_col, rango.max_row, rango.max_col)
+                for rango in hoja.merged_cells.ranges
+            ]
+
+        return list(self._combinadas_por_hoja[hoja_nombre])
+
+    def cerrar(self):
+        """Liberar el libro abierto."""
+        if self.workbook is not None:
+            self.workbook.close()
+            self.workbook = None
+        self._abierta = False
+        self._combinadas_por_hoja.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.cerrar()
+        return False
+
+
+class StreamingWorkbookSession(WorkbookSession):
+    """
+    Sesión en modo streaming para rangos fijos (ej. A5:Z17).
+
+    Usa openpyxl en modo read-only: las filas se parsean a demanda y la
+    lectura se detiene después de la última fila del rango. Los rangos
+    combinados (no disponibles en read-only) se recuperan aparte leyendo
+    solo el elemento <mergeCells> de la hoja.
+    """
+
+    OPCIONES_CARGA = {'data_only': True, 'read_only': True}
+
+    def leer_rango(self, hoja_nombre: str, rango_coords: Dict[str, int]) -> List[List]:
+        """
+        Leer valores de un rango en streaming.
+
+        Args:
+            hoja_nombre: Nombre de la hoja
+            rango_coords: Coordenadas del rango (min_row, max_row, min_col, max_col)
+
+        Returns:
+            Lista de listas con valores ("" para celdas vacías)
+        """
+        datos = super().leer_rango(hoja_nombre, rango_coords)
+
+        # openpyxl read-only omite las filas finales que no existen en el XML
+        ancho = rango_coords['max_col'] - rango_coords['min_col'] + 1
+        alto = rango_coords['max_row'] - rango_coords['min_row'] + 1
+        while len(datos) < alto:
+            datos.append([""] * ancho)
+
+        # En modo completo openpyxl vacía las celdas secundarias de un rango
+        # combinado; read-only las entrega tal como estén en el XML
+        for min_row, min_col, max_row, max_col in self.obtener_celdas_combinadas(hoja_nombre):
+            for fila in range(max(min_row, rango_coords['min_row']), min(max_row, rango_coords['max_row']) + 1):
+                for col in range(max(min_col, rango_coords['min_col']), min(max_col, rango_coords['max_col']) + 1):
+                    if (fila, col) != (min_row, min_col):
+                        datos[fila - rango_coords['min_row']][col - rango_coords['min_col']] = ""
+
+        return datos
+
+    def obtener_celdas_combinadas(self, hoja_nombre: str) -> List[Tuple]:
+        """
+        Obtener rangos combinados leyendo <mergeCells> directamente del XML.
+
+        Args:
+            hoja_nombre: Nombre de la hoja
+
+        Returns:
+            Lista de tuplas (min_row, min_col, max_row, max_col)
+        """
+        if hoja_nombre not in self._combinadas_por_hoja:
+            self._combinadas_por_hoja[hoja_nombre] = leer_rangos_combinados_archivo(
+                self.archivo_path, hoja_nombre
+            )
+
+        return list(self._combinadas_por_hoja[hoja_nombre])
+
+
+class XmlWorkbookSession(WorkbookSession):
+    """
+    Sesión de lectura directa sobre el zip/XML del .xlsx.
+
+    Solo toca las partes necesarias: workbook.xml y sus relaciones para
+    ubicar la hoja, el XML de la hoja hasta la última fila del rango, y
+    las cadenas compartidas que realmente aparecen en el rango. Los
+    estilos solo se leen si hay celdas numéricas con estilo (para
+    reconocer fechas igual que openpyxl).
+    """
+
+    def _abrir(self):
+        """Abrir el zip y leer el índice de hojas."""
+        self._zip = ZipFile(self.archivo_path)
+        self._rutas_hojas = dict(listar_hojas_zip(self._zip))
+        self._nombres_hojas = list(self._rutas_hojas.keys())
+        self._estilos_fecha = None
+        self._epoca = None
+
+    def listar_hojas(self) -> List[str]:
+        """
+        Listar nombres de hojas del libro.
+
+        Returns:
+            Lista de nombres de hojas
+        """
+        return list(self._nombres_hojas)
+
+    def obtener_hoja(self, hoja_nombre: str):
+        """
+        Obtener la ruta de la parte XML de una hoja.
+
+        Args:
+            hoja_nombre: Nombre de la hoja
+
+        Returns:
+            Ruta de la hoja dentro del zip
+        """
+        if hoja_nombre not in self._rutas_hojas:
+            raise KeyError(f"Worksheet {hoja_nombre} does not exist.")
+        return self._rutas_hojas[hoja_nombre]
+
+    def leer_rango(self, hoja_nombre: str, rango_coords: Dict[str, int]) -> List[List]:
+        """
+        Leer valores de un rango parseando solo el XML necesario.
+
+        Args:
+            hoja_nombre: Nombre de la hoja
+            rango_coords: Coordenadas del rango (min_row, max_row, min_col, max_col)
+
+        Returns:
+            Lista de listas con valores ("" para celdas vacías)
+        """
+        min_row, max_row = rango_coords['min_row'], rango_coords['max_row']
+        min_col, max_col = rango_coords['min_col'], rango_coords['max_col']
+        datos = [[""] * (max_col - min_col + 1) for _ in range(max_row - min_row + 1)]
+
+        pendientes_cadenas = []
+        celdas = iterar_celdas(self._zip, self.obtener_hoja(hoja_nombre), min_row, max_row, min_col, max_col)
+        for fila, col, tipo, valor, estilo in celdas:
+            if valor is None:
+                continue
+
+            i, j = fila - min_row, col - min_col
+            if tipo == 's':
+                pendientes_cadenas.append((i, j, int(valor)))
+                continue
+
+            valor = self._convertir_valor(tipo, valor, estilo)
+            if valor is not None:
+                datos[i][j] = valor
+
+        # Resolver cadenas compartidas solo para los índices encontrados
+        if pendientes_cadenas:
+            cadenas = leer_cadenas_compartidas(self._zip, {indice for _, _, indice in pendientes_cadenas})
+            for i, j, indice in pendientes_cadenas:
+                datos[i][j] = cadenas.get(indice, "")
+
+        # Igual que openpyxl en modo completo: celdas secundarias combinadas vacías
+        for c_min_row, c_min_col, c_max_row, c_max_col in self.obtener_celdas_combinadas(hoja_nombre):
+            for fila in range(max(c_min_row, min_row), min(c_max_row, max_row) + 1):
+                for col in range(max(c_min_col, min_col), min(c_max_col, max_col) + 1):
+                    if (fila, col) != (c_min_row, c_min_col):
+                        datos[fila - min_row][col - min_col] = ""
+
+        return datos
+
+    def _convertir_valor(self, tipo: str, valor: str, estilo: int) -> Any:
+        """
+        Convertir el texto de <v> al tipo Python que entregaría openpyxl.
+
+        Args:
+            tipo: Atributo t de la celda
+            valor: Texto crudo
+            estilo: Índice de estilo (cellXfs)
+
+        Returns:
+            Valor convertido
+        """
+        if tipo == 'n':
+            numero = float(valor) if ('.' in valor or 'E' in valor or 'e' in valor) else int(valor)
+            if estilo:
+                estilos_fecha, estilos_duracion = self._obtener_estilos_fecha()
+                if estilo in estilos_fecha:
+                    try:
+                        return from_excel(numero, self._epoca, timedelta=estilo in estilos_duracion)
+                    except (OverflowError, ValueError):
+                        return "#VALUE!"
+            return numero
+        if tipo == 'b':
+            return bool(int(valor))
+        if tipo == 'd':
+            return from_ISO8601(valor)
+        # 'str', 'e' e 'inlineStr' se entregan como texto
+        return valor
+
+    def _obtener_estilos_fecha(self):
+        """Cargar (una vez) los estilos con formato de fecha y la época del libro."""
+        if self._estilos_fecha is None:
+            self._estilos_fecha = leer_estilos_fecha(self._zip)
+            self._epoca = CALENDAR_MAC_1904 if usa_fechas_1904(self._zip) else CALENDAR_WINDOWS_1900
+        return self._estilos_fecha
+
+    def obtener_celdas_combinadas(self, hoja_nombre: str) -> List[Tuple]:
+        """
+        Obtener rangos combinados leyendo <mergeCells> directamente del XML.
+
+        Args:
+            hoja_nombre: Nombre de la hoja
+
+        Returns:
+            Lista de tuplas (min_row, min_col, max_row, max_col)
+        """
+        if hoja_nombre not in self._combinadas_por_hoja:
+            self._combinadas_por_hoja[hoja_nombre] = leer_rangos_combinados(
+                self._zip, self.obtener_hoja(hoja_nombre)
+            )
+
+        return list(self._combinadas_por_hoja[hoja_nombre])
+
+    def cerrar(self):
+        """Cerrar el zip."""
+        if getattr(self, '_zip', None) is not None:
+            self._zip.close()
+            self._zip = None
+        super().cerrar()
+
+
+# 🎯 Motores de extracción disponibles
+MOTORES_SESION = {
+    'completo': WorkbookSession,
+    'streaming': StreamingWorkbookSession,
+    'xml': XmlWorkbookSession,
+}
+
+
+def abrir_sesion_libro(archivo_path: str, motor: str = 'completo') -> WorkbookSession:
+    """
+    Abrir sesión de lectura con el motor indicado.
+
+    Args:
+        archivo_path: Ruta del archivo Excel
+        motor: Nombre del motor ('completo', 'streaming', 'xml')
+
+    Returns:
+        Sesión abierta
+
+    Raises:
+        ValueError: Si el motor no existe
+    """
+    if motor not in MOTORES_SESION:
+        raise ValueError(f"Motor de extracción no válido: {motor}")
+
+    return MOTORES_SESION[motor](archivo_path)
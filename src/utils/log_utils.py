@@ -0,0 +1,97 @@
+"""
+📝 LOG UTILS - Bitácora por Niveles
+===================================
+
+Configuración central del logging del sistema.
+
+Cada módulo usa su propio logger (logging.getLogger(__name__)); todos
+cuelgan del logger 'src', que es el único que se configura aquí. Los
+mensajes se formatean de forma perezosa (logger.debug("... %s", valor)),
+así que un nivel deshabilitado solo cuesta la comprobación del nivel.
+
+Sin configurar, solo se muestran advertencias y errores (por stderr).
+
+CARACTERÍSTICAS:
+✅ Un logger por módulo, un solo punto de configuración
+✅ Silencioso por defecto en lotes y CLI (WARNING)
+✅ Traza completa con nivel DEBUG (módulo y hora en cada línea)
+✅ Nivel reemplazable con la variable de entorno CONCENTRADOR_LOG
+"""
+
+import logging
+import os
+import sys
+from typing import Optional, TextIO, Union
+
+from ..config.settings import BITACORA
+
+LOGGER_RAIZ = 'src'
+
+_FORMATO = '%(message)s'
+_FORMATO_TRAZA = '%(asctime)s %(levelname)-7s %(name)s: %(message)s'
+
+
+class _ManejadorBitacora(logging.StreamHandler):
+    """StreamHandler que escribe en el sys.stderr vigente si no se indica destino."""
+
+    def __init__(self, destino: Optional[TextIO] = None):
+        logging.Handler.__init__(self)
+        self._destino = destino
+
+    @property
+    def stream(self) -> TextIO:
+        return self._destino if self._destino is not None else sys.stderr
+
+
+def nivel_numerico(nivel: Union[str, int]) -> int:
+    """
+    Convertir un nivel ("DEBUG", "info", 20, "20") a su valor numérico.
+
+    Raises:
+        ValueError: Si el nivel no existe
+    """
+    if isinstance(nivel, int):
+        return nivel
+    texto = str(nivel).strip().upper()
+    if texto.isdigit():
+        return int(texto)
+    valor = logging.getLevelName(texto)
+    if not isinstance(valor, int):
+        raise ValueError(f"Nivel de bitácora no válido: {nivel}")
+    return valor
+
+
+def configurar_logging(nivel: Optional[Union[str, int]] = None, destino: Optional[TextIO] = None,
+                       predeterminado: Optional[Union[str, int]] = None) -> logging.Logger:
+    """
+    Configurar la bitácora del sistema.
+
+    Reemplaza el manejador instalado por una llamada anterior, así que se
+    puede llamar de nuevo para cambiar de nivel.
+
+    Args:
+        nivel: Nivel explícito (ej. el de -v en la CLI). Si None, se usa la
+               variable de entorno BITACORA['VARIABLE_ENTORNO'] y, si no
+               existe, predeterminado
+        destino: Flujo de salida (por defecto sys.stderr)
+        predeterminado: Nivel sin indicación explícita (por defecto BITACORA['NIVEL'])
+
+    Returns:
+        logging.Logger: Logger raíz del sistema
+    """
+    if nivel is None:
+        nivel = os.environ.get(BITACORA['VARIABLE_ENTORNO']) or predeterminado or BITACORA['NIVEL']
+    nivel = nivel_numerico(nivel)
+
+    raiz = logging.getLogger(LOGGER_RAIZ)
+    for manejador in list(raiz.handlers):
+        if isinstance(manejador, _ManejadorBitacora):
+            raiz.removeHandler(manejador)
+
+    manejador = _ManejadorBitacora(destino)
+    manejador.setFormatter(logging.Formatter(_FORMATO_TRAZA if nivel <= logging.DEBUG else _FORMATO))
+    raiz.addHandler(manejador)
+    raiz.setLevel(nivel)
+    # Evita líneas duplicadas si la aplicación anfitriona configuró el logger raíz
+    raiz.propagate = False
+    return raiz
@@ -0,0 +1,298 @@
+"""
+Utilidades de bajo nivel sobre el formato .xlsx (zip + XML).
+
+Permiten leer partes concretas del libro (ubicación de una hoja,
+celdas de un rango, cadenas compartidas, rangos combinados) sin
+cargar el libro completo con openpyxl.
+"""
+
+import posixpath
+import xml.etree.ElementTree as ET
+from zipfile import ZipFile
+from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format, is_timedelta_format
+
+NS_MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+NS_REL_DOC = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+NS_REL_PKG = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+TAG_SHEET = f"{{{NS_MAIN}}}sheet"
+TAG_ROW = f"{{{NS_MAIN}}}row"
+TAG_SHEET_DATA = f"{{{NS_MAIN}}}sheetData"
+TAG_MERGE_CELL = f"{{{NS_MAIN}}}mergeCell"
+TAG_CELL = f"{{{NS_MAIN}}}c"
+TAG_VALUE = f"{{{NS_MAIN}}}v"
+TAG_INLINE_STRING = f"{{{NS_MAIN}}}is"
+TAG_TEXT = f"{{{NS_MAIN}}}t"
+TAG_RUN = f"{{{NS_MAIN}}}r"
+TAG_SHARED_ITEM = f"{{{NS_MAIN}}}si"
+TAG_WORKBOOK_PR = f"{{{NS_MAIN}}}workbookPr"
+TAG_NUM_FMT = f"{{{NS_MAIN}}}numFmt"
+TAG_CELL_XFS = f"{{{NS_MAIN}}}cellXfs"
+TAG_XF = f"{{{NS_MAIN}}}xf"
+TAG_RELATIONSHIP = f"{{{NS_REL_PKG}}}Relationship"
+ATTR_REL_ID = f"{{{NS_REL_DOC}}}id"
+
+
+def columna_a_numero(letras):
+    """
+    Convertir letras de columna a número (A=1, Z=26, AA=27).
+    """
+    numero = 0
+    for char in letras:
+        numero = numero * 26 + (ord(char.upper()) - 64)
+    return numero
+
+
+def coordenada_a_indices(coordenada):
+    """
+    Convertir coordenada "H6" a tupla (fila, columna) base 1.
+    """
+    posicion = 0
+    while posicion < len(coordenada) and coordenada[posicion].isalpha():
+        posicion += 1
+    return int(coordenada[posicion:]), columna_a_numero(coordenada[:posicion])
+
+
+def rango_a_tupla(rango):
+    """
+    Convertir rango "A5:Z17" a tupla (min_row, min_col, max_row, max_col).
+
+    Un rango de una sola celda ("A5") se interpreta como A5:A5.
+    """
+    partes = rango.split(':')
+    min_row, min_col = coordenada_a_indices(partes[0])
+    max_row, max_col = coordenada_a_indices(partes[-1])
+    return (min_row, min_col, max_row, max_col)
+
+
+def _resolver_destino(base, destino):
+    """Resolver destino de relación relativo a la carpeta de la parte base."""
+    if destino.startswith('/'):
+        return destino.lstrip('/')
+    return posixpath.normpath(posixpath.join(posixpath.dirname(base), destino))
+
+
+def _resolver_parte_libro(archivo_zip, tipo):
+    """
+    Encontrar la ruta de una parte referenciada por workbook.xml.rels.
+
+    Args:
+        archivo_zip: ZipFile abierto sobre el .xlsx
+        tipo: Sufijo del tipo de relación (ej. "/sharedStrings", "/styles")
+
+    Returns:
+        Ruta de la parte o None si el libro no la tiene
+    """
+    raiz_rels = ET.fromstring(archivo_zip.read('xl/_rels/workbook.xml.rels'))
+    for rel in raiz_rels.iter(TAG_RELATIONSHIP):
+        if rel.get('Type', '').endswith(tipo):
+            return _resolver_destino('xl/workbook.xml', rel.get('Target'))
+    return None
+
+
+def usa_fechas_1904(archivo_zip):
+    """Indicar si el libro usa el calendario de 1904."""
+    raiz_libro = ET.fromstring(archivo_zip.read('xl/workbook.xml'))
+    propiedades = raiz_libro.find(TAG_WORKBOOK_PR)
+    if propiedades is None:
+        return False
+    return propiedades.get('date1904', '0').lower() in ('1', 'true')
+
+
+def listar_hojas_zip(archivo_zip):
+    """
+    Listar hojas del libro con la ruta de su parte XML.
+
+    Args:
+        archivo_zip: ZipFile abierto sobre el .xlsx
+
+    Returns:
+        Lista de tuplas (nombre_hoja, ruta_xml) en el orden del libro
+    """
+    relaciones = {}
+    raiz_rels = ET.fromstring(archivo_zip.read('xl/_rels/workbook.xml.rels'))
+    for rel in raiz_rels.iter(TAG_RELATIONSHIP):
+        relaciones[rel.get('Id')] = _resolver_destino('xl/workbook.xml', rel.get('Target'))
+
+    hojas = []
+    raiz_libro = ET.fromstring(archivo_zip.read('xl/workbook.xml'))
+    for hoja in raiz_libro.iter(TAG_SHEET):
+        ruta = relaciones.get(hoja.get(ATTR_REL_ID))
+        if ruta is not None:
+            hojas.append((hoja.get('name'), ruta))
+
+    return hojas
+
+
+def localizar_ruta_hoja(archivo_zip, hoja_nombre):
+    """
+    Encontrar la parte XML de una hoja vía workbook.xml y sus relaciones.
+
+    Raises:
+        KeyError: Si la hoja no existe en el libro
+    """
+    for nombre, ruta in listar_hojas_zip(archivo_zip):
+        if nombre == hoja_nombre:
+            return ruta
+    raise KeyError(f"Worksheet {hoja_nombre} does not exist.")
+
+
+def leer_rangos_combinados(archivo_zip, ruta_hoja):
+    """
+    Leer el elemento <mergeCells> de una hoja en streaming.
+
+    Las filas de <sheetData> se descartan a medida que se recorren,
+    así la memoria no depende del tamaño de la hoja.
+
+    Returns:
+        Lista de tuplas (min_row, min_col, max_row, max_col)
+    """
+    rangos = []
+    with archivo_zip.open(ruta_hoja) as fuente:
+        for _, elemento in ET.iterparse(fuente, events=('end',)):
+            if elemento.tag == TAG_MERGE_CELL:
+                rangos.append(rango_a_tupla(elemento.get('ref')))
+            elif elemento.tag in (TAG_ROW, TAG_SHEET_DATA):
+                elemento.clear()
+    return rangos
+
+
+def leer_rangos_combinados_archivo(archivo_path, hoja_nombre):
+    """
+    Leer rangos combinados de una hoja abriendo solo las partes necesarias.
+    """
+    with ZipFile(archivo_path) as archivo_zip:
+        return leer_rangos_combinados(archivo_zip, localizar_ruta_hoja(archivo_zip, hoja_nombre))
+
+
+def _texto_de_elemento(elemento):
+    """
+    Texto plano de <si> o <is>: <t> directo más los <t> de cada run <r>.
+
+    Igual que openpyxl, ignora la guía fonética (<rPh>).
+    """
+    fragmentos = []
+    for hijo in elemento:
+        if hijo.tag == TAG_TEXT:
+            fragmentos.append(hijo.text or '')
+        elif hijo.tag == TAG_RUN:
+            texto = hijo.find(TAG_TEXT)
+            if texto is not None:
+                fragmentos.append(texto.text or '')
+    return ''.join(fragmentos)
+
+
+def iterar_celdas(archivo_zip, ruta_hoja, min_row, max_row, min_col, max_col):
+    """
+    Recorrer en streaming las celdas de un rango.
+
+    El parseo se detiene en cuanto aparece una fila posterior a max_row;
+    el resto del XML de la hoja no se lee.
+
+    Yields:
+        Tuplas (fila, columna, tipo, valor_crudo, estilo) donde valor_crudo
+        es el texto de <v> (o el texto de la cadena en línea para inlineStr)
+    """
+    with archivo_zip.open(ruta_hoja) as fuente:
+        fila_actual = 0
+        for evento, elemento in ET.iterparse(fuente, events=('start', 'end')):
+            if evento == 'start':
+                if elemento.tag == TAG_ROW:
+                    numero = elemento.get('r')
+                    fila_actual = int(numero) if numero else fila_actual + 1
+                    if fila_actual > max_row:
+                        return
+                    columna_actual = 0
+                continue
+
+            if elemento.tag == TAG_CELL:
+                coordenada = elemento.get('r')
+                if coordenada:
+                    _, columna_actual = coordenada_a_indices(coordenada)
+                else:
+                    columna_actual += 1
+
+                if min_row <= fila_actual and min_col <= columna_actual <= max_col:
+                    tipo = elemento.get('t', 'n')
+                    if tipo == 'inlineStr':
+                        nodo = elemento.find(TAG_INLINE_STRING)
+                        valor = _texto_de_elemento(nodo) if nodo is not None else None
+                    else:
+                        valor = elemento.findtext(TAG_VALUE, None) or None
+                    yield (fila_actual, columna_actual, tipo, valor, int(elemento.get('s', 0)))
+
+            elif elemento.tag == TAG_ROW:
+                elemento.clear()
+
+
+def leer_cadenas_compartidas(archivo_zip, indices):
+    """
+    Resolver solo los índices pedidos de la tabla de cadenas compartidas.
+
+    La tabla se recorre en streaming y la lectura termina en cuanto se
+    alcanza el mayor índice solicitado.
+
+    Args:
+        archivo_zip: ZipFile abierto sobre el .xlsx
+        indices: Conjunto de índices a resolver
+
+    Returns:
+        Diccionario {indice: texto}
+    """
+    cadenas = {}
+    if not indices:
+        return cadenas
+
+    ruta = _resolver_parte_libro(archivo_zip, '/sharedStrings')
+    if ruta is None:
+        return cadenas
+
+    indice_maximo = max(indices)
+    posicion = 0
+    with archivo_zip.open(ruta) as fuente:
+        for _, elemento in ET.iterparse(fuente, events=('end',)):
+            if elemento.tag != TAG_SHARED_ITEM:
+                continue
+            if posicion in indices:
+                cadenas[posicion] = _texto_de_elemento(elemento).replace('x005F_', '')
+            elemento.clear()
+            if posicion >= indice_maximo:
+                break
+            posicion += 1
+
+    return cadenas
+
+
+def leer_estilos_fecha(archivo_zip):
+    """
+    Identificar los estilos de celda (índices de cellXfs) con formato de fecha.
+
+    Returns:
+        Tupla (estilos_fecha, estilos_duracion) como conjuntos de índices
+    """
+    estilos_fecha, estilos_duracion = set(), set()
+    ruta = _resolver_parte_libro(archivo_zip, '/styles')
+    if ruta is None:
+        return estilos_fecha, estilos_duracion
+
+    formatos = dict(BUILTIN_FORMATS)
+    dentro_xfs = False
+    indice_xf = 0
+    with archivo_zip.open(ruta) as fuente:
+        for evento, elemento in ET.iterparse(fuente, events=('start', 'end')):
+            if elemento.tag == TAG_CELL_XFS:
+                if evento == 'end':
+                    break
+                dentro_xfs = True
+            elif evento == 'end' and elemento.tag == TAG_NUM_FMT:
+                formatos[int(elemento.get('numFmtId'))] = elemento.get('formatCode', '')
+            elif evento == 'end' and dentro_xfs and elemento.tag == TAG_XF:
+                formato = formatos.get(int(elemento.get('numFmtId', 0)), '')
+                if formato and is_date_format(formato):
+                    estilos_fecha.add(indice_xf)
+                    if is_timedelta_format(formato):
+                        estilos_duracion.add(indice_xf)
+                indice_xf += 1
+                elemento.clear()
+
+    return estilos_fecha, estilos_duracion
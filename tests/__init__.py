@@ -0,0 +1,10 @@
+from unittest import mock
+
+from src.config.settings import CACHE_EXTRACCION
+
+
+def desactivar_cache_extraccion(caso):
+    """Desactivar la caché persistente durante una prueba (no escribe en .cache_extraccion/)."""
+    parche = mock.patch.dict(CACHE_EXTRACCION, {'HABILITADO': False})
+    parche.start()
+    caso.addCleanup(parche.stop)
@@ -0,0 +1,116 @@
+import glob
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+import cli
+from src.config.settings import configurar_modo
+from src.core.agregador_jerarquico import AgregadorJerarquico, cargar_mapeo_jerarquia
+from src.core.data_manager import DataManager
+from tests import desactivar_cache_extraccion
+
+DIRECTORIO_FORMATOS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "formatos reales")
+
+
+class TestAgregadorJerarquico(unittest.TestCase):
+    def setUp(self):
+        desactivar_cache_extraccion(self)
+        configurar_modo('ESCUELAS')
+        generador = np.random.default_rng(5)
+        self.numericos = {
+            f"escuela_{i}.xlsx": pd.DataFrame(generador.integers(0, 50, size=(10, 19)))
+            for i in range(5)
+        }
+        self.escuela_a_zona = {
+            "escuela_0.xlsx": "101", "escuela_1.xlsx": "102", "escuela_2.xlsx": "101",
+            "escuela_3.xlsx": "103", "escuela_9.xlsx": "104",
+        }
+        self.zona_a_sector = {"101": "I", "102": "I", "103": "II"}
+
+        manager = DataManager()
+        for nombre, df in self.numericos.items():
+            manager._registrar_archivo(f"/entradas/{nombre}", {'datos_numericos': df})
+        self.agregador = AgregadorJerarquico(self.escuela_a_zona, self.zona_a_sector, data_manager=manager)
+
+    def _suma(self, nombres):
+        return sum(self.numericos[nombre].to_numpy() for nombre in nombres)
+
+    def test_totales_por_nivel(self):
+        grupos = self.agregador.agregar()
+        self.assertEqual(grupos, {'zonas': ["101", "102", "103"], 'sectores': ["I", "II"]})
+
+        zonas = self.agregador.totales_nivel('zonas')
+        self.assertTrue(np.array_equal(zonas["101"].to_numpy(), self._suma(["escuela_0.xlsx", "escuela_2.xlsx"])))
+        self.assertTrue(np.array_equal(zonas["103"].to_numpy(), self._suma(["escuela_3.xlsx"])))
+
+        sectores = self.agregador.totales_nivel('sectores')
+        self.assertTrue(np.array_equal(sectores["I"].to_numpy(),
+                                       self._suma(["escuela_0.xlsx", "escuela_1.xlsx", "escuela_2.xlsx"])))
+        self.assertEqual(sectores["II"].dtypes.unique().tolist(), [np.dtype(np.int64)])
+
+        self.assertEqual(self.agregador.miembros['sectores'], {"I": ["101", "102"], "II": ["103"]})
+        self.assertEqual(self.agregador.sin_asignar['zonas'], ["escuela_4.xlsx"])
+        with self.assertRaises(ValueError):
+            self.agregador.totales_nivel('escuelas')
+
+    def test_zona_sin_sector(self):
+        del self.agregador.zona_a_sector["103"]
+        self.agregador.agregar()
+        self.assertEqual(self.agregador.sin_asignar['sectores'], ["103"])
+        self.assertEqual(list(self.agregador.totales_nivel('sectores')), ["I"])
+
+
+class TestMapeoJerarquia(unittest.TestCase):
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directorio, ignore_errors=True)
+
+    def _escribir(self, contenido):
+        ruta = os.path.join(self.directorio, "mapeo.csv")
+        with open(ruta, 'w', encoding='utf-8') as archivo:
+            archivo.write(contenido)
+        return ruta
+
+    def test_cargar_csv(self):
+        ruta = self._escribir("escuela,zona,sector\n"
+                              "entradas/a.xlsx,101,I\n"
+                              "b.xlsx,102,\n"
+                              ",103,II\n")
+        self.assertEqual(cargar_mapeo_jerarquia(ruta), ({"a.xlsx": "101", "b.xlsx": "102"}, {"101": "I"}))
+
+    def test_errores_csv(self):
+        with self.assertRaises(ValueError):
+            cargar_mapeo_jerarquia(self._escribir("archivo,zona\na.xlsx,101\n"))
+        with self.assertRaises(ValueError):
+            cargar_mapeo_jerarquia(self._escribir("escuela,zona,sector\na.xlsx,101,I\nb.xlsx,101,II\n"))
+
+
+class TestCliJerarquia(unittest.TestCase):
+    def setUp(self):
+        desactivar_cache_extraccion(self)
+
+    def test_concentrados_de_zona_y_sector(self):
+        archivos = sorted(glob.glob(os.path.join(DIRECTORIO_FORMATOS, "10*.xlsx")))
+        if len(archivos) < 2:
+            self.skipTest("Se necesitan al menos 2 archivos de escuela en 'formatos reales/'")
+
+        directorio = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directorio, ignore_errors=True)
+        mapeo = os.path.join(directorio, "mapeo.csv")
+        with open(mapeo, 'w', encoding='utf-8') as archivo:
+            archivo.write("escuela,zona,sector\n")
+            for i, ruta in enumerate(archivos):
+                archivo.write(f"{os.path.basename(ruta)},{101 + i % 2},I\n")
+
+        salida = os.path.join(directorio, "salida")
+        self.assertEqual(cli.main(["ESCUELAS", *archivos, "-o", salida, "--jerarquia", mapeo]), 0)
+        self.assertEqual(sorted(os.listdir(salida)), ["SECTOR I.xlsx", "ZONA 101.xlsx", "ZONA 102.xlsx"])
+        self.assertEqual(cli.main(["ZONAS", *archivos, "-o", salida, "--jerarquia", mapeo]), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
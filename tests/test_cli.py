@@ -0,0 +1,54 @@
+import glob
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import cli
+from tests import desactivar_cache_extraccion
+
+DIRECTORIO_FORMATOS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "formatos reales")
+
+
+class TestCli(unittest.TestCase):
+    def setUp(self):
+        desactivar_cache_extraccion(self)
+        self.directorio = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directorio, ignore_errors=True)
+
+    def test_resolver_entradas(self):
+        for nombre in ("b.xlsx", "a.xlsx", "~$a.xlsx", "notas.txt"):
+            open(os.path.join(self.directorio, nombre), 'w').close()
+
+        esperados = [os.path.join(self.directorio, n) for n in ("a.xlsx", "b.xlsx")]
+        self.assertEqual(cli.resolver_entradas([self.directorio]), esperados)
+        self.assertEqual(cli.resolver_entradas([os.path.join(self.directorio, "*.xlsx"), esperados[0]]), esperados)
+
+    def test_verbosidad(self):
+        niveles = [cli.nivel_bitacora(cli.crear_parser().parse_args(["ESCUELAS", "x", "-o", "s.xlsx"] + extra))
+                   for extra in ([], ["-v"], ["-vv"], ["-q"])]
+        self.assertEqual(niveles, [None, "INFO", "DEBUG", "ERROR"])
+
+    def test_sin_entradas(self):
+        self.assertEqual(cli.main(["ESCUELAS", self.directorio, "-o", os.path.join(self.directorio, "s.xlsx")]), 1)
+
+    def test_concentrado_escuelas(self):
+        archivos = sorted(glob.glob(os.path.join(DIRECTORIO_FORMATOS, "10*.xlsx")))
+        if len(archivos) < 2:
+            self.skipTest("Se necesitan al menos 2 archivos de escuela en 'formatos reales/'")
+
+        salida = os.path.join(self.directorio, "concentrado.xlsx")
+        patron = os.path.join(DIRECTORIO_FORMATOS, "10*.xlsx")
+        # Desde otra carpeta: la plantilla se busca en la raíz del proyecto
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(self.directorio)
+        self.assertEqual(cli.main(["ESCUELAS", patron, "-o", salida]), 0)
+        self.assertTrue(os.path.exists(salida))
+        self.assertFalse(any(modulo.startswith("PyQt5") for modulo in sys.modules))
+
+
+if __name__ == '__main__':
+    unittest.main()
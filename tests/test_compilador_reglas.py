@@ -0,0 +1,101 @@
+import unittest
+
+import numpy as np
+
+from src.config.table_schemas import get_table_schema
+from src.core.compilador_reglas import (
+    compilar_formula, compilar_reglas, espacios_de_esquema, reglas_de_esquema
+)
+
+
+class TestCompilarFormula(unittest.TestCase):
+    def setUp(self):
+        self.filas, self.columnas = espacios_de_esquema(get_table_schema("ESC2_MOVIMIENTOS")['estructura'])
+
+    def test_suma_de_columnas_y_puntos_suspensivos(self):
+        completa = compilar_formula("suma(H_1O + H_2O + H_3O + H_4O + H_5O + H_6O)", self.columnas)
+        abreviada = compilar_formula("suma(H_1O + ... + H_6O)", self.columnas)
+        self.assertEqual(completa, ({7: 1.0, 9: 1.0, 11: 1.0, 13: 1.0, 15: 1.0, 17: 1.0}, 0.0))
+        self.assertEqual(abreviada, completa)
+        self.assertEqual(compilar_formula("subtotal_H + subtotal_M", self.columnas), ({19: 1.0, 21: 1.0}, 0.0))
+
+    def test_filas_con_signos_factores_y_constantes(self):
+        self.assertEqual(compilar_formula("INSCRIPCIÓN - BAJAS", self.filas), ({3: 1.0, 4: -1.0}, 0.0))
+        self.assertEqual(compilar_formula("-(INSCRIPCIÓN - 2 * BAJAS) + BECADOS SEED + 3", self.filas),
+                         ({3: -1.0, 4: 2.0, 10: 1.0}, 3.0))
+        self.assertEqual(compilar_formula("ALTAS - ALTAS", self.filas), ({}, 0.0))
+
+    def test_errores(self):
+        for formula in ("H_1O +", "X_9", "promedio(H_1O)", "H_1O * H_2O", "(H_1O", "... + H_2O"):
+            with self.subTest(formula=formula), self.assertRaises(ValueError):
+                compilar_formula(formula, self.columnas)
+
+
+class TestReglasCompiladas(unittest.TestCase):
+    def setUp(self):
+        self.esquema = get_table_schema("ESC2_MOVIMIENTOS")
+        generador = np.random.default_rng(4)
+        matriz = np.zeros((10, 19))
+        matriz[:, :12] = generador.integers(0, 20, size=(10, 12))
+        matriz[:, 12] = matriz[:, 0:12:2].sum(axis=1)
+        matriz[:, 14] = matriz[:, 1:12:2].sum(axis=1)
+        matriz[:, 16] = matriz[:, 12] + matriz[:, 14]
+        matriz[2] = matriz[0] - matriz[1]
+        self.matriz = matriz
+
+    def test_etiquetas_y_evaluacion(self):
+        reglas = compilar_reglas(self.esquema, self.matriz.shape)
+        # 3 reglas por columna en 9 conceptos (sin GRUPOS) + coherencia en 12 columnas
+        self.assertEqual(len(reglas), 3 * 9 + 12)
+        self.assertEqual(tuple(reglas.etiquetas[0]), ('subtotales_H', 'INSCRIPCIÓN', 'subtotal_H'))
+        self.assertEqual(tuple(reglas.etiquetas[-1]), ('coherencia.EXISTENCIA', 'EXISTENCIA', 'M_6O'))
+
+        esperado, reportado = reglas.evaluar(self.matriz)
+        self.assertTrue(np.array_equal(esperado, reportado))
+
+        alterada = self.matriz.copy()
+        alterada[0, 0] += 5
+        esperado, reportado = reglas.evaluar(alterada)
+        fallidas = {tuple(etiqueta) for etiqueta in reglas.etiquetas[esperado != reportado]}
+        self.assertEqual(fallidas, {('subtotales_H', 'INSCRIPCIÓN', 'subtotal_H'),
+                                    ('coherencia.EXISTENCIA', 'EXISTENCIA', 'H_1O')})
+
+    def test_cubo_equivale_a_cada_matriz(self):
+        reglas = compilar_reglas(self.esquema, self.matriz.shape, excluir=('totales',))
+        cubo = np.stack([self.matriz, self.matriz * 2, self.matriz + 1])
+        esperado, reportado = reglas.evaluar(cubo)
+        self.assertEqual(esperado.shape, (3, len(reglas)))
+        for k, matriz in enumerate(cubo):
+            esperado_k, reportado_k = reglas.evaluar(matriz)
+            self.assertTrue(np.array_equal(esperado[k], esperado_k))
+            self.assertTrue(np.array_equal(reportado[k], reportado_k))
+
+        with self.assertRaises(ValueError):
+            reglas.evaluar(np.zeros((10, 18)))
+
+    def test_regla_fuera_de_la_matriz(self):
+        with self.assertRaises(ValueError):
+            compilar_reglas(self.esquema, (10, 12))
+
+    def test_se_compila_una_vez_por_forma(self):
+        reglas = reglas_de_esquema("ESC2_MOVIMIENTOS", (10, 19))
+        self.assertIs(reglas_de_esquema("ESC2_MOVIMIENTOS", (10, 19)), reglas)
+        self.assertIsNot(reglas_de_esquema("ESC2_MOVIMIENTOS", (10, 19), ('totales',)), reglas)
+
+    def test_reglas_por_fila_de_esc1(self):
+        reglas = compilar_reglas(get_table_schema("ESC1_GRUPOS"), (10, 19))
+        self.assertEqual(set(reglas.formulas), {'total_por_grupo'})
+        self.assertEqual(len(reglas), 18)
+
+        matriz = np.zeros((10, 19))
+        matriz[0, :18] = 3
+        matriz[1, :18] = 4
+        matriz[2, :18] = 7
+        matriz[2, 5] = 6
+        esperado, reportado = reglas.evaluar(matriz)
+        self.assertEqual([tuple(e) for e in reglas.etiquetas[esperado != reportado]],
+                         [('total_por_grupo', 'TOTAL_GRUPO', '2DO_GRADO_C')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.config.settings import configurar_modo
+from src.core.cubo_resultados import CuboResultados
+from src.core.data_manager import DataManager
+from tests import desactivar_cache_extraccion
+
+
+class TestCuboResultados(unittest.TestCase):
+    def setUp(self):
+        self.cubo = CuboResultados(['INSCRIPCIÓN', 'BAJAS'], ['1O_H', '1O_M', 'TOTAL'], capacidad_inicial=2)
+        self.matrices = {
+            'a.xlsx': np.array([[1, 2, 3], [0, 1, 1]]),
+            'b.xlsx': np.array([[4, 4, 8], [1, 0, 1]]),
+            'c.xlsx': np.array([[2, 0, 2], [0, 0, 0]]),
+        }
+        for nombre, matriz in self.matrices.items():
+            self.cubo.agregar(nombre, matriz)
+
+    def test_crece_y_suma(self):
+        self.assertEqual(len(self.cubo), 3)
+        self.assertEqual(self.cubo.datos.shape, (3, 2, 3))
+        self.assertEqual(self.cubo.datos.dtype, np.int64)
+        self.assertTrue(np.array_equal(self.cubo.sumatoria(), sum(self.matrices.values())))
+        with self.assertRaises(ValueError):
+            self.cubo.datos[0, 0, 0] = 9
+
+    def test_eliminar_conserva_orden(self):
+        self.assertTrue(self.cubo.eliminar('a.xlsx'))
+        self.assertFalse(self.cubo.eliminar('a.xlsx'))
+        self.assertEqual(self.cubo.nombres, ['b.xlsx', 'c.xlsx'])
+        self.assertTrue(np.array_equal(self.cubo.matriz('c.xlsx'), self.matrices['c.xlsx']))
+        self.assertTrue(np.array_equal(self.cubo.sumatoria(), self.matrices['b.xlsx'] + self.matrices['c.xlsx']))
+        self.assertTrue(np.array_equal(self.cubo.datos, np.stack([self.matrices['b.xlsx'], self.matrices['c.xlsx']])))
+        self.assertEqual(self.cubo.indice_archivo, {'b.xlsx': 0, 'c.xlsx': 1})
+
+        self.cubo.agregar('d.xlsx', self.matrices['a.xlsx'])
+        self.assertEqual(self.cubo.nombres, ['b.xlsx', 'c.xlsx', 'd.xlsx'])
+        self.assertTrue(np.array_equal(self.cubo.datos[2], self.matrices['a.xlsx']))
+
+    def test_reemplazar_archivo(self):
+        self.cubo.agregar('b.xlsx', np.zeros((2, 3), dtype=np.int64))
+        self.assertEqual(self.cubo.nombres, list(self.matrices))
+        self.assertEqual(self.cubo.sumatoria()[0, 2], 5)
+
+    def test_totales_y_ranking(self):
+        totales = self.cubo.totales_por_concepto()
+        self.assertEqual(totales.loc['b.xlsx', 'INSCRIPCIÓN'], 8)
+        self.assertEqual(self.cubo.ranking('INSCRIPCIÓN'), [('b.xlsx', 8), ('a.xlsx', 3), ('c.xlsx', 2)])
+        self.assertEqual(self.cubo.ranking('BAJAS', descendente=False)[0], ('c.xlsx', 0))
+
+    def test_sumar_por_grupo(self):
+        grupos, totales = self.cubo.sumar_por_grupo({'a.xlsx': 'Z2', 'b.xlsx': 'Z1', 'c.xlsx': 'Z2', 'x.xlsx': 'Z1'})
+        self.assertEqual(grupos, ['Z2', 'Z1'])
+        self.assertEqual(totales.dtype, np.int64)
+        self.assertTrue(np.array_equal(totales[0], self.matrices['a.xlsx'] + self.matrices['c.xlsx']))
+        self.assertTrue(np.array_equal(totales[1], self.matrices['b.xlsx']))
+
+        grupos, totales = self.cubo.sumar_por_grupo({'a.xlsx': 'Z1'}, grupos=['Z1', 'Z9'])
+        self.assertEqual(totales.shape, (2, 2, 3))
+        self.assertFalse(totales[1].any())
+
+    def test_formas_distintas_y_decimales(self):
+        self.cubo.agregar('d.xlsx', np.array([[0.5, 0.5, 1.0, 7.0]]))
+        self.assertEqual(self.cubo.datos.shape, (4, 2, 4))
+        self.assertEqual(self.cubo.datos.dtype, np.float64)
+        self.assertEqual(self.cubo.formas_inconsistentes(), [
+            {'archivo': 'd.xlsx', 'forma_esperada': (2, 3), 'forma_actual': (1, 4)}
+        ])
+        self.assertTrue(np.array_equal(self.cubo.matriz('a.xlsx'), self.matrices['a.xlsx']))
+
+    def test_eliminar_devuelve_forma_y_tipo(self):
+        self.cubo.agregar('d.xlsx', np.array([[0.5, 0.5, 1.0, 7.0], [0, 0, 0, 0], [1, 1, 2, 0]]))
+        self.assertEqual(self.cubo.sumatoria().shape, (3, 4))
+        self.assertEqual(self.cubo.sumatoria().dtype, np.float64)
+
+        self.cubo.eliminar('d.xlsx')
+        total = self.cubo.sumatoria()
+        self.assertEqual(total.shape, (2, 3))
+        self.assertEqual(total.dtype, np.int64)
+        self.assertTrue(np.array_equal(total, sum(self.matrices.values())))
+        self.assertEqual(self.cubo.datos.shape, (3, 2, 3))
+        self.assertEqual(self.cubo.datos.dtype, np.int64)
+        self.assertEqual(self.cubo.columnas, ['1O_H', '1O_M', 'TOTAL'])
+        self.assertEqual(self.cubo.formas_inconsistentes(), [])
+
+    def test_sumatoria_acumulada(self):
+        self.cubo.agregar('b.xlsx', np.ones((2, 3), dtype=np.int64))
+        self.cubo.agregar('d.xlsx', np.full((2, 3), 0.1))
+        self.cubo.agregar('e.xlsx', np.full((2, 3), 0.2))
+        self.cubo.eliminar('a.xlsx')
+        esperado = np.ones((2, 3)) + self.matrices['c.xlsx'] + 0.3
+        self.assertTrue(np.allclose(self.cubo.sumatoria(), esperado))
+
+        # Sin decimales presentes vuelve a ser entero exacto, aun antes de compactar
+        self.cubo.eliminar('d.xlsx')
+        self.cubo.eliminar('e.xlsx')
+        total = self.cubo.sumatoria()
+        self.assertEqual(total.dtype, np.int64)
+        self.assertTrue(np.array_equal(total, np.ones((2, 3), dtype=np.int64) + self.matrices['c.xlsx']))
+        self.assertTrue(np.array_equal(self.cubo.datos.sum(axis=0), total))
+
+        total[0, 0] = -1
+        self.assertNotEqual(self.cubo.sumatoria()[0, 0], -1)
+
+
+class TestCuboEnDataManager(unittest.TestCase):
+    def setUp(self):
+        desactivar_cache_extraccion(self)
+
+    def test_cubo_sigue_a_archivos_procesados(self):
+        configurar_modo('ESCUELAS')
+        manager = DataManager()
+        self.assertEqual(manager.cubo.conceptos[0], 'INSCRIPCIÓN')
+        self.assertEqual(manager.cubo.columnas[:2], ['1O_H', '1O_M'])
+        self.assertEqual(manager.cubo.indice_columna['TOTAL'], 16)
+
+        generador = np.random.default_rng(3)
+        for i in range(5):
+            numericos = pd.DataFrame(generador.integers(0, 40, size=(10, 19)))
+            manager._registrar_archivo(f"/entradas/{i}.xlsx", {'datos_numericos': numericos})
+        manager.eliminar_archivo("2.xlsx")
+
+        self.assertEqual(manager.cubo.nombres, list(manager.archivos_procesados))
+        self.assertTrue(np.array_equal(manager.cubo.sumatoria(), manager.calcular_sumatoria().to_numpy()))
+        self.assertTrue(manager.validar_consistencia()['valido'])
+
+        manager.limpiar_datos()
+        self.assertEqual(len(manager.cubo), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
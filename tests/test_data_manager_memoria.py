@@ -0,0 +1,94 @@
+import os
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from src.core.data_manager import DataManager
+from src.core.resultado_procesamiento import ResultadoProcesamiento
+from tests import desactivar_cache_extraccion
+
+
+class TestMemoriaAcotada(unittest.TestCase):
+    def setUp(self):
+        desactivar_cache_extraccion(self)
+        self.manager = DataManager(max_residentes=2)
+        generador = np.random.default_rng(11)
+        self.numericos = {
+            f"escuela_{i}.xlsx": pd.DataFrame(generador.integers(0, 50, size=(10, 19)))
+            for i in range(5)
+        }
+        for nombre, df in self.numericos.items():
+            self.manager._registrar_archivo(f"/entradas/{nombre}", {'datos_numericos': df})
+
+    def _descargados(self):
+        return [nombre for nombre, registro in self.manager.archivos_procesados.items() if registro.en_disco]
+
+    def test_solo_los_recientes_quedan_en_memoria(self):
+        self.assertEqual(self.manager.archivos_residentes(), ["escuela_3.xlsx", "escuela_4.xlsx"])
+        self.assertEqual(self._descargados(), ["escuela_0.xlsx", "escuela_1.xlsx", "escuela_2.xlsx"])
+
+        registro = self.manager.archivos_procesados["escuela_0.xlsx"]
+        self.assertEqual(registro['archivo_completo'], "/entradas/escuela_0.xlsx")
+        self.assertTrue(registro.en_disco)
+
+        esperado = sum(df.to_numpy() for df in self.numericos.values())
+        self.assertTrue(np.array_equal(self.manager.calcular_sumatoria().to_numpy(), esperado))
+        self.assertEqual(len(self._descargados()), 3)
+
+    def test_obtener_archivo_lo_vuelve_a_cargar(self):
+        registro = self.manager.obtener_archivo("escuela_0.xlsx")
+
+        self.assertFalse(registro.en_disco)
+        self.assertTrue(registro['datos_numericos'].equals(self.numericos["escuela_0.xlsx"]))
+        self.assertEqual(self.manager.archivos_residentes(), ["escuela_4.xlsx", "escuela_0.xlsx"])
+        self.assertIn("escuela_3.xlsx", self._descargados())
+
+    def test_acceso_directo_tambien_carga(self):
+        datos = self.manager.archivos_procesados["escuela_1.xlsx"]['datos_numericos']
+
+        self.assertTrue(datos.equals(self.numericos["escuela_1.xlsx"]))
+        self.assertEqual(self.manager.archivos_residentes()[-1], "escuela_1.xlsx")
+
+    def test_eliminar_y_limpiar_borran_archivos_de_disco(self):
+        ruta = self.manager.archivos_procesados["escuela_0.xlsx"]._ruta_disco
+        self.assertTrue(os.path.exists(ruta))
+
+        self.manager.eliminar_archivo("escuela_0.xlsx")
+        self.assertFalse(os.path.exists(ruta))
+        esperado = sum(self.numericos[n].to_numpy() for n in self.manager.archivos_procesados)
+        self.assertTrue(np.array_equal(self.manager.sumatoria_total.to_numpy(), esperado))
+
+        directorio = self.manager._obtener_directorio_descarga()
+        self.manager.limpiar_datos()
+        self.assertEqual(os.listdir(directorio), [])
+
+    def test_soltar_no_carga_de_disco(self):
+        with mock.patch.object(ResultadoProcesamiento, 'cargar', side_effect=AssertionError("cargó de disco")):
+            self.manager.eliminar_archivo("escuela_0.xlsx")
+            nuevo = pd.DataFrame(np.ones((10, 19), dtype=np.int64))
+            self.manager._registrar_archivo("/entradas/escuela_1.xlsx", {'datos_numericos': nuevo})
+            self.manager.calcular_sumatoria()
+
+        self.assertEqual(self.manager.cubo.nombres, list(self.manager.archivos_procesados))
+
+    def test_reprocesar_archivo_descargado(self):
+        nuevo = pd.DataFrame(np.ones((10, 19), dtype=np.int64))
+        self.manager._registrar_archivo("/entradas/escuela_0.xlsx", {'datos_numericos': nuevo})
+
+        self.assertEqual(list(self.manager.archivos_procesados)[0], "escuela_0.xlsx")
+        self.numericos["escuela_0.xlsx"] = nuevo
+        esperado = sum(df.to_numpy() for df in self.numericos.values())
+        self.assertTrue(np.array_equal(self.manager.sumatoria_total.to_numpy(), esperado))
+
+    def test_sin_limite_no_descarga(self):
+        manager = DataManager()
+        for nombre, df in self.numericos.items():
+            manager._registrar_archivo(f"/entradas/{nombre}", {'datos_numericos': df})
+        self.assertEqual(manager.archivos_residentes(), list(self.numericos))
+        self.assertFalse(any(registro.en_disco for registro in manager.archivos_procesados.values()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import glob
+import os
+import unittest
+
+from src.config.settings import configurar_modo
+from src.core.data_manager import DataManager
+from tests import desactivar_cache_extraccion
+
+DIRECTORIO_FORMATOS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "formatos reales")
+
+
+class TestProcesamientoParalelo(unittest.TestCase):
+    def setUp(self):
+        desactivar_cache_extraccion(self)
+        archivos = sorted(glob.glob(os.path.join(DIRECTORIO_FORMATOS, "10*.xlsx")))
+        if len(archivos) < 2:
+            self.skipTest("Se necesitan al menos 2 archivos de escuela en 'formatos reales/'")
+        configurar_modo('ESCUELAS')
+        self.archivos = archivos[:3] + [os.path.join(DIRECTORIO_FORMATOS, "no_existe.xlsx")]
+
+    def _procesar(self, paralelo):
+        manager = DataManager()
+        progreso = []
+        resumen = manager.procesar_multiples_archivos(
+            self.archivos, lambda i, total, archivo: progreso.append((i, total, archivo)),
+            paralelo=paralelo, max_workers=2
+        )
+        return manager, resumen, progreso
+
+    def test_paralelo_igual_a_secuencial(self):
+        secuencial, resumen_sec, progreso_sec = self._procesar(False)
+        paralelo, resumen_par, progreso_par = self._procesar(True)
+
+        self.assertEqual(progreso_par, progreso_sec)
+        self.assertEqual(resumen_par['exitosos'], len(self.archivos) - 1)
+        self.assertEqual(resumen_par['fallidos'], 1)
+        self.assertEqual(resumen_par['errores'][0]['archivo'], self.archivos[-1])
+
+        self.assertEqual(list(paralelo.archivos_procesados), list(secuencial.archivos_procesados))
+        for nombre, esperado in secuencial.archivos_procesados.items():
+            obtenido = paralelo.archivos_procesados[nombre]
+            for clave in ('datos_crudos', 'datos_combinados', 'datos_numericos'):
+                self.assertTrue(esperado[clave].equals(obtenido[clave]), f"{nombre}: {clave}")
+            self.assertEqual(esperado['mapeo_posicional'], obtenido['mapeo_posicional'])
+
+
+if __name__ == '__main__':
+    unittest.main()
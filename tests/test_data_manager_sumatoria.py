@@ -0,0 +1,97 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.core.data_manager import DataManager
+from tests import desactivar_cache_extraccion
+
+
+def sumatoria_referencia(dataframes):
+    """Suma original, re-sumando todos los DataFrames."""
+    total = dataframes[0].copy()
+    for df in dataframes[1:]:
+        total = total.add(df, fill_value=0)
+    return total
+
+
+class TestSumatoriaAcumulada(unittest.TestCase):
+    def setUp(self):
+        desactivar_cache_extraccion(self)
+        self.manager = DataManager()
+        generador = np.random.default_rng(7)
+        self.numericos = {
+            f"escuela_{i}.xlsx": pd.DataFrame(generador.integers(0, 50, size=(10, 19)))
+            for i in range(4)
+        }
+
+    def _registrar(self, nombre):
+        self.manager._registrar_archivo(f"/entradas/{nombre}", {'datos_numericos': self.numericos[nombre]})
+
+    def test_sumatoria_al_agregar_y_eliminar(self):
+        self.assertIsNone(self.manager.sumatoria_total)
+        for nombre in self.numericos:
+            self._registrar(nombre)
+            esperado = sumatoria_referencia([self.numericos[n] for n in self.manager.archivos_procesados])
+            self.assertTrue(np.array_equal(self.manager.sumatoria_total.to_numpy(), esperado.to_numpy()))
+
+        total = self.manager.calcular_sumatoria()
+        self.assertEqual(total.dtypes.unique().tolist(), [np.dtype(np.int64)])
+
+        self.manager.eliminar_archivo("escuela_1.xlsx")
+        esperado = sumatoria_referencia([self.numericos[n] for n in self.manager.archivos_procesados])
+        self.assertTrue(np.array_equal(self.manager.calcular_sumatoria().to_numpy(), esperado.to_numpy()))
+
+        self.manager.limpiar_datos()
+        self.assertIsNone(self.manager.sumatoria_total)
+
+    def test_reprocesar_reemplaza_aporte(self):
+        self._registrar("escuela_0.xlsx")
+        self._registrar("escuela_1.xlsx")
+        self._registrar("escuela_0.xlsx")
+
+        esperado = self.numericos["escuela_0.xlsx"] + self.numericos["escuela_1.xlsx"]
+        self.assertTrue(np.array_equal(self.manager.calcular_sumatoria().to_numpy(), esperado.to_numpy()))
+
+    def test_formas_distintas(self):
+        chico = pd.DataFrame([[1.5, 2.0]])
+        grande = pd.DataFrame([[1, 2, 3], [4, 5, 6]])
+        self.manager._registrar_archivo("/a.xlsx", {'datos_numericos': chico})
+        self.manager._registrar_archivo("/b.xlsx", {'datos_numericos': grande})
+
+        esperado = sumatoria_referencia([chico, grande])
+        self.assertTrue(np.array_equal(self.manager.calcular_sumatoria().to_numpy(), esperado.to_numpy()))
+
+    def test_eliminar_devuelve_forma_y_tipo(self):
+        generador = np.random.default_rng(11)
+        primero = pd.DataFrame(generador.integers(0, 50, size=(10, 19)))
+        decimales = pd.DataFrame(generador.random((12, 20)))
+        segundo = pd.DataFrame(generador.integers(0, 50, size=(10, 19)))
+        self.manager._registrar_archivo("/a.xlsx", {'datos_numericos': primero})
+        self.manager._registrar_archivo("/b.xlsx", {'datos_numericos': decimales})
+        self.manager._registrar_archivo("/c.xlsx", {'datos_numericos': segundo})
+        self.assertEqual(self.manager.calcular_sumatoria().shape, (12, 20))
+
+        self.manager.eliminar_archivo("b.xlsx")
+        total = self.manager.calcular_sumatoria()
+        self.assertEqual(total.shape, (10, 19))
+        self.assertEqual(total.dtypes.unique().tolist(), [np.dtype(np.int64)])
+        self.assertTrue(np.array_equal(total.to_numpy(), (primero + segundo).to_numpy()))
+
+    def test_sin_datos_numericos(self):
+        for nombre in ("a.xlsx", "b.xlsx"):
+            self.manager.archivos_procesados[nombre] = {'tipo_procesamiento': 'multiples_hojas'}
+        self.assertIsNone(self.manager.sumatoria_total)
+        with self.assertRaises(ValueError):
+            self.manager.calcular_sumatoria()
+
+    def test_sumatoria_no_se_modifica_desde_fuera(self):
+        self._registrar("escuela_0.xlsx")
+        self._registrar("escuela_1.xlsx")
+        total = self.manager.calcular_sumatoria()
+        total.iloc[0, 0] = -1
+        self.assertNotEqual(self.manager.sumatoria_total.iat[0, 0], -1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,234 @@
+import glob
+import os
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.core.data_transformer import DataTransformer, SALIDAS_LOTE
+from src.core.excel_extractor import ExcelExtractor
+
+DIRECTORIO_FORMATOS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "formatos reales")
+
+
+def marcadores_referencia(datos, celdas_combinadas):
+    """Implementación celda por celda original, usada como referencia."""
+    datos_marcados = datos.copy()
+    for min_row, min_col, max_row, max_col in celdas_combinadas:
+        if min_row < len(datos_marcados) and min_col < len(datos_marcados.columns):
+            valor_original = datos_marcados.iloc[min_row, min_col]
+            if valor_original is not None and str(valor_original).strip() != '':
+                for fila in range(min_row, max_row + 1):
+                    for col in range(min_col, max_col + 1):
+                        if fila < len(datos_marcados) and col < len(datos_marcados.columns):
+                            if fila == min_row and col == min_col:
+                                continue
+                            celda_actual = datos_marcados.iloc[fila, col]
+                            if celda_actual is None or str(celda_actual).strip() == '':
+                                datos_marcados.iloc[fila, col] = f"[{valor_original}]"
+    return datos_marcados
+
+
+def vista_referencia(datos_marcados):
+    """Implementación celda por celda original de la vista combinada."""
+    vista = datos_marcados.copy()
+    for i in range(len(vista)):
+        for j in range(len(vista.columns)):
+            valor = vista.iloc[i, j]
+            if isinstance(valor, str) and valor.startswith('[') and valor.endswith(']'):
+                vista.iloc[i, j] = ''
+    return vista
+
+
+class TestMarcadoresCombinadas(unittest.TestCase):
+    def setUp(self):
+        self.transformer = DataTransformer()
+
+    def test_tabla_sintetica(self):
+        datos = pd.DataFrame([
+            ["A", "", "", 5],
+            ["", "", " ", ""],
+            [3, "", "x", ""],
+        ], dtype=object)
+        celdas = [(0, 0, 1, 2), (2, 0, 2, 2), (1, 3, 2, 3), (0, 3, 0, 3), (2, 3, 5, 6)]
+
+        resultado = self.transformer.crear_marcadores_combinadas(datos, celdas)
+
+        self.assertTrue(resultado.equals(marcadores_referencia(datos, celdas)))
+        self.assertEqual(resultado.iat[1, 2], "[A]")
+        self.assertEqual(resultado.iat[2, 1], "[3]")
+        self.assertEqual(resultado.iat[2, 2], "x")
+        self.assertEqual(datos.iat[1, 2], " ")
+
+    def test_archivos_reales(self):
+        archivos = sorted(glob.glob(os.path.join(DIRECTORIO_FORMATOS, "*.xlsx")))
+        if not archivos:
+            self.skipTest("No hay archivos en 'formatos reales/'")
+
+        extractor = ExcelExtractor(motor='xml')
+        for archivo in archivos:
+            for hoja in extractor.listar_hojas(archivo):
+                with self.subTest(archivo=os.path.basename(archivo), hoja=hoja):
+                    extraccion = extractor.extraer_con_metadatos(archivo, hoja, "A1:AJ60")
+                    esperado = marcadores_referencia(extraccion['datos'], extraccion['celdas_combinadas'])
+                    obtenido = self.transformer.crear_marcadores_combinadas(
+                        extraccion['datos'], extraccion['celdas_combinadas']
+                    )
+                    self.assertTrue(obtenido.equals(esperado))
+                    self.assertTrue((obtenido.dtypes == esperado.dtypes).all())
+
+
+class TestVistaCombinada(unittest.TestCase):
+    def setUp(self):
+        self.transformer = DataTransformer()
+
+    def test_marcadores_previos_del_archivo(self):
+        # Un texto "[...]" que ya venía en el archivo también se vacía
+        datos = pd.DataFrame([["A", "", "[nota]"], ["", 2, ""]], dtype=object)
+        crudos, mascara = self.transformer.crear_marcadores_combinadas(
+            datos, [(0, 0, 1, 1)], devolver_mascara=True
+        )
+
+        esperado = vista_referencia(crudos)
+        self.assertTrue(self.transformer.crear_vista_combinada(crudos).equals(esperado))
+        self.assertTrue(self.transformer.crear_vista_combinada(crudos, mascara).equals(esperado))
+        self.assertEqual(esperado.iat[0, 2], '')
+
+    def test_archivos_reales_con_y_sin_mascara(self):
+        archivos = sorted(glob.glob(os.path.join(DIRECTORIO_FORMATOS, "*.xlsx")))
+        if not archivos:
+            self.skipTest("No hay archivos en 'formatos reales/'")
+
+        extractor = ExcelExtractor(motor='xml')
+        for archivo in archivos:
+            for hoja in extractor.listar_hojas(archivo):
+                with self.subTest(archivo=os.path.basename(archivo), hoja=hoja):
+                    extraccion = extractor.extraer_con_metadatos(archivo, hoja, "A1:AJ60")
+                    crudos, mascara = self.transformer.crear_marcadores_combinadas(
+                        extraccion['datos'], extraccion['celdas_combinadas'], devolver_mascara=True
+                    )
+                    esperado = vista_referencia(crudos)
+                    for obtenido in (self.transformer.crear_vista_combinada(crudos),
+                                     self.transformer.crear_vista_combinada(crudos, mascara)):
+                        self.assertTrue(obtenido.equals(esperado))
+                        self.assertTrue((obtenido.dtypes == esperado.dtypes).all())
+
+
+class TestDatosNumericos(unittest.TestCase):
+    def setUp(self):
+        self.transformer = DataTransformer()
+
+    def test_matriz_tipada_y_mascara(self):
+        datos = pd.DataFrame([
+            ["ALUMNOS", 3, "14", ""],
+            ["[ALUMNOS]", None, " 7 ", "n/a"],
+        ], dtype=object)
+        rango = {'filas_inicio': 0, 'filas_fin': 5, 'columnas_inicio': 1, 'columnas_fin': 4}
+
+        numericos, mapeo, mascara = self.transformer.extraer_datos_numericos(
+            datos, rango, devolver_mascara=True
+        )
+
+        self.assertTrue((numericos.dtypes == np.int64).all())
+        self.assertEqual(numericos.values.tolist(), [[3, 14, 0, 0], [0, 7, 0, 0]])
+        self.assertEqual(mascara.tolist(), [[False, False, False, False], [False, False, True, False]])
+        self.assertEqual(mapeo[(0, 2)], {'valor_original': "14", 'valor_numerico': 14, 'tipo': 'numero_string'})
+        self.assertEqual(mapeo[(1, 3)]['tipo'], 'texto')
+
+    def test_decimales_en_float64(self):
+        datos = pd.DataFrame([[1, "2.5"], ["[1]", 4]], dtype=object)
+        rango = {'filas_inicio': 0, 'filas_fin': 1, 'columnas_inicio': 0, 'columnas_fin': 1}
+
+        numericos, _ = self.transformer.extraer_datos_numericos(datos, rango)
+
+        self.assertTrue((numericos.dtypes == np.float64).all())
+        self.assertEqual(numericos.values.tolist(), [[1.0, 2.5], [0.0, 4.0]])
+
+
+
+class TestMapeoPosicional(unittest.TestCase):
+    def setUp(self):
+        self.transformer = DataTransformer()
+
+    def test_equivale_al_diccionario_original(self):
+        datos = pd.DataFrame([
+            ["x", 1, 2.5, "[1]"],
+            ["", None, "3", "abc"],
+            [4, "", "[A]", 7],
+        ], dtype=object)
+        rango = {'filas_inicio': 1, 'filas_fin': 8, 'columnas_inicio': 1, 'columnas_fin': 6}
+
+        mapeo = self.transformer.generar_mapeo_posicional(datos, rango)
+
+        claves = [(i, j) for i in range(1, 3) for j in range(1, 4)]
+        self.assertEqual(list(mapeo), claves)
+        self.assertEqual(len(mapeo), len(claves))
+        self.assertNotIn((0, 1), mapeo)
+        self.assertNotIn((1, 4), mapeo)
+        for i, j in claves:
+            valor = datos.iat[i, j]
+            self.assertIs(mapeo[(i, j)]['valor_original'], valor)
+            self.assertEqual(mapeo[(i, j)]['tipo'], self.transformer._clasificar_valor(valor))
+        self.assertEqual(mapeo[(1, 2)]['valor_numerico'], 3.0)
+        self.assertEqual(mapeo[(1, 3)]['valor_numerico'], 0.0)
+        with self.assertRaises(KeyError):
+            mapeo[(5, 5)]
+
+    def test_copia_comparte_arreglos(self):
+        datos = pd.DataFrame([[1, 2], [3, 4]], dtype=object)
+        rango = {'filas_inicio': 0, 'filas_fin': 1, 'columnas_inicio': 0, 'columnas_fin': 1}
+
+        mapeo = self.transformer.generar_mapeo_posicional(datos, rango)
+        copia = mapeo.copy()
+
+        self.assertEqual(dict(copia), dict(mapeo))
+        self.assertIs(copia.tipos, mapeo.tipos)
+        self.assertFalse(mapeo.valores_numericos.flags.writeable)
+
+
+
+class TestTransformacionFusionada(unittest.TestCase):
+    def setUp(self):
+        self.transformer = DataTransformer()
+        self.rango = {'filas_inicio': 3, 'filas_fin': 12, 'columnas_inicio': 7, 'columnas_fin': 25}
+
+    def test_equivale_a_los_pasos_separados(self):
+        archivos = sorted(glob.glob(os.path.join(DIRECTORIO_FORMATOS, "*.xlsx")))
+        if not archivos:
+            self.skipTest("No hay archivos en 'formatos reales/'")
+
+        extractor = ExcelExtractor(motor='xml')
+        for archivo in archivos:
+            for hoja in extractor.listar_hojas(archivo):
+                with self.subTest(archivo=os.path.basename(archivo), hoja=hoja):
+                    extraccion = extractor.extraer_con_metadatos(archivo, hoja, "A5:Z17")
+                    crudos = self.transformer.crear_marcadores_combinadas(
+                        extraccion['datos'], extraccion['celdas_combinadas']
+                    )
+                    combinados = self.transformer.crear_vista_combinada(crudos)
+                    numericos, mapeo = self.transformer.extraer_datos_numericos(crudos, self.rango)
+
+                    fusionado = self.transformer.transformar_fusionado(
+                        extraccion['datos'], extraccion['celdas_combinadas'], self.rango
+                    )
+
+                    self.assertTrue(fusionado['datos_crudos'].equals(crudos))
+                    self.assertTrue(fusionado['datos_combinados'].equals(combinados))
+                    self.assertTrue(fusionado['datos_numericos'].equals(numericos))
+                    self.assertEqual(dict(fusionado['mapeo_posicional']), dict(mapeo))
+
+    def test_solo_salidas_pedidas(self):
+        datos = pd.DataFrame([["A", "", 1], ["", "", "2"]], dtype=object)
+        rango = {'filas_inicio': 0, 'filas_fin': 1, 'columnas_inicio': 1, 'columnas_fin': 2}
+
+        resultado = self.transformer.transformar_fusionado(datos, [(0, 0, 1, 0)], rango, SALIDAS_LOTE)
+
+        self.assertEqual(set(resultado), set(SALIDAS_LOTE))
+        self.assertEqual(resultado['datos_crudos'].iat[1, 0], "[A]")
+        self.assertEqual(resultado['datos_numericos'].values.tolist(), [[0, 1], [0, 2]])
+        with self.assertRaises(ValueError):
+            self.transformer.transformar_fusionado(datos, [], rango, ('datos_crudos', 'otra'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,322 @@
+import copy
+import glob
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.generar_libros import generar_libros
+from src.config.settings import configurar_modo
+from src.config.table_schemas import TABLE_SCHEMAS
+from src.core.data_manager import DataManager
+from src.core.data_validator import COLUMNAS_LOTE, DataValidator
+from src.core.excel_processor import ExcelProcessor
+from src.core.registros_validacion import RegistrosValidacion
+from src.core.workbook_session import abrir_sesion_libro
+from tests import desactivar_cache_extraccion
+
+DIRECTORIO_FORMATOS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "formatos reales")
+
+
+class _TablaGenerada(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directorio = tempfile.mkdtemp()
+        configurar_modo('ESCUELAS')
+        archivo = generar_libros('ESCUELAS', 1, cls.directorio, semilla=3)[0]
+        datos = ExcelProcessor(cache=False).extraer_datos_completo(archivo)
+        cls.numericos = datos['datos_numericos']
+        cls.crudos = datos['datos_crudos']
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.directorio, ignore_errors=True)
+
+    def _validar(self, numericos):
+        return DataValidator().validar_tabla_completa(numericos, self.crudos)
+
+
+class TestReglasVectorizadas(_TablaGenerada):
+    def test_tabla_correcta(self):
+        reporte = self._validar(self.numericos)
+        self.assertEqual(reporte['discrepancias'], [])
+        tipos = [validacion['tipo'] for validacion in reporte['validaciones_exitosas']]
+        self.assertEqual(tipos.count('SUBTOTAL_H'), 9)
+        self.assertEqual(tipos.count('TOTAL_GRUPOS'), 1)
+        self.assertEqual(tipos.count('COHERENCIA_EXISTENCIA'), 12)
+        # Las fórmulas del esquema que ya cubren las reglas integradas no se repiten
+        self.assertFalse(any(tipo.startswith('REGLA_') for tipo in tipos))
+
+    def test_celda_alterada(self):
+        numericos = self.numericos.copy()
+        numericos.iat[0, 0] += 2  # INSCRIPCIÓN, 1O. H
+
+        discrepancias = self._validar(numericos)['discrepancias']
+        self.assertEqual([(d['tipo'], d['concepto']) for d in discrepancias], [
+            ('SUBTOTAL_H', 'INSCRIPCIÓN'),
+            ('DISCREPANCIA_INTERNA', 'INSCRIPCIÓN'),
+            ('COHERENCIA_EXISTENCIA', 'H-1O.'),
+        ])
+
+        subtotal = discrepancias[0]
+        self.assertEqual(subtotal['valor_calculado'] - subtotal['valor_reportado'], 2.0)
+        self.assertEqual(subtotal['diferencia'], 2.0)
+        self.assertIsInstance(subtotal['valor_reportado'], float)
+        self.assertTrue(subtotal['descripcion'].startswith("❌ Subtotal H en INSCRIPCIÓN: reportado "))
+
+    def test_matriz_object_equivale_a_numerica(self):
+        numericos = self.numericos.astype(float)
+        numericos.iat[2, 3] += 1
+        como_texto = numericos.astype(str).astype(object)
+        como_texto.iat[0, 12] = f"[{como_texto.iat[0, 12]}]"  # Subtotal H con marcador
+        como_texto.iat[1, 1] = ""
+
+        numericos.iat[1, 1] = np.nan
+        self.assertEqual(self._validar(como_texto)['discrepancias'], self._validar(numericos)['discrepancias'])
+
+    def test_celdas_no_numericas(self):
+        como_texto = self.numericos.astype(object)
+        como_texto.iat[0, 0] = 'x'   # Sumando de INSCRIPCIÓN H: se omite
+        como_texto.iat[1, 12] = 'x'  # Subtotal H de BAJAS: no se comprueba
+        reporte = self._validar(como_texto)
+
+        subtotal = reporte['discrepancias'][0]
+        fila = self.numericos.iloc[0, [2, 4, 6, 8, 10]].astype(float).tolist()
+        self.assertEqual((subtotal['tipo'], subtotal['concepto']), ('SUBTOTAL_H', 'INSCRIPCIÓN'))
+        self.assertEqual(subtotal['valor_calculado'], sum(fila))
+        self.assertEqual(subtotal['descripcion'],
+                         f"❌ Subtotal H en INSCRIPCIÓN: reportado {float(self.numericos.iat[0, 12])}, "
+                         f"calculado {' + '.join(map(str, fila))} = {sum(fila)}")
+
+        bajas = [(r['tipo'], r['concepto']) for clave in ('discrepancias', 'validaciones_exitosas')
+                 for r in reporte[clave] if r['tipo'].startswith('SUBTOTAL')]
+        self.assertNotIn(('SUBTOTAL_H', 'BAJAS'), bajas)
+        self.assertIn(('SUBTOTAL_M', 'BAJAS'), bajas)
+
+
+class TestRegistrosCompactos(_TablaGenerada):
+    def test_descripcion_solo_al_consultarla(self):
+        numericos = self.numericos.copy()
+        numericos.iat[0, 0] += 2
+        validador = DataValidator()
+        reporte = validador.validar_tabla_completa(numericos, self.crudos)
+
+        discrepancias = reporte['discrepancias']
+        self.assertEqual(discrepancias.datos.dtype.names, ('regla', 'concepto', 'columna', 'esperado', 'reportado'))
+        self.assertEqual(len(discrepancias.datos), 3)
+
+        with mock.patch.object(validador._contexto, 'descripcion', wraps=validador._contexto.descripcion) as descripcion:
+            self.assertEqual(discrepancias[0]['valor_reportado'] + 2, discrepancias[0]['valor_calculado'])
+            descripcion.assert_not_called()
+            texto = discrepancias[0]['descripcion']
+            descripcion.assert_called_once()
+
+        reportado = float(numericos.iat[0, 12])
+        self.assertTrue(texto.startswith(f"❌ Subtotal H en INSCRIPCIÓN: reportado {reportado}, calculado "))
+        self.assertEqual(dict(discrepancias[2]), {
+            'tipo': 'COHERENCIA_EXISTENCIA', 'concepto': 'H-1O.',
+            'valor_reportado': discrepancias[2]['valor_reportado'],
+            'valor_calculado': discrepancias[2]['valor_calculado'],
+            'diferencia': 2.0, 'descripcion': discrepancias[2]['descripcion'],
+        })
+        self.assertIn("(Inscripción ", discrepancias[2]['descripcion'])
+
+    def test_resultados_de_una_validacion_no_cambian_con_la_siguiente(self):
+        validador = DataValidator()
+        numericos = self.numericos.copy()
+        numericos.iat[0, 0] += 2
+        primera = validador.validar_tabla_completa(numericos, self.crudos)['discrepancias']
+        descripciones = [d['descripcion'] for d in primera]
+
+        validador.validar_tabla_completa(self.numericos, self.crudos)
+        self.assertEqual([d['descripcion'] for d in primera], descripciones)
+
+
+class TestCacheEstructura(_TablaGenerada):
+    def setUp(self):
+        DataValidator._cache_estructuras.clear()
+
+    def test_misma_huella_reutiliza_estructura(self):
+        primero = DataValidator()
+        primero.validar_tabla_completa(self.numericos, self.crudos)
+        self.assertEqual(len(DataValidator._cache_estructuras), 1)
+
+        # Otros números con la misma distribución: misma entrada de caché
+        crudos = self.crudos.copy()
+        crudos.iat[3, 7] = "999"
+        segundo = DataValidator()
+        segundo.validar_tabla_completa(self.numericos, crudos)
+        self.assertEqual(len(DataValidator._cache_estructuras), 1)
+        self.assertEqual(segundo.estructura_detectada, primero.estructura_detectada)
+        self.assertIsNot(segundo.estructura_detectada['filas_conceptos'],
+                         primero.estructura_detectada['filas_conceptos'])
+
+        # Otro encabezado: nueva detección
+        crudos.iat[2, 7] = "X"
+        DataValidator()._detectar_estructura_tabla(crudos)
+        self.assertEqual(len(DataValidator._cache_estructuras), 2)
+
+    def test_concepto_adicional_depende_de_los_numeros(self):
+        fila = len(self.crudos) - 1
+        crudos = self.crudos.copy()
+        crudos.iat[fila, 0] = "OTRO CONCEPTO"
+        sin_numeros = crudos.copy()
+        for j in range(7, 19):
+            sin_numeros.iat[fila, j] = None
+
+        validador = DataValidator()
+        validador._detectar_estructura_tabla(crudos)
+        self.assertIn(("OTRO CONCEPTO", fila), validador.estructura_detectada['filas_conceptos'])
+        validador._detectar_estructura_tabla(sin_numeros)
+        self.assertNotIn(("OTRO CONCEPTO", fila), validador.estructura_detectada['filas_conceptos'])
+        self.assertEqual(len(DataValidator._cache_estructuras), 1)
+
+
+class TestValidacionLote(_TablaGenerada):
+    def test_lote_equivale_a_validar_cada_archivo(self):
+        generador = np.random.default_rng(2)
+        matrices = []
+        for k in range(6):
+            matriz = self.numericos.to_numpy().copy()
+            celdas = generador.integers(0, matriz.size, size=k)
+            matriz.flat[celdas] += generador.integers(1, 4, size=k)
+            matrices.append(matriz)
+        nombres = [f"escuela_{k}.xlsx" for k in range(6)]
+
+        tabla = DataValidator().validar_lote(np.stack(matrices), self.crudos, nombres)
+        self.assertEqual(tuple(tabla.columns), COLUMNAS_LOTE)
+        self.assertNotIn("escuela_0.xlsx", set(tabla['archivo']))
+
+        for nombre, matriz in zip(nombres, matrices):
+            discrepancias = self._validar(pd.DataFrame(matriz))['discrepancias']
+            filas = tabla[tabla['archivo'] == nombre]
+            self.assertEqual(list(zip(filas['tipo'], filas['esperado'], filas['reportado'])),
+                             [(d['tipo'], d['valor_calculado'], d['valor_reportado']) for d in discrepancias])
+
+    def test_una_matriz_y_nombres_invalidos(self):
+        tabla = DataValidator().validar_lote(self.numericos.to_numpy(), self.crudos)
+        self.assertTrue(tabla.empty)
+        with self.assertRaises(ValueError):
+            DataValidator().validar_lote(self.numericos.to_numpy(), self.crudos, ["a", "b"])
+
+
+class TestReglasEsquema(_TablaGenerada):
+    def setUp(self):
+        # Regla nueva en el esquema: EXISTENCIA = APROBADOS + REPROBADOS
+        esquema = copy.deepcopy(TABLE_SCHEMAS["ESC2_MOVIMIENTOS"])
+        esquema['validaciones']['aprobacion'] = {"formula": "APROBADOS + REPROBADOS", "fila_resultado": 5}
+        parche = mock.patch.dict(TABLE_SCHEMAS, {"ESC2_MOVIMIENTOS": esquema})
+        parche.start()
+        self.addCleanup(parche.stop)
+
+    def test_regla_nueva_se_evalua(self):
+        reporte = self._validar(self.numericos)
+        self.assertEqual(reporte['discrepancias'], [])
+        tipos = [validacion['tipo'] for validacion in reporte['validaciones_exitosas']]
+        self.assertEqual(tipos.count('REGLA_APROBACION'), 12)
+
+        numericos = self.numericos.copy()
+        numericos.iat[5, 2] += 1  # REPROBADOS, 2O. H
+        discrepancias = [d for d in self._validar(numericos)['discrepancias'] if d['tipo'] == 'REGLA_APROBACION']
+        self.assertEqual(len(discrepancias), 1)
+        self.assertEqual(discrepancias[0]['diferencia'], 1.0)
+        self.assertIn("REPROBADOS", discrepancias[0]['descripcion'])
+
+    def test_regla_nueva_en_lote(self):
+        matrices = np.stack([self.numericos.to_numpy()] * 3).astype(float)
+        matrices[1, 5, 2] += 1
+        tabla = DataValidator().validar_lote(matrices, self.crudos, ["a", "b", "c"])
+        tabla = tabla[tabla['tipo'].str.startswith('REGLA_')]
+        self.assertEqual(list(zip(tabla['archivo'], tabla['tipo'], tabla['columna'])),
+                         [("b", 'REGLA_APROBACION', 'H_2O')])
+
+
+class TestValidacionCruzada(_TablaGenerada):
+    def _listado_esc1(self, numericos):
+        """Listado de grupos de ESC1 coherente con la EXISTENCIA y los GRUPOS de ESC2."""
+        matriz = numericos.to_numpy()
+        filas = [["GPO.", "H", "M", "SUBTOTAL"], ["GDO.", None, None, None]]
+        for grado in range(6):
+            n_grupos = int(matriz[9, 2 * grado])
+            hombres, mujeres = int(matriz[2, 2 * grado]), int(matriz[2, 2 * grado + 1])
+            for k in range(n_grupos):
+                h = hombres // n_grupos + (hombres % n_grupos if k == 0 else 0)
+                m = mujeres // n_grupos + (mujeres % n_grupos if k == 0 else 0)
+                filas.append([f"{grado + 1}°{'ABC'[k]}", h, m, h + m])
+                filas.append([None, None, None, None])
+        filas.append(["TOTAL DE ALUMNOS", None, None, int(matriz[2, :12].sum())])
+        return pd.DataFrame(filas, dtype=object)
+
+    def _hojas(self, esc1):
+        return {
+            'ESC2': {'datos_numericos': self.numericos, 'datos_crudos': self.crudos, 'tipo': 'movimientos'},
+            'ESC1': {'datos_numericos': pd.DataFrame(), 'datos_crudos': esc1, 'tipo': 'grupos'}
+        }
+
+    def test_hojas_coherentes(self):
+        reporte = DataValidator().validar_multiples_hojas(self._hojas(self._listado_esc1(self.numericos)))
+        cruzadas = reporte['validaciones_cruzadas']
+
+        self.assertEqual(reporte['resumen']['hojas_validadas'], 1)
+        self.assertEqual(reporte['resumen']['discrepancias_cruzadas'], 0)
+        self.assertEqual(len(cruzadas['coherencia_grupos_movimientos']), 12)
+        self.assertEqual([c['tipo'] for c in cruzadas['consistencia_totales']], ['GRUPOS_POR_GRADO'] * 6 + ['TOTAL_ALUMNOS'] * 2)
+        self.assertTrue(all(c['coincide'] for c in cruzadas['coherencia_grupos_movimientos']))
+        self.assertEqual(cruzadas['alertas_cruzadas'], [])
+
+    def test_discrepancia_por_grado_y_genero(self):
+        esc1 = self._listado_esc1(self.numericos)
+        esc1.iat[2, 2] += 3  # Grupo 1°A, mujeres
+        esc1.iat[len(esc1) - 3, 0] = None  # Último grupo de 6° sin etiqueta
+
+        cruzadas = DataValidator()._validar_coherencia_cruzada(self._hojas(esc1))
+        fallidas = [(c['tipo'], c['grado'], c['genero'], c['diferencia'])
+                    for clave in ('coherencia_grupos_movimientos', 'consistencia_totales')
+                    for c in cruzadas[clave] if not c['coincide']]
+        self.assertIn(('EXISTENCIA_VS_GRUPOS', '1', 'M', 3.0), fallidas)
+        self.assertIn(('GRUPOS_POR_GRADO', '6', None, 1.0), fallidas)
+        self.assertIn('TOTAL_ALUMNOS', {tipo for tipo, _, _, _ in fallidas})
+        self.assertEqual(cruzadas['alertas_cruzadas'][-1]['tipo'], 'error')
+
+        # Guardadas como registros compactos; la descripción se arma al pedirla
+        self.assertIsInstance(cruzadas['coherencia_grupos_movimientos'], RegistrosValidacion)
+        comparacion = cruzadas['coherencia_grupos_movimientos'][6]
+        self.assertEqual((comparacion['grado'], comparacion['genero']), ('1', 'M'))
+        self.assertTrue(comparacion['descripcion'].startswith("❌ Alumnos M de 1° (grupos ESC1 vs existencia ESC2)"))
+
+    def test_esc1_sin_listado(self):
+        esc1 = pd.DataFrame([["NOMBRE", None], ["X", 1]], dtype=object)
+        cruzadas = DataValidator()._validar_coherencia_cruzada(self._hojas(esc1))
+        self.assertEqual(cruzadas['coherencia_grupos_movimientos'], [])
+        self.assertEqual(cruzadas['alertas_cruzadas'][0]['tipo'], 'advertencia')
+
+
+class TestValidacionCruzadaFormatosReales(unittest.TestCase):
+    def setUp(self):
+        desactivar_cache_extraccion(self)
+
+    def test_ambas_hojas_en_una_apertura(self):
+        archivos = sorted(glob.glob(os.path.join(DIRECTORIO_FORMATOS, "10*.xlsx")))
+        if not archivos:
+            self.skipTest("No hay archivos de escuela en 'formatos reales/'")
+        configurar_modo('ESCUELAS')
+
+        manager = DataManager()
+        with mock.patch('src.core.excel_extractor.abrir_sesion_libro', wraps=abrir_sesion_libro) as abrir:
+            hojas = manager.procesar_archivo_multiples_hojas(archivos[0])
+        self.assertEqual(abrir.call_count, 1)
+        self.assertEqual(set(hojas), {'ESC1', 'ESC2'})
+
+        datos = manager.obtener_datos_para_validacion_cruzada(os.path.basename(archivos[0]))
+        reporte = DataValidator().validar_multiples_hojas(datos['datos_por_hoja'])
+        cruzadas = reporte['validaciones_cruzadas']
+        self.assertEqual(len(cruzadas['coherencia_grupos_movimientos']), 12)
+        self.assertEqual(reporte['resumen']['discrepancias_cruzadas'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import glob
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from src.config.settings import configurar_modo
+from src.core.extraction_cache import ExtractionCache
+from src.core.excel_processor import ExcelProcessor
+
+DIRECTORIO_FORMATOS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "formatos reales")
+RANGO_NUMERICO = {'filas_inicio': 3, 'filas_fin': 12, 'columnas_inicio': 7, 'columnas_fin': 25}
+
+
+class TestExtractionCache(unittest.TestCase):
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp()
+        self.cache = ExtractionCache(directorio=self.directorio)
+        self.archivo = os.path.join(self.directorio, "libro.xlsx")
+        with open(self.archivo, 'wb') as archivo:
+            archivo.write(b"contenido de prueba")
+
+    def tearDown(self):
+        shutil.rmtree(self.directorio, ignore_errors=True)
+
+    def test_ida_y_vuelta(self):
+        bloque = pd.DataFrame([["ALUMNOS", None, 3], [None, "1o", 4]])
+        numericos = pd.DataFrame([[0, 3], [0, 4]])
+        clave = self.cache.generar_clave(self.archivo, 'ESC2', 'A5:Z17', RANGO_NUMERICO)
+
+        self.assertIsNone(self.cache.obtener(clave))
+        self.cache.guardar(clave, bloque, numericos, [(5, 1, 5, 3)])
+
+        entrada = self.cache.obtener(clave)
+        self.assertTrue(entrada['datos'].equals(bloque))
+        self.assertTrue(entrada['datos_numericos'].equals(numericos))
+        self.assertEqual(entrada['celdas_combinadas'], [(5, 1, 5, 3)])
+
+    def test_clave_cambia_con_configuracion(self):
+        clave = self.cache.generar_clave(self.archivo, 'ESC2', 'A5:Z17', RANGO_NUMERICO)
+        self.assertNotEqual(clave, self.cache.generar_clave(self.archivo, 'ESC2', 'A5:Z18', RANGO_NUMERICO))
+        self.assertNotEqual(clave, self.cache.generar_clave(self.archivo, 'ESC1', 'A5:Z17', RANGO_NUMERICO))
+
+        with mock.patch('src.core.extraction_cache.get_schemas_version', return_value='otra'):
+            self.assertNotEqual(clave, self.cache.generar_clave(self.archivo, 'ESC2', 'A5:Z17', RANGO_NUMERICO))
+
+    def test_clave_cambia_con_contenido(self):
+        clave = self.cache.generar_clave(self.archivo, 'ESC2', 'A5:Z17', RANGO_NUMERICO)
+        with open(self.archivo, 'ab') as archivo:
+            archivo.write(b"!")
+        self.assertNotEqual(clave, self.cache.generar_clave(self.archivo, 'ESC2', 'A5:Z17', RANGO_NUMERICO))
+
+    def test_entrada_danada_se_descarta(self):
+        clave = self.cache.generar_clave(self.archivo, 'ESC2', 'A5:Z17', RANGO_NUMERICO)
+        with open(os.path.join(self.directorio, clave + ".bin"), 'wb') as archivo:
+            archivo.write(b"no es zlib")
+
+        self.assertIsNone(self.cache.obtener(clave))
+        self.assertEqual(self.cache.obtener_estadisticas()['entradas'], 0)
+
+    def test_expulsa_entradas_menos_usadas(self):
+        datos = pd.DataFrame([[str(i * j) for j in range(20)] for i in range(20)])
+        self.cache.guardar('a', datos, datos, [])
+        tamano = self.cache.obtener_estadisticas()['tamano_bytes']
+        self.cache.tamano_maximo_bytes = tamano * 2
+
+        self.cache.guardar('b', datos, datos, [])
+        os.utime(self.cache._ruta_entrada('a'), ns=(1, 1))
+        self.cache.guardar('c', datos, datos, [])
+
+        self.assertIsNone(self.cache.obtener('a'))
+        self.assertIsNotNone(self.cache.obtener('b'))
+        self.assertIsNotNone(self.cache.obtener('c'))
+
+
+class TestProcesadorConCache(unittest.TestCase):
+    def setUp(self):
+        self.archivos = sorted(glob.glob(os.path.join(DIRECTORIO_FORMATOS, "10*.xlsx")))
+        if not self.archivos:
+            self.skipTest("No hay archivos de escuela en 'formatos reales/'")
+        self.directorio = tempfile.mkdtemp()
+        configurar_modo('ESCUELAS')
+
+    def tearDown(self):
+        shutil.rmtree(self.directorio, ignore_errors=True)
+
+    def test_resultado_desde_cache_identico(self):
+        archivo = self.archivos[0]
+        esperado = ExcelProcessor(cache=False).extraer_datos_completo(archivo)
+
+        procesador = ExcelProcessor(cache=ExtractionCache(directorio=self.directorio))
+        procesador.extraer_datos_completo(archivo)
+        self.assertEqual(procesador.cache.obtener_estadisticas()['entradas'], 1)
+
+        with mock.patch.object(procesador.extractor, 'extraer_con_metadatos') as extraccion:
+            obtenido = procesador.extraer_datos_completo(archivo)
+            extraccion.assert_not_called()
+        self.assertEqual(obtenido.pendientes(), ['datos_crudos', 'datos_combinados', 'mapeo_posicional'])
+
+        for clave in ('datos_crudos', 'datos_combinados', 'datos_numericos'):
+            self.assertTrue(esperado[clave].equals(obtenido[clave]), clave)
+        self.assertEqual(esperado['mapeo_posicional'], obtenido['mapeo_posicional'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import shutil
+import tempfile
+import unittest
+
+from benchmarks.generar_libros import generar_libros
+from src.config.settings import configurar_modo
+from src.core.data_validator import DataValidator
+from src.core.excel_extractor import ExcelExtractor
+from src.core.excel_processor import ExcelProcessor
+
+
+class TestGeneradorLibros(unittest.TestCase):
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directorio, ignore_errors=True)
+        configurar_modo('ZONAS')
+
+    def _validar_modo(self, modo):
+        archivos = generar_libros(modo, 3, self.directorio, semilla=7)
+        configurar_modo(modo)
+
+        procesador = ExcelProcessor(cache=False)
+        procesador.extractor = ExcelExtractor(motor='completo')
+        for archivo in archivos:
+            with self.subTest(modo=modo, archivo=archivo):
+                datos = procesador.extraer_datos_completo(archivo)
+                reporte = DataValidator().validar_tabla_completa(datos['datos_numericos'], datos['datos_crudos'])
+                self.assertEqual(reporte['total_discrepancias'], 0)
+                self.assertGreater(reporte['total_validaciones_exitosas'], 0)
+
+    def test_libros_escuelas_sin_discrepancias(self):
+        self._validar_modo('ESCUELAS')
+
+    def test_libros_zonas_sin_discrepancias(self):
+        self._validar_modo('ZONAS')
+
+    def test_misma_semilla_mismos_datos(self):
+        primero = generar_libros('ESCUELAS', 2, self.directorio + "/a", semilla=3)
+        segundo = generar_libros('ESCUELAS', 2, self.directorio + "/b", semilla=3)
+        extractor = ExcelExtractor(motor='xml')
+        for a, b in zip(primero, segundo):
+            self.assertTrue(extractor.extraer_hoja_simple(a, 'ESC2', 'A5:Z17').equals(
+                extractor.extraer_hoja_simple(b, 'ESC2', 'A5:Z17')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import io
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from benchmarks.generar_libros import generar_libros
+from src.config.settings import BITACORA, configurar_modo
+from src.core.data_validator import DataValidator
+from src.core.excel_processor import ExcelProcessor
+from src.utils.log_utils import LOGGER_RAIZ, configurar_logging, nivel_numerico
+
+
+class _BitacoraTemporal(unittest.TestCase):
+    def setUp(self):
+        self.raiz = logging.getLogger(LOGGER_RAIZ)
+        self.estado = (list(self.raiz.handlers), self.raiz.level, self.raiz.propagate)
+        self.salida = io.StringIO()
+
+    def tearDown(self):
+        self.raiz.handlers[:], nivel, self.raiz.propagate = self.estado
+        self.raiz.setLevel(nivel)
+
+
+class TestConfigurarLogging(_BitacoraTemporal):
+    def test_nivel_numerico(self):
+        self.assertEqual(nivel_numerico("debug"), logging.DEBUG)
+        self.assertEqual(nivel_numerico(" WARNING "), logging.WARNING)
+        self.assertEqual(nivel_numerico("15"), 15)
+        self.assertEqual(nivel_numerico(logging.ERROR), logging.ERROR)
+        with self.assertRaises(ValueError):
+            nivel_numerico("RUIDOSO")
+
+    def test_niveles_y_reconfiguracion(self):
+        logger = logging.getLogger("src.core.prueba")
+        configurar_logging("INFO", destino=self.salida)
+        logger.info("📊 %s archivos", 3)
+        logger.debug("no se muestra")
+        self.assertEqual(self.salida.getvalue(), "📊 3 archivos\n")
+
+        traza = io.StringIO()
+        configurar_logging("DEBUG", destino=traza)
+        logger.debug("📍 fila %s", 7)
+        self.assertEqual(sum(isinstance(m, logging.StreamHandler) and m.stream in (self.salida, traza)
+                             for m in self.raiz.handlers), 1)
+        self.assertIn("DEBUG   src.core.prueba: 📍 fila 7", traza.getvalue())
+        self.assertEqual(self.salida.getvalue(), "📊 3 archivos\n")
+
+    def test_variable_de_entorno(self):
+        with mock.patch.dict(os.environ, {BITACORA['VARIABLE_ENTORNO']: "debug"}):
+            self.assertEqual(configurar_logging(destino=self.salida).level, logging.DEBUG)
+            self.assertEqual(configurar_logging("ERROR", destino=self.salida).level, logging.ERROR)
+        with mock.patch.dict(os.environ, {BITACORA['VARIABLE_ENTORNO']: ""}):
+            self.assertEqual(configurar_logging(destino=self.salida).level, nivel_numerico(BITACORA['NIVEL']))
+            self.assertEqual(configurar_logging(destino=self.salida, predeterminado="INFO").level, logging.INFO)
+
+    def test_nivel_deshabilitado_no_formatea(self):
+        configurar_logging("WARNING", destino=self.salida)
+        argumento = mock.MagicMock()
+        logging.getLogger("src.core.prueba").debug("valor %s", argumento)
+        argumento.__str__.assert_not_called()
+        self.assertEqual(self.salida.getvalue(), "")
+
+
+class TestBitacoraValidador(_BitacoraTemporal):
+    @classmethod
+    def setUpClass(cls):
+        cls.directorio = tempfile.mkdtemp()
+        configurar_modo('ESCUELAS')
+        archivo = generar_libros('ESCUELAS', 1, cls.directorio, semilla=5)[0]
+        datos = ExcelProcessor(cache=False).extraer_datos_completo(archivo)
+        cls.numericos, cls.crudos = datos['datos_numericos'], datos['datos_crudos']
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.directorio, ignore_errors=True)
+
+    def test_silencioso_por_defecto_y_traza_en_debug(self):
+        configurar_logging("WARNING", destino=self.salida)
+        DataValidator().validar_tabla_completa(self.numericos, self.crudos)
+        self.assertEqual(self.salida.getvalue(), "")
+
+        configurar_logging("DEBUG", destino=self.salida)
+        DataValidator().validar_tabla_completa(self.numericos, self.crudos)
+        self.assertIn("src.core.data_validator: ✅ Validación completada: 0 discrepancias", self.salida.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import glob
+import os
+import unittest
+
+from src.core.excel_extractor import ExcelExtractor
+
+DIRECTORIO_FORMATOS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "formatos reales")
+
+
+class TestParidadMotoresExtraccion(unittest.TestCase):
+    """Los motores streaming y xml deben entregar lo mismo que openpyxl completo."""
+
+    RANGO = "A1:AJ60"
+
+    def setUp(self):
+        self.archivos = sorted(glob.glob(os.path.join(DIRECTORIO_FORMATOS, "*.xlsx")))
+        if not self.archivos:
+            self.skipTest("No hay archivos en 'formatos reales/'")
+        self.referencia = ExcelExtractor(motor='completo')
+
+    def _comparar_motor(self, motor):
+        extractor = ExcelExtractor(motor=motor)
+        for archivo in self.archivos:
+            hojas = self.referencia.listar_hojas(archivo)
+            self.assertEqual(extractor.listar_hojas(archivo), hojas)
+
+            for hoja in hojas:
+                with self.subTest(motor=motor, archivo=os.path.basename(archivo), hoja=hoja):
+                    esperado = self.referencia.extraer_con_metadatos(archivo, hoja, self.RANGO)
+                    obtenido = extractor.extraer_con_metadatos(archivo, hoja, self.RANGO)
+
+                    self.assertTrue(esperado['datos'].equals(obtenido['datos']))
+                    self.assertEqual(sorted(esperado['celdas_combinadas']), sorted(obtenido['celdas_combinadas']))
+
+    def test_paridad_streaming(self):
+        self._comparar_motor('streaming')
+
+    def test_paridad_xml(self):
+        self._comparar_motor('xml')
+
+    def test_rango_datos_esc2(self):
+        archivo = self.archivos[0]
+        extractor = ExcelExtractor(motor='xml')
+        resultado = extractor.extraer_con_metadatos(archivo, 'ESC2', 'A5:Z17')
+        self.assertEqual(resultado['datos'].shape, (13, 26))
+        self.assertEqual(resultado['datos'].iat[0, 0], 'MOVIMIENTO DE ALUMNOS')
+
+    def test_motor_invalido(self):
+        with self.assertRaises(ValueError):
+            ExcelExtractor(motor='inexistente')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+
+import numpy as np
+
+from src.core.registros_validacion import RegistrosValidacion, id_regla
+
+
+class _Contexto:
+    def concepto(self, registro):
+        return f"C{registro.concepto_idx}"
+
+    def descripcion(self, registro):
+        return f"{registro.tipo} {registro.concepto_idx}/{registro.columna_idx}"
+
+
+class TestRegistrosValidacion(unittest.TestCase):
+    def test_bloques_y_escalares(self):
+        registros = RegistrosValidacion(exito=False, contexto=_Contexto())
+        registros.agregar('PRUEBA_A', np.arange(3), -1, [1.0, 2.0, 3.0], [1.0, 0.0, np.nan])
+        registros.agregar(id_regla('PRUEBA_B'), 7, 2, 5, 4)
+        registros.agregar('PRUEBA_A', np.arange(0), -1, [], [])
+
+        self.assertEqual(len(registros), 4)
+        self.assertEqual(registros.contar_por_regla(), {'PRUEBA_A': 3, 'PRUEBA_B': 1})
+        self.assertEqual(registros[1]['diferencia'], 2.0)
+        self.assertEqual(registros[2]['valor_reportado'], 'N/A')
+        self.assertEqual(registros[2]['diferencia'], 0)
+        self.assertEqual(registros[-1]['descripcion'], "PRUEBA_B 7/2")
+        self.assertEqual([r['concepto'] for r in registros[:2]], ['C0', 'C1'])
+
+    def test_interfaz_de_diccionario(self):
+        exitosas = RegistrosValidacion(exito=True, contexto=_Contexto())
+        exitosas.agregar('PRUEBA_A', 4, -1, 9.0, 9.0)
+
+        self.assertEqual(exitosas, [{'tipo': 'PRUEBA_A', 'concepto': 'C4', 'valor': 9.0,
+                                     'descripcion': "PRUEBA_A 4/-1"}])
+        self.assertIn('valor', exitosas[0])
+        self.assertNotIn('valor_calculado', exitosas[0])
+        with self.assertRaises(KeyError):
+            exitosas[0]['diferencia']
+        self.assertEqual(RegistrosValidacion(exito=False), [])
+
+    def test_claves_del_contexto(self):
+        class _ContextoPropio(_Contexto):
+            claves = ('tipo', 'suma', 'descripcion')
+
+            def valor(self, registro, clave):
+                return registro.esperado + registro.reportado
+
+        registros = RegistrosValidacion(exito=False, contexto=_ContextoPropio())
+        registros.agregar('PRUEBA_C', 1, 0, 2.0, 3.0)
+
+        self.assertEqual(registros, [{'tipo': 'PRUEBA_C', 'suma': 5.0, 'descripcion': "PRUEBA_C 1/0"}])
+        with self.assertRaises(KeyError):
+            registros[0]['concepto']
+
+
+if __name__ == '__main__':
+    unittest.main()
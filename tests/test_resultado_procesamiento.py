@@ -0,0 +1,179 @@
+import glob
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+from functools import partial
+
+import pandas as pd
+
+from src.config.settings import configurar_modo
+from src.core.data_manager import DataManager
+from src.core.data_transformer import SALIDAS_LOTE
+from src.core.excel_processor import ExcelProcessor
+from src.core.extraction_cache import ExtractionCache
+from src.core.resultado_procesamiento import GeneradorConjunto, ResultadoProcesamiento
+from tests import desactivar_cache_extraccion
+
+DIRECTORIO_FORMATOS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "formatos reales")
+
+
+class TestResultadoProcesamiento(unittest.TestCase):
+    def test_generador_se_ejecuta_una_vez(self):
+        llamadas = []
+        resultado = ResultadoProcesamiento({'a': 1}, {'b': lambda: llamadas.append(1) or 2})
+
+        self.assertIn('b', resultado)
+        self.assertEqual(list(resultado), ['a', 'b'])
+        self.assertEqual(resultado.pendientes(), ['b'])
+        self.assertEqual(llamadas, [])
+
+        self.assertEqual(resultado['b'], 2)
+        self.assertEqual(resultado['b'], 2)
+        self.assertEqual(llamadas, [1])
+        self.assertTrue(resultado.esta_calculado('b'))
+        with self.assertRaises(KeyError):
+            resultado['c']
+
+    def test_asignar_reemplaza_generador(self):
+        resultado = ResultadoProcesamiento(generadores={'a': partial(int, "3")})
+        resultado['a'] = 5
+        self.assertEqual(resultado['a'], 5)
+        self.assertEqual(resultado.pendientes(), [])
+
+    def test_valores_de_solo_lectura(self):
+        datos = pd.DataFrame([[1, "x"], [2, "y"]], dtype=object)
+        resultado = ResultadoProcesamiento({'datos': datos}, {'numeros': partial(pd.DataFrame, [[1, 2]])})
+
+        for clave in ('datos', 'numeros'):
+            with self.assertRaises(ValueError):
+                resultado[clave].iloc[0, 0] = 9
+
+        copia = resultado['datos'].copy()
+        copia.iloc[0, 0] = 9
+        self.assertEqual(datos.iat[0, 0], 1)
+
+    def test_columnas_mixtas_de_solo_lectura(self):
+        datos = pd.DataFrame({'n': [1, 2], 'x': [1.5, 2.0], 'o': pd.Series(["a", "b"], dtype=object),
+                              's': pd.array(["p", "q"], dtype="string")})
+        protegido = ResultadoProcesamiento({'datos': datos})['datos']
+        self.assertEqual(list(protegido.dtypes), list(datos.dtypes))
+
+        for columna in ('n', 'x', 'o'):
+            with self.assertRaises(ValueError):
+                protegido.loc[0, columna] = 9
+
+        # Extensión: sin arreglo NumPy que marcar, Copy-on-Write protege al original
+        protegido.loc[0, 's'] = "z"
+        self.assertEqual(datos.at[0, 's'], "p")
+
+    def test_generador_conjunto_calcula_todas_las_pendientes(self):
+        llamadas = []
+
+        def calcular(claves):
+            llamadas.append(claves)
+            return {clave: clave.upper() for clave in claves}
+
+        vistas = GeneradorConjunto(calcular)
+        resultado = ResultadoProcesamiento(generadores={'a': vistas, 'b': vistas, 'c': vistas})
+        resultado['c'] = "fijo"
+
+        self.assertEqual(resultado['b'], "B")
+        self.assertEqual(resultado['a'], "A")
+        self.assertEqual(llamadas, [('a', 'b')])
+        self.assertEqual(resultado.pendientes(), [])
+        self.assertEqual(resultado['c'], "fijo")
+
+    def test_serializable_con_pendientes(self):
+        resultado = pickle.loads(pickle.dumps(ResultadoProcesamiento({'a': 1}, {'b': partial(int, "3")})))
+        self.assertEqual(resultado.pendientes(), ['b'])
+        self.assertEqual(dict(resultado), {'a': 1, 'b': 3})
+
+    def test_descargar_y_cargar(self):
+        directorio = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directorio, ignore_errors=True)
+        ruta = os.path.join(directorio, "resultado")
+        datos = pd.DataFrame([[1, 2], [3, 4]])
+        resultado = ResultadoProcesamiento({'datos': datos, 'nombre': "a.xlsx"}, {'b': partial(int, "3")})
+
+        resultado.descargar(ruta)
+        self.assertTrue(resultado.en_disco)
+        self.assertEqual(resultado._valores, {'nombre': "a.xlsx"})
+        self.assertEqual(set(resultado), {'datos', 'nombre', 'b'})
+
+        self.assertTrue(resultado['datos'].equals(datos))
+        self.assertFalse(resultado.en_disco)
+        self.assertFalse(os.path.exists(ruta))
+        self.assertEqual(resultado.pendientes(), ['b'])
+        with self.assertRaises(ValueError):
+            resultado['datos'].iloc[0, 0] = 9
+
+
+class TestVistasPerezosas(unittest.TestCase):
+    def setUp(self):
+        desactivar_cache_extraccion(self)
+        archivos = sorted(glob.glob(os.path.join(DIRECTORIO_FORMATOS, "10*.xlsx")))
+        if not archivos:
+            self.skipTest("No hay archivos de escuela en 'formatos reales/'")
+        configurar_modo('ESCUELAS')
+        self.archivo = archivos[0]
+
+    def test_vistas_se_calculan_al_consultarlas(self):
+        directorio = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directorio, ignore_errors=True)
+
+        for cache in (False, ExtractionCache(directorio=directorio)):
+            with self.subTest(cache=bool(cache)):
+                resultado = ExcelProcessor(cache=cache).extraer_datos_completo(self.archivo)
+                self.assertTrue(resultado.esta_calculado('datos_numericos'))
+                self.assertIn('datos_combinados', resultado.pendientes())
+                self.assertIn('mapeo_posicional', resultado.pendientes())
+
+                combinados = resultado['datos_combinados']
+                self.assertIs(resultado['datos_combinados'], combinados)
+                self.assertEqual(combinados.shape, resultado['datos_crudos'].shape)
+
+    def test_una_pasada_para_todas_las_vistas(self):
+        procesador = ExcelProcessor(cache=False)
+        resultado = procesador.extraer_datos_completo(self.archivo)
+        original = procesador.transformer.transformar_fusionado
+        llamadas = []
+
+        def contar(*args, **kwargs):
+            llamadas.append(args[3])
+            return original(*args, **kwargs)
+
+        procesador.transformer.transformar_fusionado = contar
+        resultado['datos_combinados']
+        self.assertEqual(resultado.pendientes(), [])
+        self.assertEqual(len(llamadas), 1)
+        self.assertEqual(set(llamadas[0]), {'datos_crudos', 'datos_combinados', 'mapeo_posicional'})
+
+    def test_salidas_de_lote(self):
+        resultado = ExcelProcessor(cache=False, salidas=SALIDAS_LOTE).extraer_datos_completo(self.archivo)
+        self.assertEqual(set(resultado), set(SALIDAS_LOTE))
+        self.assertEqual(resultado.pendientes(), ['datos_crudos'])
+
+    def test_no_deja_el_libro_abierto(self):
+        procesador = ExcelProcessor(cache=False)
+        resultado = procesador.extraer_datos_completo(self.archivo)
+        self.assertIsNone(procesador.extractor._sesion)
+        self.assertEqual(resultado['datos_combinados'].shape, resultado['datos_crudos'].shape)
+
+        hojas = procesador.extraer_multiples_hojas(self.archivo, {'ESC2': {'hoja': 'ESC2', 'rango': 'A5:Z17'}})
+        self.assertNotIn('error', hojas['ESC2'])
+        self.assertIsNone(procesador.extractor._sesion)
+
+    def test_data_manager_comparte_el_resultado(self):
+        manager = DataManager()
+        datos_procesados = manager.procesar_archivo(self.archivo)
+        registro = manager.archivos_procesados[os.path.basename(self.archivo)]
+
+        self.assertIs(registro, datos_procesados)
+        self.assertIs(registro['datos_numericos'], manager.processor.datos_numericos)
+        self.assertEqual(registro['archivo_completo'], self.archivo)
+
+
+if __name__ == '__main__':
+    unittest.main()